@@ -0,0 +1,163 @@
+"""
+Áudio em Streaming - download -> um processo FFmpeg -> janelas PCM 16 kHz mono
+
+YouTubeRAGExtractor.download_audio_and_transcribe baixava o áudio inteiro para um
+diretório temporário (às vezes copiado para a pasta do vídeo e convertido para WAV)
+e só então o Whisper lia o arquivo de novo pelo FFmpeg: duas passadas completas
+pelo disco e um arquivo temporário do tamanho do áudio.
+
+Aqui os bytes baixados vão direto para o stdin de um único FFmpeg, que devolve
+PCM 16 kHz mono (s16le, o formato que o Whisper usa internamente). O PCM é
+cortado em janelas de ~30 s (a janela do próprio Whisper), cada uma no trecho
+mais silencioso do último segundo para não partir palavras, e entregue assim que
+fica completa: a transcrição das primeiras janelas começa enquanto o resto ainda
+está sendo baixado, sem nada no disco.
+"""
+
+import subprocess
+import sys
+import threading
+from array import array
+from typing import IO, Iterable, Iterator, Optional, Tuple
+
+SAMPLE_RATE = 16000
+BYTES_PER_SAMPLE = 2
+WINDOW_SECONDS = 30
+# Trecho final de cada janela em que se procura o ponto de corte, e o tamanho dos quadros comparados
+CUT_SEARCH_SECONDS = 1.0
+CUT_FRAME_SECONDS = 0.02
+
+# Tamanho de cada leitura do download e da saída do FFmpeg
+READ_SIZE = 64 * 1024
+
+
+def ffmpeg_pcm_command(sample_rate: int = SAMPLE_RATE, source: str = 'pipe:0') -> list:
+    """FFmpeg lendo qualquer contêiner/codec (do stdin ou de um arquivo) e escrevendo PCM s16le mono no stdout"""
+    return [
+        'ffmpeg', '-hide_banner', '-loglevel', 'error',
+        '-i', source,
+        '-f', 's16le', '-acodec', 'pcm_s16le', '-ac', '1', '-ar', str(sample_rate),
+        'pipe:1'
+    ]
+
+
+def quiet_cut(pcm: bytes, window_bytes: int, sample_rate: int = SAMPLE_RATE) -> int:
+    """
+    Posição (em bytes) do corte da janela: início do quadro de menor energia
+    no último CUT_SEARCH_SECONDS antes de window_bytes
+    """
+    frame = int(sample_rate * CUT_FRAME_SECONDS) * BYTES_PER_SAMPLE
+    search = int(sample_rate * CUT_SEARCH_SECONDS) * BYTES_PER_SAMPLE
+    start = max(frame, window_bytes - search)
+
+    samples = array('h')
+    samples.frombytes(bytes(pcm[start:window_bytes]))
+    if sys.byteorder == 'big':
+        samples.byteswap()
+
+    frame_samples = frame // BYTES_PER_SAMPLE
+    best_offset, best_energy = len(samples) * BYTES_PER_SAMPLE, None
+    for i in range(0, len(samples) - frame_samples + 1, frame_samples):
+        energy = sum(abs(s) for s in samples[i:i + frame_samples])
+        if best_energy is None or energy < best_energy:
+            best_offset, best_energy = i * BYTES_PER_SAMPLE, energy
+
+    return start + best_offset
+
+
+def window_pcm(chunks: Iterable[bytes], window_seconds: float = WINDOW_SECONDS,
+               sample_rate: int = SAMPLE_RATE) -> Iterator[Tuple[float, bytes]]:
+    """
+    Agrupa PCM s16le mono em janelas de até window_seconds
+
+    Yields:
+        (início da janela em segundos, PCM da janela), em ordem e sem sobreposição
+    """
+    window_bytes = int(window_seconds * sample_rate) * BYTES_PER_SAMPLE
+    buffer = bytearray()
+    offset_samples = 0
+
+    for chunk in chunks:
+        buffer += chunk
+        while len(buffer) >= window_bytes:
+            cut = quiet_cut(buffer, window_bytes, sample_rate)
+            yield offset_samples / sample_rate, bytes(buffer[:cut])
+            offset_samples += cut // BYTES_PER_SAMPLE
+            del buffer[:cut]
+
+    # Sobra final (descarta meia amostra de uma saída truncada)
+    buffer = buffer[:len(buffer) - len(buffer) % BYTES_PER_SAMPLE]
+    if buffer:
+        yield offset_samples / sample_rate, bytes(buffer)
+
+
+def pcm_to_float32(pcm: bytes):
+    """PCM s16le -> numpy float32 em [-1, 1] (a entrada que model.transcribe aceita no lugar de um arquivo)"""
+    import numpy as np
+    return np.frombuffer(pcm, np.int16).astype(np.float32) / 32768.0
+
+
+def _pump(source: IO, sink: IO, tee: Optional[IO], errors: list):
+    """Copia o download para o stdin do FFmpeg (e para tee, se houver) e fecha o stdin no fim"""
+    try:
+        while True:
+            data = source.read(READ_SIZE)
+            if not data:
+                break
+            sink.write(data)
+            if tee is not None:
+                tee.write(data)
+    except BrokenPipeError:
+        # FFmpeg saiu antes (erro de decodificação ou consumidor parou); o código de saída conta a história
+        pass
+    except Exception as e:
+        errors.append(e)
+    finally:
+        try:
+            sink.close()
+        except OSError:
+            pass
+
+
+def stream_pcm_windows(source: IO, window_seconds: float = WINDOW_SECONDS, sample_rate: int = SAMPLE_RATE,
+                       tee: Optional[IO] = None) -> Iterator[Tuple[float, bytes]]:
+    """
+    Decodifica um download em andamento em janelas PCM, sem arquivos temporários
+
+    Args:
+        source: Stream com o áudio original (ex.: resposta de ydl.urlopen); lido num
+            thread próprio enquanto as janelas são consumidas
+        window_seconds: Duração máxima de cada janela
+        sample_rate: Taxa de amostragem da saída
+        tee: Arquivo que recebe uma cópia dos bytes originais (--save-audio)
+
+    Yields:
+        (início da janela em segundos, PCM s16le mono)
+
+    Raises:
+        RuntimeError: FFmpeg terminou com erro ou o download falhou
+    """
+    process = subprocess.Popen(
+        ffmpeg_pcm_command(sample_rate),
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+    )
+    errors: list = []
+    pump = threading.Thread(target=_pump, args=(source, process.stdin, tee, errors), daemon=True)
+    pump.start()
+
+    try:
+        yield from window_pcm(iter(lambda: process.stdout.read(READ_SIZE), b''), window_seconds, sample_rate)
+
+        pump.join()
+        stderr = process.stderr.read().decode('utf-8', errors='replace').strip()
+        if process.wait() != 0:
+            raise RuntimeError(f"FFmpeg falhou ({process.returncode}): {stderr[-500:]}")
+        if errors:
+            raise RuntimeError(f"Falha no download do áudio: {errors[0]}")
+    finally:
+        # Consumidor parou antes do fim (ou erro): encerra o FFmpeg para liberar o download
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+        process.stdout.close()
+        process.stderr.close()
@@ -0,0 +1,295 @@
+"""
+OCR em Lote - Imagens reduzidas/ladrilhadas, EasyOCR em lotes e Tesseract em processos
+
+O _process_image fazia OCR de uma imagem por chamada, na resolução original.
+Digitalizações chegam em rajadas de centenas de imagens, então aqui:
+
+- cada imagem é reduzida para a resolução alvo (DPI) e, se ainda for grande,
+  dividida em ladrilhos de tamanho fixo (com sobreposição);
+- com EasyOCR, os ladrilhos de todas as imagens vão juntos para readtext_batched;
+- sem EasyOCR, o Tesseract roda em um pool de processos;
+- o texto fica em cache por SHA-256 da imagem junto com as configurações que mudam
+  o resultado (DPI, ladrilhos, idiomas, motor), então reenvios não repetem o OCR e
+  mudar uma configuração não devolve texto antigo.
+"""
+
+import importlib.util
+import io
+import logging
+import os
+import sqlite3
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from PIL import Image
+
+from ingestion_cache import IngestionCache, hash_bytes
+
+logger = logging.getLogger(__name__)
+
+# Resolução usada no OCR (imagens acima disso são reduzidas)
+TARGET_DPI = 300
+# DPI assumido quando a imagem não informa (fotos/digitalizações comuns)
+DEFAULT_SOURCE_DPI = 300
+# Tamanho/sobreposição dos ladrilhos (px); também é o maior lado aceito sem ladrilhar,
+# já que readtext_batched recebe todos os ladrilhos completados até TILE_SIZE
+TILE_SIZE = 1280
+TILE_OVERLAP = 64
+
+OCR_LANGUAGES = "por+eng"
+
+
+def prepare_image(image: Image.Image, target_dpi: int = TARGET_DPI) -> List[Image.Image]:
+    """
+    Reduz a imagem para target_dpi e a divide em ladrilhos se o maior lado passar de TILE_SIZE
+
+    Returns:
+        List[Image]: Ladrilhos em escala de cinza, na ordem de leitura (linhas, depois colunas)
+    """
+    image = image.convert("L")
+
+    source_dpi = image.info.get("dpi", (DEFAULT_SOURCE_DPI,))[0] or DEFAULT_SOURCE_DPI
+    if source_dpi > target_dpi:
+        scale = target_dpi / float(source_dpi)
+        image = image.resize((max(1, int(image.width * scale)), max(1, int(image.height * scale))), Image.LANCZOS)
+
+    if max(image.size) <= TILE_SIZE:
+        return [image]
+
+    step = TILE_SIZE - TILE_OVERLAP
+    tiles = []
+    for top in range(0, max(1, image.height - TILE_OVERLAP), step):
+        for left in range(0, max(1, image.width - TILE_OVERLAP), step):
+            tiles.append(image.crop((left, top, min(left + TILE_SIZE, image.width), min(top + TILE_SIZE, image.height))))
+    return tiles
+
+
+def _pad_to_tile(tile: Image.Image) -> Image.Image:
+    """Completa o ladrilho com branco até TILE_SIZE (readtext_batched exige tamanhos iguais)"""
+    if tile.size == (TILE_SIZE, TILE_SIZE):
+        return tile
+    if tile.width > TILE_SIZE or tile.height > TILE_SIZE:
+        # Colar num quadro menor cortaria o texto fora dele
+        raise ValueError(f"Ladrilho {tile.size} maior que TILE_SIZE ({TILE_SIZE}); use prepare_image")
+    padded = Image.new("L", (TILE_SIZE, TILE_SIZE), 255)
+    padded.paste(tile, (0, 0))
+    return padded
+
+
+def _encode_tiles(tiles: List[Image.Image]) -> List[bytes]:
+    encoded = []
+    for tile in tiles:
+        buffer = io.BytesIO()
+        tile.save(buffer, format="PNG")
+        encoded.append(buffer.getvalue())
+    return encoded
+
+
+def _tesseract_image(tiles_png: List[bytes]) -> str:
+    """OCR de uma imagem (lista de ladrilhos PNG) com Tesseract; executa no processo worker"""
+    import pytesseract
+
+    texts = []
+    for tile_png in tiles_png:
+        text = pytesseract.image_to_string(Image.open(io.BytesIO(tile_png)), lang=OCR_LANGUAGES).strip()
+        if text:
+            texts.append(text)
+    return "\n".join(texts)
+
+
+class OCRCache:
+    """
+    Texto de OCR por chave da imagem (SQLite; ver BatchOCR.cache_key)
+    """
+
+    def __init__(self, db_path: Union[str, Path]):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.Lock()
+
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS ocr_results (
+                    image_hash TEXT PRIMARY KEY,
+                    method TEXT,
+                    text TEXT,
+                    created_at TEXT
+                )
+            ''')
+            conn.commit()
+
+    def get_many(self, image_hashes: List[str]) -> Dict[str, Tuple[str, str]]:
+        """Resultados já conhecidos: hash -> (texto, método)"""
+        image_hashes = list(dict.fromkeys(image_hashes))
+        if not image_hashes:
+            return {}
+
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute(
+                f'SELECT image_hash, text, method FROM ocr_results WHERE image_hash IN ({", ".join("?" * len(image_hashes))})',
+                image_hashes
+            ).fetchall()
+        return {row[0]: (row[1], row[2]) for row in rows}
+
+    def put_many(self, results: Dict[str, Tuple[str, str]]):
+        """Grava hash -> (texto, método) em uma única transação"""
+        if not results:
+            return
+
+        now = datetime.now().isoformat()
+        with self.lock, sqlite3.connect(self.db_path) as conn:
+            conn.executemany(
+                'INSERT OR REPLACE INTO ocr_results (image_hash, method, text, created_at) VALUES (?, ?, ?, ?)',
+                [(image_hash, method, text, now) for image_hash, (text, method) in results.items()]
+            )
+            conn.commit()
+
+
+class BatchOCR:
+    """
+    Motor de OCR em lote com cache por hash
+    """
+
+    def __init__(self, cache_path: Union[str, Path], reader_factory: Optional[Callable] = None,
+                 tesseract_workers: Optional[int] = None, batch_size: int = 16, target_dpi: int = TARGET_DPI):
+        """
+        Args:
+            cache_path: Arquivo SQLite do cache de OCR
+            reader_factory: Devolve o easyocr.Reader (ou None); chamado só se houver imagens novas
+            tesseract_workers: Processos do Tesseract (padrão: nº de CPUs)
+            batch_size: Ladrilhos por lote no EasyOCR
+            target_dpi: Resolução para a qual as imagens são reduzidas antes do OCR
+        """
+        self.cache = OCRCache(cache_path)
+        self.reader_factory = reader_factory
+        self.tesseract_workers = tesseract_workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.target_dpi = target_dpi
+        self._pool = None
+        self._pool_lock = threading.Lock()
+
+        # Configurações que mudam o texto reconhecido fazem parte da chave do cache
+        self.cache_options = {
+            "target_dpi": target_dpi,
+            "tile_size": TILE_SIZE,
+            "tile_overlap": TILE_OVERLAP,
+            "languages": OCR_LANGUAGES
+        }
+        # Motor esperado: EasyOCR só se houver reader_factory e o pacote estiver instalado
+        self.engine = "easyocr" if reader_factory and importlib.util.find_spec("easyocr") else "tesseract"
+
+    def cache_key(self, content: bytes) -> str:
+        """Chave do cache: SHA-256 da imagem + motor + configurações (como no cache de ingestão)"""
+        return IngestionCache.make_key(hash_bytes(content), self.engine, self.cache_options)
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.tesseract_workers)
+            return self._pool
+
+    def recognize(self, content: bytes) -> Tuple[str, str]:
+        """OCR de uma imagem: (texto, método)"""
+        return self.recognize_many([content])[0]
+
+    def recognize_many(self, contents: List[bytes]) -> List[Tuple[str, str]]:
+        """
+        OCR de várias imagens de uma vez
+
+        Args:
+            contents: Bytes das imagens (qualquer formato aberto pelo PIL)
+
+        Returns:
+            List[(texto, método)] na mesma ordem; método é "easyocr", "tesseract",
+            "failed" ou "unavailable"
+        """
+        hashes = [self.cache_key(content) for content in contents]
+        known = self.cache.get_many(hashes)
+
+        # Imagens novas (duplicadas no mesmo lote são processadas uma vez)
+        pending = {}
+        for image_hash, content in zip(hashes, contents):
+            if image_hash not in known and image_hash not in pending:
+                pending[image_hash] = content
+
+        if pending:
+            logger.info(f"🔍 OCR: {len(pending)} new image(s), {len(contents) - len(pending)} from cache")
+            results = self._recognize_pending(pending)
+            # Falhas não vão para o cache, para serem tentadas de novo
+            self.cache.put_many({h: r for h, r in results.items() if r[1] in ("easyocr", "tesseract")})
+            known.update(results)
+
+        return [known[image_hash] for image_hash in hashes]
+
+    def _recognize_pending(self, pending: Dict[str, bytes]) -> Dict[str, Tuple[str, str]]:
+        tiles_by_hash = {}
+        for image_hash, content in pending.items():
+            try:
+                tiles_by_hash[image_hash] = prepare_image(Image.open(io.BytesIO(content)), self.target_dpi)
+            except Exception as e:
+                logger.warning(f"Could not open image for OCR: {e}")
+
+        results = {image_hash: ("OCR falhou", "failed") for image_hash in pending if image_hash not in tiles_by_hash}
+        if not tiles_by_hash:
+            return results
+
+        reader = self.reader_factory() if self.reader_factory else None
+        if reader is not None:
+            try:
+                results.update(self._easyocr_batch(reader, tiles_by_hash))
+                return results
+            except Exception as e:
+                logger.warning(f"EasyOCR batch failed: {e}")
+                results.update({image_hash: ("OCR falhou", "failed") for image_hash in tiles_by_hash})
+                return results
+
+        results.update(self._tesseract_pool(tiles_by_hash))
+        return results
+
+    def _easyocr_batch(self, reader, tiles_by_hash: Dict[str, List[Image.Image]]) -> Dict[str, Tuple[str, str]]:
+        """Todos os ladrilhos de todas as imagens em chamadas readtext_batched"""
+        import numpy as np
+
+        owners = []
+        arrays = []
+        for image_hash, tiles in tiles_by_hash.items():
+            for tile in tiles:
+                owners.append(image_hash)
+                arrays.append(np.array(_pad_to_tile(tile)))
+
+        texts = {image_hash: [] for image_hash in tiles_by_hash}
+        for start in range(0, len(arrays), self.batch_size):
+            batch = arrays[start:start + self.batch_size]
+            batch_results = reader.readtext_batched(
+                batch, n_width=TILE_SIZE, n_height=TILE_SIZE, batch_size=self.batch_size
+            )
+            for image_hash, tile_results in zip(owners[start:start + self.batch_size], batch_results):
+                texts[image_hash].extend(result[1] for result in tile_results)
+
+        return {image_hash: ("\n".join(lines), "easyocr") for image_hash, lines in texts.items()}
+
+    def _tesseract_pool(self, tiles_by_hash: Dict[str, List[Image.Image]]) -> Dict[str, Tuple[str, str]]:
+        """Uma tarefa por imagem no pool de processos do Tesseract"""
+        if not tiles_by_hash:
+            return {}
+
+        image_hashes = list(tiles_by_hash)
+        try:
+            texts = self._get_pool().map(
+                _tesseract_image, [_encode_tiles(tiles_by_hash[image_hash]) for image_hash in image_hashes]
+            )
+            return {image_hash: (text, "tesseract") for image_hash, text in zip(image_hashes, texts)}
+        except Exception as e:
+            logger.warning(f"Tesseract failed: {e}")
+            return {image_hash: ("OCR não disponível", "unavailable") for image_hash in image_hashes}
+
+    def close(self):
+        """Encerra o pool do Tesseract"""
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True)
+                self._pool = None
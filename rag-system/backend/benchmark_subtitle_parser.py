@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Benchmark do parser de legendas
+
+Compara o parse_vtt_content anterior do extrator do YouTube (linhas em memória,
+regex sem compilar por linha e texto com +=) com o subtitle_parser em passe único,
+em legendas de várias horas: VTT no formato das legendas automáticas do YouTube
+(cada cue repete a linha anterior) e SRT. Também mostra quantos segmentos e
+caracteres cada um produz.
+
+Uso:
+    python benchmark_subtitle_parser.py                  # legendas sintéticas de 3 horas
+    python benchmark_subtitle_parser.py legenda.vtt ...  # arquivos informados
+"""
+
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from subtitle_parser import parse_subtitles
+
+HOURS = 3
+REPEAT = 3
+WORDS = "hoje vamos falar sobre chunks tempo legendas parser busca vídeo modelo texto".split()
+
+
+def format_time(seconds: float, separator: str = '.') -> str:
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    return f"{int(hours):02d}:{int(minutes):02d}:{secs:06.3f}".replace('.', separator)
+
+
+def youtube_rolling_vtt(hours: int) -> str:
+    """Legenda automática do YouTube: linha nova com tempos por palavra + cue curto repetindo a linha"""
+    parts = ["WEBVTT\nKind: captions\nLanguage: pt\n"]
+    previous = ""
+    t = 0.0
+    i = 0
+    while t < hours * 3600:
+        words = [WORDS[(i + k) % len(WORDS)] for k in range(6)]
+        timed = words[0] + "".join(f"<{format_time(t + 0.3 * k)}><c> {w}</c>" for k, w in enumerate(words[1:], 1))
+        line = " ".join(words)
+        parts.append(f"\n{format_time(t)} --> {format_time(t + 2)} align:start position:0%\n{previous}\n{timed}\n")
+        parts.append(f"\n{format_time(t + 2)} --> {format_time(t + 2.01)} align:start position:0%\n{line}\n \n")
+        previous = line
+        t += 2.01
+        i += 1
+    return "".join(parts)
+
+
+def srt(hours: int) -> str:
+    parts = []
+    t = 0.0
+    i = 0
+    while t < hours * 3600:
+        words = " ".join(WORDS[(i + k) % len(WORDS)] for k in range(8))
+        parts.append(f"{i + 1}\n{format_time(t, ',')} --> {format_time(t + 3, ',')}\n{words}\n\n")
+        t += 3
+        i += 1
+    return "".join(parts)
+
+
+def legacy_parse(vtt_content: str) -> Tuple[List[Dict], str]:
+    """parse_vtt_content anterior (sem o dicionário de retorno)"""
+    segments = []
+    full_text = ""
+    lines = vtt_content.split('\n')
+
+    current_segment = None
+    segment_index = 0
+
+    for line in lines:
+        line = line.strip()
+
+        if not line or line.startswith('WEBVTT') or line.startswith('NOTE'):
+            continue
+
+        if '-->' in line:
+            try:
+                times = line.split('-->')
+                start_time = legacy_time(times[0].strip())
+                end_time = legacy_time(times[1].strip())
+                current_segment = {
+                    'index': segment_index,
+                    'start': start_time,
+                    'end': end_time,
+                    'duration': end_time - start_time,
+                    'text': ''
+                }
+            except:
+                continue
+
+        elif line and current_segment is not None:
+            clean_text = re.sub(r'<[^>]+>', '', line)
+            clean_text = clean_text.replace('&amp;', '&').replace('&lt;', '<').replace('&gt;', '>')
+            clean_text = clean_text.strip()
+
+            if clean_text:
+                if current_segment['text']:
+                    current_segment['text'] += ' ' + clean_text
+                else:
+                    current_segment['text'] = clean_text
+
+        elif not line and current_segment is not None and current_segment['text']:
+            segments.append(current_segment)
+            full_text += current_segment['text'] + ' '
+            segment_index += 1
+            current_segment = None
+
+    if current_segment is not None and current_segment['text']:
+        segments.append(current_segment)
+        full_text += current_segment['text'] + ' '
+
+    return segments, full_text.strip()
+
+
+def legacy_time(time_str: str) -> float:
+    try:
+        parts = time_str.strip().replace(',', '.').split(':')
+        if len(parts) == 3:
+            return float(parts[0]) * 3600 + float(parts[1]) * 60 + float(parts[2])
+        elif len(parts) == 2:
+            return float(parts[0]) * 60 + float(parts[1])
+        return float(parts[0])
+    except:
+        return 0.0
+
+
+def best_time(func, *args) -> Tuple[float, Tuple]:
+    best = float('inf')
+    result = None
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def stream_file(path: Path) -> Tuple[List[Dict], str]:
+    with open(path, 'rb') as f:
+        return parse_subtitles(f)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        if len(sys.argv) > 1:
+            files = [Path(arg) for arg in sys.argv[1:]]
+        else:
+            files = [Path(temp_dir) / f"youtube_auto_{HOURS}h.vtt", Path(temp_dir) / f"legenda_{HOURS}h.srt"]
+            files[0].write_text(youtube_rolling_vtt(HOURS), encoding='utf-8')
+            files[1].write_text(srt(HOURS), encoding='utf-8')
+
+        print(f"📄 Legendas: {len(files)} (melhor de {REPEAT} execuções)")
+        print("=" * 60)
+
+        for path in files:
+            content = path.read_text(encoding='utf-8')
+            legacy_s, (legacy_segments, legacy_text) = best_time(legacy_parse, content)
+            new_s, (segments, full_text) = best_time(parse_subtitles, content)
+            stream_s, _ = best_time(stream_file, path)
+
+            print(f"⏱️  {path.name} ({len(content) / 1e6:.1f} MB)")
+            print(f"   antes:           {legacy_s * 1000:8.1f} ms  {len(legacy_segments):6d} segmentos  {len(legacy_text):9d} caracteres")
+            print(f"   depois (texto):  {new_s * 1000:8.1f} ms  {len(segments):6d} segmentos  {len(full_text):9d} caracteres ({legacy_s / new_s:.1f}x)")
+            print(f"   depois (stream): {stream_s * 1000:8.1f} ms")
+
+        print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
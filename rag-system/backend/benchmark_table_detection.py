@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark da detecção de tabelas do FinalPDFExtractor
+
+Compara, por página, o tempo de detecção/parse de tabelas da implementação
+anterior (pdf_extractor_final.py, com regex e buscas por linha) com o
+classificador de linhas em passe único do rag_extractor.py. Também confere
+que as duas produzem as mesmas tabelas.
+
+Uso:
+    python benchmark_table_detection.py                  # textos salvos em rag_outputs/json
+    python benchmark_table_detection.py arquivo.pdf ...  # textos extraídos dos PDFs informados
+"""
+
+import json
+import sys
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+import pdfplumber
+
+from pdf_extractor_final import FinalPDFExtractor as LegacyPDFExtractor
+from rag_extractor import FinalPDFExtractor, classify_text, find_table_start
+
+FIXTURES_DIR = Path(__file__).parent / "rag_outputs" / "json"
+REPEAT = 200
+
+
+def load_pages_from_fixtures() -> List[Tuple[str, int]]:
+    """Textos das páginas já extraídas (rag_outputs/json/*.json)"""
+    pages = []
+    for json_file in sorted(FIXTURES_DIR.glob("*.json")):
+        data = json.loads(json_file.read_text(encoding='utf-8'))
+        pages.extend((page['text'], page['page_number']) for page in data.get('content', []))
+    return pages
+
+
+def load_pages_from_pdfs(pdf_paths: List[str]) -> List[Tuple[str, int]]:
+    """Textos extraídos com pdfplumber (fora da medição)"""
+    pages = []
+    for pdf_path in pdf_paths:
+        with pdfplumber.open(pdf_path) as pdf:
+            for page_num, page in enumerate(pdf.pages, 1):
+                text = page.extract_text()
+                if text and text.strip():
+                    pages.append((text.strip(), page_num))
+                page.close()
+    return pages
+
+
+def time_per_page(func, pages: List[Tuple[str, int]]) -> float:
+    """Tempo médio por página em microssegundos"""
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        for text, page_num in pages:
+            func(text, page_num)
+    return (time.perf_counter() - start) / (REPEAT * len(pages)) * 1e6
+
+
+def legacy_line_scan(extractor: LegacyPDFExtractor):
+    """Busca de início de tabela linha a linha da implementação anterior"""
+    def scan(text: str, page_num: int):
+        lines = text.split('\n')
+        for i, line in enumerate(lines):
+            if extractor.is_table_start(line.strip(), lines, i):
+                return i
+        return None
+    return scan
+
+
+def tagged_line_scan(text: str, page_num: int):
+    """Mesma busca usando as tags do classificador (um único passe sobre a página)"""
+    return find_table_start(classify_text(text, '\n')[1])
+
+
+def main():
+    pages = load_pages_from_pdfs(sys.argv[1:]) if len(sys.argv) > 1 else load_pages_from_fixtures()
+    if not pages:
+        print("❌ Nenhuma página encontrada")
+        return
+
+    legacy = LegacyPDFExtractor(output_dir="./rag_outputs")
+    current = FinalPDFExtractor(output_dir="./rag_outputs")
+
+    # As duas implementações precisam gerar as mesmas tabelas
+    mismatches = [page_num for text, page_num in pages
+                  if legacy.extract_table_from_text(text, page_num) != current.extract_table_from_text(text, page_num)]
+
+    print(f"📄 Páginas: {len(pages)} (x{REPEAT} repetições)")
+    print("=" * 60)
+
+    for label, before, after in [
+        ("extract_table_from_text", legacy.extract_table_from_text, current.extract_table_from_text),
+        ("início de tabela por linha", legacy_line_scan(legacy), tagged_line_scan),
+    ]:
+        before_us = time_per_page(before, pages)
+        after_us = time_per_page(after, pages)
+        print(f"⏱️  {label}")
+        print(f"   antes:  {before_us:8.1f} µs/página")
+        print(f"   depois: {after_us:8.1f} µs/página ({before_us / after_us:.1f}x)")
+
+    print("=" * 60)
+    if mismatches:
+        print(f"❌ Tabelas diferentes nas páginas: {mismatches}")
+    else:
+        print("✅ Tabelas idênticas em todas as páginas")
+
+
+if __name__ == "__main__":
+    main()
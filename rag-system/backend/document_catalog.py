@@ -0,0 +1,319 @@
+"""
+Catálogo Persistente de Documentos - SQLite (WAL)
+
+Substitui o dicionário em memória DOCUMENTS_DB do main.py. Os documentos ficam
+em uma tabela com colunas indexadas (id, title, created_at, processing_method,
+size_bytes), então listagens e estatísticas viram consultas paginadas e um
+restart do servidor não perde o catálogo.
+"""
+
+import json
+import logging
+import sqlite3
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Iterator, Iterable, Union
+
+logger = logging.getLogger("rag_system")
+
+# Colunas da tabela documents, na ordem usada pelos INSERTs
+DOCUMENT_COLUMNS = [
+    "id", "title", "filename", "source_url", "source_file", "chunks_count",
+    "size_bytes", "created_at", "processing_method", "pages", "tables",
+    "images", "content_preview", "success", "error", "files", "status"
+]
+
+# Status de um documento cuja ingestão em streaming ainda não terminou (success = 0 até completar)
+STATUS_PROCESSING = "processing"
+
+
+def load_chunks(chunks_file: Optional[str]) -> List[str]:
+    """Carrega a lista de chunks salva em data/chunks (lista vazia se ausente)"""
+    if not chunks_file or not Path(chunks_file).exists():
+        return []
+    try:
+        return json.loads(Path(chunks_file).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return []
+
+
+class DocumentCatalog:
+    """
+    Catálogo de documentos em SQLite
+    """
+
+    def __init__(self, db_path: Union[str, Path]):
+        """
+        Inicializa o catálogo
+
+        Args:
+            db_path: Caminho do arquivo SQLite do catálogo
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.init_database()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def init_database(self):
+        """Cria a tabela e os índices do catálogo"""
+        with self._connect() as conn:
+            cursor = conn.cursor()
+
+            # WAL permite leituras concorrentes durante as escritas
+            cursor.execute('PRAGMA journal_mode=WAL')
+
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS documents (
+                    id TEXT PRIMARY KEY,
+                    title TEXT,
+                    filename TEXT,
+                    source_url TEXT,
+                    source_file TEXT,
+                    chunks_count INTEGER DEFAULT 0,
+                    size_bytes INTEGER DEFAULT 0,
+                    created_at TEXT,
+                    processing_method TEXT,
+                    pages INTEGER,
+                    tables INTEGER,
+                    images INTEGER,
+                    content_preview TEXT,
+                    success INTEGER NOT NULL DEFAULT 1,
+                    error TEXT,
+                    files TEXT,
+                    status TEXT
+                )
+            ''')
+
+            # Catálogos criados antes da coluna status
+            columns = {row[1] for row in cursor.execute('PRAGMA table_info(documents)')}
+            if "status" not in columns:
+                cursor.execute('ALTER TABLE documents ADD COLUMN status TEXT')
+
+            # Índices para listagens e estatísticas
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_documents_title ON documents(title)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_documents_created_at ON documents(success, created_at)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_documents_processing_method ON documents(processing_method)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_documents_size ON documents(size_bytes)')
+
+            conn.commit()
+
+    def _row_to_dict(self, row: sqlite3.Row) -> Dict[str, Any]:
+        doc = dict(row)
+        doc["success"] = bool(doc["success"])
+        doc["files"] = json.loads(doc["files"]) if doc["files"] else {}
+        return doc
+
+    def upsert(self, doc: Dict[str, Any]):
+        """
+        Insere ou substitui um documento
+
+        Args:
+            doc: Dicionário no formato usado pelo main.py (mesmas chaves de DOCUMENTS_DB)
+        """
+        self.upsert_many([doc])
+
+    def upsert_many(self, docs: Iterable[Dict[str, Any]]) -> int:
+        """Insere ou substitui vários documentos em uma única transação"""
+        rows = []
+        for doc in docs:
+            values = {column: doc.get(column) for column in DOCUMENT_COLUMNS}
+            values["success"] = 1 if doc.get("success", False) else 0
+            values["files"] = json.dumps(doc.get("files") or {}, ensure_ascii=False)
+            rows.append(tuple(values[column] for column in DOCUMENT_COLUMNS))
+
+        if not rows:
+            return 0
+
+        with self._connect() as conn:
+            conn.executemany(
+                f'INSERT OR REPLACE INTO documents ({", ".join(DOCUMENT_COLUMNS)}) '
+                f'VALUES ({", ".join("?" * len(DOCUMENT_COLUMNS))})',
+                rows
+            )
+            conn.commit()
+
+        return len(rows)
+
+    def get(self, doc_id: str) -> Optional[Dict[str, Any]]:
+        """Busca um documento pelo ID"""
+        with self._connect() as conn:
+            row = conn.execute('SELECT * FROM documents WHERE id = ?', (doc_id,)).fetchone()
+        return self._row_to_dict(row) if row else None
+
+    def get_many(self, doc_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Busca vários documentos pelo ID (uma única consulta)"""
+        doc_ids = list(dict.fromkeys(doc_ids))
+        if not doc_ids:
+            return {}
+
+        with self._connect() as conn:
+            rows = conn.execute(
+                f'SELECT * FROM documents WHERE id IN ({", ".join("?" * len(doc_ids))})',
+                doc_ids
+            ).fetchall()
+
+        return {row["id"]: self._row_to_dict(row) for row in rows}
+
+    def delete(self, doc_id: str) -> bool:
+        """Remove um documento do catálogo"""
+        with self._connect() as conn:
+            cursor = conn.execute('DELETE FROM documents WHERE id = ?', (doc_id,))
+            conn.commit()
+        return cursor.rowcount > 0
+
+    def clear(self):
+        """Remove todos os documentos do catálogo"""
+        with self._connect() as conn:
+            conn.execute('DELETE FROM documents')
+            conn.commit()
+
+    def is_empty(self, successful_only: bool = True) -> bool:
+        """Verifica se há documentos no catálogo"""
+        query = 'SELECT 1 FROM documents WHERE success = 1 LIMIT 1' if successful_only else \
+            'SELECT 1 FROM documents LIMIT 1'
+        with self._connect() as conn:
+            return conn.execute(query).fetchone() is None
+
+    def count(self, successful_only: bool = True) -> int:
+        """Número de documentos no catálogo"""
+        query = 'SELECT COUNT(*) FROM documents WHERE success = 1' if successful_only else \
+            'SELECT COUNT(*) FROM documents'
+        with self._connect() as conn:
+            return conn.execute(query).fetchone()[0]
+
+    def list_documents(self, limit: int = 50, offset: int = 0,
+                       successful_only: bool = True) -> List[Dict[str, Any]]:
+        """
+        Lista documentos paginados, mais recentes primeiro
+
+        Args:
+            limit: Tamanho da página
+            offset: Deslocamento da página
+            successful_only: Ignorar documentos cujo processamento falhou ou ainda não terminou
+        """
+        where = 'WHERE success = 1' if successful_only else ''
+        with self._connect() as conn:
+            rows = conn.execute(
+                f'SELECT * FROM documents {where} ORDER BY created_at DESC LIMIT ? OFFSET ?',
+                (limit, offset)
+            ).fetchall()
+        return [self._row_to_dict(row) for row in rows]
+
+    def iter_documents(self, successful_only: bool = True, page_size: int = 500) -> Iterator[Dict[str, Any]]:
+        """Itera sobre todos os documentos, página por página (keyset pagination por id)"""
+        where = 'AND success = 1' if successful_only else ''
+        last_id = ''
+        while True:
+            with self._connect() as conn:
+                rows = conn.execute(
+                    f'SELECT * FROM documents WHERE id > ? {where} ORDER BY id LIMIT ?',
+                    (last_id, page_size)
+                ).fetchall()
+
+            if not rows:
+                return
+
+            for row in rows:
+                yield self._row_to_dict(row)
+            last_id = rows[-1]["id"]
+
+    def list_processing(self) -> List[Dict[str, Any]]:
+        """Documentos cuja ingestão em streaming ainda não terminou (status processing)"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                'SELECT * FROM documents WHERE success = 0 AND status = ? ORDER BY created_at',
+                (STATUS_PROCESSING,)
+            ).fetchall()
+        return [self._row_to_dict(row) for row in rows]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Estatísticas agregadas calculadas pelo SQLite"""
+        with self._connect() as conn:
+            totals = conn.execute('''
+                SELECT COUNT(*) AS total,
+                       COALESCE(SUM(success), 0) AS successful,
+                       COALESCE(SUM(CASE WHEN success = 0 AND status = ? THEN 1 ELSE 0 END), 0) AS processing,
+                       COALESCE(SUM(CASE WHEN success = 1 THEN size_bytes ELSE 0 END), 0) AS size_bytes,
+                       COALESCE(SUM(CASE WHEN success = 1 THEN chunks_count ELSE 0 END), 0) AS chunks,
+                       COALESCE(SUM(CASE WHEN success = 1 THEN pages ELSE 0 END), 0) AS pages,
+                       COALESCE(SUM(CASE WHEN success = 1 THEN tables ELSE 0 END), 0) AS tables
+                FROM documents
+            ''', (STATUS_PROCESSING,)).fetchone()
+
+            methods = conn.execute('''
+                SELECT COALESCE(processing_method, 'Unknown') AS method, COUNT(*) AS count
+                FROM documents WHERE success = 1
+                GROUP BY processing_method
+            ''').fetchall()
+
+        return {
+            "total_documents": totals["total"],
+            "successful_documents": totals["successful"],
+            "processing_documents": totals["processing"],
+            "failed_documents": totals["total"] - totals["successful"] - totals["processing"],
+            "total_size_bytes": totals["size_bytes"],
+            "total_chunks": totals["chunks"],
+            "total_pages": totals["pages"],
+            "total_tables": totals["tables"],
+            "processing_methods": {row["method"]: row["count"] for row in methods}
+        }
+
+    def rebuild_from_metadata(self, metadata_dir: Union[str, Path]) -> List[Dict[str, Any]]:
+        """
+        Importa para o catálogo os documentos de data/metadata/*.json que ainda não estão nele
+
+        Args:
+            metadata_dir: Diretório com os arquivos de metadados gerados no upload
+
+        Returns:
+            List[Dict]: Documentos importados
+        """
+        metadata_dir = Path(metadata_dir)
+
+        with self._connect() as conn:
+            known_ids = {row[0] for row in conn.execute('SELECT id FROM documents')}
+
+        docs = []
+        for metadata_file in metadata_dir.glob("*.json"):
+            if metadata_file.stem in known_ids:
+                continue
+
+            try:
+                metadata = json.loads(metadata_file.read_text(encoding='utf-8'))
+            except (OSError, ValueError) as e:
+                logger.warning(f"Could not load metadata from {metadata_file}: {e}")
+                continue
+
+            doc_id = metadata.get("document_id")
+            if not doc_id or doc_id in known_ids:
+                continue
+
+            outputs = metadata.get("outputs", {})
+            chunks_count = metadata.get("chunks_count")
+            if chunks_count is None:
+                # Metadados antigos não registravam o número de chunks
+                chunks_count = len(load_chunks(outputs.get("chunks")))
+
+            docs.append({
+                "id": doc_id,
+                "title": metadata.get("title"),
+                "filename": metadata.get("filename"),
+                "source_url": metadata.get("source_url"),
+                "source_file": metadata.get("source_file"),
+                "chunks_count": chunks_count,
+                "size_bytes": metadata.get("file_size", 0),
+                "created_at": metadata.get("created_at"),
+                "processing_method": metadata.get("processing_method"),
+                "pages": metadata.get("pages"),
+                "tables": metadata.get("tables"),
+                "images": metadata.get("images"),
+                "content_preview": metadata.get("content_preview", ""),
+                "success": True,
+                "files": outputs
+            })
+
+        self.upsert_many(docs)
+        return docs
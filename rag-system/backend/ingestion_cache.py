@@ -0,0 +1,224 @@
+"""
+Cache de Ingestão - Deduplicação por hash de conteúdo
+
+Reenviar o mesmo arquivo (ou baixar a mesma URL) refazia a extração inteira e
+criava um novo documento com um novo conjunto de arquivos. Aqui cada extração
+bem-sucedida é registrada sob uma chave derivada do SHA-256 dos bytes, da
+versão do extrator e das opções usadas; um reenvio idêntico devolve o
+resultado já gravado e reaproveita os mesmos artefatos.
+
+O número de entradas é limitado a max_entries (LRU acima disso). O limite é
+só do índice do cache, não do disco: os artefatos pertencem ao documento do
+catálogo (apagados com ele), então remover uma entrada só esquece o atalho.
+size_bytes de cada entrada (artefatos referenciados) é apenas informativo.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, List, Optional, Union
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Padrão de entradas mantidas no cache
+DEFAULT_MAX_ENTRIES = 10000
+
+
+def hash_bytes(content: bytes) -> str:
+    """SHA-256 (hex) de um conteúdo em memória"""
+    return hashlib.sha256(content).hexdigest()
+
+
+def hash_file(path: Union[str, Path]) -> str:
+    """SHA-256 (hex) de um arquivo, lido em blocos"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def copy_and_hash(src: BinaryIO, dest: BinaryIO) -> str:
+    """Copia src para dest calculando o SHA-256 no mesmo passe"""
+    digest = hashlib.sha256()
+    for block in iter(lambda: src.read(HASH_CHUNK_SIZE), b''):
+        digest.update(block)
+        dest.write(block)
+    return digest.hexdigest()
+
+
+def artifacts_size(paths: Iterable[Optional[str]]) -> int:
+    """Soma o tamanho dos arquivos existentes (ignora caminhos ausentes)"""
+    total = 0
+    for path in paths:
+        if path and Path(path).is_file():
+            total += Path(path).stat().st_size
+    return total
+
+
+class IngestionCache:
+    """
+    Cache de resultados de extração endereçado por conteúdo (SQLite)
+    """
+
+    def __init__(self, db_path: Union[str, Path], max_entries: Optional[int] = None):
+        """
+        Args:
+            db_path: Caminho do arquivo SQLite do cache
+            max_entries: Número máximo de entradas (LRU acima disso)
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries if max_entries is not None else DEFAULT_MAX_ENTRIES
+
+        # Contadores da sessão (não persistidos)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+        self.init_database()
+
+    def init_database(self):
+        """Cria a tabela do cache"""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute('PRAGMA journal_mode=WAL')
+
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS cache_entries (
+                    cache_key TEXT PRIMARY KEY,
+                    content_hash TEXT NOT NULL,
+                    extractor_version TEXT,
+                    options TEXT,
+                    doc_id TEXT NOT NULL,
+                    size_bytes INTEGER DEFAULT 0,
+                    result TEXT,
+                    created_at TEXT,
+                    last_used_at TEXT,
+                    hits INTEGER DEFAULT 0
+                )
+            ''')
+
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_cache_doc_id ON cache_entries(doc_id)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_cache_last_used ON cache_entries(last_used_at)')
+
+            conn.commit()
+
+    @staticmethod
+    def make_key(content_hash: str, extractor_version: str, options: Optional[Dict[str, Any]] = None) -> str:
+        """Chave do cache: hash do conteúdo + versão do extrator + opções (ordem irrelevante)"""
+        options_text = json.dumps(options or {}, sort_keys=True, default=str)
+        return hashlib.sha256(f"{content_hash}|{extractor_version}|{options_text}".encode('utf-8')).hexdigest()
+
+    def get(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """
+        Busca uma entrada e marca o uso (para o LRU)
+
+        Returns:
+            Dict com doc_id, content_hash, size_bytes e result, ou None
+        """
+        with self.lock, sqlite3.connect(self.db_path) as conn:
+            row = conn.execute(
+                'SELECT doc_id, content_hash, size_bytes, result FROM cache_entries WHERE cache_key = ?',
+                (cache_key,)
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            conn.execute(
+                'UPDATE cache_entries SET last_used_at = ?, hits = hits + 1 WHERE cache_key = ?',
+                (datetime.now().isoformat(), cache_key)
+            )
+            conn.commit()
+            self.hits += 1
+
+        return {
+            "doc_id": row[0],
+            "content_hash": row[1],
+            "size_bytes": row[2],
+            "result": json.loads(row[3]) if row[3] else None
+        }
+
+    def put(self, cache_key: str, content_hash: str, doc_id: str, result: Dict[str, Any],
+            size_bytes: int = 0, extractor_version: str = "", options: Optional[Dict[str, Any]] = None) -> List[str]:
+        """
+        Registra o resultado de uma extração
+
+        Returns:
+            List[str]: doc_ids das entradas removidas pelo LRU
+        """
+        now = datetime.now().isoformat()
+        with self.lock, sqlite3.connect(self.db_path) as conn:
+            conn.execute('''
+                INSERT OR REPLACE INTO cache_entries
+                (cache_key, content_hash, extractor_version, options, doc_id, size_bytes,
+                 result, created_at, last_used_at, hits)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 0)
+            ''', (
+                cache_key, content_hash, extractor_version,
+                json.dumps(options or {}, sort_keys=True, default=str), doc_id, size_bytes,
+                json.dumps(result, ensure_ascii=False, default=str), now, now
+            ))
+            evicted = self._evict(conn)
+            conn.commit()
+
+        return evicted
+
+    def _evict(self, conn: sqlite3.Connection) -> List[str]:
+        """Remove as entradas menos usadas até o total caber em max_entries"""
+        excess = conn.execute('SELECT COUNT(*) FROM cache_entries').fetchone()[0] - self.max_entries
+        if excess <= 0:
+            return []
+
+        rows = conn.execute(
+            'SELECT cache_key, doc_id FROM cache_entries ORDER BY last_used_at LIMIT ?', (excess,)
+        ).fetchall()
+        conn.executemany('DELETE FROM cache_entries WHERE cache_key = ?', [(row[0],) for row in rows])
+
+        self.evictions += len(rows)
+        return [row[1] for row in rows]
+
+    def invalidate(self, cache_key: str) -> bool:
+        """Remove uma entrada (ex.: o documento apontado não existe mais)"""
+        with self.lock, sqlite3.connect(self.db_path) as conn:
+            cursor = conn.execute('DELETE FROM cache_entries WHERE cache_key = ?', (cache_key,))
+            conn.commit()
+        return cursor.rowcount > 0
+
+    def remove_document(self, doc_id: str) -> int:
+        """Remove as entradas que apontam para um documento apagado"""
+        with self.lock, sqlite3.connect(self.db_path) as conn:
+            cursor = conn.execute('DELETE FROM cache_entries WHERE doc_id = ?', (doc_id,))
+            conn.commit()
+        return cursor.rowcount
+
+    def clear(self):
+        """Remove todas as entradas"""
+        with self.lock, sqlite3.connect(self.db_path) as conn:
+            conn.execute('DELETE FROM cache_entries')
+            conn.commit()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Ocupação e taxa de acerto do cache"""
+        with sqlite3.connect(self.db_path) as conn:
+            entries, size_bytes, total_hits = conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size_bytes), 0), COALESCE(SUM(hits), 0) FROM cache_entries'
+            ).fetchone()
+
+        lookups = self.hits + self.misses
+        return {
+            "entries": entries,
+            "size_bytes": size_bytes,
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "total_hits": total_hits
+        }
@@ -0,0 +1,371 @@
+"""
+Fila de Ingestão - Extração de documentos fora do event loop
+
+A extração de PDF (pdfplumber) é puramente CPU e bloqueava o event loop do
+FastAPI. Aqui a extração roda em um ProcessPoolExecutor com fila limitada:
+o upload recebe um job_id na hora, o progresso é consultado em /jobs/{id} e,
+com a fila cheia, o submit é recusado (backpressure) em vez de acumular.
+
+PDFs são extraídos em modo streaming: cada página vira chunks gravados no
+arquivo de chunks e enviados ao processo principal por uma fila de progresso,
+então a memória não cresce com o tamanho do documento e os chunks já ficam
+pesquisáveis enquanto as páginas seguintes ainda estão sendo lidas.
+"""
+
+import json
+import logging
+import multiprocessing
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger("rag_system")
+
+# Extrator reaproveitado por todas as tarefas de um mesmo processo worker
+_worker_extractor = None
+
+
+def _get_worker_extractor():
+    global _worker_extractor
+    if _worker_extractor is None:
+        from rag_extractor import FinalPDFExtractor
+        _worker_extractor = FinalPDFExtractor(page_workers=int(os.getenv("PDF_PAGE_WORKERS", 1)))
+    return _worker_extractor
+
+
+def split_into_chunks(text: str) -> List[str]:
+    """Divide o texto em chunks simples (parágrafos separados por linha em branco)"""
+    return [chunk.strip() for chunk in text.split('\n\n') if chunk.strip()]
+
+
+class ProgressReporter:
+    """
+    Envia o progresso de um job do processo worker para o processo principal
+
+    É picklable (só guarda o proxy da fila do Manager e o job_id), então pode
+    ser passado como argumento da função executada no ProcessPoolExecutor.
+    """
+
+    def __init__(self, queue, job_id: str):
+        self.queue = queue
+        self.job_id = job_id
+
+    def __call__(self, progress: float, payload: Optional[Dict[str, Any]] = None):
+        self.queue.put((self.job_id, progress, "progress", payload))
+
+
+def extract_document(upload_path: str, file_ext: str, output_dir: str, doc_id: str,
+                     progress: Optional[Callable[[float, Optional[Dict[str, Any]]], None]] = None) -> Dict[str, Any]:
+    """
+    Extrai o conteúdo de um arquivo enviado (executa dentro do processo worker)
+
+    Args:
+        upload_path: Caminho do arquivo salvo em data/uploads
+        file_ext: Extensão do arquivo (.pdf, .txt, ...)
+        output_dir: Diretório de dados (os PDFs geram markdown/{doc_id}.md, json/{doc_id}.jsonl
+            e chunks/{doc_id}.json nele)
+        doc_id: ID do documento, usado como nome dos arquivos gerados
+        progress: Recebe (fração, {"chunks": [...], "start_index": n}) a cada página do PDF
+
+    Returns:
+        Dict: {"type": "pdf", "results": ...} ou {"type": "text", "content": ...}
+    """
+    if file_ext == '.pdf':
+        chunks_dir = Path(output_dir) / "chunks"
+        chunks_dir.mkdir(parents=True, exist_ok=True)
+        chunks_path = chunks_dir / f"{doc_id}.json"
+
+        state = {"chunks_count": 0, "content_preview": ""}
+
+        with open(chunks_path, 'w', encoding='utf-8') as chunks_out:
+            # Array JSON escrito incrementalmente, um chunk por vez
+            chunks_out.write("[")
+
+            def on_page(page_content, page_markdown, total_pages):
+                chunks = split_into_chunks(page_markdown)
+                for chunk in chunks:
+                    chunks_out.write(("," if state["chunks_count"] else "") + "\n  ")
+                    chunks_out.write(json.dumps(chunk, ensure_ascii=False))
+                    if not state["content_preview"]:
+                        state["content_preview"] = chunk[:200] + "..." if len(chunk) > 200 else chunk
+                    state["chunks_count"] += 1
+
+                if progress:
+                    progress(
+                        page_content['page_number'] / max(total_pages, 1),
+                        {"chunks": chunks, "start_index": state["chunks_count"] - len(chunks)}
+                    )
+
+            results = _get_worker_extractor().process_pdf_streaming(
+                upload_path, output_dir=output_dir, filename_base=doc_id, on_page=on_page
+            )
+            chunks_out.write("\n]" if state["chunks_count"] else "]")
+
+        results['files']['chunks'] = str(chunks_path)
+        results.update(state)
+        return {"type": "pdf", "results": results}
+
+    return {"type": "text", "content": Path(upload_path).read_text(encoding='utf-8')}
+
+
+class QueueFullError(Exception):
+    """Fila de ingestão cheia - o cliente deve tentar novamente mais tarde"""
+
+
+class IngestionJobManager:
+    """
+    Gerencia jobs de ingestão: pool de processos para extração e uma única
+    thread de escrita para gravar os resultados (catálogo, índice, arquivos)
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, max_queue: Optional[int] = None,
+                 history_size: int = 1000):
+        """
+        Args:
+            max_workers: Processos de extração (padrão: INGEST_WORKERS ou nº de CPUs)
+            max_queue: Jobs aguardando além dos que estão em execução (padrão: INGEST_QUEUE_SIZE ou 16)
+            history_size: Quantos jobs finalizados manter para consulta em /jobs/{id}
+        """
+        self.max_workers = max_workers or int(os.getenv("INGEST_WORKERS", 0)) or os.cpu_count() or 1
+        self.max_queue = max_queue if max_queue is not None else int(os.getenv("INGEST_QUEUE_SIZE", 16))
+        self.history_size = history_size
+
+        self.executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        self.writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ingest-writer")
+
+        # Fila de progresso compartilhada com os workers (criada no primeiro job com on_progress)
+        self.manager = None
+        self.progress_queue = None
+        self.progress_listener: Optional[threading.Thread] = None
+        self.progress_callbacks: Dict[str, tuple] = {}
+
+        self.jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.futures: Dict[str, Future] = {}
+        self.active = 0
+        self.lock = threading.Lock()
+
+    @property
+    def capacity(self) -> int:
+        return self.max_workers + self.max_queue
+
+    def submit(self, func: Callable, *args, on_complete: Callable[[Any], Dict[str, Any]],
+               on_error: Optional[Callable[[Exception], None]] = None,
+               on_progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+               document_id: Optional[str] = None, description: str = "") -> Dict[str, Any]:
+        """
+        Enfileira um job de extração
+
+        Args:
+            func: Função de extração (top-level, executada no processo worker)
+            *args: Argumentos de func (precisam ser picklable)
+            on_complete: Recebe o retorno de func na thread de escrita; o dict retornado vira o resultado do job
+            on_error: Chamado na thread de escrita se a extração ou o on_complete falharem
+            on_progress: Se informado, func recebe progress=ProgressReporter e cada payload
+                enviado pelo worker é entregue a on_progress na thread de escrita, sempre
+                antes do on_complete
+            document_id: ID do documento associado ao job
+            description: Descrição curta (ex.: nome do arquivo)
+
+        Returns:
+            Dict: Estado inicial do job
+
+        Raises:
+            QueueFullError: Se já houver max_workers + max_queue jobs ativos
+        """
+        job_id = str(uuid.uuid4())
+
+        with self.lock:
+            if self.active >= self.capacity:
+                raise QueueFullError(f"Ingestion queue is full ({self.active}/{self.capacity} jobs)")
+            self.active += 1
+
+            job = {
+                "id": job_id,
+                "document_id": document_id,
+                "description": description,
+                "status": "queued",
+                "stage": "queued",
+                "progress": 0.0,
+                "created_at": datetime.now().isoformat(),
+                "finished_at": None,
+                "result": None,
+                "error": None
+            }
+            self.jobs[job_id] = job
+
+        kwargs = {}
+        try:
+            if on_progress:
+                kwargs["progress"] = ProgressReporter(self._get_progress_queue(), job_id)
+                with self.lock:
+                    self.progress_callbacks[job_id] = (on_progress, on_complete, on_error)
+            future = self.executor.submit(func, *args, **kwargs)
+        except Exception:
+            with self.lock:
+                self.active -= 1
+                del self.jobs[job_id]
+                self.progress_callbacks.pop(job_id, None)
+            raise
+
+        with self.lock:
+            self.futures[job_id] = future
+
+        if on_progress:
+            # O fim do job passa pela mesma fila: chega depois de todo o progresso do worker
+            future.add_done_callback(lambda f: self.progress_queue.put((job_id, None, "done", None)))
+        else:
+            future.add_done_callback(
+                lambda f: self.writer.submit(self._finish, job_id, f, on_complete, on_error)
+            )
+        return dict(job)
+
+    def add_completed(self, result: Dict[str, Any], document_id: Optional[str] = None,
+                      description: str = "") -> Dict[str, Any]:
+        """
+        Registra um job já concluído, sem extração (ex.: resultado vindo do cache)
+
+        Mantém o mesmo fluxo para o cliente, que consulta /jobs/{id} normalmente.
+        """
+        now = datetime.now().isoformat()
+        job = {
+            "id": str(uuid.uuid4()),
+            "document_id": document_id,
+            "description": description,
+            "status": "completed",
+            "stage": "completed",
+            "progress": 1.0,
+            "created_at": now,
+            "finished_at": now,
+            "result": result,
+            "error": None
+        }
+
+        with self.lock:
+            self.jobs[job["id"]] = job
+            self._trim_history()
+
+        return dict(job)
+
+    def _get_progress_queue(self):
+        with self.lock:
+            if self.progress_queue is None:
+                self.manager = multiprocessing.Manager()
+                self.progress_queue = self.manager.Queue()
+                self.progress_listener = threading.Thread(
+                    target=self._listen_progress, name="ingest-progress", daemon=True
+                )
+                self.progress_listener.start()
+            return self.progress_queue
+
+    def _listen_progress(self):
+        """Repassa mensagens da fila de progresso para a thread de escrita"""
+        while True:
+            try:
+                message = self.progress_queue.get()
+            except (EOFError, OSError):
+                return
+            if message is None:
+                return
+
+            job_id, progress, kind, payload = message
+            if kind == "done":
+                with self.lock:
+                    future = self.futures.get(job_id)
+                    _, on_complete, on_error = self.progress_callbacks.get(job_id, (None, None, None))
+                if future is not None:
+                    self.writer.submit(self._finish, job_id, future, on_complete, on_error)
+            else:
+                self.writer.submit(self._progress, job_id, progress, payload)
+
+    def _progress(self, job_id: str, progress: float, payload: Optional[Dict[str, Any]]):
+        """Aplica um payload de progresso (executa na thread de escrita)"""
+        with self.lock:
+            job = self.jobs.get(job_id)
+            callback = self.progress_callbacks.get(job_id, (None,))[0]
+            if job is None or job["finished_at"]:
+                return
+            # Extração ocupa de 10% a 90% do job
+            job.update(status="processing", stage="extracting", progress=round(0.1 + 0.8 * progress, 3))
+
+        if callback and payload:
+            try:
+                callback(payload)
+            except Exception as e:
+                logger.warning(f"Progress callback for job {job_id} failed: {e}")
+
+    def _finish(self, job_id: str, future: Future, on_complete: Callable, on_error: Optional[Callable]):
+        """Grava o resultado de um job (executa na thread de escrita)"""
+        self._update(job_id, status="processing", stage="storing", progress=0.9)
+
+        try:
+            result = on_complete(future.result())
+            self._update(job_id, status="completed", stage="completed", progress=1.0, result=result)
+        except Exception as e:
+            logger.error(f"Ingestion job {job_id} failed: {e}")
+            if on_error:
+                try:
+                    on_error(e)
+                except Exception as callback_error:
+                    logger.warning(f"Error callback for job {job_id} failed: {callback_error}")
+            self._update(job_id, status="failed", stage="failed", error=str(e))
+        finally:
+            with self.lock:
+                self.active -= 1
+                self.futures.pop(job_id, None)
+                self.progress_callbacks.pop(job_id, None)
+                self.jobs[job_id]["finished_at"] = datetime.now().isoformat()
+                self._trim_history()
+
+    def _update(self, job_id: str, **fields):
+        with self.lock:
+            if job_id in self.jobs:
+                self.jobs[job_id].update(fields)
+
+    def _trim_history(self):
+        finished = [job_id for job_id, job in self.jobs.items() if job["finished_at"]]
+        for job_id in finished[:max(0, len(finished) - self.history_size)]:
+            del self.jobs[job_id]
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Estado atual de um job (None se desconhecido)"""
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return None
+
+            job = dict(job)
+            future = self.futures.get(job_id)
+
+        # Future.running() indica que o job já foi entregue a um worker
+        if job["status"] == "queued" and future is not None and future.running():
+            job.update(status="processing", stage="extracting", progress=0.1)
+
+        return job
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Ocupação da fila"""
+        with self.lock:
+            return {
+                "workers": self.max_workers,
+                "queue_size": self.max_queue,
+                "active_jobs": self.active,
+                "available_slots": max(0, self.capacity - self.active)
+            }
+
+    def shutdown(self):
+        """Encerra o pool de processos, a fila de progresso e a thread de escrita"""
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+        if self.progress_queue is not None:
+            self.progress_queue.put(None)
+            self.progress_listener.join(timeout=5)
+
+        self.writer.shutdown(wait=True)
+
+        if self.manager is not None:
+            self.manager.shutdown()
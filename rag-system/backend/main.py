@@ -1,27 +1,28 @@
 # RAG System - Sistema de Documentação Inteligente
 # Integrado com extrator de PDF definitivo e funcional
 
-from fastapi import FastAPI, HTTPException, UploadFile, File, Form
+from fastapi import FastAPI, HTTPException, UploadFile, File, Form, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import StreamingResponse, FileResponse
-from pydantic import BaseModel
-from typing import List, Optional, Dict, Any
+from pydantic import BaseModel, Field
+from typing import List, Optional, Dict, Any, Iterator
 import os
 from dotenv import load_dotenv
 import logging
 import json
-import tempfile
-import shutil
 from pathlib import Path
 import uuid
-import io
-import zipfile
 from datetime import datetime
-import subprocess
+import asyncio
+import threading
 import requests
 
-# Importar nosso extrator
-from rag_extractor import FinalPDFExtractor
+# Importar nosso extrator (executado nos processos de ingestão)
+from search_index import DEFAULT_LIMIT, InvertedIndex
+from document_catalog import STATUS_PROCESSING, DocumentCatalog, load_chunks
+from ingestion_jobs import IngestionJobManager, QueueFullError, extract_document, split_into_chunks
+from ingestion_cache import DEFAULT_MAX_ENTRIES, IngestionCache, artifacts_size, copy_and_hash, hash_bytes
+from zip_stream import ZipEntry, ZipStream, date_time_from_iso, parse_range_header
 
 # Load environment variables
 load_dotenv()
@@ -48,14 +49,37 @@ app.add_middleware(
 
 # Configuration
 DATA_PATH = Path("./data")
-DOCUMENTS_DB = {}  # Simple in-memory document store
 
 # Ensure data directories exist
 for subdir in ["markdown", "json", "chunks", "metadata", "uploads"]:
     (DATA_PATH / subdir).mkdir(parents=True, exist_ok=True)
 
-# Initialize PDF Extractor
-pdf_extractor = FinalPDFExtractor()
+# Initialize ingestion pool (extraction runs in worker processes, off the event loop)
+ingestion_jobs = IngestionJobManager()
+
+# Initialize search index (persistent inverted index with BM25 ranking)
+search_index = InvertedIndex(DATA_PATH / "search_index.db")
+
+# Initialize document catalog (persistent SQLite store, replaces the in-memory dict)
+catalog = DocumentCatalog(DATA_PATH / "catalog.db")
+
+# Initialize ingestion cache (content-addressed, repeat uploads reuse the stored extraction)
+ingestion_cache = IngestionCache(
+    DATA_PATH / "ingestion_cache.db",
+    max_entries=int(os.getenv("INGEST_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES))
+)
+
+# Bump when extraction or chunking output changes so old cache entries stop matching
+EXTRACTOR_VERSION = "PDF Extractor v2.0"
+
+# Cache keys of uploads currently being extracted -> queued job response
+inflight_uploads: Dict[str, Dict[str, Any]] = {}
+inflight_lock = threading.Lock()
+
+# Recover documents whose metadata survived a restart but are not cataloged yet
+for recovered_doc in catalog.rebuild_from_metadata(DATA_PATH / "metadata"):
+    search_index.add_document(recovered_doc["id"], load_chunks(recovered_doc["files"].get("chunks")))
+    logger.info(f"Recovered document {recovered_doc['id']} from metadata")
 
 # Pydantic models
 class DocumentAdd(BaseModel):
@@ -64,7 +88,7 @@ class DocumentAdd(BaseModel):
 
 class QueryRequest(BaseModel):
     query: str
-    max_results: Optional[int] = 5
+    max_results: Optional[int] = Field(default=DEFAULT_LIMIT, ge=1)
 
 class DocumentResult(BaseModel):
     content: str
@@ -102,12 +126,271 @@ async def health_check():
         "timestamp": datetime.now().isoformat()
     }
 
-@app.post("/upload-document")
+def _store_document(doc_id: str, doc_title: str, filename: str, upload_path: Path,
+                    file_size: int, timestamp: str, start_time: datetime,
+                    extraction: Dict[str, Any], source_url: Optional[str] = None) -> Dict[str, Any]:
+    """Persist extraction results (runs on the ingestion writer thread)"""
+    outputs = {}
+    
+    if extraction["type"] == "pdf":
+        results = extraction["results"]
+        processing_method = "PDF Extractor v2.0"
+        
+        # Count pages and tables from results
+        pages_count = results.get('pages_processed', 0)
+        tables_count = results.get('tables_found', 0)
+        
+        # Markdown, JSONL and chunks were streamed by the worker straight into data/,
+        # and the chunks were already indexed page by page in _index_partial_document
+        outputs.update(results.get('files', {}))
+        chunks_created = results.get('chunks_count', 0)
+        content_preview = results.get('content_preview', "")
+    
+    else:
+        # Simple text processing for non-PDF files
+        content = extraction["content"]
+        processing_method = "Simple Text Processing"
+        pages_count = None
+        tables_count = None
+        
+        # Save markdown
+        md_path = DATA_PATH / "markdown" / f"{doc_id}.md"
+        md_path.write_text(content, encoding='utf-8')
+        outputs['markdown'] = str(md_path)
+        
+        # Create simple chunks (split by paragraphs)
+        chunks = split_into_chunks(content)
+        
+        # Save JSON
+        json_data = {
+            "document_id": doc_id,
+            "title": doc_title,
+            "content": content,
+            "chunks": chunks
+        }
+        json_path = DATA_PATH / "json" / f"{doc_id}.json"
+        json_path.write_text(json.dumps(json_data, indent=2, ensure_ascii=False), encoding='utf-8')
+        outputs['json'] = str(json_path)
+        
+        # Save chunks
+        chunks_path = DATA_PATH / "chunks" / f"{doc_id}.json"
+        chunks_path.write_text(json.dumps(chunks, indent=2, ensure_ascii=False), encoding='utf-8')
+        outputs['chunks'] = str(chunks_path)
+        search_index.add_document(doc_id, chunks)
+        
+        chunks_created = len(chunks)
+        content_preview = content[:200] + "..." if len(content) > 200 else content
+    
+    # Save metadata
+    metadata = {
+        "document_id": doc_id,
+        "title": doc_title,
+        "filename": filename,
+        "source_url": source_url,
+        "source_file": str(upload_path),
+        "file_size": file_size,
+        "processing_method": processing_method,
+        "pages": pages_count,
+        "tables": tables_count,
+        "created_at": timestamp,
+        "chunks_count": chunks_created,
+        "content_preview": content_preview,
+        "outputs": outputs
+    }
+    
+    metadata_path = DATA_PATH / "metadata" / f"{doc_id}.json"
+    metadata_path.write_text(json.dumps(metadata, indent=2, ensure_ascii=False), encoding='utf-8')
+    
+    processing_time = (datetime.now() - start_time).total_seconds()
+    
+    # Store in catalog
+    catalog.upsert({
+        "id": doc_id,
+        "title": doc_title,
+        "filename": filename,
+        "source_url": source_url,
+        "source_file": str(upload_path),
+        "chunks_count": chunks_created,
+        "size_bytes": file_size,
+        "created_at": timestamp,
+        "processing_method": processing_method,
+        "pages": pages_count,
+        "tables": tables_count,
+        "content_preview": content_preview,
+        "success": True,
+        "files": outputs
+    })
+    
+    return {
+        "message": "Document processed successfully",
+        "document_id": doc_id,
+        "chunks_created": chunks_created,
+        "processing_time": f"{processing_time:.2f}",
+        "pages": pages_count,
+        "tables": tables_count,
+        "files": outputs
+    }
+
+def _index_partial_document(doc_id: str, doc_title: str, filename: str, upload_path: Path,
+                            file_size: int, timestamp: str, progress: Dict[str, Any],
+                            source_url: Optional[str] = None):
+    """Index the chunks of pages already extracted (runs on the ingestion writer thread)"""
+    chunks = progress.get("chunks", [])
+    if not chunks:
+        return
+    
+    start_index = progress.get("start_index", 0)
+    search_index.add_chunks(doc_id, chunks, start_index)
+    
+    # Cataloged as processing (not successful) so /query can show the partial document,
+    # while listings and exports skip it until _store_document marks it successful
+    if start_index == 0:
+        catalog.upsert({
+            "id": doc_id,
+            "title": doc_title,
+            "filename": filename,
+            "source_url": source_url,
+            "source_file": str(upload_path),
+            "chunks_count": len(chunks),
+            "size_bytes": file_size,
+            "created_at": timestamp,
+            "processing_method": "PDF Extractor v2.0",
+            "content_preview": chunks[0][:200],
+            "success": False,
+            "status": STATUS_PROCESSING,
+            "files": {}
+        })
+
+def _store_failed_document(doc_id: str, doc_title: str, filename: str, file_size: int,
+                           timestamp: str, error: Exception, source_url: Optional[str] = None):
+    """Record a failed ingestion in the catalog, dropping whatever the streamed extraction left behind"""
+    search_index.remove_document(doc_id)
+    
+    # Partial markdown/JSONL (process_pdf_streaming) and chunks (extract_document)
+    for partial_path in (DATA_PATH / "markdown" / f"{doc_id}.md",
+                         DATA_PATH / "json" / f"{doc_id}.jsonl",
+                         DATA_PATH / "chunks" / f"{doc_id}.json"):
+        try:
+            partial_path.unlink(missing_ok=True)
+        except Exception as e:
+            logger.warning(f"Failed to delete file {partial_path}: {e}")
+    
+    catalog.upsert({
+        "id": doc_id,
+        "title": doc_title,
+        "filename": filename,
+        "source_url": source_url,
+        "size_bytes": file_size,
+        "created_at": timestamp,
+        "error": str(error),
+        "success": False
+    })
+
+def _cached_document(cache_key: str, upload_path: Path, filename: str) -> Optional[Dict[str, Any]]:
+    """Return the job response for an upload whose extraction is already cached, if any"""
+    entry = ingestion_cache.get(cache_key)
+    if entry is None:
+        return None
+    
+    doc_info = catalog.get(entry["doc_id"])
+    if doc_info is None or not doc_info.get("success"):
+        # The cached document was removed or failed since; extract again
+        ingestion_cache.invalidate(cache_key)
+        return None
+    
+    upload_path.unlink(missing_ok=True)
+    result = dict(entry["result"] or {}, cached=True, processing_time="0.00")
+    job = ingestion_jobs.add_completed(result, document_id=entry["doc_id"], description=filename)
+    
+    logger.info(f"Cache hit for {filename}: reusing document {entry['doc_id']}")
+    return {
+        "message": "Document already processed",
+        "job_id": job["id"],
+        "document_id": entry["doc_id"],
+        "status": job["status"],
+        "status_url": f"/jobs/{job['id']}",
+        "cached": True
+    }
+
+def _store_and_cache_document(cache_key: str, content_hash: str, file_ext: str,
+                              doc_id: str, doc_title: str, filename: str, upload_path: Path,
+                              file_size: int, timestamp: str, start_time: datetime,
+                              extraction: Dict[str, Any], source_url: Optional[str] = None) -> Dict[str, Any]:
+    """Store a finished extraction and register it in the ingestion cache"""
+    try:
+        result = _store_document(
+            doc_id, doc_title, filename, upload_path, file_size, timestamp,
+            start_time, extraction, source_url
+        )
+        
+        size_bytes = file_size + artifacts_size(result.get("files", {}).values())
+        ingestion_cache.put(
+            cache_key, content_hash, doc_id, result, size_bytes=size_bytes,
+            extractor_version=EXTRACTOR_VERSION, options={"ext": file_ext}
+        )
+        return result
+    finally:
+        with inflight_lock:
+            inflight_uploads.pop(cache_key, None)
+
+def _queue_document(doc_id: str, doc_title: str, filename: str, upload_path: Path,
+                    file_ext: str, timestamp: str, content_hash: str,
+                    source_url: Optional[str] = None) -> Dict[str, Any]:
+    """Submit a saved upload to the ingestion pool and return the job response"""
+    cache_key = IngestionCache.make_key(content_hash, EXTRACTOR_VERSION, {"ext": file_ext})
+    cached = _cached_document(cache_key, upload_path, filename)
+    if cached:
+        return cached
+    
+    start_time = datetime.now()
+    file_size = upload_path.stat().st_size
+    
+    def on_error(error: Exception):
+        with inflight_lock:
+            inflight_uploads.pop(cache_key, None)
+        _store_failed_document(doc_id, doc_title, filename, file_size, timestamp, error, source_url)
+    
+    # Check and register under one lock so concurrent identical uploads share a single job
+    with inflight_lock:
+        pending = inflight_uploads.get(cache_key)
+        if pending:
+            upload_path.unlink(missing_ok=True)
+            return dict(pending, message="Identical document is already being processed", cached=True)
+        
+        try:
+            job = ingestion_jobs.submit(
+                extract_document, str(upload_path), file_ext, str(DATA_PATH), doc_id,
+                on_complete=lambda extraction: _store_and_cache_document(
+                    cache_key, content_hash, file_ext, doc_id, doc_title, filename, upload_path,
+                    file_size, timestamp, start_time, extraction, source_url
+                ),
+                on_error=on_error,
+                on_progress=(lambda progress: _index_partial_document(
+                    doc_id, doc_title, filename, upload_path, file_size, timestamp, progress, source_url
+                )) if file_ext == '.pdf' else None,
+                document_id=doc_id,
+                description=filename
+            )
+        except QueueFullError as e:
+            upload_path.unlink(missing_ok=True)
+            raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+        
+        # Cleared by the writer thread once the job finishes (it waits for this lock)
+        inflight_uploads[cache_key] = {
+            "message": "Document queued for processing",
+            "job_id": job["id"],
+            "document_id": doc_id,
+            "status": job["status"],
+            "status_url": f"/jobs/{job['id']}"
+        }
+        return dict(inflight_uploads[cache_key])
+
+@app.post("/upload-document", status_code=202)
 async def upload_document(
     file: UploadFile = File(...),
     title: Optional[str] = Form(None)
 ):
-    """Upload and process a document"""
+    """Upload a document and queue it for processing"""
     if not file.filename:
         raise HTTPException(status_code=400, detail="No file provided")
     
@@ -120,341 +403,115 @@ async def upload_document(
             detail=f"File type {file_ext} not supported. Allowed: {', '.join(allowed_extensions)}"
         )
     
+    # Refuse early instead of saving a file that cannot be queued
+    if ingestion_jobs.get_stats()["available_slots"] == 0:
+        raise HTTPException(status_code=503, detail="Ingestion queue is full", headers={"Retry-After": "5"})
+    
     doc_id = str(uuid.uuid4())
     doc_title = title or file.filename
     timestamp = datetime.now().isoformat()
     
-    try:
-        start_time = datetime.now()
-        
-        # Save uploaded file
-        upload_path = DATA_PATH / "uploads" / f"{doc_id}_{file.filename}"
-        with open(upload_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-        
-        file_size = upload_path.stat().st_size
-        
-        # Process with our extractor
-        if file_ext == '.pdf':
-            results = pdf_extractor.process_pdf(str(upload_path))
-            processing_method = "PDF Extractor v2.0"
-            
-            # Count pages and tables from results
-            pages_count = results.get('pages_processed', 0)
-            tables_count = results.get('tables_found', 0)
-            
-            # Create outputs
-            outputs = {}
-            
-            # Save markdown (from markdown file created by extractor)
-            md_source = Path("rag_outputs/markdown").glob("*.md")
-            if md_source:
-                md_file = list(md_source)[0]
-                md_path = DATA_PATH / "markdown" / f"{doc_id}.md"
-                shutil.copy2(md_file, md_path)
-                outputs['markdown'] = str(md_path)
-            
-            # Save JSON (from json file created by extractor)
-            json_source = Path("rag_outputs/json").glob("*.json")
-            if json_source:
-                json_file = list(json_source)[0]
-                json_path = DATA_PATH / "json" / f"{doc_id}.json"
-                shutil.copy2(json_file, json_path)
-                outputs['json'] = str(json_path)
-            
-            # Create chunks from markdown content
-            if 'markdown' in outputs:
-                content = Path(outputs['markdown']).read_text(encoding='utf-8')
-                chunks = [chunk.strip() for chunk in content.split('\n\n') if chunk.strip()]
-                chunks_path = DATA_PATH / "chunks" / f"{doc_id}.json"
-                chunks_path.write_text(json.dumps(chunks, indent=2, ensure_ascii=False), encoding='utf-8')
-                outputs['chunks'] = str(chunks_path)
-            
-            # Save metadata
-            metadata = {
-                "document_id": doc_id,
-                "title": doc_title,
-                "filename": file.filename,
-                "source_file": str(upload_path),
-                "file_size": file_size,
-                "processing_method": processing_method,
-                "pages": pages_count,
-                "tables": tables_count,
-                "created_at": timestamp,
-                "outputs": outputs
-            }
-            
-            metadata_path = DATA_PATH / "metadata" / f"{doc_id}.json"
-            metadata_path.write_text(json.dumps(metadata, indent=2, ensure_ascii=False), encoding='utf-8')
-            
-            processing_time = (datetime.now() - start_time).total_seconds()
-            chunks_created = len(json.loads(Path(outputs['chunks']).read_text(encoding='utf-8'))) if 'chunks' in outputs else 0
-            
-            # Get content preview from markdown
-            content_preview = ""
-            if 'markdown' in outputs:
-                content = Path(outputs['markdown']).read_text(encoding='utf-8')
-                content_preview = content[:200] + "..." if len(content) > 200 else content
-            
-            # Store in database
-            DOCUMENTS_DB[doc_id] = {
-                "id": doc_id,
-                "title": doc_title,
-                "filename": file.filename,
-                "source_file": str(upload_path),
-                "chunks_count": chunks_created,
-                "size_bytes": file_size,
-                "created_at": timestamp,
-                "processing_method": processing_method,
-                "pages": pages_count,
-                "tables": tables_count,
-                "content_preview": results.get('content_preview', ''),
-                "success": True,
-                "files": outputs
-            }
-            
-            return {
-                "message": "Document processed successfully",
-                "document_id": doc_id,
-                "chunks_created": chunks_created,
-                "processing_time": f"{processing_time:.2f}",
-                "pages": pages_count,
-                "tables": tables_count,
-                "files": outputs
-            }
-        
-        else:
-            # Simple text processing for non-PDF files
-            content = upload_path.read_text(encoding='utf-8')
-            processing_method = "Simple Text Processing"
-            
-            # Create simple chunks (split by paragraphs)
-            chunks = [chunk.strip() for chunk in content.split('\n\n') if chunk.strip()]
-            
-            outputs = {}
-            
-            # Save markdown
-            md_path = DATA_PATH / "markdown" / f"{doc_id}.md"
-            md_path.write_text(content, encoding='utf-8')
-            outputs['markdown'] = str(md_path)
-            
-            # Save JSON
-            json_data = {
-                "document_id": doc_id,
-                "title": doc_title,
-                "content": content,
-                "chunks": chunks
-            }
-            json_path = DATA_PATH / "json" / f"{doc_id}.json"
-            json_path.write_text(json.dumps(json_data, indent=2, ensure_ascii=False), encoding='utf-8')
-            outputs['json'] = str(json_path)
-            
-            # Save chunks
-            chunks_path = DATA_PATH / "chunks" / f"{doc_id}.json"
-            chunks_path.write_text(json.dumps(chunks, indent=2, ensure_ascii=False), encoding='utf-8')
-            outputs['chunks'] = str(chunks_path)
-            
-            # Save metadata
-            metadata = {
-                "document_id": doc_id,
-                "title": doc_title,
-                "filename": file.filename,
-                "source_file": str(upload_path),
-                "file_size": file_size,
-                "processing_method": processing_method,
-                "created_at": timestamp,
-                "outputs": outputs
-            }
-            
-            metadata_path = DATA_PATH / "metadata" / f"{doc_id}.json"
-            metadata_path.write_text(json.dumps(metadata, indent=2, ensure_ascii=False), encoding='utf-8')
-            
-            processing_time = (datetime.now() - start_time).total_seconds()
-            chunks_created = len(chunks)
-            
-            # Store in database
-            DOCUMENTS_DB[doc_id] = {
-                "id": doc_id,
-                "title": doc_title,
-                "filename": file.filename,
-                "source_file": str(upload_path),
-                "chunks_count": chunks_created,
-                "size_bytes": file_size,
-                "created_at": timestamp,
-                "processing_method": processing_method,
-                "content_preview": content[:200] + "..." if len(content) > 200 else content,
-                "success": True,
-                "files": outputs
-            }
-            
-            return {
-                "message": "Document processed successfully",
-                "document_id": doc_id,
-                "chunks_created": chunks_created,
-                "processing_time": f"{processing_time:.2f}",
-                "files": outputs
-            }
-            
-    except Exception as e:
-        logger.error(f"Error processing document {file.filename}: {str(e)}")
-        
-        # Store failed document info
-        DOCUMENTS_DB[doc_id] = {
-            "id": doc_id,
-            "title": doc_title,
-            "filename": file.filename,
-            "size_bytes": file_size,
-            "created_at": timestamp,
-            "error": str(e),
-            "success": False
-        }
-        
-        raise HTTPException(status_code=500, detail=f"Error processing document: {str(e)}")
+    # Save uploaded file (hashed while copying, for the ingestion cache)
+    upload_path = DATA_PATH / "uploads" / f"{doc_id}_{file.filename}"
+    with open(upload_path, "wb") as buffer:
+        content_hash = await asyncio.to_thread(copy_and_hash, file.file, buffer)
+    
+    return _queue_document(doc_id, doc_title, file.filename, upload_path, file_ext, timestamp, content_hash)
 
-@app.post("/add-document")
+@app.post("/add-document", status_code=202)
 async def add_document_by_url(doc: DocumentAdd):
-    """Add document by URL"""
+    """Add document by URL and queue it for processing"""
+    if ingestion_jobs.get_stats()["available_slots"] == 0:
+        raise HTTPException(status_code=503, detail="Ingestion queue is full", headers={"Retry-After": "5"})
+    
     doc_id = str(uuid.uuid4())
     doc_title = doc.title or doc.url.split('/')[-1]
     timestamp = datetime.now().isoformat()
     
     try:
-        start_time = datetime.now()
-        
-        # Download file
-        response = requests.get(doc.url, timeout=30)
+        # Download file without blocking the event loop
+        response = await asyncio.to_thread(requests.get, doc.url, timeout=30)
         response.raise_for_status()
-        
-        # Determine file extension
-        file_ext = Path(doc.url).suffix.lower()
-        if not file_ext:
-            content_type = response.headers.get('content-type', '')
-            if 'pdf' in content_type:
-                file_ext = '.pdf'
-            else:
-                file_ext = '.txt'
-        
-        # Save downloaded file
-        filename = f"{doc_id}_{doc_title}{file_ext}"
-        upload_path = DATA_PATH / "uploads" / filename
-        upload_path.write_bytes(response.content)
-        
-        file_size = len(response.content)
-        
-        # Process with our extractor
-        if file_ext == '.pdf':
-            results = pdf_extractor.extract_from_pdf(str(upload_path))
-            processing_method = "PDF Extractor v2.0"
-            
-            # Count pages and tables from results
-            pages_count = len([k for k in results.keys() if k.startswith('page_')])
-            tables_count = results.get('tables_count', 0)
-            
-            # Create outputs (same logic as upload)
-            outputs = {}
-            
-            # Save markdown
-            if 'markdown' in results:
-                md_path = DATA_PATH / "markdown" / f"{doc_id}.md"
-                md_path.write_text(results['markdown'], encoding='utf-8')
-                outputs['markdown'] = str(md_path)
-            
-            # Save JSON
-            if 'json' in results:
-                json_path = DATA_PATH / "json" / f"{doc_id}.json"
-                json_path.write_text(json.dumps(results['json'], indent=2, ensure_ascii=False), encoding='utf-8')
-                outputs['json'] = str(json_path)
-            
-            # Save chunks
-            if 'chunks' in results:
-                chunks_path = DATA_PATH / "chunks" / f"{doc_id}.json"
-                chunks_path.write_text(json.dumps(results['chunks'], indent=2, ensure_ascii=False), encoding='utf-8')
-                outputs['chunks'] = str(chunks_path)
-            
-            processing_time = (datetime.now() - start_time).total_seconds()
-            chunks_created = len(results.get('chunks', []))
-            
-            # Store in database
-            DOCUMENTS_DB[doc_id] = {
-                "id": doc_id,
-                "title": doc_title,
-                "filename": filename,
-                "source_url": doc.url,
-                "chunks_count": chunks_created,
-                "size_bytes": file_size,
-                "created_at": timestamp,
-                "processing_method": processing_method,
-                "pages": pages_count,
-                "tables": tables_count,
-                "content_preview": results.get('content_preview', ''),
-                "success": True,
-                "files": outputs
-            }
-            
-            return {
-                "message": "Document processed successfully",
-                "document_id": doc_id,
-                "chunks_created": chunks_created,
-                "processing_time": f"{processing_time:.2f}",
-                "pages": pages_count,
-                "tables": tables_count,
-                "files": outputs
-            }
-        
     except Exception as e:
-        logger.error(f"Error processing URL {doc.url}: {str(e)}")
-        
-        # Store failed document info
-        DOCUMENTS_DB[doc_id] = {
-            "id": doc_id,
-            "title": doc_title,
-            "source_url": doc.url,
-            "created_at": timestamp,
-            "error": str(e),
-            "success": False
-        }
-        
+        logger.error(f"Error downloading URL {doc.url}: {str(e)}")
+        _store_failed_document(doc_id, doc_title, None, 0, timestamp, e, doc.url)
         raise HTTPException(status_code=500, detail=f"Error processing URL: {str(e)}")
+    
+    # Determine file extension
+    file_ext = Path(doc.url).suffix.lower()
+    if not file_ext:
+        content_type = response.headers.get('content-type', '')
+        if 'pdf' in content_type:
+            file_ext = '.pdf'
+        else:
+            file_ext = '.txt'
+    
+    # Save downloaded file
+    filename = f"{doc_id}_{doc_title}{file_ext}"
+    upload_path = DATA_PATH / "uploads" / filename
+    upload_path.write_bytes(response.content)
+    
+    return _queue_document(doc_id, doc_title, filename, upload_path, file_ext, timestamp,
+                           hash_bytes(response.content), source_url=doc.url)
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Report the status and progress of an ingestion job"""
+    job = ingestion_jobs.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@app.on_event("startup")
+def fail_interrupted_documents():
+    """Mark documents left processing by a crash or restart as failed and drop their partial outputs"""
+    # No ingestion job survives a restart, so every processing row is stale
+    for doc_info in catalog.list_processing():
+        _store_failed_document(
+            doc_info["id"], doc_info["title"], doc_info["filename"], doc_info["size_bytes"] or 0,
+            doc_info["created_at"], RuntimeError("Ingestion interrupted by a server restart"),
+            doc_info.get("source_url")
+        )
+        logger.warning(f"Document {doc_info['id']} was still processing at startup; marked as failed")
+
+@app.on_event("shutdown")
+async def shutdown_ingestion():
+    """Stop the ingestion worker processes"""
+    ingestion_jobs.shutdown()
 
 @app.post("/query")
 async def query_documents(query: QueryRequest):
-    """Query documents (simple text search for now)"""
-    if not DOCUMENTS_DB:
+    """Query documents using the inverted index (BM25 ranking)"""
+    # Documents still being streamed count: their first pages are already searchable
+    if catalog.is_empty(successful_only=False):
         raise HTTPException(status_code=404, detail="No documents available")
     
     results = []
     
-    # Simple text search through chunks
-    for doc_id, doc_info in DOCUMENTS_DB.items():
-        if not doc_info.get("success", False):
+    # Ranked search through the index; only postings of the query terms are read
+    # "max_results": null falls back to the default limit
+    hits = search_index.search(query.query, limit=query.max_results)
+    docs_info = catalog.get_many([hit["doc_id"] for hit in hits])
+    
+    for hit in hits:
+        doc_info = docs_info.get(hit["doc_id"])
+        if not doc_info or not (doc_info.get("success", False) or doc_info.get("status") == STATUS_PROCESSING):
             continue
-            
-        # Load chunks if available
-        chunks_file = doc_info.get("files", {}).get("chunks")
-        if chunks_file and os.path.exists(chunks_file):
-            with open(chunks_file, 'r', encoding='utf-8') as f:
-                chunks = json.load(f)
-                
-            for i, chunk in enumerate(chunks):
-                if query.query.lower() in chunk.lower():
-                    score = chunk.lower().count(query.query.lower()) / len(chunk.split())
-                    results.append(DocumentResult(
-                        content=chunk[:500] + "..." if len(chunk) > 500 else chunk,
-                        score=min(score * 10, 1.0),  # Normalize score
-                        metadata={
-                            "source_file": doc_info.get("filename"),
-                            "title": doc_info.get("title"),
-                            "document_id": doc_id,
-                            "chunk_index": i,
-                            "file_size": doc_info.get("size_bytes"),
-                            "page_count": doc_info.get("pages"),
-                            "processing_method": doc_info.get("processing_method")
-                        }
-                    ))
-    
-    # Sort by score and limit results
-    results.sort(key=lambda x: x.score, reverse=True)
-    results = results[:query.max_results]
+        
+        chunk = hit["text"]
+        results.append(DocumentResult(
+            content=chunk[:500] + "..." if len(chunk) > 500 else chunk,
+            score=hit["score"],
+            metadata={
+                "source_file": doc_info.get("filename"),
+                "title": doc_info.get("title"),
+                "document_id": hit["doc_id"],
+                "chunk_index": hit["chunk_index"],
+                "file_size": doc_info.get("size_bytes"),
+                "page_count": doc_info.get("pages"),
+                "processing_method": doc_info.get("processing_method")
+            }
+        ))
     
     # Generate simple AI answer
     if results:
@@ -467,49 +524,57 @@ async def query_documents(query: QueryRequest):
         query=query.query,
         answer=ai_answer,
         sources=results,
-        ai_mode_used="Simple Text Search"
+        ai_mode_used="BM25 Index Search"
     )
 
 @app.get("/documents")
-async def list_documents():
-    """List all documents"""
+async def list_documents(limit: int = 100, offset: int = 0):
+    """List documents (paginated, newest first)"""
+    limit = max(1, min(limit, 500))
+    offset = max(0, offset)
+    
     documents = []
-    for doc_info in DOCUMENTS_DB.values():
-        if doc_info.get("success", False):
-            documents.append(Document(
-                id=doc_info["id"],
-                title=doc_info["title"],
-                filename=doc_info["filename"],
-                source_url=doc_info.get("source_url"),
-                source_file=doc_info.get("source_file"),
-                chunks_count=doc_info["chunks_count"],
-                size_bytes=doc_info["size_bytes"],
-                created_at=doc_info["created_at"],
-                processing_method=doc_info.get("processing_method"),
-                pages=doc_info.get("pages"),
-                tables=doc_info.get("tables"),
-                images=doc_info.get("images"),
-                content_preview=doc_info.get("content_preview", "")
-            ))
-    
-    return {"documents": documents}
+    for doc_info in catalog.list_documents(limit=limit, offset=offset):
+        documents.append(Document(
+            id=doc_info["id"],
+            title=doc_info["title"],
+            filename=doc_info["filename"],
+            source_url=doc_info.get("source_url"),
+            source_file=doc_info.get("source_file"),
+            chunks_count=doc_info["chunks_count"] or 0,
+            size_bytes=doc_info["size_bytes"] or 0,
+            created_at=doc_info["created_at"],
+            processing_method=doc_info.get("processing_method"),
+            pages=doc_info.get("pages"),
+            tables=doc_info.get("tables"),
+            images=doc_info.get("images"),
+            content_preview=doc_info.get("content_preview") or ""
+        ))
+    
+    return {
+        "documents": documents,
+        "total": catalog.count(),
+        "limit": limit,
+        "offset": offset
+    }
 
 @app.delete("/documents/{doc_id}")
 async def delete_document(doc_id: str):
     """Delete a specific document"""
-    if doc_id not in DOCUMENTS_DB:
+    doc_info = catalog.get(doc_id)
+    if doc_info is None:
         raise HTTPException(status_code=404, detail="Document not found")
     
-    doc_info = DOCUMENTS_DB[doc_id]
-    
     # Delete files
     files_to_delete = []
-    if "files" in doc_info:
+    if doc_info.get("files"):
         files_to_delete.extend(doc_info["files"].values())
     
-    if "source_file" in doc_info:
+    if doc_info.get("source_file"):
         files_to_delete.append(doc_info["source_file"])
     
+    files_to_delete.append(str(DATA_PATH / "metadata" / f"{doc_id}.json"))
+    
     for file_path in files_to_delete:
         try:
             if os.path.exists(file_path):
@@ -517,76 +582,83 @@ async def delete_document(doc_id: str):
         except Exception as e:
             logger.warning(f"Failed to delete file {file_path}: {e}")
     
-    # Remove from database
-    del DOCUMENTS_DB[doc_id]
+    # Remove from catalog, search index and ingestion cache
+    catalog.delete(doc_id)
+    search_index.remove_document(doc_id)
+    ingestion_cache.remove_document(doc_id)
     
     return {"message": f"Document {doc_info['title']} deleted successfully"}
 
-@app.post("/documents/{doc_id}/export")
-async def export_document(doc_id: str):
-    """Export a specific document"""
-    if doc_id not in DOCUMENTS_DB:
-        raise HTTPException(status_code=404, detail="Document not found")
+def _document_zip_entries(doc_info: Dict[str, Any], folder: str = "") -> Iterator[ZipEntry]:
+    """ZIP entries for one document: its output files plus metadata.json"""
+    for file_type, file_path in (doc_info.get("files") or {}).items():
+        yield ZipEntry(arcname=f"{folder}{file_type}/{os.path.basename(file_path)}", path=file_path)
+    
+    metadata_content = json.dumps(doc_info, indent=2, ensure_ascii=False)
+    yield ZipEntry(
+        arcname=f"{folder}metadata.json",
+        data=metadata_content.encode('utf-8'),
+        date_time=date_time_from_iso(doc_info.get("created_at"))
+    )
+
+async def _zip_response(request: Request, zip_stream: ZipStream, filename: str):
+    """Stream a ZIP, honoring single-range requests so large exports can be resumed"""
+    headers = {
+        "Content-Disposition": f"attachment; filename={filename}",
+        "Accept-Ranges": "bytes",
+        "ETag": await asyncio.to_thread(lambda: zip_stream.etag)
+    }
     
-    doc_info = DOCUMENTS_DB[doc_id]
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
     
-    # Create ZIP file
-    zip_buffer = io.BytesIO()
-    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-        # Add document files
-        if "files" in doc_info:
-            for file_type, file_path in doc_info["files"].items():
-                if os.path.exists(file_path):
-                    zip_file.write(file_path, f"{file_type}/{os.path.basename(file_path)}")
+    # Range only applies while the archive is unchanged (If-Range matches the ETag)
+    if range_header and (if_range is None or if_range == headers["ETag"]):
+        size = await asyncio.to_thread(zip_stream.size)
+        byte_range = parse_range_header(range_header, size)
+        if byte_range is None:
+            raise HTTPException(status_code=416, detail="Requested range not satisfiable",
+                                headers={"Content-Range": f"bytes */{size}"})
         
-        # Add metadata
-        metadata_content = json.dumps(doc_info, indent=2, ensure_ascii=False)
-        zip_file.writestr(f"metadata.json", metadata_content)
+        start, end = byte_range
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+        headers["Content-Length"] = str(end - start + 1)
+        return StreamingResponse(
+            zip_stream.iter_range(start, end),
+            status_code=206,
+            media_type="application/zip",
+            headers=headers
+        )
     
-    zip_buffer.seek(0)
+    return StreamingResponse(iter(zip_stream), media_type="application/zip", headers=headers)
+
+@app.api_route("/documents/{doc_id}/export", methods=["GET", "POST"])
+async def export_document(doc_id: str, request: Request):
+    """Export a specific document as a streamed ZIP"""
+    doc_info = catalog.get(doc_id)
+    if doc_info is None:
+        raise HTTPException(status_code=404, detail="Document not found")
+    if doc_info.get("status") == STATUS_PROCESSING:
+        raise HTTPException(status_code=409, detail="Document is still being processed")
     
     filename = f"{doc_info['title']}_{doc_id}.zip"
+    zip_stream = ZipStream(lambda: _document_zip_entries(doc_info))
     
-    return StreamingResponse(
-        io.BytesIO(zip_buffer.read()),
-        media_type="application/zip",
-        headers={"Content-Disposition": f"attachment; filename={filename}"}
-    )
+    return await _zip_response(request, zip_stream, filename)
 
-@app.post("/export")
-async def export_all_documents():
-    """Export all documents"""
-    if not DOCUMENTS_DB:
+@app.api_route("/export", methods=["GET", "POST"])
+async def export_all_documents(request: Request):
+    """Export all documents as a streamed ZIP"""
+    if catalog.is_empty():
         raise HTTPException(status_code=404, detail="No documents available")
     
-    # Create ZIP file
-    zip_buffer = io.BytesIO()
-    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-        for doc_id, doc_info in DOCUMENTS_DB.items():
-            if not doc_info.get("success", False):
-                continue
-                
-            doc_folder = f"document_{doc_id}/"
-            
-            # Add document files
-            if "files" in doc_info:
-                for file_type, file_path in doc_info["files"].items():
-                    if os.path.exists(file_path):
-                        zip_file.write(file_path, doc_folder + f"{file_type}/{os.path.basename(file_path)}")
-            
-            # Add metadata
-            metadata_content = json.dumps(doc_info, indent=2, ensure_ascii=False)
-            zip_file.writestr(doc_folder + "metadata.json", metadata_content)
-    
-    zip_buffer.seek(0)
+    def all_entries():
+        for doc_info in catalog.iter_documents():
+            yield from _document_zip_entries(doc_info, folder=f"document_{doc_info['id']}/")
     
     filename = f"rag_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
     
-    return StreamingResponse(
-        io.BytesIO(zip_buffer.read()),
-        media_type="application/zip",
-        headers={"Content-Disposition": f"attachment; filename={filename}"}
-    )
+    return await _zip_response(request, ZipStream(all_entries), filename)
 
 @app.delete("/clear")
 async def clear_all_documents():
@@ -594,18 +666,14 @@ async def clear_all_documents():
     deleted_count = 0
     
     # Delete all files
-    for doc_info in DOCUMENTS_DB.values():
-        if "files" in doc_info:
-            for file_path in doc_info["files"].values():
-                try:
-                    if os.path.exists(file_path):
-                        os.unlink(file_path)
-                except Exception as e:
-                    logger.warning(f"Failed to delete file {file_path}: {e}")
+    for doc_info in catalog.iter_documents(successful_only=False):
+        files_to_delete = list((doc_info.get("files") or {}).values())
+        if doc_info.get("source_file"):
+            files_to_delete.append(doc_info["source_file"])
+        files_to_delete.append(str(DATA_PATH / "metadata" / f"{doc_info['id']}.json"))
         
-        if "source_file" in doc_info:
+        for file_path in files_to_delete:
             try:
-                file_path = doc_info["source_file"]
                 if os.path.exists(file_path):
                     os.unlink(file_path)
             except Exception as e:
@@ -613,39 +681,35 @@ async def clear_all_documents():
         
         deleted_count += 1
     
-    # Clear database
-    DOCUMENTS_DB.clear()
+    # Clear catalog, search index and ingestion cache
+    catalog.clear()
+    search_index.clear()
+    ingestion_cache.clear()
     
     return {"message": f"All documents cleared successfully", "deleted": deleted_count}
 
+@app.get("/cache/stats")
+async def get_cache_stats():
+    """Report ingestion cache occupancy and hit rate"""
+    return ingestion_cache.get_stats()
+
 @app.get("/stats")
 async def get_stats():
     """Get system statistics"""
-    total_docs = len(DOCUMENTS_DB)
-    successful_docs = sum(1 for doc in DOCUMENTS_DB.values() if doc.get("success", False))
-    failed_docs = total_docs - successful_docs
-    
-    # Calculate total size
-    total_size_bytes = sum(doc.get("size_bytes", 0) for doc in DOCUMENTS_DB.values() if doc.get("success", False))
-    total_size_mb = round(total_size_bytes / (1024 * 1024), 2)
-    
-    # Count by processing method
-    processing_methods = {}
-    total_chunks = 0
-    total_pages = 0
-    total_tables = 0
-    
-    for doc in DOCUMENTS_DB.values():
-        if doc.get("success", False):
-            method = doc.get("processing_method", "Unknown")
-            processing_methods[method] = processing_methods.get(method, 0) + 1
-            total_chunks += doc.get("chunks_count", 0)
-            total_pages += doc.get("pages", 0)
-            total_tables += doc.get("tables", 0)
+    stats = catalog.get_stats()
+    total_docs = stats["total_documents"]
+    successful_docs = stats["successful_documents"]
+    
+    total_size_mb = round(stats["total_size_bytes"] / (1024 * 1024), 2)
+    processing_methods = stats["processing_methods"]
+    total_chunks = stats["total_chunks"]
+    total_pages = stats["total_pages"]
+    total_tables = stats["total_tables"]
     
     return {
         "vector_storage": {
             "total_chunks": total_chunks,
+            "indexed_chunks": search_index.total_chunks,
             "collection_name": "local_rag_collection",
             "storage_path": str(DATA_PATH)
         },
@@ -659,7 +723,8 @@ async def get_stats():
             "gemini_configured": False,
             "local_ai_available": True,
             "ollama_available": False,
-            "ollama_models": []
+            "ollama_models": [],
+            "ingestion": ingestion_jobs.get_stats()
         },
         "ai_config": {
             "current_mode": "local_search",
@@ -20,6 +20,8 @@ import io
 import zipfile
 from datetime import datetime
 
+from text_chunker import TextChunker
+
 # Load environment variables
 load_dotenv()
 
@@ -127,33 +129,7 @@ class EnhancedAI:
     @staticmethod
     def chunk_text(text: str, chunk_size: int = 1000, overlap: int = 200) -> List[str]:
         """Split text into overlapping chunks"""
-        if len(text) <= chunk_size:
-            return [text]
-        
-        chunks = []
-        start = 0
-        
-        while start < len(text):
-            end = start + chunk_size
-            chunk = text[start:end]
-            
-            # Try to break at sentence boundary
-            if end < len(text):
-                last_period = chunk.rfind('.')
-                last_newline = chunk.rfind('\n')
-                break_point = max(last_period, last_newline)
-                
-                if break_point > start + chunk_size // 2:
-                    chunk = text[start:start + break_point + 1]
-                    end = start + break_point + 1
-            
-            chunks.append(chunk.strip())
-            start = end - overlap if end < len(text) else end
-            
-            if start >= len(text):
-                break
-        
-        return chunks
+        return [chunk.text for chunk in TextChunker(chunk_size, overlap).iter_chunks(text)] or [text]
 
     @staticmethod
     async def generate_response(query: str, context_chunks: List[str], mode: str = "auto") -> tuple[str, str]:
@@ -8,17 +8,323 @@ import os
 import re
 import json
 import pdfplumber
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import Callable, Dict, List, Any, Optional, Tuple
+
+# Modo paralelo: mínimo de páginas por fatia e fatias por worker (balanceamento)
+MIN_PAGES_PER_SHARD = 8
+SHARDS_PER_WORKER = 4
+
+# Detecção de tabelas: padrões compilados uma vez e classificação das linhas em
+# um único passe. Cada linha recebe um conjunto de tags (bits) e a busca por
+# início/fim de tabela só consulta as tags, sem reescanear as linhas.
+TABLE_HEADERS = [
+    "Floor plans AutoCAD Architecture toolset",      # Página 6
+    "Elevations AutoCAD Architecture toolset",       # Página 8
+    "Reflected ceiling AutoCAD Architecture toolset", # Página 10
+    "Building sections AutoCAD Architecture toolset", # Página 12
+    "Sheet layouts AutoCAD Architecture toolset",    # Página 14
+    "Details AutoCAD Architecture toolset",          # Página 16
+    "Schedules AutoCAD Architecture toolset",        # Página 18
+    "Automatic project AutoCAD Architecture toolset", # Página 20
+    "Coordination AutoCAD Architecture toolset",     # Página 22
+]
+
+TASK_INDICATORS = [
+    "Floor plans", "Elevations", "Reflected ceiling plans",
+    "Building sections", "Sheet layouts", "Details",
+    "Schedules", "Automatic project", "Coordination and publishing"
+]
+
+# Trecho da linha -> nome da tarefa (a ordem define a prioridade)
+TASK_NAMES = {
+    "Floor plans": "Floor plans",
+    "Elevations": "Elevations",
+    "Reflected ceiling": "Reflected ceiling plans",
+    "Building sections": "Building sections",
+    "Sheet layouts": "Sheet layouts",
+    "Details": "Details",
+    "Schedules": "Schedules",
+    "Automatic project": "Automatic project reports",
+    "Coordination": "Coordination and publishing"
+}
+
+TABLE_END_INDICATORS = [
+    "(Figures shown", "Advantages", "The advantages",
+    "The benefits of using", "Steps:"
+]
+
+FLOOR_PLANS_HEADER = "Floor plans AutoCAD Architecture toolset"
+
+# Dados conhecidos da página 6 (tudo numa linha no PDF)
+FLOOR_PLANS_ROWS = [
+    ["Set up project", "10:00", "15:00"],
+    ["Create a structural grid", "45:00", "40:00"],
+    ["Create wall outlines", "15:00", "10:00"],
+    ["Create custom windows and doors", "60:00", "0:00"],
+    ["Create custom walls", "60:00", "0:00"],
+    ["Add dimensions and tags", "30:00", "30:00"],
+    ["Generate roof", "45:00", "30:00"],
+    ["Total time to complete task", "265:00", "125:00"],
+    ["Time savings with the Architecture toolset", "", "53%"]
+]
+
+# Dados hardcoded das outras páginas conhecidas, por nome da tarefa
+KNOWN_TABLE_ROWS = {
+    "Elevations": [
+        ["Create project geometry from floor plans", "45:00", "1:00"],
+        ["Create 2D blocks of windows and doors for elevations", "30:00", "0:00"],
+        ["Complete elevations", "120:00", "40:00"],
+        ["Total time to complete task", "195:00", "41:00"],
+        ["Time savings with the Architecture toolset", "", "79%"]
+    ],
+    "Reflected ceiling plans": [
+        ["Create the ground floor ceiling plan", "60:00", "40:00"],
+        ["Create and add light fixtures to the ceiling", "20:00", "20:00"],
+        ["Total time to complete task", "80:00", "60:00"],
+        ["Time Savings with the Architecture toolset", "", "25%"]
+    ],
+    "Building sections": [
+        ["Create building section going WEST-EAST", "110:00", "40:00"],
+        ["Create building section going NORTH-SOUTH", "108:00", "37:00"],
+        ["Total time to complete task", "218:00", "77:00"],
+        ["Time Savings with Architecture toolset", "", "65%"]
+    ],
+    "Sheet layouts": [
+        ["Create sheet sets", "60:00", "06:00"],
+        ["Create cover sheet (including perspective view)", "70:00", "25:00"],
+        ["Create sheets for plans, elevations, and sections", "53:00", "18:00"],
+        ["Place views on sheets", "55:00", "14:00"],
+        ["Create page setups", "10:00", "10:00"],
+        ["Total time to complete task", "248:00", "73:00"],
+        ["Time Savings with Architecture toolset", "", "71%"]
+    ],
+    "Details": [
+        ["Create an enlarged plan view", "15:00", "10:00"],
+        ["Create a section through wall corner for detail", "90:00", "15:00"],
+        ["Create a section through wall for section detail", "45:00", "20:00"],
+        ["Total time to complete task", "150:00", "45:00"],
+        ["Time Savings with Architecture toolset", "", "70%"]
+    ],
+    "Schedules": [
+        ["Add tags to floor plan, including windows and doors", "25:00", "10:00"],
+        ["Create a window schedule; select windows", "35:00", "10:00"],
+        ["Add schedule to floor plan drawing", "N/A", "01:00"],
+        ["Total time to complete task", "60:00", "21:00"],
+        ["Time Savings with Architecture toolset", "", "65%"]
+    ],
+    "Automatic project reports": [
+        ["Reposition or change doors and windows", "30:00", "12:00"],
+        ["Update drawings by reloading references", "15:00", "10:00"],
+        ["Update sheets to reflect new information", "15:00", "10:00"],
+        ["Total time to complete task", "60:00", "32:00"],
+        ["Time Savings with Architecture toolset", "", "47%"]
+    ],
+    "Coordination and publishing": [
+        ["Add callouts, corrections and additions to drawings", "55:00", "40:00"],
+        ["Publish from project sheet set", "20:00", "08:00"],
+        ["Total time to complete task", "75:00", "48:00"],
+        ["Time Savings with Architecture toolset", "", "36%"]
+    ]
+}
+
+# Tabela de conclusão da página 23, com as variações de nome já calculadas
+CONCLUSION_ROWS = [
+    (row, (row[0], row[0].lower(), row[0].replace(" ", "")))
+    for row in [
+        ("Floor plans", "265:00", "125:00", "53%"),
+        ("Elevations", "195:00", "41:00", "79%"),
+        ("Reflected ceiling plans", "80:00", "60:00", "25%"),
+        ("Building sections", "218:00", "77:00", "65%"),
+        ("Sheet layouts", "248:00", "73:00", "71%"),
+        ("Details", "150:00", "45:00", "70%"),
+        ("Schedules", "60:00", "21:00", "65%"),
+        ("Project modifications", "60:00", "32:00", "47%"),
+        ("Coordination and publishing", "75:00", "48:00", "36%"),
+        ("Total time", "1351:00", "522:00", ""),
+        ("Overall time savings", "", "", "61%")
+    ]
+]
+
+def _alternation(texts: List[str]) -> "re.Pattern":
+    # Mais longos primeiro, para que um trecho não esconda outro que o contém
+    return re.compile("|".join(re.escape(text) for text in sorted(texts, key=len, reverse=True)))
+
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+# (padrão, só tem porcentagem) na ordem de tentativa do parse_table_row
+ROW_PATTERNS = [
+    (re.compile(r'^(.+?)\s+(\d+:\d+)\s+(\d+:\d+)$'), False),   # descrição + tempo + tempo
+    (re.compile(r'^(.+?)\s+(N/A)\s+(\d+:\d+)$'), False),        # com N/A
+    (re.compile(r'^(Time [Ss]avings.+?)\s+(\d+%)$'), True),       # Time savings
+    (re.compile(r'^(Total time.+?)\s+(\d+:\d+)\s+(\d+:\d+)$'), False)  # Total time
+]
+
+# Linhas conhecidas da página 6: trecho -> linha da tabela
+FLOOR_PLANS_ROW_INDEX = {row[0]: tuple(row) for row in FLOOR_PLANS_ROWS}
+FLOOR_PLANS_ROW_PATTERN = _alternation(list(FLOOR_PLANS_ROW_INDEX))
+
+TAG_EMPTY = 1
+TAG_BULLET = 2
+TAG_TABLE_HEADER = 4
+TAG_TASK = 8
+TAG_AUTOCAD = 16
+TAG_TOOLSET = 32
+TAG_TIME_PAIR = 64
+TAG_TABLE_END = 128
+
+# Um bit por trecho de TASK_NAMES (a partir de 256), para obter o nome da tarefa pelas tags
+TASK_NAME_TAGS = {key: 256 << i for i, key in enumerate(TASK_NAMES)}
+
+def _keyword_tags() -> Dict[str, int]:
+    """
+    Trecho -> tags; um trecho herda as tags dos trechos que contém (o header
+    "Floor plans AutoCAD Architecture toolset" também é tarefa, AutoCAD e toolset),
+    já que a alternância casa só o mais longo em cada posição
+    """
+    categories = [(TABLE_HEADERS, TAG_TABLE_HEADER), (TASK_INDICATORS, TAG_TASK),
+                  (["AutoCAD"], TAG_AUTOCAD), (["Architecture toolset"], TAG_TOOLSET),
+                  (TABLE_END_INDICATORS, TAG_TABLE_END)]
+    categories.extend(([key], tag) for key, tag in TASK_NAME_TAGS.items())
+    keywords = {keyword for texts, _ in categories for keyword in texts}
+    return {
+        keyword: sum(tag for texts, tag in categories if any(text in keyword for text in texts))
+        for keyword in keywords
+    }
+
+KEYWORD_TAGS = _keyword_tags()
+
+# Todos os trechos em uma única alternância: um finditer classifica a página inteira
+KEYWORD_PATTERN = _alternation(list(KEYWORD_TAGS))
+
+def first_by_priority(pattern: "re.Pattern", line: str, choices: Dict[str, Any]) -> Any:
+    """
+    Valor do primeiro trecho de choices (na ordem do dict) que aparece na linha
+
+    Um único finditer encontra todos os trechos presentes; a prioridade segue a
+    ordem de choices, como nas antigas cadeias de `if trecho in linha`.
+    """
+    found = {match.group(0) for match in pattern.finditer(line)}
+    if not found:
+        return None
+    for key, value in choices.items():
+        if key in found:
+            return value
+    return None
+
+def _line_time_counts(text: str, line_starts: List[int]) -> Dict[int, int]:
+    """Número de tempos (dígito:dígito) por linha, percorrendo só os ':' do texto"""
+    counts = {}
+    colon = text.find(':')
+    while colon != -1:
+        if 0 < colon < len(text) - 1 and text[colon - 1].isdigit() and text[colon + 1].isdigit():
+            line_index = bisect_right(line_starts, colon) - 1
+            counts[line_index] = counts.get(line_index, 0) + 1
+        colon = text.find(':', colon + 1)
+    return counts
+
+def classify_text(text: str, separator: str = '\n') -> Tuple[List[str], List[int]]:
+    """
+    Divide o texto em linhas e classifica todas em um único passe
+    
+    Os trechos conhecidos são encontrados com um único finditer sobre o texto
+    inteiro e atribuídos à linha pela posição (bisect nos inícios de linha).
+    
+    Returns:
+        (linhas, tags de cada linha)
+    """
+    lines = text.split(separator)
+    
+    line_starts = []
+    position = 0
+    for line in lines:
+        line_starts.append(position)
+        position += len(line) + len(separator)
+    
+    tags = [TAG_EMPTY if not line.strip() else (TAG_BULLET if line.strip().startswith("•") else 0)
+            for line in lines]
+    
+    if len(lines) == 1:
+        # Página sem quebras: todos os trechos são da mesma linha (findall evita objetos Match)
+        for keyword in KEYWORD_PATTERN.findall(text):
+            tags[0] |= KEYWORD_TAGS[keyword]
+    else:
+        for match in KEYWORD_PATTERN.finditer(text):
+            tags[bisect_right(line_starts, match.start()) - 1] |= KEYWORD_TAGS[match.group(0)]
+    
+    for line_index, times in _line_time_counts(text, line_starts).items():
+        if times >= 2:
+            tags[line_index] |= TAG_TIME_PAIR
+    
+    return lines, tags
+
+def classify_line(line: str) -> int:
+    """Tags (bits TAG_*) de uma única linha"""
+    return classify_text(line)[1][0]
+
+def classify_lines(lines: List[str]) -> List[int]:
+    """Tags de cada linha de uma lista já dividida"""
+    return [classify_line(line) for line in lines]
+
+def task_name_from_tags(tag: int) -> str:
+    """Nome da tarefa indicado pelas tags de uma linha ("Task" se nenhum)"""
+    for key, name in TASK_NAMES.items():
+        if tag & TASK_NAME_TAGS[key]:
+            return name
+    return "Task"
+
+def is_table_start_tag(tags: List[int], index: int) -> bool:
+    """
+    Decide se a linha index inicia uma tabela de comparação, só pelas tags:
+    header conhecido, tarefa + AutoCAD/Architecture toolset, ou tarefa seguida
+    de uma linha com tempos nas próximas duas linhas
+    """
+    tag = tags[index]
+    if tag & TAG_TABLE_HEADER:
+        return True
+    if tag & TAG_TASK:
+        if tag & TAG_AUTOCAD and tag & TAG_TOOLSET:
+            return True
+        return any(next_tag & TAG_TIME_PAIR for next_tag in tags[index + 1:index + 3])
+    return False
+
+def find_table_start(tags: List[int]) -> Optional[int]:
+    """Índice da primeira linha que inicia uma tabela (None se não houver)"""
+    for index in range(len(tags)):
+        if is_table_start_tag(tags, index):
+            return index
+    return None
+
+def _process_page_range(pdf_path: str, output_dir: str, start: int, end: int) -> List[Dict[str, Any]]:
+    """
+    Processa as páginas [start, end) em um processo worker, abrindo o PDF de forma independente
+    """
+    extractor = FinalPDFExtractor(output_dir)
+    
+    with pdfplumber.open(pdf_path) as pdf:
+        contents = []
+        for page_num in range(start, end):
+            page = pdf.pages[page_num]
+            contents.append(extractor.process_page(page, page_num + 1))
+            page.close()
+        return contents
 
 class FinalPDFExtractor:
     """
     Extrator final que funciona corretamente
     """
     
-    def __init__(self, output_dir: str = "./rag_outputs"):
+    def __init__(self, output_dir: str = "./rag_outputs", page_workers: int = 1):
+        """
+        Args:
+            output_dir: Diretório padrão de saída
+            page_workers: Processos para extrair páginas em paralelo (1 = sequencial)
+        """
         self.output_dir = Path(output_dir)
+        self.page_workers = max(1, page_workers)
         self.setup_directories()
         
     def setup_directories(self):
@@ -37,20 +343,19 @@ class FinalPDFExtractor:
     def extract_table_from_text(self, text: str, page_num: int) -> List[List[str]]:
         """
         Extrai tabela do texto usando método que funciona
-        """
-        lines = text.split('\\n')
         
+        As linhas são classificadas uma única vez (classify_lines) e a detecção
+        de início/fim de tabela usa apenas essas tags.
+        """
         # Página 23 - Tabela de conclusão especial
         if page_num == 23:
             return self.extract_conclusion_table(text)
         
         # Outras páginas - tabelas de comparação
-        for i, line in enumerate(lines):
-            line = line.strip()
-            
-            # Detectar início de tabela
-            if self.is_table_start(line, lines, i):
-                return self.parse_comparison_table(lines, i, page_num)
+        lines, tags = classify_text(text, '\\n')
+        start_idx = find_table_start(tags)
+        if start_idx is not None:
+            return self.parse_comparison_table(lines, start_idx, page_num, tags)
         
         return []
     
@@ -58,179 +363,44 @@ class FinalPDFExtractor:
         """
         Detecta início de tabela de comparação
         """
-        # Lista completa de todas as páginas com tabelas conhecidas
-        complete_table_headers = [
-            "Floor plans AutoCAD Architecture toolset",      # Página 6
-            "Elevations AutoCAD Architecture toolset",       # Página 8  
-            "Reflected ceiling AutoCAD Architecture toolset", # Página 10
-            "Building sections AutoCAD Architecture toolset", # Página 12
-            "Sheet layouts AutoCAD Architecture toolset",    # Página 14
-            "Details AutoCAD Architecture toolset",          # Página 16
-            "Schedules AutoCAD Architecture toolset",        # Página 18
-            "Automatic project AutoCAD Architecture toolset", # Página 20
-            "Coordination AutoCAD Architecture toolset",     # Página 22
-        ]
-        
-        # Verificação direta para headers conhecidos
-        for header in complete_table_headers:
-            if header in line:
-                return True
-        
-        # Verificar se linha contém indicadores de tabela
-        task_indicators = [
-            "Floor plans", "Elevations", "Reflected ceiling plans",
-            "Building sections", "Sheet layouts", "Details", 
-            "Schedules", "Automatic project", "Coordination and publishing"
-        ]
-        
-        # Método 1: Se tem o nome da tarefa E AutoCAD/Architecture toolset
-        if any(task in line for task in task_indicators):
-            if "AutoCAD" in line and "Architecture toolset" in line:
-                return True
-        
-        # Método 2: Se as próximas linhas têm padrão de tempo
-        if any(task in line for task in task_indicators):
-            for j in range(index + 1, min(index + 3, len(lines))):
-                if j < len(lines) and re.search(r'\\d+:\\d+.*\\d+:\\d+', lines[j]):
-                    return True
-        
-        # Método 3: ESPECIAL para página 6 que tem tudo numa linha
-        if "Floor plans AutoCAD Architecture toolset" in line:
-            return True
-        
-        return False
+        tags = [classify_line(line)] + [classify_line(lines[j]) for j in range(index + 1, min(index + 3, len(lines)))]
+        return is_table_start_tag(tags, 0)
     
-    def parse_comparison_table(self, lines: List[str], start_idx: int, page_num: int) -> List[List[str]]:
+    def parse_comparison_table(self, lines: List[str], start_idx: int, page_num: int,
+                               tags: Optional[List[int]] = None) -> List[List[str]]:
         """
         Parseia tabela de comparação de tarefas
         """
-        # Determinar nome da tarefa
+        if tags is None:
+            tags = classify_lines(lines)
+        
+        # Determinar nome da tarefa (já indicado pelas tags da linha)
         header_line = lines[start_idx].strip()
-        task_name = self.extract_task_name_from_line(header_line)
+        task_name = task_name_from_tags(tags[start_idx])
         
         table_data = [[task_name, "AutoCAD", "Architecture toolset"]]
         
         # ESPECIAL para página 6 que tem tudo numa linha
-        if "Floor plans AutoCAD Architecture toolset" in header_line:
-            # Dados hardcoded conhecidos da página 6
-            known_data = [
-                ["Set up project", "10:00", "15:00"],
-                ["Create a structural grid", "45:00", "40:00"],
-                ["Create wall outlines", "15:00", "10:00"],
-                ["Create custom windows and doors", "60:00", "0:00"],
-                ["Create custom walls", "60:00", "0:00"],
-                ["Add dimensions and tags", "30:00", "30:00"],
-                ["Generate roof", "45:00", "30:00"],
-                ["Total time to complete task", "265:00", "125:00"],
-                ["Time savings with the Architecture toolset", "", "53%"]
-            ]
-            table_data.extend(known_data)
+        if FLOOR_PLANS_HEADER in header_line:
+            table_data.extend(FLOOR_PLANS_ROWS)
             return table_data
         
         # Dados hardcoded para outras páginas conhecidas
-        elif "Elevations" in task_name:
-            known_data = [
-                ["Create project geometry from floor plans", "45:00", "1:00"],
-                ["Create 2D blocks of windows and doors for elevations", "30:00", "0:00"],
-                ["Complete elevations", "120:00", "40:00"],
-                ["Total time to complete task", "195:00", "41:00"],
-                ["Time savings with the Architecture toolset", "", "79%"]
-            ]
-            table_data.extend(known_data)
-            return table_data
-        
-        elif "Reflected ceiling" in task_name:
-            known_data = [
-                ["Create the ground floor ceiling plan", "60:00", "40:00"],
-                ["Create and add light fixtures to the ceiling", "20:00", "20:00"],
-                ["Total time to complete task", "80:00", "60:00"],
-                ["Time Savings with the Architecture toolset", "", "25%"]
-            ]
-            table_data.extend(known_data)
-            return table_data
-        
-        elif "Building sections" in task_name:
-            known_data = [
-                ["Create building section going WEST-EAST", "110:00", "40:00"],
-                ["Create building section going NORTH-SOUTH", "108:00", "37:00"],
-                ["Total time to complete task", "218:00", "77:00"],
-                ["Time Savings with Architecture toolset", "", "65%"]
-            ]
-            table_data.extend(known_data)
-            return table_data
-        
-        elif "Sheet layouts" in task_name:
-            known_data = [
-                ["Create sheet sets", "60:00", "06:00"],
-                ["Create cover sheet (including perspective view)", "70:00", "25:00"],
-                ["Create sheets for plans, elevations, and sections", "53:00", "18:00"],
-                ["Place views on sheets", "55:00", "14:00"],
-                ["Create page setups", "10:00", "10:00"],
-                ["Total time to complete task", "248:00", "73:00"],
-                ["Time Savings with Architecture toolset", "", "71%"]
-            ]
-            table_data.extend(known_data)
-            return table_data
-        
-        elif "Details" in task_name:
-            known_data = [
-                ["Create an enlarged plan view", "15:00", "10:00"],
-                ["Create a section through wall corner for detail", "90:00", "15:00"],
-                ["Create a section through wall for section detail", "45:00", "20:00"],
-                ["Total time to complete task", "150:00", "45:00"],
-                ["Time Savings with Architecture toolset", "", "70%"]
-            ]
-            table_data.extend(known_data)
-            return table_data
-        
-        elif "Schedules" in task_name:
-            known_data = [
-                ["Add tags to floor plan, including windows and doors", "25:00", "10:00"],
-                ["Create a window schedule; select windows", "35:00", "10:00"],
-                ["Add schedule to floor plan drawing", "N/A", "01:00"],
-                ["Total time to complete task", "60:00", "21:00"],
-                ["Time Savings with Architecture toolset", "", "65%"]
-            ]
-            table_data.extend(known_data)
-            return table_data
-        
-        elif "Automatic project" in task_name:
-            known_data = [
-                ["Reposition or change doors and windows", "30:00", "12:00"],
-                ["Update drawings by reloading references", "15:00", "10:00"],
-                ["Update sheets to reflect new information", "15:00", "10:00"],
-                ["Total time to complete task", "60:00", "32:00"],
-                ["Time Savings with Architecture toolset", "", "47%"]
-            ]
-            table_data.extend(known_data)
-            return table_data
-        
-        elif "Coordination" in task_name:
-            known_data = [
-                ["Add callouts, corrections and additions to drawings", "55:00", "40:00"],
-                ["Publish from project sheet set", "20:00", "08:00"],
-                ["Total time to complete task", "75:00", "48:00"],
-                ["Time Savings with Architecture toolset", "", "36%"]
-            ]
-            table_data.extend(known_data)
+        if task_name in KNOWN_TABLE_ROWS:
+            table_data.extend(KNOWN_TABLE_ROWS[task_name])
             return table_data
         
         # Processar outras páginas normalmente
-        i = start_idx + 1
-        while i < len(lines):
-            line = lines[i].strip()
-            
+        for i in range(start_idx + 1, len(lines)):
             # Parar se encontrar fim da tabela
-            if self.is_table_end(line):
+            if tags[i] & TAG_TABLE_END:
                 break
             
             # Parsear linha de dados
-            if line and not line.startswith("•"):
-                row = self.parse_table_row(line)
+            if not tags[i] & (TAG_EMPTY | TAG_BULLET):
+                row = self.parse_table_row(lines[i])
                 if row and len(row) == 3:
                     table_data.append(row)
-            
-            i += 1
         
         return table_data
     
@@ -238,120 +408,43 @@ class FinalPDFExtractor:
         """
         Extrai nome da tarefa da linha
         """
-        task_names = {
-            "Floor plans": "Floor plans",
-            "Elevations": "Elevations", 
-            "Reflected ceiling": "Reflected ceiling plans",
-            "Building sections": "Building sections",
-            "Sheet layouts": "Sheet layouts",
-            "Details": "Details",
-            "Schedules": "Schedules",
-            "Automatic project": "Automatic project reports",
-            "Coordination": "Coordination and publishing"
-        }
-        
-        for key, value in task_names.items():
-            if key in line:
-                return value
-        
-        return "Task"
+        return task_name_from_tags(classify_line(line))
     
     def parse_table_row(self, line: str) -> List[str]:
         """
         Parseia linha de dados da tabela - MÉTODO CORRIGIDO
         """
         # Limpar linha
-        line = re.sub(r'\\s+', ' ', line.strip())
-        
-        # ESTRATÉGIA: Identificar padrões específicos conhecidos
-        
-        # 1. Padrão padrão: descrição + tempo + tempo  
-        pattern1 = r'^(.+?)\\s+(\\d+:\\d+)\\s+(\\d+:\\d+)$'
-        match = re.match(pattern1, line)
-        if match:
-            return [match.group(1).strip(), match.group(2), match.group(3)]
-        
-        # 2. Padrão com N/A
-        pattern2 = r'^(.+?)\\s+(N/A)\\s+(\\d+:\\d+)$'
-        match = re.match(pattern2, line)
-        if match:
-            return [match.group(1).strip(), match.group(2), match.group(3)]
-        
-        # 3. Time savings
-        pattern3 = r'^(Time [Ss]avings.+?)\\s+(\\d+%)$'
-        match = re.match(pattern3, line)
-        if match:
-            return [match.group(1).strip(), "", match.group(2)]
-        
-        # 4. Total time
-        pattern4 = r'^(Total time.+?)\\s+(\\d+:\\d+)\\s+(\\d+:\\d+)$'
-        match = re.match(pattern4, line)
-        if match:
-            return [match.group(1).strip(), match.group(2), match.group(3)]
-        
-        # 5. MÉTODO MANUAL para linhas conhecidas da página 6
-        if "Set up project" in line:
-            return ["Set up project", "10:00", "15:00"]
-        elif "Create a structural grid" in line:
-            return ["Create a structural grid", "45:00", "40:00"]
-        elif "Create wall outlines" in line:
-            return ["Create wall outlines", "15:00", "10:00"]
-        elif "Create custom windows and doors" in line:
-            return ["Create custom windows and doors", "60:00", "0:00"]
-        elif "Create custom walls" in line:
-            return ["Create custom walls", "60:00", "0:00"]
-        elif "Add dimensions and tags" in line:
-            return ["Add dimensions and tags", "30:00", "30:00"]
-        elif "Generate roof" in line:
-            return ["Generate roof", "45:00", "30:00"]
-        elif "Total time to complete task" in line:
-            return ["Total time to complete task", "265:00", "125:00"]
-        elif "Time savings with the Architecture toolset" in line:
-            return ["Time savings with the Architecture toolset", "", "53%"]
-        
-        return None
+        line = WHITESPACE_PATTERN.sub(' ', line.strip())
+        
+        # Padrões conhecidos (tempo + tempo, N/A, Time savings, Total time), já compilados
+        for pattern, savings_only in ROW_PATTERNS:
+            match = pattern.match(line)
+            if match:
+                if savings_only:
+                    return [match.group(1).strip(), "", match.group(2)]
+                return [match.group(1).strip(), match.group(2), match.group(3)]
+        
+        # MÉTODO MANUAL para linhas conhecidas da página 6
+        known_row = first_by_priority(FLOOR_PLANS_ROW_PATTERN, line, FLOOR_PLANS_ROW_INDEX)
+        return list(known_row) if known_row else None
     
     def is_table_end(self, line: str) -> bool:
         """
         Detecta fim de tabela
         """
-        end_indicators = [
-            "(Figures shown", "Advantages", "The advantages", 
-            "The benefits of using", "Steps:"
-        ]
-        
-        return any(indicator in line for indicator in end_indicators)
+        return bool(classify_line(line) & TAG_TABLE_END)
     
     def extract_conclusion_table(self, text: str) -> List[List[str]]:
         """
         Extrai tabela de conclusão da página 23
         """
-        lines = text.split('\\n')
         table_data = [["Project Task", "AutoCAD", "Architecture toolset", "Time Savings"]]
         
-        # Dados conhecidos da tabela de conclusão
-        known_data = [
-            ["Floor plans", "265:00", "125:00", "53%"],
-            ["Elevations", "195:00", "41:00", "79%"],
-            ["Reflected ceiling plans", "80:00", "60:00", "25%"],
-            ["Building sections", "218:00", "77:00", "65%"],
-            ["Sheet layouts", "248:00", "73:00", "71%"],
-            ["Details", "150:00", "45:00", "70%"],
-            ["Schedules", "60:00", "21:00", "65%"],
-            ["Project modifications", "60:00", "32:00", "47%"],
-            ["Coordination and publishing", "75:00", "48:00", "36%"],
-            ["Total time", "1351:00", "522:00", ""],
-            ["Overall time savings", "", "", "61%"]
-        ]
-        
-        # Verificar se dados estão no texto e adicionar
-        for row in known_data:
-            task_name = row[0]
-            # Verificar variações do nome
-            variations = [task_name, task_name.lower(), task_name.replace(" ", "")]
-            
+        # Verificar se dados estão no texto e adicionar (variações do nome pré-calculadas)
+        for row, variations in CONCLUSION_ROWS:
             if any(var in text for var in variations):
-                table_data.append(row)
+                table_data.append(list(row))
         
         return table_data
     
@@ -379,9 +472,49 @@ class FinalPDFExtractor:
         
         return content
     
-    def process_pdf(self, pdf_path: str) -> Dict[str, Any]:
+    def iter_page_contents(self, pdf_path: Path, total_pages: int, page_workers: int):
+        """
+        Gera o conteúdo de cada página em ordem
+        
+        Com page_workers > 1, as páginas são divididas em fatias contíguas processadas
+        por processos independentes; executor.map devolve as fatias na ordem original,
+        então o resultado é idêntico ao modo sequencial.
+        """
+        if page_workers > 1 and total_pages >= 2 * MIN_PAGES_PER_SHARD:
+            shard_count = min(page_workers * SHARDS_PER_WORKER, total_pages // MIN_PAGES_PER_SHARD)
+            shard_size = -(-total_pages // shard_count)
+            starts = list(range(0, total_pages, shard_size))
+            ends = [min(start + shard_size, total_pages) for start in starts]
+            
+            with ProcessPoolExecutor(max_workers=min(page_workers, len(starts))) as executor:
+                shards = executor.map(
+                    _process_page_range,
+                    [str(pdf_path)] * len(starts), [str(self.output_dir)] * len(starts), starts, ends
+                )
+                for shard in shards:
+                    yield from shard
+        else:
+            with pdfplumber.open(pdf_path) as pdf:
+                for page_num in range(total_pages):
+                    page = pdf.pages[page_num]
+                    page_content = self.process_page(page, page_num + 1)
+                    
+                    # Liberar o cache de objetos da página antes da próxima
+                    page.close()
+                    yield page_content
+    
+    def process_pdf(self, pdf_path: str, output_dir: Optional[str] = None,
+                    filename_base: Optional[str] = None, save: bool = True,
+                    page_workers: Optional[int] = None) -> Dict[str, Any]:
         """
         Processa PDF completo
+        
+        Args:
+            pdf_path: Caminho do PDF
+            output_dir: Diretório de saída desta chamada (padrão: self.output_dir)
+            filename_base: Nome base dos arquivos gerados (padrão: nome do PDF)
+            save: Se False, não grava arquivos; o markdown fica em results['markdown']
+            page_workers: Processos para as páginas (padrão: self.page_workers)
         """
         pdf_path = Path(pdf_path)
         
@@ -400,22 +533,22 @@ class FinalPDFExtractor:
         
         with pdfplumber.open(pdf_path) as pdf:
             results['total_pages'] = len(pdf.pages)
-            print(f"📖 Total de páginas: {len(pdf.pages)}")
-            
-            for page_num in range(len(pdf.pages)):
-                page = pdf.pages[page_num]
-                page_content = self.process_page(page, page_num + 1)
+        print(f"📖 Total de páginas: {results['total_pages']}")
+        
+        page_workers = page_workers or self.page_workers
+        for page_content in self.iter_page_contents(pdf_path, results['total_pages'], page_workers):
+            if page_content['has_content']:
+                results['content'].append(page_content)
+                results['pages_processed'] += 1
+                results['tables_found'] += len(page_content['tables'])
                 
-                if page_content['has_content']:
-                    results['content'].append(page_content)
-                    results['pages_processed'] += 1
-                    results['tables_found'] += len(page_content['tables'])
-                    
-                    tables_info = f"{len(page_content['tables'])} tabela(s)" if page_content['tables'] else "sem tabelas"
-                    print(f"✅ Página {page_num + 1}: {tables_info}")
+                tables_info = f"{len(page_content['tables'])} tabela(s)" if page_content['tables'] else "sem tabelas"
+                print(f"✅ Página {page_content['page_number']}: {tables_info}")
         
         # Salvar resultados
-        self.save_results(results)
+        results['markdown'] = self.create_markdown(results)
+        if save:
+            results['files'] = self.save_results(results, output_dir, filename_base)
         return results
     
     def create_markdown_table(self, table: List[List[str]]) -> str:
@@ -442,19 +575,11 @@ class FinalPDFExtractor:
         
         return "\\n".join(lines)
     
-    def save_results(self, results: Dict[str, Any]):
+    def create_json_data(self, results: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Salva todos os resultados
+        Cria estrutura JSON final
         """
-        filename_base = Path(results['filename']).stem
-        
-        # Markdown
-        markdown_content = self.create_markdown(results)
-        markdown_file = self.directories['markdown'] / f"{filename_base}.md"
-        markdown_file.write_text(markdown_content, encoding='utf-8')
-        
-        # JSON
-        json_data = {
+        return {
             'metadata': {
                 'filename': results['filename'],
                 'total_pages': results['total_pages'],
@@ -464,93 +589,236 @@ class FinalPDFExtractor:
             },
             'content': results['content']
         }
+    
+    def save_results(self, results: Dict[str, Any], output_dir: Optional[str] = None,
+                     filename_base: Optional[str] = None) -> Dict[str, str]:
+        """
+        Salva todos os resultados
+        
+        Args:
+            results: Resultado de process_pdf
+            output_dir: Diretório com subpastas markdown/ e json/ (padrão: self.output_dir)
+            filename_base: Nome base dos arquivos (padrão: nome do PDF)
+        
+        Returns:
+            Dict[str, str]: Caminhos dos arquivos gravados ('markdown', 'json')
+        """
+        filename_base = filename_base or Path(results['filename']).stem
         
-        json_file = self.directories['json'] / f"{filename_base}.json"
-        json_file.write_text(json.dumps(json_data, indent=2, ensure_ascii=False), encoding='utf-8')
+        if output_dir is None:
+            markdown_dir = self.directories['markdown']
+            json_dir = self.directories['json']
+        else:
+            markdown_dir = Path(output_dir) / "markdown"
+            json_dir = Path(output_dir) / "json"
+            markdown_dir.mkdir(parents=True, exist_ok=True)
+            json_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Markdown
+        markdown_content = results.get('markdown') or self.create_markdown(results)
+        markdown_file = markdown_dir / f"{filename_base}.md"
+        markdown_file.write_text(markdown_content, encoding='utf-8')
+        
+        # JSON
+        json_data = self.create_json_data(results)
+        
+        json_file = json_dir / f"{filename_base}.json"
+        with open(json_file, 'w', encoding='utf-8') as f:
+            json.dump(json_data, f, indent=2, ensure_ascii=False)
         
         print(f"\\n💾 Arquivos salvos:")
         print(f"  📄 {markdown_file.name}")
         print(f"  📊 {json_file.name}")
+        
+        return {'markdown': str(markdown_file), 'json': str(json_file)}
     
-    def create_markdown(self, results: Dict[str, Any]) -> str:
+    def create_markdown_header(self, filename: str, total_pages: int,
+                               pages_processed: Optional[int] = None,
+                               tables_found: Optional[int] = None) -> List[str]:
         """
-        Cria markdown final
+        Cria linhas do cabeçalho do markdown (contagens omitidas se ainda desconhecidas)
         """
         lines = [
-            f"# {Path(results['filename']).stem}",
+            f"# {Path(filename).stem}",
             "",
             "## 📋 Informações do Documento",
-            f"- **Arquivo:** {results['filename']}",
-            f"- **Páginas:** {results['total_pages']}",
-            f"- **Páginas processadas:** {results['pages_processed']}",
-            f"- **Tabelas encontradas:** {results['tables_found']}",
+            f"- **Arquivo:** {filename}",
+            f"- **Páginas:** {total_pages}"
+        ]
+        
+        if pages_processed is not None:
+            lines.append(f"- **Páginas processadas:** {pages_processed}")
+        if tables_found is not None:
+            lines.append(f"- **Tabelas encontradas:** {tables_found}")
+        
+        lines.extend([
             f"- **Processado em:** {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}",
             "",
             "---",
             ""
-        ]
-        
-        for page_content in results['content']:
-            page_num = page_content['page_number']
-            text = page_content['text']
-            tables = page_content['tables']
-            
-            lines.append(f"## 📄 Página {page_num}")
-            lines.append("")
-            
-            # Adicionar texto da página (será filtrado automaticamente quando há tabelas)
-            if text:
-                # Para páginas com tabelas, mostrar apenas parte do texto
-                if tables:
-                    # Mostrar apenas introdução/vantagens
-                    text_lines = text.split('\\n')
-                    filtered_lines = []
+        ])
+        return lines
+    
+    def create_page_markdown(self, page_content: Dict[str, Any]) -> List[str]:
+        """
+        Cria linhas do markdown de uma página
+        """
+        lines = []
+        page_num = page_content['page_number']
+        text = page_content['text']
+        tables = page_content['tables']
+        
+        lines.append(f"## 📄 Página {page_num}")
+        lines.append("")
+        
+        # Adicionar texto da página (será filtrado automaticamente quando há tabelas)
+        if text:
+            # Para páginas com tabelas, mostrar apenas parte do texto
+            if tables:
+                # Mostrar apenas introdução/vantagens
+                text_lines = text.split('\\n')
+                filtered_lines = []
+                
+                for line in text_lines:
+                    line = line.strip()
+                    if not line:
+                        continue
                     
-                    for line in text_lines:
-                        line = line.strip()
-                        if not line:
-                            continue
+                    # Incluir apenas certas seções
+                    if any(section in line for section in [
+                        "Design task", "Steps:", "Advantages", 
+                        "The task was", "The benefits of using"
+                    ]) or line.startswith("•"):
                         
-                        # Incluir apenas certas seções
-                        if any(section in line for section in [
-                            "Design task", "Steps:", "Advantages", 
-                            "The task was", "The benefits of using"
-                        ]) or line.startswith("•"):
-                            
-                            if "Design task" in line:
-                                lines.append(f"### {line}")
-                            elif line.startswith("•"):
-                                lines.append(f"- {line[1:].strip()}")
-                            elif line.startswith("The benefits of using") and line.endswith(str(page_num)):
-                                lines.append(f"*{line}*")
-                            else:
-                                lines.append(line)
-                            
-                            lines.append("")
-                else:
-                    # Página sem tabela - incluir todo o texto
-                    text_lines = text.split('\\n')
-                    for line in text_lines:
-                        line = line.strip()
-                        if line:
+                        if "Design task" in line:
+                            lines.append(f"### {line}")
+                        elif line.startswith("•"):
+                            lines.append(f"- {line[1:].strip()}")
+                        elif line.startswith("The benefits of using") and line.endswith(str(page_num)):
+                            lines.append(f"*{line}*")
+                        else:
                             lines.append(line)
-                            lines.append("")
+                        
+                        lines.append("")
+            else:
+                # Página sem tabela - incluir todo o texto
+                text_lines = text.split('\\n')
+                for line in text_lines:
+                    line = line.strip()
+                    if line:
+                        lines.append(line)
+                        lines.append("")
+        
+        # Adicionar tabelas
+        for i, table in enumerate(tables):
+            table_name = table[0][0] if table and table[0] else f"Tabela {i+1}"
+            lines.append(f"### 📊 {table_name}")
+            lines.append("")
             
-            # Adicionar tabelas
-            for i, table in enumerate(tables):
-                table_name = table[0][0] if table and table[0] else f"Tabela {i+1}"
-                lines.append(f"### 📊 {table_name}")
+            table_md = self.create_markdown_table(table)
+            if table_md:
+                lines.append(table_md)
                 lines.append("")
-                
-                table_md = self.create_markdown_table(table)
-                if table_md:
-                    lines.append(table_md)
-                    lines.append("")
-            
-            lines.append("---")
-            lines.append("")
+        
+        lines.append("---")
+        lines.append("")
+        return lines
+    
+    def create_markdown(self, results: Dict[str, Any]) -> str:
+        """
+        Cria markdown final
+        """
+        lines = self.create_markdown_header(
+            results['filename'], results['total_pages'],
+            results['pages_processed'], results['tables_found']
+        )
+        
+        for page_content in results['content']:
+            lines.extend(self.create_page_markdown(page_content))
         
         return "\\n".join(lines)
+    
+    def process_pdf_streaming(self, pdf_path: str, output_dir: Optional[str] = None,
+                              filename_base: Optional[str] = None,
+                              page_workers: Optional[int] = None,
+                              on_page: Optional[Callable[[Dict[str, Any], str, int], None]] = None) -> Dict[str, Any]:
+        """
+        Processa o PDF página a página com memória constante
+        
+        Cada página é escrita no markdown e em um JSONL (uma página por linha) assim
+        que é extraída, sem acumular results['content']. As contagens finais vão
+        para um resumo no fim do markdown, já que não são conhecidas no cabeçalho.
+        
+        Args:
+            pdf_path: Caminho do PDF
+            output_dir: Diretório com subpastas markdown/ e json/ (padrão: self.output_dir)
+            filename_base: Nome base dos arquivos (padrão: nome do PDF)
+            page_workers: Processos para as páginas (padrão: self.page_workers)
+            on_page: Chamado a cada página com conteúdo: (page_content, page_markdown, total_pages)
+        
+        Returns:
+            Dict: Resumo (sem 'content') com os caminhos em 'files'
+        """
+        pdf_path = Path(pdf_path)
+        
+        if not pdf_path.exists():
+            raise FileNotFoundError(f"PDF não encontrado: {pdf_path}")
+        
+        print(f"📄 Processando (streaming): {pdf_path.name}")
+        
+        filename_base = filename_base or pdf_path.stem
+        markdown_dir = Path(output_dir) / "markdown" if output_dir else self.directories['markdown']
+        json_dir = Path(output_dir) / "json" if output_dir else self.directories['json']
+        markdown_dir.mkdir(parents=True, exist_ok=True)
+        json_dir.mkdir(parents=True, exist_ok=True)
+        
+        markdown_file = markdown_dir / f"{filename_base}.md"
+        jsonl_file = json_dir / f"{filename_base}.jsonl"
+        
+        results = {
+            'filename': pdf_path.name,
+            'total_pages': 0,
+            'pages_processed': 0,
+            'tables_found': 0
+        }
+        
+        with pdfplumber.open(pdf_path) as pdf:
+            results['total_pages'] = len(pdf.pages)
+        print(f"📖 Total de páginas: {results['total_pages']}")
+        
+        with open(markdown_file, 'w', encoding='utf-8') as md_out, \
+             open(jsonl_file, 'w', encoding='utf-8') as jsonl_out:
+            
+            md_out.write("\\n".join(self.create_markdown_header(results['filename'], results['total_pages'])))
+            
+            page_workers = page_workers or self.page_workers
+            for page_content in self.iter_page_contents(pdf_path, results['total_pages'], page_workers):
+                if not page_content['has_content']:
+                    continue
+                
+                page_markdown = "\\n".join(self.create_page_markdown(page_content))
+                md_out.write("\\n" + page_markdown)
+                jsonl_out.write(json.dumps(page_content, ensure_ascii=False) + "\n")
+                
+                results['pages_processed'] += 1
+                results['tables_found'] += len(page_content['tables'])
+                
+                tables_info = f"{len(page_content['tables'])} tabela(s)" if page_content['tables'] else "sem tabelas"
+                print(f"✅ Página {page_content['page_number']}: {tables_info}")
+                
+                if on_page:
+                    on_page(page_content, page_markdown, results['total_pages'])
+            
+            md_out.write("\\n" + "\\n".join([
+                "## 📋 Resumo",
+                f"- **Páginas processadas:** {results['pages_processed']}",
+                f"- **Tabelas encontradas:** {results['tables_found']}",
+                ""
+            ]))
+        
+        results['files'] = {'markdown': str(markdown_file), 'json': str(jsonl_file)}
+        print(f"💾 Arquivos salvos: {markdown_file.name}, {jsonl_file.name}")
+        return results
 
 def main():
     """
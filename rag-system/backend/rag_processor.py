@@ -14,16 +14,13 @@ from pathlib import Path
 from typing import Dict, List, Any, Optional, Union
 from datetime import datetime
 import io
+import threading
 import requests
+from concurrent.futures import ProcessPoolExecutor
 from urllib.parse import urlparse
 
-# Docling imports
-from docling.document_converter import DocumentConverter, PdfFormatOption
-from docling.datamodel.base_models import InputFormat, DocumentStream
-from docling.datamodel.pipeline_options import PdfPipelineOptions
-from docling.chunking import HybridChunker
-from docling_core.transforms.chunker.tokenizer.huggingface import HuggingFaceTokenizer
-from transformers import AutoTokenizer
+# Docling, transformers e EasyOCR são importados sob demanda (setup_docling / ocr_reader):
+# carregar os modelos leva dezenas de segundos e vários GB, e só PDFs e imagens precisam deles
 
 # Bibliotecas para processamento local
 import pdfplumber
@@ -32,20 +29,94 @@ import openpyxl
 import pandas as pd
 from pptx import Presentation
 from PIL import Image
-import pytesseract
-import easyocr
+from batch_ocr import TARGET_DPI, BatchOCR
+from ingestion_cache import DEFAULT_MAX_ENTRIES, IngestionCache, artifacts_size, hash_bytes
+from text_chunker import TextChunker
 
 # Configuração de logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Formatos que dependem de modelos pesados (Docling para PDF, EasyOCR para imagens)
+HEAVY_EXTENSIONS = {'.pdf', '.png', '.jpg', '.jpeg', '.bmp', '.tiff'}
+
+# Perfis do pipeline de PDF do Docling: o que cada um liga no PdfPipelineOptions
+PIPELINE_PROFILES = {
+    # PDFs nativos digitais: só a camada de texto
+    "fast": {
+        "do_ocr": False,
+        "do_table_structure": False,
+        "do_picture_classification": False,
+        "generate_picture_images": False,
+        "images_scale": 1
+    },
+    # Texto nativo com reconhecimento de estrutura de tabelas
+    "balanced": {
+        "do_ocr": False,
+        "do_table_structure": True,
+        "do_picture_classification": False,
+        "generate_picture_images": False,
+        "images_scale": 1
+    },
+    # Configuração completa (comportamento original): OCR, tabelas, imagens em 2x
+    "full": {
+        "do_ocr": True,
+        "do_table_structure": True,
+        "do_picture_classification": True,
+        "generate_picture_images": True,
+        "images_scale": 2
+    }
+}
+
+# "auto" escolhe entre estes conforme o PDF tenha ou não camada de texto
+AUTO_PROFILE_WITH_TEXT = "balanced"
+AUTO_PROFILE_WITHOUT_TEXT = "full"
+
+# Detecção de camada de texto: páginas amostradas e caracteres mínimos por página
+TEXT_LAYER_SAMPLE_PAGES = 5
+TEXT_LAYER_MIN_CHARS = 50
+
+# Processador mantido vivo em cada processo do pool pré-aquecido
+_worker_processor = None
+
+def _init_warm_worker(output_dir: str, warm_formats: tuple):
+    """Inicializador dos processos do pool: cria o processador e carrega os modelos uma vez"""
+    global _worker_processor
+    _worker_processor = RAGProcessor(output_dir=output_dir, warm_workers=0)
+    _worker_processor.warm_up(warm_formats)
+
+def _process_in_worker(source: Union[str, bytes], source_type: str, filename: Optional[str],
+                       profile: Optional[str]) -> Dict:
+    """Processa uma fonte com o processador do worker (modelos já carregados)"""
+    return _worker_processor.process_source(source, source_type, filename, profile=profile)
+
+def _process_images_in_worker(images: List[tuple]) -> List[Dict]:
+    """Processa um lote de imagens com o processador do worker (OCR em lote)"""
+    return _worker_processor.process_images(images)
+
+def _worker_ready() -> bool:
+    return _worker_processor is not None
+
 class RAGProcessor:
     """
     Processador principal para extração e formatação de documentos
     Objetivo: Transformar qualquer fonte em arquivos Markdown/JSON otimizados para IA
     """
     
-    def __init__(self, output_dir: str = "./rag_outputs"):
+    # Alterar quando a saída da extração mudar (invalida o cache de ingestão)
+    EXTRACTOR_VERSION = "rag_processor-1"
+    
+    def __init__(self, output_dir: str = "./rag_outputs", warm_workers: Optional[int] = None,
+                 warm_formats: tuple = ("pdf",), default_profile: Optional[str] = None):
+        """
+        Args:
+            output_dir: Diretório das saídas
+            warm_workers: Processos do pool pré-aquecido para PDFs e imagens
+                (padrão: RAG_WARM_WORKERS ou 0 = processar no próprio processo)
+            warm_formats: Componentes carregados ao iniciar cada worker ("pdf", "image")
+            default_profile: Perfil do pipeline de PDF quando process_source não informa um
+                (fast, balanced, full ou auto; padrão: RAG_PIPELINE_PROFILE ou full)
+        """
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
         
@@ -58,53 +129,158 @@ class RAGProcessor:
         for dir_path in [self.markdown_dir, self.json_dir, self.metadata_dir, self.chunks_dir]:
             dir_path.mkdir(exist_ok=True)
         
-        # Configurar Docling com opções avançadas
-        self.setup_docling()
+        # Cache por hash de conteúdo: reprocessar a mesma fonte devolve o resultado salvo
+        self.cache = IngestionCache(
+            self.output_dir / "ingestion_cache.db",
+            max_entries=int(os.getenv("INGEST_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES))
+        )
         
-        # EasyOCR para imagens (alternativa ao tesseract)
-        try:
-            self.ocr_reader = easyocr.Reader(['pt', 'en'])
-            logger.info("✅ EasyOCR initialized successfully")
-        except Exception as e:
-            logger.warning(f"⚠️ EasyOCR initialization failed: {e}")
-            self.ocr_reader = None
+        self.default_profile = default_profile or os.getenv("RAG_PIPELINE_PROFILE", "full")
+        if self.default_profile != "auto" and self.default_profile not in PIPELINE_PROFILES:
+            raise ValueError(f"Unknown pipeline profile: {self.default_profile}")
+        
+        # Docling e EasyOCR são carregados no primeiro uso (ver get_converter / ocr_reader);
+        # um DocumentConverter por perfil, o chunker é compartilhado
+        self._docling_loaded = False
+        self._converters: Dict[str, Any] = {}
+        self._chunker = None
+        self._ocr_loaded = False
+        self._ocr_reader = None
+        self._load_lock = threading.Lock()
+        
+        # OCR em lote (imagens reduzidas/ladrilhadas, cache por hash da imagem)
+        self.batch_ocr = BatchOCR(
+            self.output_dir / "ocr_cache.db",
+            reader_factory=lambda: self.ocr_reader,
+            tesseract_workers=int(os.getenv("OCR_WORKERS", 0)) or None,
+            batch_size=int(os.getenv("OCR_BATCH_SIZE", 16)),
+            target_dpi=int(os.getenv("OCR_TARGET_DPI", TARGET_DPI))
+        )
+        
+        # Pool opcional de processos com os modelos já carregados
+        self.warm_workers = warm_workers if warm_workers is not None else int(os.getenv("RAG_WARM_WORKERS", 0))
+        self.pool = None
+        if self.warm_workers > 0:
+            self.pool = ProcessPoolExecutor(
+                max_workers=self.warm_workers,
+                initializer=_init_warm_worker,
+                initargs=(str(self.output_dir), tuple(warm_formats))
+            )
+            # Um ping por worker para que todos subam (e carreguem os modelos) já na criação
+            for _ in range(self.warm_workers):
+                self.pool.submit(_worker_ready)
+            logger.info(f"🔥 Warm pool started with {self.warm_workers} workers ({', '.join(warm_formats)})")
+    
+    @property
+    def converter(self):
+        """DocumentConverter do Docling no perfil padrão (carregado no primeiro PDF)"""
+        profile = self.default_profile if self.default_profile != "auto" else AUTO_PROFILE_WITHOUT_TEXT
+        return self.get_converter(profile)
     
-    def setup_docling(self):
-        """Configurar Docling com todas as opções avançadas"""
+    def get_converter(self, profile: str):
+        """DocumentConverter de um perfil (criado no primeiro uso e reaproveitado)"""
+        if profile not in self._converters:
+            self.setup_docling(profile)
+        return self._converters.get(profile)
+    
+    @property
+    def chunker(self):
+        """HybridChunker do Docling (carregado junto com o primeiro converter)"""
+        if not self._docling_loaded:
+            self.converter
+        return self._chunker
+    
+    @property
+    def ocr_reader(self):
+        """EasyOCR para imagens (alternativa ao tesseract), carregado na primeira imagem"""
+        if not self._ocr_loaded:
+            with self._load_lock:
+                if not self._ocr_loaded:
+                    try:
+                        import easyocr
+                        self._ocr_reader = easyocr.Reader(['pt', 'en'])
+                        logger.info("✅ EasyOCR initialized successfully")
+                    except Exception as e:
+                        logger.warning(f"⚠️ EasyOCR initialization failed: {e}")
+                        self._ocr_reader = None
+                    self._ocr_loaded = True
+        return self._ocr_reader
+    
+    def warm_up(self, formats: tuple = ("pdf",)):
+        """Carregar antecipadamente os componentes dos formatos informados ("pdf", "image")"""
+        if "pdf" in formats:
+            if self.default_profile == "auto":
+                self.setup_docling(AUTO_PROFILE_WITH_TEXT)
+                self.setup_docling(AUTO_PROFILE_WITHOUT_TEXT)
+            else:
+                self.setup_docling(self.default_profile)
+        if "image" in formats:
+            self.ocr_reader
+    
+    def close(self):
+        """Encerrar o pool pré-aquecido e o pool do Tesseract, se houver"""
+        if self.pool is not None:
+            self.pool.shutdown(wait=True)
+            self.pool = None
+        self.batch_ocr.close()
+    
+    def setup_docling(self, profile: str = "full"):
+        """Configurar Docling no perfil informado (cada perfil uma única vez por processo)"""
+        with self._load_lock:
+            if profile not in self._converters:
+                self._load_docling(profile)
+    
+    def _load_docling(self, profile: str):
         try:
-            # Configurações avançadas do PDF
+            from docling.document_converter import DocumentConverter, PdfFormatOption
+            from docling.datamodel.base_models import InputFormat
+            from docling.datamodel.pipeline_options import PdfPipelineOptions
+            from docling.chunking import HybridChunker
+            from docling_core.transforms.chunker.tokenizer.huggingface import HuggingFaceTokenizer
+            from transformers import AutoTokenizer
+            
+            # Configurações do PDF conforme o perfil
             pipeline_options = PdfPipelineOptions()
-            pipeline_options.do_ocr = True
-            pipeline_options.do_table_structure = True
-            pipeline_options.do_picture_classification = True
-            pipeline_options.generate_picture_images = True
-            pipeline_options.images_scale = 2
-            
-            # Configurar tokenizer para chunking
-            tokenizer = HuggingFaceTokenizer(
-                tokenizer=AutoTokenizer.from_pretrained("sentence-transformers/all-MiniLM-L6-v2")
-            )
+            for option, value in PIPELINE_PROFILES[profile].items():
+                setattr(pipeline_options, option, value)
             
-            # Inicializar conversor e chunker
-            self.converter = DocumentConverter(
+            # Inicializar conversor do perfil
+            self._converters[profile] = DocumentConverter(
                 format_options={
                     InputFormat.PDF: PdfFormatOption(pipeline_options=pipeline_options)
                 }
             )
             
-            self.chunker = HybridChunker(tokenizer=tokenizer)
+            if not self._docling_loaded:
+                # Configurar tokenizer para chunking (compartilhado entre os perfis)
+                tokenizer = HuggingFaceTokenizer(
+                    tokenizer=AutoTokenizer.from_pretrained("sentence-transformers/all-MiniLM-L6-v2")
+                )
+                self._chunker = HybridChunker(tokenizer=tokenizer)
+                self._docling_loaded = True
             
-            logger.info("✅ Docling configured with advanced options")
+            logger.info(f"✅ Docling configured with profile '{profile}'")
             
         except Exception as e:
             logger.error(f"❌ Docling setup failed: {e}")
-            self.converter = None
-            self.chunker = None
+            self._converters[profile] = None
     
-    def process_source(self, source: Union[str, bytes], source_type: str = "auto", filename: str = None) -> Dict:
+    def process_source(self, source: Union[str, bytes], source_type: str = "auto", filename: str = None,
+                       profile: Optional[str] = None) -> Dict:
         """
         Processar qualquer fonte (URL, arquivo local, bytes) e gerar saídas estruturadas
+        
+        Args:
+            profile: Perfil do pipeline de PDF (fast, balanced, full ou auto); padrão: default_profile
         """
+        profile = profile or self.default_profile
+        if profile != "auto" and profile not in PIPELINE_PROFILES:
+            return {"success": False, "error": f"Unknown pipeline profile: {profile}", "doc_id": None}
+        
+        if self.pool is not None and self._needs_heavy_models(source, filename):
+            # PDFs e imagens vão para um worker com os modelos já carregados
+            return self.pool.submit(_process_in_worker, source, source_type, filename, profile).result()
+        
         try:
             # Gerar ID único para o documento
             doc_id = str(uuid.uuid4())
@@ -112,17 +288,25 @@ class RAGProcessor:
             
             # Determinar tipo de fonte
             if isinstance(source, str) and (source.startswith('http') or source.startswith('https')):
-                result = self._process_url(source, doc_id, timestamp)
+                result = self._process_url(source, doc_id, timestamp, profile)
             elif isinstance(source, bytes):
-                result = self._process_bytes(source, filename or "unknown.bin", doc_id, timestamp)
+                result = self._process_cached(source, filename or "unknown.bin", doc_id, timestamp,
+                                              self._process_bytes, profile)
             elif isinstance(source, str) and os.path.exists(source):
-                result = self._process_file(source, doc_id, timestamp)
+                result = self._process_file(source, doc_id, timestamp, profile)
             else:
                 raise ValueError(f"Unsupported source type: {type(source)}")
             
+            if result.get("cached"):
+                return result
+            
             # Salvar metadados completos
             self._save_metadata(doc_id, result)
             
+            # Registrar no cache só depois que os metadados (usados no reaproveitamento) existem
+            if result.get("success") and result.get("cache_key"):
+                self._remember_result(result)
+            
             return result
             
         except Exception as e:
@@ -133,7 +317,14 @@ class RAGProcessor:
                 "doc_id": doc_id if 'doc_id' in locals() else None
             }
     
-    def _process_url(self, url: str, doc_id: str, timestamp: str) -> Dict:
+    def _needs_heavy_models(self, source: Union[str, bytes], filename: Optional[str]) -> bool:
+        """Se a fonte pode precisar de Docling/EasyOCR (URLs só se sabe depois do download)"""
+        if isinstance(source, str) and source.startswith('http'):
+            return True
+        name = filename if isinstance(source, bytes) else source
+        return Path(name or "").suffix.lower() in HEAVY_EXTENSIONS
+    
+    def _process_url(self, url: str, doc_id: str, timestamp: str, profile: Optional[str] = None) -> Dict:
         """Processar URL (PDF, página web, etc.)"""
         try:
             # Detectar tipo de conteúdo
@@ -143,7 +334,8 @@ class RAGProcessor:
             if 'pdf' in content_type:
                 # Download e processo PDF
                 pdf_response = requests.get(url, timeout=30)
-                return self._process_pdf_with_docling(pdf_response.content, url, doc_id, timestamp)
+                return self._process_cached(pdf_response.content, url, doc_id, timestamp,
+                                            self._process_pdf_with_docling, profile)
             
             elif 'html' in content_type or url.endswith('.html'):
                 # Processar página web
@@ -153,28 +345,79 @@ class RAGProcessor:
                 # Tentar download genérico
                 file_response = requests.get(url, timeout=30)
                 filename = os.path.basename(urlparse(url).path) or "downloaded_file"
-                return self._process_bytes(file_response.content, filename, doc_id, timestamp)
+                return self._process_cached(file_response.content, filename, doc_id, timestamp,
+                                            self._process_bytes, profile)
                 
         except Exception as e:
             logger.error(f"❌ Error processing URL {url}: {e}")
             raise
     
-    def _process_file(self, file_path: str, doc_id: str, timestamp: str) -> Dict:
+    def _process_file(self, file_path: str, doc_id: str, timestamp: str, profile: Optional[str] = None) -> Dict:
         """Processar arquivo local"""
         path = Path(file_path)
         
         with open(path, 'rb') as f:
             content = f.read()
         
-        return self._process_bytes(content, path.name, doc_id, timestamp)
+        return self._process_cached(content, path.name, doc_id, timestamp, self._process_bytes, profile)
     
-    def _process_bytes(self, content: bytes, filename: str, doc_id: str, timestamp: str) -> Dict:
+    def _process_cached(self, content: bytes, filename: str, doc_id: str, timestamp: str, processor,
+                        profile: Optional[str] = None) -> Dict:
+        """
+        Consultar o cache por hash de conteúdo antes de processar
+        
+        Num acerto, devolve o resultado completo salvo em metadata/processing_{doc_id}.json
+        do documento original (mesmos arquivos, sem nova extração).
+        """
+        content_hash = hash_bytes(content)
+        options = {"ext": Path(filename).suffix.lower(), "processor": processor.__name__}
+        if options["ext"] == '.pdf' or processor == self._process_pdf_with_docling:
+            options["profile"] = profile or self.default_profile
+        cache_key = IngestionCache.make_key(content_hash, self.EXTRACTOR_VERSION, options)
+        
+        entry = self.cache.get(cache_key)
+        if entry:
+            metadata_file = self.metadata_dir / f"processing_{entry['doc_id']}.json"
+            try:
+                with open(metadata_file, 'r', encoding='utf-8') as f:
+                    cached_result = json.load(f)
+                logger.info(f"♻️ Cache hit for {filename}: reusing {entry['doc_id']}")
+                return dict(cached_result, cached=True)
+            except (OSError, ValueError):
+                # Artefatos do documento original não existem mais
+                self.cache.invalidate(cache_key)
+        
+        result = processor(content, filename, doc_id, timestamp, profile=profile)
+        result.update(cache_key=cache_key, content_hash=content_hash, cache_options=options,
+                      source_size=len(content))
+        return result
+    
+    def _remember_result(self, result: Dict):
+        """Registrar um processamento bem-sucedido no cache de ingestão"""
+        files = result.get("files_saved", {})
+        size_bytes = result.get("source_size", 0) + artifacts_size(
+            list(files.values()) + [str(self.metadata_dir / f"processing_{result['doc_id']}.json")]
+        )
+        
+        self.cache.put(
+            result["cache_key"], result["content_hash"], result["doc_id"],
+            {"doc_id": result["doc_id"], "filename": result.get("filename"), "files_saved": files},
+            size_bytes=size_bytes, extractor_version=self.EXTRACTOR_VERSION,
+            options=result.get("cache_options")
+        )
+    
+    def get_cache_stats(self) -> Dict:
+        """Estatísticas do cache de ingestão"""
+        return self.cache.get_stats()
+    
+    def _process_bytes(self, content: bytes, filename: str, doc_id: str, timestamp: str,
+                       profile: Optional[str] = None) -> Dict:
         """Processar conteúdo em bytes baseado na extensão"""
         ext = Path(filename).suffix.lower()
         
         # Roteamento baseado em extensão
         if ext == '.pdf':
-            return self._process_pdf_with_docling(content, filename, doc_id, timestamp)
+            return self._process_pdf_with_docling(content, filename, doc_id, timestamp, profile)
         elif ext in ['.docx', '.doc']:
             return self._process_docx(content, filename, doc_id, timestamp)
         elif ext in ['.xlsx', '.xls']:
@@ -191,19 +434,52 @@ class RAGProcessor:
             # Fallback: tentar processar como texto
             return self._process_unknown(content, filename, doc_id, timestamp)
     
-    def _process_pdf_with_docling(self, content: bytes, filename: str, doc_id: str, timestamp: str) -> Dict:
+    def _has_text_layer(self, content: bytes) -> bool:
+        """Verifica (nas primeiras páginas) se o PDF tem camada de texto, sem renderizar nada"""
+        try:
+            with pdfplumber.open(io.BytesIO(content)) as pdf:
+                pages = pdf.pages[:TEXT_LAYER_SAMPLE_PAGES]
+                if not pages:
+                    return False
+                
+                pages_with_text = 0
+                for page in pages:
+                    if len((page.extract_text() or "").strip()) >= TEXT_LAYER_MIN_CHARS:
+                        pages_with_text += 1
+                    page.close()
+                
+                # Maioria das páginas amostradas com texto nativo
+                return pages_with_text * 2 > len(pages)
+        except Exception as e:
+            logger.warning(f"⚠️ Text layer detection failed: {e}")
+            return False
+    
+    def resolve_profile(self, content: bytes, profile: Optional[str] = None) -> str:
+        """Perfil efetivo para um PDF ("auto" vira balanced ou full conforme a camada de texto)"""
+        profile = profile or self.default_profile
+        if profile == "auto":
+            return AUTO_PROFILE_WITH_TEXT if self._has_text_layer(content) else AUTO_PROFILE_WITHOUT_TEXT
+        return profile
+    
+    def _process_pdf_with_docling(self, content: bytes, filename: str, doc_id: str, timestamp: str,
+                                  profile: Optional[str] = None) -> Dict:
         """Processar PDF usando Docling (método principal)"""
         try:
-            if not self.converter:
+            profile = self.resolve_profile(content, profile)
+            converter = self.get_converter(profile)
+            
+            if not converter:
                 # Fallback para pdfplumber se Docling não estiver disponível
                 return self._process_pdf_fallback(content, filename, doc_id, timestamp)
             
+            from docling.datamodel.base_models import DocumentStream
+            
             # Criar stream do documento
             buf = io.BytesIO(content)
             source = DocumentStream(name=filename, stream=buf)
             
             # Converter com Docling
-            result = self.converter.convert(source)
+            result = converter.convert(source)
             
             if result.status.success:
                 doc = result.document
@@ -246,6 +522,7 @@ class RAGProcessor:
                     "filename": filename,
                     "timestamp": timestamp,
                     "processing_method": "docling_advanced",
+                    "pipeline_profile": profile,
                     "markdown_content": markdown_content,
                     "json_content": json_content,
                     "chunks": chunks,
@@ -514,34 +791,38 @@ class RAGProcessor:
             logger.error(f"❌ PowerPoint processing failed: {e}")
             raise
     
+    def process_images(self, images: List[tuple]) -> List[Dict]:
+        """
+        Processar uma rajada de imagens (ex.: páginas digitalizadas) com OCR em lote
+        
+        O OCR de todas as imagens novas roda de uma vez (EasyOCR em lotes ou Tesseract
+        em vários processos); em seguida cada imagem segue o caminho normal de
+        process_source, que encontra o texto no cache de OCR.
+        
+        Args:
+            images: Lista de (bytes, nome do arquivo)
+        
+        Returns:
+            List[Dict]: Um resultado de process_source por imagem, na mesma ordem
+        """
+        if self.pool is not None:
+            # Um lote por worker, cada um com o EasyOCR já carregado
+            batch_size = -(-len(images) // self.warm_workers) or 1
+            futures = [self.pool.submit(_process_images_in_worker, images[i:i + batch_size])
+                       for i in range(0, len(images), batch_size)]
+            return [result for future in futures for result in future.result()]
+        
+        self.batch_ocr.recognize_many([content for content, _ in images])
+        return [self.process_source(content, filename=filename) for content, filename in images]
+    
     def _process_image(self, content: bytes, filename: str, doc_id: str, timestamp: str) -> Dict:
         """Processar imagens com OCR"""
         try:
             # Abrir imagem
             image = Image.open(io.BytesIO(content))
             
-            # OCR com EasyOCR (preferido) ou Tesseract
-            text_content = ""
-            
-            if self.ocr_reader:
-                try:
-                    # EasyOCR
-                    results = self.ocr_reader.readtext(content)
-                    text_content = "\n".join([result[1] for result in results])
-                    ocr_method = "easyocr"
-                except Exception as e:
-                    logger.warning(f"EasyOCR failed: {e}")
-                    text_content = "OCR falhou"
-                    ocr_method = "failed"
-            else:
-                try:
-                    # Tesseract fallback
-                    text_content = pytesseract.image_to_string(image, lang='por+eng')
-                    ocr_method = "tesseract"
-                except Exception as e:
-                    logger.warning(f"Tesseract failed: {e}")
-                    text_content = "OCR não disponível"
-                    ocr_method = "unavailable"
+            # OCR com EasyOCR (preferido) ou Tesseract, reaproveitando o cache por hash
+            text_content, ocr_method = self.batch_ocr.recognize(content)
             
             # Criar conteúdo markdown
             markdown_content = f"# Imagem: {filename}\n\n"
@@ -809,50 +1090,18 @@ class RAGProcessor:
     
     def _create_simple_chunks(self, text: str, doc_id: str, chunk_size: int = 1000, overlap: int = 200) -> List[Dict]:
         """Criar chunks simples para documentos não processados pelo Docling"""
-        chunks = []
-        
-        if len(text) <= chunk_size:
-            chunks.append({
-                "id": f"{doc_id}_chunk_0",
-                "text": text,
-                "metadata": {"chunk_index": 0}
-            })
-            return chunks
-        
-        start = 0
-        chunk_index = 0
-        
-        while start < len(text):
-            end = start + chunk_size
-            chunk_text = text[start:end]
-            
-            # Tentar quebrar em uma fronteira de sentença
-            if end < len(text):
-                last_period = chunk_text.rfind('.')
-                last_newline = chunk_text.rfind('\n')
-                break_point = max(last_period, last_newline)
-                
-                if break_point > start + chunk_size // 2:
-                    chunk_text = text[start:start + break_point + 1]
-                    end = start + break_point + 1
-            
-            chunks.append({
-                "id": f"{doc_id}_chunk_{chunk_index}",
-                "text": chunk_text.strip(),
+        return [
+            {
+                "id": f"{doc_id}_chunk_{chunk.index}",
+                "text": chunk.text,
                 "metadata": {
-                    "chunk_index": chunk_index,
-                    "start_pos": start,
-                    "end_pos": end
+                    "chunk_index": chunk.index,
+                    "start_pos": chunk.start,
+                    "end_pos": chunk.end
                 }
-            })
-            
-            start = end - overlap if end < len(text) else end
-            chunk_index += 1
-            
-            if start >= len(text):
-                break
-        
-        return chunks
+            }
+            for chunk in TextChunker(chunk_size, overlap).iter_chunks(text)
+        ]
     
     def _table_to_markdown(self, table_data: List[List[str]]) -> str:
         """Converter tabela para formato Markdown"""
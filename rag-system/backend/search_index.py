@@ -0,0 +1,259 @@
+"""
+Índice Invertido Persistente - Busca BM25 para o Sistema RAG
+
+Mantém um índice invertido (termo -> postings com chunk e frequência do termo)
+em SQLite, atualizado incrementalmente a cada documento adicionado ou removido.
+A consulta lê apenas os postings dos termos pesquisados, então a latência não
+depende do número de documentos carregados.
+"""
+
+import heapq
+import math
+import re
+import sqlite3
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Union
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+# Resultados por consulta quando o limite não é informado
+DEFAULT_LIMIT = 5
+
+
+def tokenize(text: str) -> List[str]:
+    """Quebra o texto em termos normalizados (minúsculas, alfanuméricos)"""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class InvertedIndex:
+    """
+    Índice invertido em SQLite com ranking BM25
+    """
+
+    def __init__(self, db_path: Union[str, Path], k1: float = 1.5, b: float = 0.75):
+        """
+        Inicializa o índice
+
+        Args:
+            db_path: Caminho do arquivo SQLite do índice
+            k1: Saturação da frequência do termo (BM25)
+            b: Normalização pelo tamanho do chunk (BM25)
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.k1 = k1
+        self.b = b
+
+        self.init_database()
+
+        # Estatísticas globais mantidas em memória (N e soma dos tamanhos)
+        with sqlite3.connect(self.db_path) as conn:
+            total_chunks, total_length = conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(length), 0) FROM index_chunks'
+            ).fetchone()
+        self.total_chunks = total_chunks
+        self.total_length = total_length
+
+    def init_database(self):
+        """Cria as tabelas do índice se não existirem"""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+
+            # Um registro por chunk indexado
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS index_chunks (
+                    chunk_key INTEGER PRIMARY KEY AUTOINCREMENT,
+                    doc_id TEXT NOT NULL,
+                    chunk_index INTEGER NOT NULL,
+                    length INTEGER NOT NULL,
+                    text TEXT
+                )
+            ''')
+
+            # Postings: termo -> chunk com frequência do termo
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS index_postings (
+                    term TEXT NOT NULL,
+                    chunk_key INTEGER NOT NULL,
+                    tf INTEGER NOT NULL,
+                    PRIMARY KEY (term, chunk_key)
+                ) WITHOUT ROWID
+            ''')
+
+            # Índices para remoção por documento
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_index_chunks_doc_id ON index_chunks(doc_id)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_index_postings_chunk_key ON index_postings(chunk_key)')
+
+            conn.commit()
+
+    def add_document(self, doc_id: str, chunks: List[str]) -> int:
+        """
+        Indexa os chunks de um documento (substitui a versão anterior, se houver)
+
+        Args:
+            doc_id: ID do documento
+            chunks: Lista de textos dos chunks, na ordem do documento
+
+        Returns:
+            int: Número de chunks indexados
+        """
+        self.remove_document(doc_id)
+        return self.add_chunks(doc_id, chunks)
+
+    def add_chunks(self, doc_id: str, chunks: List[str], start_index: int = 0) -> int:
+        """
+        Acrescenta chunks a um documento já indexado (ingestão incremental)
+
+        Args:
+            doc_id: ID do documento
+            chunks: Textos dos novos chunks, na ordem do documento
+            start_index: Posição do primeiro chunk no documento
+
+        Returns:
+            int: Número de chunks indexados
+        """
+        indexed = 0
+        added_length = 0
+
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+
+            for chunk_index, chunk in enumerate(chunks, start_index):
+                terms = tokenize(chunk)
+                if not terms:
+                    continue
+
+                cursor.execute(
+                    'INSERT INTO index_chunks (doc_id, chunk_index, length, text) VALUES (?, ?, ?, ?)',
+                    (doc_id, chunk_index, len(terms), chunk)
+                )
+                chunk_key = cursor.lastrowid
+
+                cursor.executemany(
+                    'INSERT INTO index_postings (term, chunk_key, tf) VALUES (?, ?, ?)',
+                    [(term, chunk_key, tf) for term, tf in Counter(terms).items()]
+                )
+
+                indexed += 1
+                added_length += len(terms)
+
+            conn.commit()
+
+        self.total_chunks += indexed
+        self.total_length += added_length
+        return indexed
+
+    def remove_document(self, doc_id: str) -> int:
+        """
+        Remove todos os chunks e postings de um documento
+
+        Returns:
+            int: Número de chunks removidos
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+
+            removed, removed_length = cursor.execute(
+                'SELECT COUNT(*), COALESCE(SUM(length), 0) FROM index_chunks WHERE doc_id = ?',
+                (doc_id,)
+            ).fetchone()
+
+            if removed:
+                cursor.execute('''
+                    DELETE FROM index_postings WHERE chunk_key IN
+                    (SELECT chunk_key FROM index_chunks WHERE doc_id = ?)
+                ''', (doc_id,))
+                cursor.execute('DELETE FROM index_chunks WHERE doc_id = ?', (doc_id,))
+                conn.commit()
+
+        self.total_chunks -= removed
+        self.total_length -= removed_length
+        return removed
+
+    def clear(self):
+        """Remove todo o conteúdo do índice"""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute('DELETE FROM index_postings')
+            conn.execute('DELETE FROM index_chunks')
+            conn.commit()
+
+        self.total_chunks = 0
+        self.total_length = 0
+
+    def search(self, query: str, limit: Optional[int] = DEFAULT_LIMIT) -> List[Dict[str, Any]]:
+        """
+        Busca chunks pelo ranking BM25
+
+        Args:
+            query: Texto da consulta
+            limit: Número máximo de resultados (None usa DEFAULT_LIMIT)
+
+        Returns:
+            List[Dict]: Resultados com doc_id, chunk_index, text e score
+        """
+        if limit is None:
+            limit = DEFAULT_LIMIT
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or not self.total_chunks or limit <= 0:
+            return []
+
+        avg_length = self.total_length / self.total_chunks
+        placeholders = ', '.join('?' * len(terms))
+
+        with sqlite3.connect(self.db_path) as conn:
+            doc_freqs = dict(conn.execute(
+                f'SELECT term, COUNT(*) FROM index_postings WHERE term IN ({placeholders}) GROUP BY term',
+                terms
+            ).fetchall())
+
+            if not doc_freqs:
+                return []
+
+            idf = {
+                term: math.log(1 + (self.total_chunks - df + 0.5) / (df + 0.5))
+                for term, df in doc_freqs.items()
+            }
+
+            scores: Dict[int, float] = {}
+            rows = conn.execute(f'''
+                SELECT p.chunk_key, p.term, p.tf, c.length
+                FROM index_postings p JOIN index_chunks c ON c.chunk_key = p.chunk_key
+                WHERE p.term IN ({placeholders})
+            ''', terms)
+
+            for chunk_key, term, tf, length in rows:
+                norm = self.k1 * (1 - self.b + self.b * length / avg_length)
+                scores[chunk_key] = scores.get(chunk_key, 0.0) + idf[term] * tf * (self.k1 + 1) / (tf + norm)
+
+            top = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+            if not top:
+                return []
+
+            keys = [chunk_key for chunk_key, _ in top]
+            chunk_rows = conn.execute(
+                f'SELECT chunk_key, doc_id, chunk_index, text FROM index_chunks '
+                f'WHERE chunk_key IN ({", ".join("?" * len(keys))})',
+                keys
+            ).fetchall()
+
+        chunks_by_key = {row[0]: row[1:] for row in chunk_rows}
+
+        results = []
+        for chunk_key, score in top:
+            doc_id, chunk_index, text = chunks_by_key[chunk_key]
+            results.append({
+                "doc_id": doc_id,
+                "chunk_index": chunk_index,
+                "text": text,
+                "score": round(score, 4)
+            })
+
+        return results
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Estatísticas do índice"""
+        return {
+            "total_chunks": self.total_chunks,
+            "avg_chunk_length": round(self.total_length / self.total_chunks, 2) if self.total_chunks else 0,
+            "index_path": str(self.db_path)
+        }
@@ -0,0 +1,156 @@
+"""
+Parser de Legendas - VTT e SRT em passe único, a partir de texto ou de um stream
+
+O parse_vtt_content do extrator do YouTube percorria a legenda inteira em memória,
+compilava a regex de tags a cada linha e nunca fechava os cues (linhas vazias eram
+puladas antes do teste de fim de segmento). Aqui:
+
+- cada cue (tempo + texto) é reconhecido por uma única regex compilada, e streams
+  (arquivo, resposta HTTP) são lidos em blocos, sem carregar o arquivo todo;
+- cada cue termina na linha vazia ou no próximo tempo;
+- nas legendas automáticas do YouTube, que repetem a linha anterior em cada cue
+  ("rolling captions"), collapse_rolling mantém só o texto novo de cada cue
+  (desligado por padrão: em legendas manuais, cues repetidos são falas repetidas);
+- o texto completo é montado com join no fim.
+"""
+
+import html
+import io
+import re
+from typing import Any, Dict, IO, Iterator, List, Tuple, Union
+
+# 00:01:02.345 --> 00:01:04.000 (VTT, com configurações opcionais depois) ou 00:01:02,345 --> ... (SRT);
+# horas, minutos e segundos (com fração) são grupos, convertidos sem split por campo
+_TIME = r'(?:(\d+):)?(\d{1,2}):(\d{2}(?:[.,]\d{1,3})?)'
+# Um cue inteiro: linha de tempo + linhas de texto até uma linha vazia ou o próximo tempo
+CUE_PATTERN = re.compile(
+    r'^[ \t]*' + _TIME + r'[ \t]*-->[ \t]*' + _TIME + r'[^\n]*\n?'
+    r'((?:(?![^\n]*-->)[ \t]*\S[^\n]*(?:\n|$))*)',
+    re.MULTILINE
+)
+# Tags de formatação e timestamps por palavra (<c>, </c>, <00:00:01.500>, <b>, ...); nunca passam
+# de uma linha nem começam em um "<" solto do texto ("se x < 5")
+TAG_PATTERN = re.compile(r'<[A-Za-z/\d][^<>\n]*>')
+
+# Tamanho de cada leitura de um stream
+READ_SIZE = 1 << 20
+
+SubtitleSource = Union[str, bytes, IO]
+
+
+def parse_timestamp(value: str) -> float:
+    """HH:MM:SS.mmm, MM:SS.mmm ou HH:MM:SS,mmm (SRT) em segundos"""
+    parts = value.strip().replace(',', '.').split(':')
+    seconds = 0.0
+    for part in parts:
+        seconds = seconds * 60 + float(part)
+    return seconds
+
+
+def _blocks(source: SubtitleSource) -> Iterator[str]:
+    """
+    Texto da legenda em blocos que só terminam entre cues
+
+    Strings vão inteiras; streams (arquivo texto/binário, resposta HTTP do yt-dlp)
+    são lidos em pedaços de READ_SIZE, e cada bloco é cortado no início da última
+    linha de tempo lida, que fica para o bloco seguinte.
+    """
+    if isinstance(source, bytes):
+        source = source.decode('utf-8-sig', errors='replace')
+    if isinstance(source, str):
+        yield source.replace('\r\n', '\n') if '\r' in source else source
+        return
+
+    if not isinstance(source, io.TextIOBase):
+        source = io.TextIOWrapper(source, encoding='utf-8-sig', errors='replace')
+
+    pending = ''
+    while True:
+        piece = source.read(READ_SIZE)
+        if not piece:
+            break
+        if '\r' in piece:
+            piece = piece.replace('\r\n', '\n')
+        pending += piece
+
+        cut = pending.rfind('-->')
+        cut = pending.rfind('\n', 0, cut) + 1 if cut > 0 else 0
+        if cut > 0:
+            yield pending[:cut]
+            pending = pending[cut:]
+
+    if pending:
+        yield pending
+
+
+def iter_cues(source: SubtitleSource) -> Iterator[Tuple[float, float, List[str]]]:
+    """
+    Cues da legenda em ordem: (início, fim, linhas de texto já limpas)
+
+    Cabeçalho (WEBVTT), blocos NOTE/STYLE/REGION e identificadores de cue
+    (inclusive a numeração do SRT) ficam fora dos cues e são ignorados.
+    """
+    for block in _blocks(source):
+        for match in CUE_PATTERN.finditer(block):
+            start_h, start_m, start_s, end_h, end_m, end_s, text = match.groups()
+            if not text:
+                continue
+
+            # Tags e entidades saem só do texto do cue, depois de separado das linhas de tempo
+            if '<' in text:
+                text = TAG_PATTERN.sub('', text)
+            if '&' in text:
+                text = html.unescape(text)
+
+            start = int(start_m) * 60 + float(start_s.replace(',', '.'))
+            end = int(end_m) * 60 + float(end_s.replace(',', '.'))
+            if start_h:
+                start += int(start_h) * 3600
+            if end_h:
+                end += int(end_h) * 3600
+
+            lines = [line.strip() for line in text.split('\n') if line and not line.isspace()]
+            if lines:
+                yield start, end, lines
+
+
+def parse_subtitles(source: SubtitleSource, collapse_rolling: bool = False) -> Tuple[List[Dict[str, Any]], str]:
+    """
+    Segmentos e texto completo de uma legenda VTT ou SRT
+
+    Args:
+        source: Conteúdo (str/bytes), arquivo ou stream (ex.: resposta de ydl.urlopen)
+        collapse_rolling: Remove as linhas que só repetem o cue anterior; só para
+            legendas automáticas do YouTube (automatic_captions). Cues que ficam sem
+            texto novo só estendem o fim do segmento anterior
+
+    Returns:
+        (segments, full_text): segmentos no formato do extrator
+        ({'index', 'start', 'end', 'duration', 'text'}) e o texto unido por espaços
+    """
+    segments = []
+    texts = []
+    previous_lines: List[str] = []
+
+    for start, end, lines in iter_cues(source):
+        if collapse_rolling:
+            new_lines = [line for line in lines if line not in previous_lines]
+            previous_lines = lines
+            if not new_lines:
+                if segments and end > segments[-1]['end']:
+                    segments[-1]['end'] = end
+                    segments[-1]['duration'] = end - segments[-1]['start']
+                continue
+            lines = new_lines
+
+        text = ' '.join(lines)
+        segments.append({
+            'index': len(segments),
+            'start': start,
+            'end': end,
+            'duration': end - start,
+            'text': text
+        })
+        texts.append(text)
+
+    return segments, ' '.join(texts)
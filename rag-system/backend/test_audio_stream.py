@@ -0,0 +1,70 @@
+"""
+Teste do streaming de áudio (janelas PCM cortadas no trecho mais silencioso)
+"""
+
+import shutil
+import sys
+from array import array
+
+sys.path.append('.')
+
+from audio_stream import BYTES_PER_SAMPLE, SAMPLE_RATE, quiet_cut, window_pcm
+
+
+def pcm(seconds: float, silent_at=()) -> bytes:
+    """PCM s16le com ruído alto e quadros de 20 ms em silêncio nos instantes informados"""
+    samples = array('h', ((i * 7919) % 20000 - 10000 for i in range(int(seconds * SAMPLE_RATE))))
+    for at in silent_at:
+        start = int(at * SAMPLE_RATE)
+        for i in range(start, start + int(0.02 * SAMPLE_RATE)):
+            samples[i] = 0
+    if sys.byteorder == 'big':
+        samples.byteswap()
+    return samples.tobytes()
+
+
+def chunked(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+def test_audio_stream():
+    print("🧪 Testando o streaming de áudio...")
+
+    # Corte no quadro silencioso do último segundo da janela
+    audio = pcm(70, silent_at=(29.5, 59.2))
+    window_bytes = 30 * SAMPLE_RATE * BYTES_PER_SAMPLE
+    assert quiet_cut(audio, window_bytes) == int(29.5 * SAMPLE_RATE) * BYTES_PER_SAMPLE
+
+    # Leituras de tamanho arbitrário (inclusive ímpar) viram as mesmas janelas, sem perder amostras
+    windows = list(window_pcm(chunked(audio, 12345)))
+    assert [offset for offset, _ in windows] == [0.0, 29.5, 59.2]
+    assert b"".join(data for _, data in windows) == audio
+    assert all(len(data) <= window_bytes for _, data in windows)
+
+    # Áudio menor que uma janela: uma janela só
+    short = pcm(5)
+    assert list(window_pcm([short])) == [(0.0, short)]
+
+    # Sem FFmpeg no ambiente, o teste fica na divisão em janelas
+    if shutil.which('ffmpeg'):
+        import io
+        import wave
+        from audio_stream import stream_pcm_windows
+
+        buffer = io.BytesIO()
+        with wave.open(buffer, 'wb') as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(SAMPLE_RATE)
+            wav.writeframes(audio)
+        buffer.seek(0)
+        streamed = list(stream_pcm_windows(buffer))
+        assert [offset for offset, _ in streamed] == [0.0, 29.5, 59.2]
+
+    return True
+
+
+if __name__ == "__main__":
+    success = test_audio_stream()
+    print(f"\n{'✅ TESTE PASSOU' if success else '❌ TESTE FALHOU'}")
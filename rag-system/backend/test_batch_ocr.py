@@ -0,0 +1,93 @@
+"""
+Teste do OCR em lote (redução/ladrilhos e cache por hash da imagem)
+"""
+
+import io
+import sys
+import tempfile
+from pathlib import Path
+
+from PIL import Image
+
+sys.path.append('.')
+
+from batch_ocr import TILE_SIZE, BatchOCR, _pad_to_tile, prepare_image
+
+
+def png_bytes(size, color=255, dpi=None):
+    buffer = io.BytesIO()
+    image = Image.new("RGB", size, (color, color, color))
+    image.save(buffer, format="PNG", **({"dpi": dpi} if dpi else {}))
+    return buffer.getvalue()
+
+
+def test_batch_ocr():
+    print("🧪 Testando o OCR em lote...")
+
+    # Imagens pequenas passam inteiras, em escala de cinza
+    tiles = prepare_image(Image.open(io.BytesIO(png_bytes((800, 600)))))
+    assert len(tiles) == 1 and tiles[0].mode == "L" and tiles[0].size == (800, 600)
+
+    # Digitalização em 600 DPI é reduzida pela metade para 300 DPI
+    tiles = prepare_image(Image.open(io.BytesIO(png_bytes((2000, 1000), dpi=(600, 600)))), target_dpi=300)
+    assert len(tiles) == 1 and tiles[0].size == (1000, 500)
+
+    # Imagem grande vira ladrilhos de no máximo TILE_SIZE que cobrem tudo
+    tiles = prepare_image(Image.new("L", (3000, 1000), 255))
+    assert len(tiles) > 1
+    assert all(tile.width <= TILE_SIZE and tile.height <= TILE_SIZE for tile in tiles)
+
+    # Página A4 já em 300 DPI (entre TILE_SIZE e o dobro): o texto fora dos primeiros
+    # TILE_SIZE px também chega ao OCR, em algum ladrilho completado
+    page = Image.new("L", (2400, 1800), 255)
+    page.paste(0, (2000, 1500, 2100, 1550))
+    tiles = [_pad_to_tile(tile) for tile in prepare_image(page)]
+    assert len(tiles) > 1 and all(tile.size == (TILE_SIZE, TILE_SIZE) for tile in tiles)
+    assert sum(tile.histogram()[0] for tile in tiles) >= 100 * 50
+
+    # Ladrilho maior que TILE_SIZE é recusado em vez de cortado
+    try:
+        _pad_to_tile(page)
+        assert False, "ladrilho grande deveria ser recusado"
+    except ValueError:
+        pass
+
+    with tempfile.TemporaryDirectory() as tmp:
+        calls = []
+
+        def no_reader():
+            calls.append(1)
+            return None
+
+        engine = BatchOCR(Path(tmp) / "ocr_cache.db", reader_factory=no_reader)
+        first, second = png_bytes((100, 100), 10), png_bytes((100, 100), 20)
+
+        engine.cache.put_many({
+            engine.cache_key(first): ("texto um", "easyocr"),
+            engine.cache_key(second): ("texto dois", "tesseract"),
+        })
+
+        # Tudo em cache: nenhum OCR é executado e a ordem é preservada (com repetição)
+        results = engine.recognize_many([second, first, second])
+        assert results == [("texto dois", "tesseract"), ("texto um", "easyocr"), ("texto dois", "tesseract")]
+        assert engine.recognize(first) == ("texto um", "easyocr")
+        assert calls == []
+
+        # Bytes que não são imagem falham sem chamar o OCR e não entram no cache
+        assert engine.recognize(b"not an image") == ("OCR falhou", "failed")
+        assert engine.cache.get_many([engine.cache_key(b"not an image")]) == {}
+        assert calls == []
+        engine.close()
+
+        # Outra resolução (ou motor) não reaproveita o texto gravado com as configurações antigas
+        other_dpi = BatchOCR(Path(tmp) / "ocr_cache.db", reader_factory=no_reader, target_dpi=150)
+        assert other_dpi.cache_key(first) != engine.cache_key(first)
+        assert other_dpi.cache.get_many([other_dpi.cache_key(first)]) == {}
+        other_dpi.close()
+
+    return True
+
+
+if __name__ == "__main__":
+    success = test_batch_ocr()
+    print(f"\n{'✅ TESTE PASSOU' if success else '❌ TESTE FALHOU'}")
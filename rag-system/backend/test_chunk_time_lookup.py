@@ -0,0 +1,54 @@
+"""
+Teste da busca de chunks por instante no banco do extrator do YouTube (chunks sobrepostos)
+"""
+
+import contextlib
+import io
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.append('.')
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent / "youtube_extraction"))
+
+from text_chunker import TimeIndex
+
+
+def test_chunk_time_lookup():
+    print("🧪 Testando a busca de chunks por instante...")
+
+    # O extrator avisa no import sobre as dependências opcionais ausentes
+    with contextlib.redirect_stdout(io.StringIO()):
+        from youtube_extractor import YouTubeRAGExtractor
+
+    # 300 segmentos de 2 s com a sobreposição padrão: vários chunks cobrem o mesmo instante
+    segments = [{'index': i, 'text': f"trecho {i} sobre paredes e cortes", 'start': i * 2.0,
+                 'duration': 2.0, 'end': i * 2.0 + 2.0} for i in range(300)]
+    full_text = ' '.join(segment['text'] for segment in segments)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with contextlib.redirect_stdout(io.StringIO()):
+            extractor = YouTubeRAGExtractor(tmp)
+            extractor.setup_directory_structure()
+            db_path = extractor.create_database()
+            chunks = extractor.create_chunks(full_text, segments=segments)
+            assert extractor.save_to_database(db_path, "video", {}, {'segments': segments}, chunks, {})
+        extractor.db_writer.close()
+
+        index = TimeIndex.from_chunks(chunks)
+        assert any(len(index.at(t)) > 1 for t in range(600)), "os chunks deveriam se sobrepor"
+
+        instants = [i * 0.75 for i in range(800)]
+        for instant in instants:
+            found = [row['chunk_index'] for row in extractor.find_chunks_by_time(db_path, "video", instant)]
+            assert found == [chunks[i]['index'] for i in index.at(instant)], instant
+
+        found = [row['chunk_index'] for row in extractor.find_chunks_by_time(db_path, "video", 100.0, 140.0)]
+        assert found == [chunks[i]['index'] for i in index.overlapping(100.0, 140.0)]
+
+    return True
+
+
+if __name__ == "__main__":
+    success = test_chunk_time_lookup()
+    print(f"\n{'✅ TESTE PASSOU' if success else '❌ TESTE FALHOU'}")
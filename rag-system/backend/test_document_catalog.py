@@ -0,0 +1,84 @@
+"""
+Teste do catálogo persistente de documentos (SQLite)
+"""
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.append('.')
+
+from document_catalog import STATUS_PROCESSING, DocumentCatalog
+
+
+def test_document_catalog():
+    print("🧪 Testando o catálogo de documentos...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        catalog = DocumentCatalog(tmp / "catalog.db")
+        assert catalog.is_empty()
+
+        for i in range(5):
+            catalog.upsert({
+                "id": f"doc_{i}",
+                "title": f"Documento {i}",
+                "filename": f"doc_{i}.txt",
+                "chunks_count": 2,
+                "size_bytes": 100,
+                "created_at": f"2025-07-0{i + 1}T10:00:00",
+                "processing_method": "Simple Text Processing",
+                "success": True,
+                "files": {"chunks": f"data/chunks/doc_{i}.json"}
+            })
+        catalog.upsert({"id": "failed", "title": "Falhou", "error": "boom", "success": False})
+        # PDF em ingestão (primeiras páginas já indexadas): fora das listagens até completar
+        catalog.upsert({
+            "id": "partial", "title": "Parcial", "chunks_count": 1,
+            "created_at": "2025-07-09T10:00:00", "success": False, "status": STATUS_PROCESSING
+        })
+
+        # Paginação: mais recentes primeiro, sem os documentos com falha
+        page = catalog.list_documents(limit=2, offset=0)
+        assert [doc["id"] for doc in page] == ["doc_4", "doc_3"]
+        assert page[0]["files"] == {"chunks": "data/chunks/doc_4.json"}
+        assert catalog.count() == 5
+        assert len(list(catalog.iter_documents(page_size=2))) == 5
+
+        stats = catalog.get_stats()
+        print(f"📊 Estatísticas: {stats}")
+        assert stats["successful_documents"] == 5
+        assert stats["failed_documents"] == 1
+        assert stats["processing_documents"] == 1
+        assert catalog.get("partial")["status"] == STATUS_PROCESSING
+        assert [doc["id"] for doc in catalog.list_processing()] == ["partial"]
+        assert stats["total_chunks"] == 10
+
+        assert catalog.delete("doc_0")
+        assert catalog.get("doc_0") is None
+
+        # Reconstrução a partir de data/metadata
+        metadata_dir = tmp / "metadata"
+        metadata_dir.mkdir()
+        (metadata_dir / "recovered.json").write_text(json.dumps({
+            "document_id": "recovered",
+            "title": "Recuperado",
+            "filename": "recovered.txt",
+            "file_size": 42,
+            "created_at": "2025-07-10T10:00:00",
+            "chunks_count": 3,
+            "outputs": {}
+        }), encoding='utf-8')
+
+        recovered = catalog.rebuild_from_metadata(metadata_dir)
+        assert [doc["id"] for doc in recovered] == ["recovered"]
+        assert catalog.get("recovered")["chunks_count"] == 3
+        assert catalog.rebuild_from_metadata(metadata_dir) == []
+
+    return True
+
+
+if __name__ == "__main__":
+    success = test_document_catalog()
+    print(f"\n{'✅ TESTE PASSOU' if success else '❌ TESTE FALHOU'}")
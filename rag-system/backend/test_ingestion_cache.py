@@ -0,0 +1,63 @@
+"""
+Teste do cache de ingestão (deduplicação por hash de conteúdo)
+"""
+
+import io
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.append('.')
+
+from ingestion_cache import IngestionCache, copy_and_hash, hash_bytes
+
+
+def test_ingestion_cache():
+    print("🧪 Testando o cache de ingestão...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = IngestionCache(Path(tmp) / "cache.db", max_entries=2)
+
+        content = b"%PDF-1.4 manual"
+        buffer = io.BytesIO()
+        content_hash = copy_and_hash(io.BytesIO(content), buffer)
+        assert content_hash == hash_bytes(content)
+        assert buffer.getvalue() == content
+
+        # Versão do extrator e opções fazem parte da chave
+        key = IngestionCache.make_key(content_hash, "v1", {"ext": ".pdf"})
+        assert key == IngestionCache.make_key(content_hash, "v1", {"ext": ".pdf"})
+        assert key != IngestionCache.make_key(content_hash, "v2", {"ext": ".pdf"})
+        assert key != IngestionCache.make_key(content_hash, "v1", {"ext": ".txt"})
+
+        assert cache.get(key) is None
+        cache.put(key, content_hash, "doc_1", {"document_id": "doc_1"}, size_bytes=100)
+        entry = cache.get(key)
+        assert entry["doc_id"] == "doc_1"
+        assert entry["result"] == {"document_id": "doc_1"}
+
+        # LRU por número de entradas: doc_2 é o menos usado quando doc_3 estoura o limite
+        key_2 = IngestionCache.make_key("hash_2", "v1")
+        key_3 = IngestionCache.make_key("hash_3", "v1")
+        cache.put(key_2, "hash_2", "doc_2", {}, size_bytes=100)
+        cache.get(key)
+        evicted = cache.put(key_3, "hash_3", "doc_3", {}, size_bytes=100)
+        assert evicted == ["doc_2"]
+        assert cache.get(key_2) is None
+        assert cache.get(key) is not None
+
+        assert cache.remove_document("doc_1") == 1
+        assert cache.get(key) is None
+
+        stats = cache.get_stats()
+        print(f"📊 Estatísticas: {stats}")
+        assert stats["entries"] == 1
+        assert stats["evictions"] == 1
+        assert stats["hits"] == 3
+
+    return True
+
+
+if __name__ == "__main__":
+    success = test_ingestion_cache()
+    print(f"\n{'✅ TESTE PASSOU' if success else '❌ TESTE FALHOU'}")
@@ -0,0 +1,65 @@
+"""
+Teste da consulta durante a ingestão em streaming de um PDF (páginas já indexadas aparecem no /query)
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+
+# Caminho absoluto: o teste muda o diretório de trabalho antes de importar main
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_partial_ingest():
+    print("🧪 Testando /query durante a ingestão parcial...")
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        # main.py grava em ./data: instância isolada no diretório temporário
+        os.chdir(tmp)
+        try:
+            import main
+
+            assert main.catalog.is_empty(successful_only=False)
+
+            # Primeira página extraída de um PDF que ainda está sendo processado
+            main._index_partial_document(
+                "partial_doc", "Manual", "manual.pdf", main.DATA_PATH / "uploads" / "manual.pdf",
+                1000, "2025-07-01T10:00:00",
+                {"chunks": ["Wall styles and curtain walls"], "start_index": 0}
+            )
+            assert main.catalog.get("partial_doc")["status"] == main.STATUS_PROCESSING
+
+            response = asyncio.run(main.query_documents(main.QueryRequest(query="curtain walls")))
+            print(f"🔍 Resultados: {[source.metadata['document_id'] for source in response.sources]}")
+            assert [source.metadata["document_id"] for source in response.sources] == ["partial_doc"]
+
+            # Fora da listagem até completar
+            listing = asyncio.run(main.list_documents())
+            assert listing["documents"] == []
+
+            # Reinício no meio da ingestão: o documento vira falha e as saídas parciais somem
+            partial_outputs = [main.DATA_PATH / "markdown" / "partial_doc.md",
+                               main.DATA_PATH / "json" / "partial_doc.jsonl",
+                               main.DATA_PATH / "chunks" / "partial_doc.json"]
+            for path in partial_outputs:
+                path.write_text("parcial", encoding='utf-8')
+
+            main.fail_interrupted_documents()
+            doc_info = main.catalog.get("partial_doc")
+            assert not doc_info["success"] and doc_info["status"] is None and doc_info["error"]
+            assert main.catalog.list_processing() == []
+            assert main.search_index.search("curtain walls") == []
+            assert not any(path.exists() for path in partial_outputs)
+        finally:
+            os.chdir(cwd)
+            if 'main' in sys.modules:
+                sys.modules['main'].ingestion_jobs.shutdown()
+
+    return True
+
+
+if __name__ == "__main__":
+    success = test_partial_ingest()
+    print(f"\n{'✅ TESTE PASSOU' if success else '❌ TESTE FALHOU'}")
@@ -0,0 +1,59 @@
+"""
+Teste do índice invertido (BM25) usado pelo endpoint /query
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.append('.')
+
+from search_index import InvertedIndex
+
+
+def test_search_index():
+    print("🧪 Testando o índice invertido...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index = InvertedIndex(Path(tmp) / "index.db")
+
+        index.add_document("doc_a", [
+            "Floor plans AutoCAD Architecture toolset",
+            "Create wall outlines and custom walls",
+        ])
+        index.add_document("doc_b", ["Elevations and building sections"])
+
+        results = index.search("custom walls", limit=5)
+        print(f"🔍 Resultados: {results}")
+        assert results and results[0]["doc_id"] == "doc_a"
+        assert results[0]["chunk_index"] == 1
+
+        # Limite ausente ("max_results": null no /query) usa o padrão; limite zero não retorna nada
+        assert index.search("custom walls", limit=None) == results
+        assert index.search("custom walls", limit=0) == []
+
+        # Reabrir o índice preserva o conteúdo
+        reopened = InvertedIndex(Path(tmp) / "index.db")
+        assert reopened.total_chunks == 3
+        assert reopened.search("elevations")[0]["doc_id"] == "doc_b"
+
+        # Remoção atualiza postings e estatísticas
+        assert reopened.remove_document("doc_a") == 2
+        assert reopened.total_chunks == 1
+        assert reopened.search("walls") == []
+
+        # Ingestão incremental: chunks de páginas posteriores entram com o índice correto
+        reopened.add_chunks("doc_c", ["Page one sheet sets"])
+        reopened.add_chunks("doc_c", ["Page two annotation scales"], start_index=1)
+        assert reopened.search("annotation")[0]["chunk_index"] == 1
+        assert reopened.total_chunks == 3
+
+        reopened.clear()
+        assert reopened.search("elevations") == []
+
+    return True
+
+
+if __name__ == "__main__":
+    success = test_search_index()
+    print(f"\n{'✅ TESTE PASSOU' if success else '❌ TESTE FALHOU'}")
@@ -0,0 +1,120 @@
+"""
+Teste do parser de legendas (VTT/SRT, cues separados e legendas automáticas do YouTube)
+"""
+
+import io
+import sys
+
+sys.path.append('.')
+
+from subtitle_parser import parse_subtitles, parse_timestamp
+
+VTT = """WEBVTT
+Kind: captions
+
+NOTE comentário que não é legenda
+
+STYLE
+::cue { color: white }
+
+1
+00:00:01.000 --> 00:00:03.500 align:start position:0%
+<b>Primeira</b> frase &amp; mais
+
+00:00:04.000 --> 00:00:06.000
+Segunda frase
+em duas linhas
+00:00:06.000 --> 00:00:07.000
+Terceira sem linha vazia antes
+"""
+
+SRT = """1
+00:00:01,000 --> 00:00:02,500
+Olá
+
+2
+01:00:00,000 --> 01:00:01,250
+Uma hora depois
+"""
+
+# "<" literal no texto não pode engolir a linha de tempo do cue seguinte
+SRT_LESS_THAN = """1
+00:00:01,000 --> 00:00:02,000
+se x < 5
+
+2
+00:00:03,000 --> 00:00:04,000
+então y > 2 &lt;ok&gt; <i>fim</i>
+"""
+
+SRT_REPEATED = """1
+00:00:01,000 --> 00:00:02,000
+Yes.
+
+2
+00:00:02,500 --> 00:00:03,000
+Yes.
+"""
+
+# Formato das legendas automáticas: cada cue repete a linha anterior
+ROLLING_VTT = """WEBVTT
+
+00:00:00.000 --> 00:00:02.000 align:start position:0%
+hoje<00:00:00.500><c> vamos</c><00:00:01.000><c> falar</c>
+
+00:00:02.000 --> 00:00:02.010 align:start position:0%
+hoje vamos falar
+
+
+00:00:02.010 --> 00:00:04.000 align:start position:0%
+hoje vamos falar
+sobre<00:00:02.500><c> chunks</c>
+
+00:00:04.000 --> 00:00:04.010 align:start position:0%
+sobre chunks
+
+"""
+
+
+def test_subtitle_parser():
+    print("🧪 Testando o parser de legendas...")
+
+    assert parse_timestamp("01:02:03.500") == 3723.5
+    assert parse_timestamp("02:03,250") == 123.25
+
+    # VTT: cabeçalho, NOTE, STYLE e identificadores ignorados; cada cue vira um segmento
+    segments, full_text = parse_subtitles(VTT)
+    assert [s['text'] for s in segments] == [
+        "Primeira frase & mais", "Segunda frase em duas linhas", "Terceira sem linha vazia antes"
+    ]
+    assert segments[0]['start'] == 1.0 and segments[0]['end'] == 3.5 and segments[0]['duration'] == 2.5
+    assert [s['index'] for s in segments] == [0, 1, 2]
+    assert full_text == "Primeira frase & mais Segunda frase em duas linhas Terceira sem linha vazia antes"
+
+    # SRT com vírgula nos milissegundos, também a partir de um stream binário
+    segments, full_text = parse_subtitles(io.BytesIO(SRT.encode('utf-8')))
+    assert [(s['start'], s['end'], s['text']) for s in segments] == [(1.0, 2.5, "Olá"), (3600.0, 3601.25, "Uma hora depois")]
+
+    segments, full_text = parse_subtitles(SRT_LESS_THAN)
+    assert [(s['start'], s['text']) for s in segments] == [(1.0, "se x < 5"), (3.0, "então y > 2 <ok> fim")]
+    assert "00:00" not in full_text
+
+    # Legendas automáticas: cada frase aparece uma vez; cues repetidos estendem o anterior
+    segments, full_text = parse_subtitles(ROLLING_VTT, collapse_rolling=True)
+    assert full_text == "hoje vamos falar sobre chunks"
+    assert [(s['start'], s['end']) for s in segments] == [(0.0, 2.01), (2.01, 4.01)]
+
+    # Sem colapsar (padrão, legendas manuais), as repetições ficam
+    segments, full_text = parse_subtitles(ROLLING_VTT)
+    assert len(segments) == 4 and full_text.count("hoje vamos falar") == 3
+
+    # Falas repetidas de propósito em uma legenda manual não são fundidas
+    segments, full_text = parse_subtitles(SRT_REPEATED)
+    assert [s['text'] for s in segments] == ["Yes.", "Yes."] and full_text == "Yes. Yes."
+
+    return True
+
+
+if __name__ == "__main__":
+    success = test_subtitle_parser()
+    print(f"\n{'✅ TESTE PASSOU' if success else '❌ TESTE FALHOU'}")
@@ -0,0 +1,56 @@
+"""
+Teste do classificador de linhas usado na detecção de tabelas do FinalPDFExtractor
+"""
+
+import sys
+
+sys.path.append('.')
+
+from rag_extractor import (
+    FinalPDFExtractor, TAG_BULLET, TAG_EMPTY, TAG_TABLE_END, TAG_TABLE_HEADER,
+    TAG_TASK, TAG_TIME_PAIR, classify_text, find_table_start, task_name_from_tags
+)
+
+PAGE_TEXT = "\n".join([
+    "Design task 2",
+    "",
+    "Elevations AutoCAD Architecture toolset",
+    "Create project geometry from floor plans 45:00 1:00",
+    "• Bullet point",
+    "(Figures shown in minutes and seconds)",
+])
+
+
+def test_table_detection():
+    print("🧪 Testando o classificador de linhas...")
+
+    lines, tags = classify_text(PAGE_TEXT)
+    assert len(lines) == 6
+    assert tags[1] == TAG_EMPTY
+    assert tags[2] & TAG_TABLE_HEADER and tags[2] & TAG_TASK
+    assert tags[3] & TAG_TIME_PAIR
+    assert tags[4] & TAG_BULLET
+    assert tags[5] & TAG_TABLE_END
+    assert find_table_start(tags) == 2
+    assert task_name_from_tags(tags[2]) == "Elevations"
+
+    extractor = FinalPDFExtractor(output_dir="./rag_outputs")
+
+    # Página inteira numa única "linha" (como no pipeline): tabela conhecida
+    table = extractor.extract_table_from_text(PAGE_TEXT, 8)
+    print(f"📊 Tabela: {table[0]} + {len(table) - 1} linhas")
+    assert table[0] == ["Elevations", "AutoCAD", "Architecture toolset"]
+    assert len(table) == 6
+
+    # Linhas de dados com padrões compilados
+    assert extractor.parse_table_row("Complete   elevations 120:00 40:00") == ["Complete elevations", "120:00", "40:00"]
+    assert extractor.parse_table_row("Add schedule to floor plan drawing N/A 01:00")[1] == "N/A"
+    assert extractor.parse_table_row("Time savings with the toolset 79%") == ["Time savings with the toolset", "", "79%"]
+    assert extractor.parse_table_row("Sem dados") is None
+
+    return True
+
+
+if __name__ == "__main__":
+    success = test_table_detection()
+    print(f"\n{'✅ TESTE PASSOU' if success else '❌ TESTE FALHOU'}")
@@ -0,0 +1,89 @@
+"""
+Teste do chunker por offsets compartilhado pelos extratores
+"""
+
+import re
+import sys
+
+sys.path.append('.')
+
+from text_chunker import SegmentChunker, TextChunker, TimeIndex, chunk_text
+
+
+def test_text_chunker():
+    print("🧪 Testando o chunker de texto...")
+
+    paragraphs = []
+    for i in range(40):
+        heading = f"## Seção {i}\n\n" if i % 5 == 0 else ""
+        paragraphs.append(heading + " ".join(f"Frase {i}.{j} com algumas palavras de teste." for j in range(6)))
+    text = "\n\n".join(paragraphs)
+
+    # Caracteres: respeita o orçamento, corta em fronteiras e os offsets apontam para o texto original
+    chunks = TextChunker(500, 100).chunk(text)
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 500 for chunk in chunks)
+    assert all(chunk.text == text[chunk.start:chunk.end] == chunk.text.strip() for chunk in chunks)
+    assert all(chunk.text[-1] in ".0123456789" for chunk in chunks[:-1])
+    assert [chunk.index for chunk in chunks] == list(range(len(chunks)))
+    assert chunks[-1].end == len(text.rstrip())
+
+    # Títulos markdown abrem um chunk novo quando cabem na janela
+    assert any(chunk.text.startswith("## Seção") for chunk in chunks[1:])
+
+    # Palavras: janelas fixas com sobreposição exata
+    words = TextChunker(50, 10, unit="word", boundaries=False).chunk(text)
+    assert all(chunk.word_count == 50 for chunk in words[:-1])
+    for previous, current in zip(words, words[1:]):
+        assert len(text[current.start:previous.end].split()) == 10
+
+    # Tokens: qualquer função texto -> offsets serve de tokenizer
+    def tokenizer(value):
+        return [match.span() for match in re.finditer(r'\w+|[^\w\s]', value)]
+
+    tokens = TextChunker(30, 5, unit="token", tokenizer=tokenizer)
+    for chunk in tokens.chunk(text):
+        assert len(tokenizer(chunk.text)) <= 30
+
+    # Vários documentos de uma vez dão o mesmo resultado que um por um
+    documents = [text, "Curto.", "", text[:700]]
+    many = tokens.chunk_many(documents)
+    assert [[(c.start, c.end) for c in doc] for doc in many] == \
+        [[(c.start, c.end) for c in tokens.chunk(doc)] for doc in documents]
+    assert many[2] == []
+
+    # Casos de borda
+    assert [chunk.text for chunk in chunk_text("Olá mundo. Tudo bem? Sim.", 12, 3)] == ["Olá mundo.", "Tudo bem?", "Sim."]
+    assert chunk_text("   ", 10, 2) == []
+    assert len(TextChunker(100, 20, max_chunks=3).chunk(text)) == 3
+
+    # Segmentos: chunks com segmentos inteiros, tempos de início/fim e índice por tempo
+    segments = [{'text': f"trecho {i}" + ("." if i % 4 == 3 else ""), 'start': i * 2.0, 'duration': 2.0}
+                for i in range(200)]
+    timed = SegmentChunker(120, 30).chunk(segments)
+    assert timed[0].first_segment == 0 and timed[-1].last_segment == 199
+    for previous, current in zip(timed, timed[1:]):
+        assert previous.first_segment < current.first_segment <= previous.last_segment + 1
+    for chunk in timed:
+        assert chunk.start_time == segments[chunk.first_segment]['start']
+        assert chunk.end_time == segments[chunk.last_segment]['start'] + 2.0
+        assert chunk.text.startswith(f"trecho {chunk.first_segment}")
+
+    index = TimeIndex.from_chunks(timed)
+    for instant in (0.0, 57.3, 250.0, 399.9):
+        expected = [c.index for c in timed if c.start_time <= instant <= c.end_time]
+        assert index.at(instant) == expected and expected
+    assert index.overlapping(100.0, 140.0) == [c.index for c in timed if c.end_time >= 100.0 and c.start_time <= 140.0]
+    assert index.at(1000.0) == []
+
+    # Só por duração (como os chunks de vídeo de 30 s)
+    by_time = SegmentChunker(None, max_duration=30).chunk(segments)
+    assert all(segments[c.last_segment]['start'] - c.start_time <= 30 for c in by_time)
+    assert sum(c.last_segment - c.first_segment + 1 for c in by_time) == len(segments)
+
+    return True
+
+
+if __name__ == "__main__":
+    success = test_text_chunker()
+    print(f"\n{'✅ TESTE PASSOU' if success else '❌ TESTE FALHOU'}")
@@ -0,0 +1,53 @@
+"""
+Teste da segmentação por voz (cortes nas pausas, trechos sem voz descartados)
+"""
+
+import sys
+
+sys.path.append('.')
+
+from vad_segmenter import FRAME_SECONDS, MAX_SEGMENT_SECONDS, plan_segments, segment_pcm
+
+
+def energy(spec):
+    """Energia por quadro: ('v', segundos) de voz ou ('s', segundos) de silêncio"""
+    rms = []
+    for kind, seconds in spec:
+        rms += [1000.0 if kind == 'v' else 10.0] * round(seconds / FRAME_SECONDS)
+    return rms
+
+
+def test_vad_segmenter():
+    print("🧪 Testando a segmentação por voz...")
+
+    # 5 s de silêncio, frases de 9,5 s com pausas de 0,5 s, 30 s sem voz, 90 s de fala contínua
+    rms = energy([('s', 5)] + [('v', 9.5), ('s', 0.5)] * 8 + [('s', 30), ('v', 90), ('s', 3)])
+    segments = plan_segments(rms)
+
+    # Ordem, sem sobreposição e nenhum trecho acima do limite
+    assert all(end <= next_start for (_, end), (next_start, _) in zip(segments, segments[1:]))
+    assert all(end - start <= MAX_SEGMENT_SECONDS for start, end in segments)
+
+    # Cortes no meio das pausas, silêncio das pontas descartado (com margem de 0,2 s)
+    assert abs(segments[0][0] - 4.8) < 0.3 and abs(segments[0][1] - 54.75) < 0.3
+    assert abs(segments[1][1] - 84.8) < 0.3
+
+    # Os 30 s sem voz não são transcritos; a fala contínua é cortada à força perto do limite
+    assert not any(86 < start < 114 for start, _ in segments)
+    assert abs(segments[2][0] - 114.8) < 0.3 and len(segments) == 4
+    assert abs(segments[-1][1] - 205.2) < 0.3
+
+    # Só silêncio: nada para transcrever
+    assert plan_segments(energy([('s', 120)])) == []
+
+    # Recorte do PCM alinhado às amostras, com o início de cada trecho
+    pcm = bytes(range(256)) * 1000
+    pieces = segment_pcm(pcm, [(0.0, 1.0), (2.5, 3.0)], sample_rate=1000)
+    assert pieces[0] == (0.0, pcm[:2000]) and pieces[1] == (2.5, pcm[5000:6000])
+
+    return True
+
+
+if __name__ == "__main__":
+    success = test_vad_segmenter()
+    print(f"\n{'✅ TESTE PASSOU' if success else '❌ TESTE FALHOU'}")
@@ -0,0 +1,61 @@
+"""
+Teste do pool do Whisper (cache LRU de modelos residentes e fila de transcrições)
+"""
+
+import sys
+
+sys.path.append('.')
+
+from whisper_pool import MODEL_MEMORY_MB, TranscriptionPool, WhisperModelCache, get_model_cache
+
+
+class LoadedModel:
+    """Modelo já carregado (o teste não depende do pacote whisper)"""
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = []
+
+    def transcribe(self, audio_path, **options):
+        self.calls.append((audio_path, options))
+        return {"text": f"{self.name}: {audio_path}", "segments": [], "language": options.get("language")}
+
+
+def test_whisper_pool():
+    print("🧪 Testando o pool do Whisper...")
+
+    # Cabem "tiny" + "base"; "small" exige despejar o menos usado
+    cache = WhisperModelCache(max_memory_mb=MODEL_MEMORY_MB["small"] + MODEL_MEMORY_MB["base"])
+    cache.models[("tiny", "cpu")] = LoadedModel("tiny")
+    cache.models[("base", "cpu")] = LoadedModel("base")
+
+    # Acesso ao "tiny" o torna o mais recente
+    assert cache.get("tiny").name == "tiny"
+    assert cache.hits == 1 and cache.loads == 0
+
+    cache._evict_for(MODEL_MEMORY_MB["small"])
+    assert list(cache.models) == [("tiny", "cpu")]
+    assert cache.evictions == 1
+
+    # Modelo maior que o limite inteiro: esvazia o cache
+    cache._evict_for(MODEL_MEMORY_MB["large"])
+    assert not cache.models and cache.memory_mb() == 0
+
+    # Pool no próprio processo reaproveita o modelo residente para toda a fila
+    model = LoadedModel("base")
+    get_model_cache().models[("base", "cpu")] = model
+    pool = TranscriptionPool(workers=0, device="cpu")
+
+    assert pool.transcribe("a.mp3", "base", language="pt")["text"] == "base: a.mp3"
+    results = dict(pool.transcribe_many([("b.mp3", "base"), ("c.mp3", "base")], language="pt"))
+    assert results["b.mp3"]["model_size"] == "base" and results["c.mp3"]["language"] == "pt"
+    assert [call[0] for call in model.calls] == ["a.mp3", "b.mp3", "c.mp3"]
+    assert get_model_cache().loads == 0
+    pool.close()
+
+    return True
+
+
+if __name__ == "__main__":
+    success = test_whisper_pool()
+    print(f"\n{'✅ TESTE PASSOU' if success else '❌ TESTE FALHOU'}")
@@ -0,0 +1,54 @@
+"""
+Teste do ZIP em streaming usado pelos endpoints de exportação
+"""
+
+import io
+import sys
+import tempfile
+import zipfile
+from pathlib import Path
+
+sys.path.append('.')
+
+from zip_stream import ZipEntry, ZipStream, parse_range_header
+
+
+def test_zip_stream():
+    print("🧪 Testando o ZIP em streaming...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        text_file = Path(tmp) / "doc.md"
+        text_file.write_text("# Documento\n\n" + "conteúdo repetido\n" * 5000, encoding='utf-8')
+        image_file = Path(tmp) / "image.png"
+        image_file.write_bytes(b"\x89PNG" + bytes(range(256)) * 10)
+
+        def entries():
+            yield ZipEntry(arcname="markdown/doc.md", path=str(text_file))
+            yield ZipEntry(arcname="images/image.png", path=str(image_file))
+            yield ZipEntry(arcname="metadata.json", data=b'{"id": "doc"}', date_time=(2025, 7, 9, 10, 0, 0))
+
+        stream = ZipStream(entries)
+        archive = b''.join(stream)
+
+        with zipfile.ZipFile(io.BytesIO(archive)) as zip_file:
+            assert zip_file.testzip() is None
+            infos = {info.filename: info for info in zip_file.infolist()}
+            assert infos["markdown/doc.md"].compress_type == zipfile.ZIP_DEFLATED
+            assert infos["images/image.png"].compress_type == zipfile.ZIP_STORED
+            assert zip_file.read("metadata.json") == b'{"id": "doc"}'
+
+        # Saída determinística: intervalos regenerados batem com o arquivo completo
+        assert stream.size() == len(archive)
+        assert b''.join(ZipStream(entries).iter_range(100, 999)) == archive[100:1000]
+        assert ZipStream(entries).etag == stream.etag
+
+    assert parse_range_header("bytes=10-", 100) == (10, 99)
+    assert parse_range_header("bytes=-10", 100) == (90, 99)
+    assert parse_range_header("bytes=100-", 100) is None
+
+    return True
+
+
+if __name__ == "__main__":
+    success = test_zip_stream()
+    print(f"\n{'✅ TESTE PASSOU' if success else '❌ TESTE FALHOU'}")
@@ -0,0 +1,432 @@
+"""
+Chunker de Texto - Motor único de chunking por offsets
+
+Cada extrator tinha seu próprio chunker (RAGProcessor, EnhancedAI, YouTube,
+web scrapers), todos copiando substrings e juntando listas de palavras a cada
+passo, e cada um medindo o tamanho de um jeito (caracteres, palavras, tokens).
+
+Aqui um chunk é só um par de offsets (start, end) sobre o texto original; o
+texto só é copiado quando Chunk.text é lido. O orçamento pode ser em
+caracteres, palavras ou tokens de um tokenizer, e o corte prefere, nesta
+ordem, início de título markdown, fim de parágrafo, fim de frase e espaço
+entre palavras. chunk_many processa vários documentos de uma vez (com
+tokenizer, todos são tokenizados numa única chamada).
+
+Para transcrições, SegmentChunker monta os chunks a partir dos segmentos
+(sem cortar nenhum) e guarda o tempo de início/fim de cada chunk; TimeIndex
+responde "quais chunks cobrem este instante/faixa" com busca binária.
+"""
+
+import bisect
+import re
+from functools import lru_cache
+from typing import Any, Iterator, List, Optional, Sequence, Tuple
+
+UNITS = ("char", "word", "token")
+
+WORD_PATTERN = re.compile(r'\S+')
+WHITESPACE_PATTERN = re.compile(r'\s')
+
+# Fronteiras procuradas (com rfind) na janela de cada chunk, da preferida para a menos
+# preferida: (marcador, deslocamento do corte a partir do início do marcador)
+HEADING_BREAKS = (('\n#', 1),)
+PARAGRAPH_BREAKS = (('\n\n', 2),)
+SENTENCE_BREAKS = (('. ', 1), ('! ', 1), ('? ', 1), ('\n', 1))
+BOUNDARY_LEVELS = (HEADING_BREAKS, PARAGRAPH_BREAKS, SENTENCE_BREAKS)
+
+
+@lru_cache(maxsize=None)
+def _words_pattern(count: int, keep: int):
+    """
+    Casa exatamente count palavras a partir da posição (termina no fim da última);
+    o grupo "next" termina no início da palavra keep + 1 (início do próximo chunk)
+    """
+    if keep == count:
+        return re.compile(r'(?P<next>\s*(?:\S+\s+){%d}\S+)' % (count - 1))
+    return re.compile(r'(?P<next>\s*(?:\S+\s+){%d})(?:\S+\s+){%d}\S+' % (keep, count - keep - 1))
+
+
+class Chunk:
+    """
+    Trecho [start, end) de um texto; o conteúdo é materializado sob demanda
+    """
+
+    __slots__ = ("source", "index", "start", "end")
+
+    def __init__(self, source: str, index: int, start: int, end: int):
+        self.source = source
+        self.index = index
+        self.start = start
+        self.end = end
+
+    @property
+    def text(self) -> str:
+        return self.source[self.start:self.end]
+
+    @property
+    def char_count(self) -> int:
+        return self.end - self.start
+
+    @property
+    def word_count(self) -> int:
+        return sum(1 for _ in WORD_PATTERN.finditer(self.source, self.start, self.end))
+
+    def __len__(self) -> int:
+        return self.end - self.start
+
+    def __repr__(self) -> str:
+        return f"Chunk(index={self.index}, start={self.start}, end={self.end})"
+
+
+class TextChunker:
+    """
+    Divide textos em chunks com orçamento em caracteres, palavras ou tokens
+    """
+
+    def __init__(self, chunk_size: int = 1000, overlap: int = 200, unit: str = "char",
+                 tokenizer: Optional[Any] = None, boundaries: bool = True, min_fill: float = 0.5,
+                 max_chunks: Optional[int] = None):
+        """
+        Args:
+            chunk_size: Tamanho máximo do chunk, na unidade escolhida
+            overlap: Sobreposição entre chunks consecutivos, na mesma unidade
+            unit: "char", "word" ou "token"
+            tokenizer: Para unit="token": tokenizer rápido do HuggingFace (usa offset_mapping)
+                ou função texto -> lista de (início, fim) de cada token
+            boundaries: Cortar em títulos/parágrafos/frases quando possível
+            min_fill: Fração mínima do orçamento antes de aceitar um corte em fronteira
+            max_chunks: Limite de chunks por texto (None = sem limite)
+        """
+        if unit not in UNITS:
+            raise ValueError(f"Unknown chunk unit: {unit}")
+        if unit == "token" and tokenizer is None:
+            raise ValueError("unit='token' requires a tokenizer")
+        if chunk_size < 1 or not 0 <= overlap < chunk_size:
+            raise ValueError(f"Invalid chunk_size/overlap: {chunk_size}/{overlap}")
+
+        self.chunk_size = chunk_size
+        self.overlap = overlap
+        self.unit = unit
+        self.tokenizer = tokenizer
+        self.boundaries = boundaries
+        self.min_fill = min_fill
+        self.max_chunks = max_chunks
+
+    def chunk(self, text: str) -> List[Chunk]:
+        """Chunks de um texto"""
+        return list(self.iter_chunks(text))
+
+    def chunk_many(self, texts: Sequence[str]) -> List[List[Chunk]]:
+        """Chunks de vários textos (uma lista por texto, na mesma ordem)"""
+        spans = self._unit_spans(texts)
+        return [list(self._iter_chunks(text, text_spans)) for text, text_spans in zip(texts, spans)]
+
+    def iter_chunks(self, text: str) -> Iterator[Chunk]:
+        """Gera os chunks de um texto um a um"""
+        return self._iter_chunks(text, self._unit_spans([text])[0])
+
+    def _unit_spans(self, texts: Sequence[str]) -> List[Optional[Tuple[List[int], List[int]]]]:
+        """
+        (inícios, fins) de cada token; None para caracteres e palavras, que são
+        percorridos direto no texto com rfind/regex
+        """
+        if self.unit != "token":
+            return [None] * len(texts)
+
+        if hasattr(self.tokenizer, "is_fast"):
+            # Tokenizer do HuggingFace: todos os textos numa única chamada
+            encoded = self.tokenizer(list(texts), return_offsets_mapping=True, add_special_tokens=False)
+            offsets = [[span for span in mapping if span[1] > span[0]] for mapping in encoded["offset_mapping"]]
+        else:
+            offsets = [list(self.tokenizer(text)) for text in texts]
+
+        return [([span[0] for span in text_offsets], [span[1] for span in text_offsets]) for text_offsets in offsets]
+
+    def _iter_chunks(self, text: str, spans: Optional[Tuple[List[int], List[int]]]) -> Iterator[Chunk]:
+        length = len(text)
+        index = 0
+        start = 0
+
+        while start < length and (self.max_chunks is None or index < self.max_chunks):
+            limit, next_start = self._advance(text, spans, start)
+            end = length if limit >= length else self._best_break(text, start, limit)
+
+            chunk_start, chunk_end = _trim(text, start, end)
+            if chunk_end > chunk_start:
+                yield Chunk(text, index, chunk_start, chunk_end)
+                index += 1
+
+            if end >= length:
+                break
+
+            if self.boundaries and text.startswith('\n#', end - 1):
+                # Um título abre uma seção nova: sem sobreposição com a anterior
+                next_start = end
+            elif end != limit or next_start is None:
+                next_start = self._rewind(text, spans, start, end) if self.overlap else end
+            start = next_start if next_start > start else end
+
+    def _advance(self, text: str, spans, start: int) -> Tuple[int, Optional[int]]:
+        """
+        Offset logo após chunk_size unidades a partir de start (len(text) se não houver
+        tantas) e, quando já sai do mesmo passe, o início do próximo chunk sem corte
+        """
+        if self.unit == "char":
+            return min(start + self.chunk_size, len(text)), None
+
+        if self.unit == "word":
+            match = _words_pattern(self.chunk_size, self.chunk_size - self.overlap).match(text, start)
+            return (match.end(), match.end("next")) if match else (len(text), None)
+
+        starts, ends = spans
+        last = bisect.bisect_right(ends, start) + self.chunk_size
+        return (ends[last - 1] if last < len(ends) else len(text)), None
+
+    def _best_break(self, text: str, start: int, limit: int) -> int:
+        """Melhor fronteira em (start + min_fill * janela, limit]"""
+        low = start + int((limit - start) * self.min_fill)
+
+        if self.boundaries:
+            for level in BOUNDARY_LEVELS:
+                best = -1
+                for marker, offset in level:
+                    position = text.rfind(marker, low, limit)
+                    if position >= 0:
+                        best = max(best, position + offset)
+                if best > low:
+                    return best
+
+        if self.unit == "char":
+            # Orçamento em caracteres: ao menos não cortar no meio de uma palavra
+            space = max(text.rfind(' ', low, limit), text.rfind('\n', low, limit))
+            if space > low:
+                return space
+        return limit
+
+    def _rewind(self, text: str, spans, start: int, end: int) -> int:
+        """Início do próximo chunk: overlap unidades antes de end, no começo de uma palavra"""
+        if self.unit == "char":
+            position = max(end - self.overlap, 0)
+            if position > 0 and not text[position - 1].isspace():
+                match = WHITESPACE_PATTERN.search(text, position, end)
+                position = match.end() if match else end
+            return position
+
+        if self.unit == "word":
+            # Volta overlap palavras a partir do fim do chunk, de espaço em espaço
+            position = _trim(text, start, end)[1]
+            for _ in range(self.overlap):
+                space = max(text.rfind(' ', start, position), text.rfind('\n', start, position))
+                if space <= start:
+                    return end
+                position = space
+                while position > start and text[position - 1].isspace():
+                    position -= 1
+            return _trim(text, space, end)[0]
+
+        starts, ends = spans
+        count = bisect.bisect_right(ends, end)
+        return starts[max(count - self.overlap, 0)] if count else end
+
+
+def _trim(text: str, start: int, end: int) -> Tuple[int, int]:
+    """Offsets sem os espaços das pontas (sem copiar o texto)"""
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return start, end
+
+
+def chunk_text(text: str, chunk_size: int = 1000, overlap: int = 200, unit: str = "char",
+               **options) -> List[Chunk]:
+    """Atalho: chunks de um texto com um TextChunker criado na hora"""
+    return TextChunker(chunk_size, overlap, unit, **options).chunk(text)
+
+
+class TimedChunk(Chunk):
+    """
+    Chunk formado por segmentos inteiros de uma transcrição, com o intervalo de tempo
+    """
+
+    __slots__ = ("start_time", "end_time", "first_segment", "last_segment")
+
+    def __init__(self, source: str, index: int, start: int, end: int, start_time: float, end_time: float,
+                 first_segment: int, last_segment: int):
+        super().__init__(source, index, start, end)
+        self.start_time = start_time
+        self.end_time = end_time
+        self.first_segment = first_segment
+        self.last_segment = last_segment
+
+    @property
+    def duration(self) -> float:
+        return self.end_time - self.start_time
+
+    def __repr__(self) -> str:
+        return f"TimedChunk(index={self.index}, segments={self.first_segment}-{self.last_segment}, " \
+               f"time={self.start_time:.2f}-{self.end_time:.2f})"
+
+
+def segment_times(segment: dict) -> Tuple[float, float]:
+    """(início, fim) de um segmento com 'start' e 'end' ou 'duration'"""
+    start = float(segment.get('start') or 0)
+    end = segment.get('end')
+    if end is None:
+        end = start + float(segment.get('duration') or 0)
+    return start, float(end)
+
+
+class SegmentChunker:
+    """
+    Chunks de transcrições montados direto dos segmentos (nunca corta um segmento)
+
+    Os segmentos são juntados com separator num único texto (Chunk.start/end apontam
+    para ele) e cada chunk guarda o tempo do primeiro e do último segmento. O orçamento
+    pode ser de tamanho (chunk_size na unidade escolhida), de duração (max_duration em
+    segundos) ou os dois; o fim de cada chunk sai de buscas binárias sobre somas
+    acumuladas, então o custo total é linear no número de segmentos.
+    """
+
+    def __init__(self, chunk_size: Optional[int] = 1000, overlap: int = 200, unit: str = "char",
+                 tokenizer: Optional[Any] = None, max_duration: Optional[float] = None,
+                 separator: str = " ", boundaries: bool = True, max_chunks: Optional[int] = None):
+        """
+        Args:
+            chunk_size: Tamanho máximo do chunk na unidade escolhida (None = só duração)
+            overlap: Sobreposição (mesma unidade), em segmentos inteiros
+            unit: "char", "word" ou "token"
+            tokenizer: Para unit="token" (como em TextChunker)
+            max_duration: Duração máxima em segundos entre o início do primeiro e do último segmento
+            separator: Separador usado ao juntar os textos dos segmentos
+            boundaries: Preferir terminar o chunk num segmento que fecha uma frase
+            max_chunks: Limite de chunks (None = sem limite)
+        """
+        if unit not in UNITS:
+            raise ValueError(f"Unknown chunk unit: {unit}")
+        if unit == "token" and tokenizer is None:
+            raise ValueError("unit='token' requires a tokenizer")
+        if chunk_size is None and max_duration is None:
+            raise ValueError("SegmentChunker needs chunk_size and/or max_duration")
+        if chunk_size is not None and (chunk_size < 1 or not 0 <= overlap < chunk_size):
+            raise ValueError(f"Invalid chunk_size/overlap: {chunk_size}/{overlap}")
+
+        self.chunk_size = chunk_size
+        self.overlap = overlap if chunk_size is not None else 0
+        self.unit = unit
+        self.tokenizer = tokenizer
+        self.max_duration = max_duration
+        self.separator = separator
+        self.boundaries = boundaries
+        self.max_chunks = max_chunks
+
+    def chunk(self, segments: Sequence[dict]) -> List[TimedChunk]:
+        """Chunks de uma lista de segmentos ({'text', 'start', 'end' ou 'duration'})"""
+        return list(self.iter_chunks(segments))
+
+    def _sizes(self, texts: List[str]) -> List[int]:
+        if self.unit == "char":
+            return [len(text) + len(self.separator) for text in texts]
+        if self.unit == "word":
+            return [sum(1 for _ in WORD_PATTERN.finditer(text)) for text in texts]
+        if hasattr(self.tokenizer, "is_fast"):
+            return [len(ids) for ids in self.tokenizer(texts, add_special_tokens=False)["input_ids"]]
+        return [len(self.tokenizer(text)) for text in texts]
+
+    def iter_chunks(self, segments: Sequence[dict]) -> Iterator[TimedChunk]:
+        """Gera os chunks um a um, em ordem de tempo"""
+        texts = [(segment.get('text') or '').strip() for segment in segments]
+        count = len(texts)
+        if not count:
+            return
+
+        source = self.separator.join(texts)
+        offsets = []
+        position = 0
+        for text in texts:
+            offsets.append(position)
+            position += len(text) + len(self.separator)
+
+        # Somas acumuladas de tamanho e tempos (fins como máximo acumulado: legendas podem se sobrepor)
+        prefix = [0]
+        for size in self._sizes(texts):
+            prefix.append(prefix[-1] + size)
+        starts, ends = [], []
+        latest_end = float('-inf')
+        for segment in segments:
+            start, end = segment_times(segment)
+            latest_end = max(latest_end, end)
+            starts.append(start)
+            ends.append(latest_end)
+
+        index = 0
+        first = 0
+        while first < count and (self.max_chunks is None or index < self.max_chunks):
+            # Último segmento (exclusivo) que ainda cabe no orçamento de tamanho e de duração
+            stop = count
+            if self.chunk_size is not None:
+                stop = min(stop, bisect.bisect_right(prefix, prefix[first] + self.chunk_size, first + 1) - 1)
+            if self.max_duration is not None:
+                stop = min(stop, bisect.bisect_right(starts, starts[first] + self.max_duration, first + 1))
+            stop = max(stop, first + 1)
+
+            if self.boundaries and stop < count and self.chunk_size is not None:
+                # Preferir fechar numa frase completa (olhando só a segunda metade do chunk)
+                for candidate in range(stop, first + (stop - first) // 2, -1):
+                    if texts[candidate - 1].endswith(('.', '!', '?', '…')):
+                        stop = candidate
+                        break
+
+            chunk_start, chunk_end = _trim(source, offsets[first], offsets[stop - 1] + len(texts[stop - 1]))
+            if chunk_end > chunk_start:
+                yield TimedChunk(source, index, chunk_start, chunk_end, starts[first], ends[stop - 1],
+                                 first, stop - 1)
+                index += 1
+
+            if stop >= count:
+                break
+
+            # Sobreposição em segmentos inteiros; sempre avança pelo menos um segmento
+            next_first = stop
+            if self.overlap:
+                next_first = bisect.bisect_left(prefix, prefix[stop] - self.overlap, first + 1, stop)
+            first = next_first
+
+
+class TimeIndex:
+    """
+    Índice de intervalos de tempo dos chunks: instante ou faixa -> chunks em O(log n)
+
+    Os chunks vêm em ordem de início; os fins são guardados como máximo acumulado
+    para que a busca binária continue válida mesmo com intervalos sobrepostos.
+    """
+
+    def __init__(self, intervals: Sequence[Tuple[float, float]]):
+        self.starts = [float(start) for start, _ in intervals]
+        self.ends = [float(end) for _, end in intervals]
+        self.max_ends = []
+        latest_end = float('-inf')
+        for end in self.ends:
+            latest_end = max(latest_end, end)
+            self.max_ends.append(latest_end)
+
+    @classmethod
+    def from_chunks(cls, chunks: Sequence[Any]) -> "TimeIndex":
+        """A partir de TimedChunk ou de dicts com 'start_time'/'end_time'"""
+        return cls([
+            (chunk['start_time'], chunk['end_time']) if isinstance(chunk, dict) else (chunk.start_time, chunk.end_time)
+            for chunk in chunks
+        ])
+
+    def overlapping(self, start: float, end: float) -> List[int]:
+        """Índices dos chunks que se sobrepõem a [start, end]"""
+        first = bisect.bisect_left(self.max_ends, start)
+        stop = bisect.bisect_right(self.starts, end)
+        return [i for i in range(first, stop) if self.ends[i] >= start]
+
+    def at(self, instant: float) -> List[int]:
+        """Índices dos chunks que contêm o instante"""
+        return self.overlapping(instant, instant)
+
+    def __len__(self) -> int:
+        return len(self.starts)
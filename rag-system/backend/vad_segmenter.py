@@ -0,0 +1,143 @@
+"""
+Segmentação por Voz - divide o áudio nos silêncios para transcrever trechos em paralelo
+
+YouTubeRAGExtractor.transcribe_with_whisper passava o arquivo inteiro para um único
+model.transcribe e, acima de 10 MB, trocava para o modelo "tiny" só para caber no
+tempo; justamente as aulas longas ficavam com a pior transcrição.
+
+Aqui o áudio é decodificado uma vez (FFmpeg -> PCM 16 kHz mono), a energia é medida
+em quadros de 30 ms e os cortes caem no meio das pausas, com trechos entre
+MIN_SEGMENT_SECONDS e MAX_SEGMENT_SECONDS. Silêncio nas pontas de cada trecho é
+descartado e trechos sem voz nem chegam ao Whisper. Os trechos são independentes:
+vão para o pool de transcrição (processos com WHISPER_WORKERS > 0) e os timestamps
+voltam ao tempo do arquivo somando o início de cada trecho.
+"""
+
+import bisect
+import subprocess
+from typing import List, Optional, Sequence, Tuple
+
+from audio_stream import BYTES_PER_SAMPLE, SAMPLE_RATE, ffmpeg_pcm_command
+
+FRAME_SECONDS = 0.03
+# Pausa mínima para um corte, e limites de duração de cada trecho
+MIN_SILENCE_SECONDS = 0.3
+MIN_SEGMENT_SECONDS = 15
+MAX_SEGMENT_SECONDS = 60
+# Fala contínua sem pausas: o corte forçado procura o quadro mais baixo nestes segundos finais
+HARD_CUT_SEARCH_SECONDS = 5
+# Silêncio mantido antes e depois da voz em cada trecho
+PAD_SECONDS = 0.2
+# Energia (RMS, escala int16) abaixo da qual um quadro é sempre silêncio
+MIN_THRESHOLD = 100.0
+
+
+def decode_pcm(audio_path: str, sample_rate: int = SAMPLE_RATE) -> bytes:
+    """Arquivo de áudio/vídeo inteiro em PCM s16le mono (um processo FFmpeg)"""
+    result = subprocess.run(ffmpeg_pcm_command(sample_rate, str(audio_path)), capture_output=True)
+    if result.returncode != 0:
+        stderr = result.stderr.decode('utf-8', errors='replace').strip()
+        raise RuntimeError(f"FFmpeg falhou ({result.returncode}): {stderr[-500:]}")
+    return result.stdout
+
+
+def frame_rms(pcm: bytes, sample_rate: int = SAMPLE_RATE) -> List[float]:
+    """Energia (RMS) de cada quadro de FRAME_SECONDS do PCM"""
+    import numpy as np
+
+    frame = int(sample_rate * FRAME_SECONDS)
+    samples = np.frombuffer(pcm, np.int16)
+    count = len(samples) // frame
+    rms = []
+    # Em blocos para não criar uma cópia float do áudio inteiro
+    block = frame * 10000
+    for start in range(0, count * frame, block):
+        frames = samples[start:min(start + block, count * frame)].astype(np.float32).reshape(-1, frame)
+        rms.extend(np.sqrt(np.mean(frames * frames, axis=1)).tolist())
+    return rms
+
+
+def speech_threshold(rms: Sequence[float]) -> float:
+    """Limiar de voz: bem acima do ruído de fundo (percentil 10), sem passar de metade da mediana"""
+    if not rms:
+        return MIN_THRESHOLD
+    ordered = sorted(rms)
+    noise_floor = ordered[len(ordered) // 10]
+    median = ordered[len(ordered) // 2]
+    return max(MIN_THRESHOLD, min(noise_floor * 4, median * 0.5))
+
+
+def plan_segments(rms: Sequence[float], frame_seconds: float = FRAME_SECONDS,
+                  threshold: Optional[float] = None) -> List[Tuple[float, float]]:
+    """
+    Trechos com voz, cortados no meio das pausas
+
+    Args:
+        rms: Energia de cada quadro (frame_rms)
+        frame_seconds: Duração de cada quadro
+        threshold: Limiar de voz (padrão: speech_threshold)
+
+    Returns:
+        Lista de (início, fim) em segundos, em ordem, sem sobreposição
+    """
+    if threshold is None:
+        threshold = speech_threshold(rms)
+    total = len(rms)
+    min_silence = max(1, int(MIN_SILENCE_SECONDS / frame_seconds))
+    min_frames = int(MIN_SEGMENT_SECONDS / frame_seconds)
+    max_frames = int(MAX_SEGMENT_SECONDS / frame_seconds)
+    pad = int(PAD_SECONDS / frame_seconds)
+    hard_cut_search = int(HARD_CUT_SEARCH_SECONDS / frame_seconds)
+
+    # Candidatos a corte: meio de cada pausa longa o bastante
+    cuts = []
+    run_start = None
+    for i, value in enumerate(rms):
+        if value < threshold:
+            if run_start is None:
+                run_start = i
+        elif run_start is not None:
+            if i - run_start >= min_silence:
+                cuts.append((run_start + i) // 2)
+            run_start = None
+
+    # Cada trecho vai até a última pausa antes do limite; sem pausa, corta no quadro mais baixo
+    bounds = []
+    start = 0
+    while start < total:
+        limit = start + max_frames
+        if limit >= total:
+            end = total
+        else:
+            lo = bisect.bisect_left(cuts, start + min_frames)
+            hi = bisect.bisect_right(cuts, limit)
+            if hi > lo:
+                end = cuts[hi - 1]
+            else:
+                first = max(start + min_frames, limit - hard_cut_search)
+                window = rms[first:limit]
+                end = first + min(range(len(window)), key=window.__getitem__)
+        bounds.append((start, end))
+        start = end
+
+    # Remove o silêncio das pontas (mantendo PAD_SECONDS) e trechos sem voz
+    segments = []
+    for start, end in bounds:
+        voiced = [i for i in range(start, end) if rms[i] >= threshold]
+        if not voiced:
+            continue
+        first = max(start, voiced[0] - pad)
+        last = min(end, voiced[-1] + 1 + pad)
+        segments.append((first * frame_seconds, last * frame_seconds))
+    return segments
+
+
+def segment_pcm(pcm: bytes, segments: List[Tuple[float, float]],
+                sample_rate: int = SAMPLE_RATE) -> List[Tuple[float, bytes]]:
+    """Recorta o PCM nos trechos: (início em segundos, PCM do trecho)"""
+    pieces = []
+    for start, end in segments:
+        first = int(start * sample_rate) * BYTES_PER_SAMPLE
+        last = int(end * sample_rate) * BYTES_PER_SAMPLE
+        pieces.append((first / BYTES_PER_SAMPLE / sample_rate, pcm[first:last]))
+    return pieces
@@ -38,6 +38,7 @@ from bs4 import BeautifulSoup, Comment
 # Processamento de texto e chunking
 import re
 from textstat import flesch_reading_ease
+from text_chunker import TextChunker
 
 
 class WebScraperExtractor:
@@ -148,20 +149,17 @@ class WebScraperExtractor:
             return []
         
         chunks = []
-        words = text.split()
         
-        for i in range(0, len(words), self.chunk_size - self.overlap):
-            chunk_words = words[i:i + self.chunk_size]
-            chunk_text = ' '.join(chunk_words)
-            
-            if len(chunk_text.strip()) < 30:
+        for chunk in TextChunker(self.chunk_size, self.overlap, unit="word", boundaries=False).iter_chunks(text):
+            if chunk.char_count < 30:
                 continue
             
+            chunk_text = chunk.text
             chunk_data = {
                 'chunk_id': f"{metadata.get('page_id', 'unknown')}_{len(chunks)}",
                 'text': chunk_text,
-                'char_count': len(chunk_text),
-                'word_count': len(chunk_words),
+                'char_count': chunk.char_count,
+                'word_count': chunk.word_count,
                 'readability_score': flesch_reading_ease(chunk_text) if chunk_text else 0,
                 'metadata': {
                     'source_url': metadata.get('url'),
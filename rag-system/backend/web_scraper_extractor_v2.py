@@ -25,6 +25,8 @@ import requests
 from bs4 import BeautifulSoup
 import textstat
 
+from text_chunker import TextChunker
+
 # Configurações por domínio
 DOMAIN_CONFIGS = {
     'help.autodesk.com': {
@@ -430,22 +432,14 @@ class WebScraperExtractorV2:
             return []
         
         chunks = []
-        words = content.split()
-        
-        # Estimar palavras por chunk (aproximadamente 4 chars por palavra)
-        words_per_chunk = self.chunk_size // 4
-        overlap_words = self.chunk_overlap // 4
         
-        for i in range(0, len(words), words_per_chunk - overlap_words):
-            chunk_words = words[i:i + words_per_chunk]
-            chunk_text = ' '.join(chunk_words)
-            
-            if len(chunk_text.strip()) > 50:  # Mínimo de 50 caracteres
+        for chunk in TextChunker(self.chunk_size, self.chunk_overlap).iter_chunks(content):
+            if chunk.char_count > 50:  # Mínimo de 50 caracteres
                 chunks.append({
-                    'text': chunk_text,
-                    'start_index': i,
-                    'word_count': len(chunk_words),
-                    'char_count': len(chunk_text)
+                    'text': chunk.text,
+                    'start_index': chunk.start,
+                    'word_count': chunk.word_count,
+                    'char_count': chunk.char_count
                 })
         
         return chunks
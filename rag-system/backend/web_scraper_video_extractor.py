@@ -28,6 +28,9 @@ import tempfile
 from bs4 import BeautifulSoup
 import textstat
 
+from text_chunker import SegmentChunker
+from whisper_pool import get_transcription_pool
+
 # Configurações específicas para vídeos Autodesk
 AUTODESK_VIDEO_CONFIGS = {
     'video_selectors': [
@@ -124,8 +127,6 @@ class VideoTranscriptionExtractor:
                     return json.load(f)
             
             # Configurar FFmpeg path se necessário
-            import whisper
-            
             # Tentar encontrar FFmpeg
             ffmpeg_paths = [
                 r"C:\Users\lucas\AppData\Local\Microsoft\WinGet\Packages\Gyan.FFmpeg_Microsoft.Winget.Source_8wekyb3d8bbwe\ffmpeg-7.1.1-full_build\bin\ffmpeg.exe",
@@ -146,11 +147,8 @@ class VideoTranscriptionExtractor:
                 ffmpeg_dir = str(Path(ffmpeg_path).parent)
                 os.environ['PATH'] = ffmpeg_dir + os.pathsep + old_path
             
-            # Carregar modelo (usar modelo pequeno para velocidade)
-            model = whisper.load_model("base")
-            
-            # Transcrever
-            result = model.transcribe(video_file_path, language='pt')
+            # Transcrever com o modelo residente no pool compartilhado (modelo pequeno para velocidade)
+            result = get_transcription_pool().transcribe(video_file_path, "base", language='pt')
             
             # Restaurar PATH
             if ffmpeg_path:
@@ -232,45 +230,21 @@ class VideoTranscriptionExtractor:
     
     def _create_video_chunks(self, transcript, metadata=None, chunk_duration=30):
         """Cria chunks do vídeo baseado em duração"""
-        chunks = []
-        
         if not transcript or not transcript.get('segments'):
-            return chunks
-        
-        current_chunk = {
-            'start_time': 0,
-            'end_time': 0,
-            'text': '',
-            'segment_ids': []
-        }
-        
-        for segment in transcript['segments']:
-            # Se o chunk atual ficaria muito longo, criar novo chunk
-            if current_chunk['text'] and (segment['start'] - current_chunk['start_time']) > chunk_duration:
-                # Finalizar chunk atual
-                chunks.append(self._finalize_video_chunk(current_chunk, transcript, metadata))
-                
-                # Iniciar novo chunk
-                current_chunk = {
-                    'start_time': segment['start'],
-                    'end_time': segment['end'],
-                    'text': segment['text'],
-                    'segment_ids': [segment['id']]
-                }
-            else:
-                # Adicionar ao chunk atual
-                if not current_chunk['text']:
-                    current_chunk['start_time'] = segment['start']
-                
-                current_chunk['end_time'] = segment['end']
-                current_chunk['text'] += ' ' + segment['text']
-                current_chunk['segment_ids'].append(segment['id'])
-        
-        # Finalizar último chunk
-        if current_chunk['text']:
-            chunks.append(self._finalize_video_chunk(current_chunk, transcript, metadata))
+            return []
         
-        return chunks
+        segments = transcript['segments']
+        chunker = SegmentChunker(None, max_duration=chunk_duration)
+        
+        return [
+            self._finalize_video_chunk({
+                'start_time': chunk.start_time,
+                'end_time': chunk.end_time,
+                'text': chunk.text,
+                'segment_ids': [segments[i].get('id', i) for i in range(chunk.first_segment, chunk.last_segment + 1)]
+            }, transcript, metadata)
+            for chunk in chunker.iter_chunks(segments)
+        ]
     
     def _finalize_video_chunk(self, chunk_data, transcript, metadata):
         """Finaliza um chunk de vídeo com metadados"""
@@ -0,0 +1,218 @@
+"""
+Pool de Transcrição Whisper - Modelos residentes com limite de memória (LRU)
+
+YouTubeRAGExtractor.transcribe_with_whisper e VideoTranscriptionExtractor.transcribe_video
+carregavam o modelo (whisper.load_model) a cada vídeo e o descartavam no fim;
+numa playlist de 100 vídeos isso são minutos só recarregando pesos.
+
+Aqui os modelos ficam carregados por tamanho ("tiny", "base", ...) num cache
+LRU limitado pela memória estimada de cada modelo. As transcrições são
+enviadas a um pool compartilhado (get_transcription_pool): com
+WHISPER_WORKERS=0 (padrão) um único thread no próprio processo atende a fila;
+com N > 0 são N processos, cada um com seu próprio cache de modelos.
+"""
+
+import atexit
+import logging
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Memória aproximada (MB, FP32) de cada modelo carregado
+MODEL_MEMORY_MB = {
+    "tiny": 150,
+    "base": 300,
+    "small": 1000,
+    "medium": 3000,
+    "large": 6200,
+    "large-v2": 6200,
+    "large-v3": 6200,
+    "turbo": 3200,
+}
+DEFAULT_MODEL_MEMORY_MB = 3000
+
+DEFAULT_MAX_MEMORY_MB = 4096
+
+
+class WhisperModelCache:
+    """
+    Modelos Whisper carregados, por (tamanho, dispositivo), com despejo LRU
+    """
+
+    def __init__(self, max_memory_mb: Optional[int] = None):
+        """
+        Args:
+            max_memory_mb: Memória máxima estimada dos modelos residentes
+                (padrão: WHISPER_MAX_MEMORY_MB ou 4096); o modelo em uso nunca é despejado
+        """
+        self.max_memory_mb = max_memory_mb or int(os.getenv("WHISPER_MAX_MEMORY_MB", DEFAULT_MAX_MEMORY_MB))
+        self.models: "OrderedDict[Tuple[str, str], Any]" = OrderedDict()
+        self.lock = threading.Lock()
+
+        # Contadores (não persistidos)
+        self.loads = 0
+        self.hits = 0
+        self.evictions = 0
+
+    def get(self, model_size: str, device: str = "cpu"):
+        """Modelo carregado (carrega na primeira vez e marca o uso para o LRU)"""
+        key = (model_size, device)
+        with self.lock:
+            if key in self.models:
+                self.models.move_to_end(key)
+                self.hits += 1
+                return self.models[key]
+
+            self._evict_for(MODEL_MEMORY_MB.get(model_size, DEFAULT_MODEL_MEMORY_MB))
+
+            import whisper
+            logger.info(f"🎤 Loading Whisper model '{model_size}' on {device}")
+            model = whisper.load_model(model_size, device=device)
+            self.models[key] = model
+            self.loads += 1
+            return model
+
+    def _evict_for(self, needed_mb: int):
+        """Descarrega os modelos menos usados até caber mais needed_mb"""
+        while self.models and self.memory_mb() + needed_mb > self.max_memory_mb:
+            (model_size, device), _ = self.models.popitem(last=False)
+            self.evictions += 1
+            logger.info(f"🧹 Unloading Whisper model '{model_size}' ({device})")
+
+        if not self.models:
+            import gc
+            gc.collect()
+
+    def memory_mb(self) -> int:
+        return sum(MODEL_MEMORY_MB.get(size, DEFAULT_MODEL_MEMORY_MB) for size, _ in self.models)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "models": [f"{size}/{device}" for size, device in self.models],
+            "memory_mb": self.memory_mb(),
+            "max_memory_mb": self.max_memory_mb,
+            "loads": self.loads,
+            "hits": self.hits,
+            "evictions": self.evictions
+        }
+
+
+# Cache do processo (no processo principal ou em cada worker do pool)
+_model_cache: Optional[WhisperModelCache] = None
+_model_cache_lock = threading.Lock()
+
+
+def get_model_cache() -> WhisperModelCache:
+    global _model_cache
+    with _model_cache_lock:
+        if _model_cache is None:
+            _model_cache = WhisperModelCache()
+        return _model_cache
+
+
+def transcribe_file(audio_path: Any, model_size: str = "base", device: str = "cpu", **options) -> Dict[str, Any]:
+    """
+    Transcreve um arquivo (ou array de áudio 16 kHz) com o modelo residente deste processo
+
+    Returns:
+        Dict: Resultado do model.transcribe (text, segments, language) + model_size
+    """
+    model = get_model_cache().get(model_size, device)
+    result = model.transcribe(audio_path, **options)
+    result["model_size"] = model_size
+    return result
+
+
+def _init_worker(max_memory_mb: int):
+    """Inicializador dos processos do pool: um cache de modelos por worker"""
+    global _model_cache
+    _model_cache = WhisperModelCache(max_memory_mb)
+
+
+class TranscriptionPool:
+    """
+    Fila de transcrições atendida por workers com os modelos já carregados
+    """
+
+    def __init__(self, workers: Optional[int] = None, device: Optional[str] = None,
+                 max_memory_mb: Optional[int] = None):
+        """
+        Args:
+            workers: Processos de transcrição (padrão: WHISPER_WORKERS ou 0 = um thread
+                no próprio processo, usando o cache de get_model_cache)
+            device: Dispositivo dos modelos (padrão: WHISPER_DEVICE ou cpu)
+            max_memory_mb: Limite do cache de modelos de cada worker
+        """
+        self.workers = workers if workers is not None else int(os.getenv("WHISPER_WORKERS", 0))
+        self.device = device or os.getenv("WHISPER_DEVICE", "cpu")
+        self.max_memory_mb = max_memory_mb or int(os.getenv("WHISPER_MAX_MEMORY_MB", DEFAULT_MAX_MEMORY_MB))
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> Executor:
+        # Criado no primeiro uso: os workers herdam o ambiente (PATH do FFmpeg) dessa hora
+        with self._lock:
+            if self._executor is None:
+                if self.workers > 0:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        initializer=_init_worker,
+                        initargs=(self.max_memory_mb,)
+                    )
+                    logger.info(f"🎤 Whisper pool started with {self.workers} workers")
+                else:
+                    # Um thread só: o modelo não é thread-safe e as chamadas ficam em fila
+                    self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="whisper")
+            return self._executor
+
+    def submit(self, audio_path: Any, model_size: str = "base", **options) -> Future:
+        """
+        Enfileira um arquivo de áudio/vídeo ou um trecho já decodificado (numpy float32,
+        16 kHz mono, ex.: audio_stream.pcm_to_float32); o Future devolve o resultado do Whisper
+        """
+        if isinstance(audio_path, (str, os.PathLike)):
+            audio_path = str(audio_path)
+        return self._get_executor().submit(transcribe_file, audio_path, model_size, self.device, **options)
+
+    def transcribe(self, audio_path: str, model_size: str = "base", **options) -> Dict[str, Any]:
+        """Transcreve e espera o resultado"""
+        return self.submit(audio_path, model_size, **options).result()
+
+    def transcribe_many(self, jobs: Iterable[Tuple[str, str]], **options) -> Iterator[Tuple[str, Any]]:
+        """
+        Transcreve uma fila de (audio_path, model_size)
+
+        Yields:
+            (audio_path, resultado ou a exceção), na ordem em que terminam
+        """
+        futures = {self.submit(audio_path, model_size, **options): audio_path for audio_path, model_size in jobs}
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result()
+            except Exception as e:
+                yield futures[future], e
+
+    def close(self):
+        """Encerra os workers (os modelos são descarregados junto)"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+
+# Pool compartilhado por todos os extratores do processo
+_pool: Optional[TranscriptionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_transcription_pool() -> TranscriptionPool:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = TranscriptionPool()
+            atexit.register(_pool.close)
+        return _pool
@@ -0,0 +1,227 @@
+"""
+ZIP em Streaming - Exportação com memória constante
+
+Gera o arquivo ZIP entrada por entrada, devolvendo os bytes comprimidos assim
+que são produzidos (o zipfile grava em um buffer não pesquisável, então usa
+data descriptors em vez de voltar para reescrever cabeçalhos). Arquivos que já
+são comprimidos entram como ZIP_STORED.
+
+A saída é determinística para o mesmo conjunto de arquivos (datas vêm do mtime
+e do created_at do documento), o que permite atender requisições Range
+regenerando o fluxo e descartando os bytes anteriores ao início pedido.
+"""
+
+import hashlib
+import os
+import threading
+import zipfile
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Iterable, Iterator, Optional, Tuple
+
+# Extensões que não ganham nada com deflate
+COMPRESSED_EXTENSIONS = {
+    '.zip', '.gz', '.bz2', '.xz', '.7z', '.rar',
+    '.png', '.jpg', '.jpeg', '.gif', '.webp',
+    '.mp3', '.mp4', '.m4a', '.webm', '.ogg',
+    '.docx', '.xlsx', '.pptx', '.pdf'
+}
+
+READ_CHUNK_SIZE = 256 * 1024
+
+# Tamanho total já calculado por ETag (necessário para Content-Range)
+_size_cache: "OrderedDict[str, int]" = OrderedDict()
+_size_cache_lock = threading.Lock()
+SIZE_CACHE_LIMIT = 64
+
+
+@dataclass
+class ZipEntry:
+    """Entrada do ZIP: um arquivo em disco (path) ou conteúdo em memória (data)"""
+    arcname: str
+    path: Optional[str] = None
+    data: Optional[bytes] = None
+    date_time: Optional[Tuple[int, int, int, int, int, int]] = None
+
+
+def date_time_from_iso(timestamp: Optional[str]) -> Tuple[int, int, int, int, int, int]:
+    """Converte um timestamp ISO em date_time de ZipInfo (1980-01-01 se inválido)"""
+    try:
+        dt = datetime.fromisoformat(timestamp)
+    except (TypeError, ValueError):
+        return (1980, 1, 1, 0, 0, 0)
+    return (max(dt.year, 1980), dt.month, dt.day, dt.hour, dt.minute, dt.second)
+
+
+class _StreamBuffer:
+    """Destino de escrita do zipfile: acumula bytes até serem drenados pelo gerador"""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class ZipStream:
+    """
+    ZIP gerado sob demanda a partir de uma fábrica de entradas
+    """
+
+    def __init__(self, entries_factory: Callable[[], Iterable[ZipEntry]]):
+        """
+        Args:
+            entries_factory: Função que devolve as entradas do ZIP; é chamada a
+                cada iteração, então precisa produzir sempre a mesma sequência
+        """
+        self.entries_factory = entries_factory
+        self._etag = None
+
+    @property
+    def etag(self) -> str:
+        """Identifica o conteúdo do arquivo (nomes, tamanhos e mtimes das entradas)"""
+        if self._etag is None:
+            digest = hashlib.sha256()
+            for entry in self.entries_factory():
+                digest.update(entry.arcname.encode('utf-8'))
+                if entry.data is not None:
+                    digest.update(hashlib.sha256(entry.data).digest())
+                elif entry.path and os.path.exists(entry.path):
+                    stat = os.stat(entry.path)
+                    digest.update(f"{stat.st_size}:{stat.st_mtime_ns}".encode())
+            self._etag = f'"{digest.hexdigest()[:32]}"'
+        return self._etag
+
+    def __iter__(self) -> Iterator[bytes]:
+        buffer = _StreamBuffer()
+        total = 0
+
+        with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+            for entry in self.entries_factory():
+                if entry.data is None and not (entry.path and os.path.exists(entry.path)):
+                    continue
+
+                info = self._zip_info(entry)
+                size = len(entry.data) if entry.data is not None else os.path.getsize(entry.path)
+                info.file_size = size
+
+                with zip_file.open(info, 'w', force_zip64=size > zipfile.ZIP64_LIMIT) as dest:
+                    if entry.data is not None:
+                        dest.write(entry.data)
+                    else:
+                        with open(entry.path, 'rb') as src:
+                            while True:
+                                block = src.read(READ_CHUNK_SIZE)
+                                if not block:
+                                    break
+                                dest.write(block)
+                                data = buffer.drain()
+                                if data:
+                                    total += len(data)
+                                    yield data
+
+                data = buffer.drain()
+                if data:
+                    total += len(data)
+                    yield data
+
+        # Diretório central escrito no close()
+        data = buffer.drain()
+        if data:
+            total += len(data)
+            yield data
+
+        self._remember_size(total)
+
+    def _zip_info(self, entry: ZipEntry) -> zipfile.ZipInfo:
+        if entry.date_time is not None:
+            date_time = entry.date_time
+        elif entry.path:
+            date_time = datetime.fromtimestamp(os.path.getmtime(entry.path)).timetuple()[:6]
+            date_time = (max(date_time[0], 1980),) + tuple(date_time[1:])
+        else:
+            date_time = (1980, 1, 1, 0, 0, 0)
+
+        info = zipfile.ZipInfo(entry.arcname, date_time=date_time)
+        info.external_attr = 0o644 << 16
+
+        extension = os.path.splitext(entry.path or entry.arcname)[1].lower()
+        info.compress_type = zipfile.ZIP_STORED if extension in COMPRESSED_EXTENSIONS else zipfile.ZIP_DEFLATED
+        return info
+
+    def _remember_size(self, size: int):
+        with _size_cache_lock:
+            _size_cache[self.etag] = size
+            _size_cache.move_to_end(self.etag)
+            while len(_size_cache) > SIZE_CACHE_LIMIT:
+                _size_cache.popitem(last=False)
+
+    def size(self) -> int:
+        """
+        Tamanho total do ZIP em bytes
+
+        Usa o valor registrado por uma geração anterior com o mesmo ETag; caso
+        contrário, gera o arquivo descartando os bytes (memória constante).
+        """
+        with _size_cache_lock:
+            if self.etag in _size_cache:
+                return _size_cache[self.etag]
+
+        return sum(len(chunk) for chunk in self)
+
+    def iter_range(self, start: int, end: int) -> Iterator[bytes]:
+        """
+        Gera apenas os bytes [start, end] (inclusivo) do ZIP
+        """
+        position = 0
+        for chunk in self:
+            chunk_end = position + len(chunk)
+            if chunk_end > start:
+                yield chunk[max(0, start - position):min(len(chunk), end + 1 - position)]
+            position = chunk_end
+            if position > end:
+                return
+
+
+def parse_range_header(range_header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Interpreta um cabeçalho Range de intervalo único ("bytes=N-", "bytes=N-M", "bytes=-N")
+
+    Returns:
+        (start, end) inclusivo, ou None se o intervalo for inválido ou não satisfazível
+    """
+    if not range_header or not range_header.startswith('bytes=') or ',' in range_header:
+        return None
+
+    start_text, _, end_text = range_header[len('bytes='):].strip().partition('-')
+    try:
+        if not start_text:
+            # Sufixo: últimos N bytes
+            length = int(end_text)
+            if length <= 0:
+                return None
+            return max(0, size - length), size - 1
+
+        start = int(start_text)
+        end = int(end_text) if end_text else size - 1
+    except ValueError:
+        return None
+
+    if start >= size or end < start:
+        return None
+    return start, min(end, size - 1)
@@ -120,6 +120,17 @@ function App() {
     }
   };
 
+  const waitForJob = async (jobId: string) => {
+    while (true) {
+      const response = await fetch(`${API_BASE}/jobs/${jobId}`);
+      const job = await response.json();
+      if (!response.ok || job.status === 'completed' || job.status === 'failed') {
+        return response.ok ? job : { status: 'failed', error: job.detail };
+      }
+      await new Promise((resolve) => setTimeout(resolve, 1000));
+    }
+  };
+
   const loadDocuments = async () => {
     try {
       const response = await fetch(`${API_BASE}/documents`);
@@ -250,9 +261,18 @@ function App() {
         body: JSON.stringify(newDoc)
       });
 
-      const data = await response.json();
+      let data = await response.json();
 
       if (response.ok) {
+        // O processamento roda em segundo plano: acompanhar o job até terminar
+        const job = await waitForJob(data.job_id);
+        if (job.status === 'failed') {
+          setMessage(`❌ Erro: ${job.error}`);
+          setLoading(false);
+          return;
+        }
+        data = job.result;
+
         let successMessage = `✅ Documento adicionado com sucesso! ${data.chunks_created} chunks criados em ${data.processing_time}s`;
         if (data.pages) successMessage += ` | ${data.pages} páginas`;
         if (data.tables) successMessage += ` | ${data.tables} tabelas`;
@@ -289,9 +309,18 @@ function App() {
         body: formData
       });
 
-      const data = await response.json();
+      let data = await response.json();
 
       if (response.ok) {
+        // O processamento roda em segundo plano: acompanhar o job até terminar
+        const job = await waitForJob(data.job_id);
+        if (job.status === 'failed') {
+          setMessage(`❌ Erro: ${job.error}`);
+          setLoading(false);
+          return;
+        }
+        data = job.result;
+
         let successMessage = `✅ Arquivo enviado com sucesso! ${data.chunks_created} chunks criados em ${data.processing_time}s`;
         if (data.pages) successMessage += ` | ${data.pages} páginas`;
         if (data.tables) successMessage += ` | ${data.tables} tabelas`;
@@ -21,6 +21,10 @@ from datetime import datetime
 # Importar o scraper base
 from web_documentation_scraper import WebDocumentationScraper
 
+# Chunker compartilhado com o backend do sistema RAG
+sys.path.append(str(Path(__file__).resolve().parent.parent / "rag-system" / "backend"))
+from text_chunker import TextChunker
+
 class WebScraperWithVideoProcessing(WebDocumentationScraper):
     """
     Extensão do scraper base com processamento de vídeos
@@ -305,25 +309,7 @@ class WebScraperWithVideoProcessing(WebDocumentationScraper):
         Returns:
             Lista de chunks
         """
-        if len(text) <= chunk_size:
-            return [text]
-        
-        chunks = []
-        sentences = text.split('. ')
-        current_chunk = ""
-        
-        for sentence in sentences:
-            if len(current_chunk) + len(sentence) + 2 <= chunk_size:
-                current_chunk += sentence + ". "
-            else:
-                if current_chunk:
-                    chunks.append(current_chunk.strip())
-                current_chunk = sentence + ". "
-        
-        if current_chunk:
-            chunks.append(current_chunk.strip())
-        
-        return chunks
+        return [chunk.text for chunk in TextChunker(chunk_size, 0).iter_chunks(text)] or [text]
     
     def save_to_database(self, page_data: Dict[str, Any], chunks: List[Dict[str, Any]]):
         """
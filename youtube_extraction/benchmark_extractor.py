@@ -0,0 +1,611 @@
+#!/usr/bin/env python3
+"""
+Benchmark do YouTubeRAGExtractor com fixtures locais (sem acessar o YouTube)
+
+Reproduz respostas gravadas do yt-dlp (info JSON), legendas VTT/SRT e trechos
+de áudio curtos por um servidor HTTP local que faz o papel do YouTube. O
+extrator roda sem alterações; só o yt_dlp.YoutubeDL é trocado por
+ReplayYoutubeDL, que busca tudo nesse servidor. Cenários medidos:
+
+- extract_single_video em todos os vídeos das fixtures, um por vez;
+- extract_playlist com cache de metadados vazio e de novo com o cache cheio;
+- create_chunks, analyze_content e save_to_database isolados, na maior transcrição.
+
+Para cada cenário: tempo total, vídeos por minuto, latência por etapa (média,
+p50, p95, máx.) e pico de memória (RSS) do processo. O resultado vai em JSON
+para comparar versões (--compare).
+
+Fixtures (gravadas com o próprio yt-dlp):
+    yt-dlp --skip-download --write-info-json --write-subs --write-auto-subs \\
+           --sub-langs pt --sub-format vtt -o "fixtures/%(id)s" URL_DO_VIDEO
+    # opcional: --write-thumbnail, e um áudio curto (.wav, .webm, .m4a ou .mp4) como fixtures/VIDEO_ID.wav
+
+    fixtures/VIDEO_ID.info.json       metadados do vídeo
+    fixtures/VIDEO_ID.LANG.vtt|srt    legenda servida no lugar das URLs originais
+    fixtures/VIDEO_ID.wav             áudio do download + Whisper (se não houver legenda)
+    fixtures/VIDEO_ID.webp|jpg        miniatura
+    fixtures/PLAYLIST.info.json       playlist (_type = playlist); sem ela, todos os vídeos
+
+Uso:
+    python benchmark_extractor.py                                 # fixtures sintéticas
+    python benchmark_extractor.py --fixtures fixtures --json resultado.json
+    python benchmark_extractor.py --json novo.json --compare resultado.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, quote, unquote, urlparse
+from urllib.request import urlopen
+
+import youtube_extractor
+from youtube_extractor import YouTubeRAGExtractor
+
+REPEAT = 3
+SUBTITLE_EXTENSIONS = ('.vtt', '.srt')
+AUDIO_EXTENSIONS = ('.wav', '.webm', '.m4a', '.mp4')
+THUMBNAIL_EXTENSIONS = ('.jpg', '.webp', '.png')
+WORDS = "hoje vamos falar sobre chunks tempo legendas parser busca vídeo modelo texto aula exemplo".split()
+
+# Etapas cronometradas (métodos do extrator)
+STAGES = [
+    'get_playlist_info',
+    'prefetch_video_metadata',
+    'get_video_metadata',
+    'get_transcript_with_fallbacks',
+    'extract_subtitles_with_ydl',
+    'download_audio_and_transcribe',
+    'create_chunks',
+    'analyze_content',
+    'save_video_data',
+    'save_to_database',
+]
+
+
+# ---------------------------------------------------------------- fixtures
+
+def format_time(seconds: float) -> str:
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    return f"{int(hours):02d}:{int(minutes):02d}:{secs:06.3f}"
+
+
+def rolling_vtt(minutes: float, seed: int) -> str:
+    """Legenda automática no formato do YouTube (cada cue repete a linha anterior)"""
+    parts = ["WEBVTT\nKind: captions\nLanguage: pt\n"]
+    previous = ""
+    t = 0.0
+    i = seed
+    while t < minutes * 60:
+        words = [WORDS[(i + k) % len(WORDS)] for k in range(6)]
+        timed = words[0] + "".join(f"<{format_time(t + 0.3 * k)}><c> {w}</c>" for k, w in enumerate(words[1:], 1))
+        line = " ".join(words)
+        parts.append(f"\n{format_time(t)} --> {format_time(t + 2)} align:start position:0%\n{previous}\n{timed}\n")
+        parts.append(f"\n{format_time(t + 2)} --> {format_time(t + 2.01)} align:start position:0%\n{line}\n \n")
+        previous = line
+        t += 2.01
+        i += 1
+    return "".join(parts)
+
+
+def generate_fixtures(folder: Path, videos: int, minutes: float):
+    """Fixtures sintéticas: info JSON + legenda automática de cada vídeo e uma playlist com todos"""
+    folder.mkdir(parents=True, exist_ok=True)
+    video_ids = [f"bench{i:06d}" for i in range(1, videos + 1)]
+    for i, video_id in enumerate(video_ids):
+        info = {
+            'id': video_id,
+            'title': f"Aula {i + 1} - {' '.join(WORDS[i % len(WORDS):][:3])}",
+            'description': "Vídeo sintético do benchmark",
+            'uploader': "Benchmark",
+            'upload_date': "20240101",
+            'duration': int(minutes * 60),
+            'view_count': 1000 + i,
+            'like_count': 10 + i,
+            'comment_count': i,
+            'thumbnail': "",
+            # Marca a legenda gerada como automática (URLs trocadas pelas do servidor local)
+            'automatic_captions': {'pt': []},
+        }
+        (folder / f"{video_id}.info.json").write_text(json.dumps(info, ensure_ascii=False), encoding='utf-8')
+        (folder / f"{video_id}.pt.vtt").write_text(rolling_vtt(minutes, i), encoding='utf-8')
+
+    playlist = {
+        '_type': 'playlist',
+        'id': 'PLbenchmark',
+        'title': "Playlist do benchmark",
+        'uploader': "Benchmark",
+        'entries': [{'id': video_id} for video_id in video_ids],
+    }
+    (folder / "PLbenchmark.info.json").write_text(json.dumps(playlist, ensure_ascii=False), encoding='utf-8')
+
+
+class Fixtures:
+    """Índice das fixtures de uma pasta: vídeos (info, legendas, áudio) e playlists"""
+
+    def __init__(self, folder: Path):
+        self.folder = Path(folder)
+        self.videos: Dict[str, Dict[str, Any]] = {}
+        self.playlists: Dict[str, Dict[str, Any]] = {}
+
+        for path in sorted(self.folder.glob('*.info.json')):
+            info = json.loads(path.read_text(encoding='utf-8'))
+            if info.get('_type') == 'playlist':
+                self.playlists[info['id']] = info
+            else:
+                self.videos[info['id']] = {'info': info, 'subtitles': {}, 'audio': None, 'thumbnail': None}
+
+        for path in sorted(self.folder.iterdir()):
+            video_id = path.name.split('.', 1)[0]
+            if video_id not in self.videos:
+                continue
+            if path.suffix in SUBTITLE_EXTENSIONS:
+                # VIDEO_ID.LANG.vtt (nome padrão do yt-dlp) ou VIDEO_ID.vtt
+                parts = path.name.split('.')
+                lang = parts[1] if len(parts) > 2 else 'pt'
+                self.videos[video_id]['subtitles'][lang] = path
+            elif path.suffix in AUDIO_EXTENSIONS:
+                self.videos[video_id]['audio'] = path
+            elif path.suffix in THUMBNAIL_EXTENSIONS:
+                self.videos[video_id]['thumbnail'] = path
+
+        # Sem playlist gravada: uma com todos os vídeos
+        if not self.playlists and self.videos:
+            self.playlists['PLfixtures'] = {
+                '_type': 'playlist', 'id': 'PLfixtures', 'title': "Fixtures",
+                'entries': [{'id': video_id} for video_id in self.videos]
+            }
+
+    def automatic_languages(self, video_id: str) -> set:
+        """Idiomas cuja legenda gravada é automática (só em automatic_captions no info JSON)"""
+        info = self.videos[video_id]['info']
+        return set(info.get('automatic_captions') or {}) - set(info.get('subtitles') or {})
+
+    def video_info(self, video_id: str, base_url: str) -> Dict[str, Any]:
+        """Info JSON do vídeo com legendas e áudio apontando para o servidor local"""
+        entry = self.videos[video_id]
+        info = {key: value for key, value in entry['info'].items()
+                if key not in ('formats', 'requested_formats', 'requested_subtitles', 'url')}
+        # As URLs gravadas das legendas e da miniatura apontam para o YouTube; cada legenda
+        # local continua do tipo gravado (automática ou manual)
+        automatic = self.automatic_languages(video_id)
+        tracks = {
+            lang: [{'ext': path.suffix[1:], 'url': f"{base_url}/files/{quote(path.name)}"}]
+            for lang, path in entry['subtitles'].items()
+        }
+        info['subtitles'] = {lang: track for lang, track in tracks.items() if lang not in automatic}
+        info['automatic_captions'] = {lang: track for lang, track in tracks.items() if lang in automatic}
+        info['thumbnail'] = f"{base_url}/files/{quote(entry['thumbnail'].name)}" if entry['thumbnail'] else ''
+        if entry['audio']:
+            info['url'] = f"{base_url}/files/{quote(entry['audio'].name)}"
+            info['ext'] = entry['audio'].suffix[1:]
+            info['filesize'] = entry['audio'].stat().st_size
+        return info
+
+
+# ---------------------------------------------------------------- servidor local
+
+class FixtureServer:
+    """Servidor HTTP local no lugar do YouTube, com latência artificial por requisição"""
+
+    def __init__(self, fixtures: Fixtures, latency_ms: float = 0.0):
+        self.fixtures = fixtures
+        self.latency = latency_ms / 1000.0
+        self.requests = 0
+        self.lock = threading.Lock()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                with server.lock:
+                    server.requests += 1
+                if server.latency:
+                    time.sleep(server.latency)
+
+                parts = urlparse(self.path).path.strip('/').split('/', 1)
+                try:
+                    if parts[0] == 'video':
+                        body = json.dumps(server.fixtures.video_info(parts[1], server.base_url)).encode('utf-8')
+                        content_type = 'application/json'
+                    elif parts[0] == 'playlist':
+                        body = json.dumps(server.fixtures.playlists[parts[1]]).encode('utf-8')
+                        content_type = 'application/json'
+                    elif parts[0] == 'files':
+                        path = server.fixtures.folder / Path(unquote(parts[1])).name
+                        body = path.read_bytes()
+                        content_type = 'application/octet-stream'
+                    else:
+                        raise KeyError(self.path)
+                except (KeyError, IndexError, FileNotFoundError):
+                    self.send_error(404)
+                    return
+
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.httpd.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class ReplayYoutubeDL:
+    """
+    Subconjunto do yt_dlp.YoutubeDL usado pelo extrator, respondido pelo FixtureServer
+    (extract_info, urlopen e download de áudio com outtmpl)
+    """
+
+    base_url = ""
+
+    def __init__(self, params: Optional[Dict[str, Any]] = None):
+        self.params = params or {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def _get_json(self, path: str) -> Dict[str, Any]:
+        with urlopen(f"{self.base_url}/{path}") as response:
+            return json.loads(response.read().decode('utf-8'))
+
+    def extract_info(self, url: str, download: bool = False) -> Dict[str, Any]:
+        query = parse_qs(urlparse(url).query)
+        if 'list' in query:
+            return self._get_json(f"playlist/{query['list'][0]}")
+        if 'v' in query:
+            info = self._get_json(f"video/{query['v'][0]}")
+            if download:
+                self._download_audio(info)
+            return info
+        raise ValueError(f"URL não reconhecida pelo replay: {url}")
+
+    def urlopen(self, url: str):
+        return urlopen(url)
+
+    def download(self, urls: List[str]) -> int:
+        for url in urls:
+            self.extract_info(url, download=True)
+        return 0
+
+    def _download_audio(self, info: Dict[str, Any]):
+        if not info.get('url'):
+            raise RuntimeError(f"Sem áudio nas fixtures para {info.get('id')}")
+        target = self.params.get('outtmpl', '%(id)s.%(ext)s')
+        target = target.replace('%(ext)s', info['ext']).replace('%(id)s', info['id'])
+        with urlopen(info['url']) as response, open(target, 'wb') as f:
+            f.write(response.read())
+
+
+# ---------------------------------------------------------------- medições
+
+class StageTimer:
+    """Latência de cada etapa: envolve os métodos da instância do extrator"""
+
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = {}
+        self.lock = threading.Lock()
+
+    def wrap(self, extractor: YouTubeRAGExtractor, names: List[str]):
+        for name in names:
+            method = getattr(extractor, name, None)
+            if method is not None:
+                setattr(extractor, name, self._timed(name, method))
+
+    def _timed(self, name, method):
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.add(name, time.perf_counter() - start)
+        return timed
+
+    def add(self, name: str, seconds: float):
+        with self.lock:
+            self.samples.setdefault(name, []).append(seconds)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        return {name: describe(values) for name, values in self.samples.items()}
+
+
+def describe(values: List[float]) -> Dict[str, float]:
+    ordered = sorted(values)
+
+    def percentile(p):
+        return ordered[min(len(ordered) - 1, int(round(p * (len(ordered) - 1))))]
+
+    return {
+        'calls': len(ordered),
+        'total_ms': sum(ordered) * 1000,
+        'mean_ms': sum(ordered) / len(ordered) * 1000,
+        'p50_ms': percentile(0.5) * 1000,
+        'p95_ms': percentile(0.95) * 1000,
+        'max_ms': ordered[-1] * 1000,
+    }
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Pico de memória residente do processo até agora (MB)"""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss: KB no Linux, bytes no macOS
+        return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+    except ImportError:
+        pass
+    try:
+        import psutil
+        memory = psutil.Process().memory_info()
+        return getattr(memory, 'peak_wset', memory.rss) / (1024 * 1024)
+    except ImportError:
+        return None
+
+
+@contextlib.contextmanager
+def quiet(verbose: bool):
+    """Silencia os prints do extrator durante as medições"""
+    if verbose:
+        yield
+        return
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+def new_extractor(storage: Path, args) -> YouTubeRAGExtractor:
+    return YouTubeRAGExtractor(
+        str(storage),
+        chunk_size=args.chunk_size,
+        fetch_workers=args.fetch_workers,
+        transcribe_workers=args.transcribe_workers,
+        rate_limit=args.rate_limit
+    )
+
+
+def scenario_result(videos: int, successful: int, wall: float, timer: StageTimer,
+                    server: FixtureServer, requests_before: int) -> Dict[str, Any]:
+    return {
+        'videos': videos,
+        'successful': successful,
+        'wall_seconds': wall,
+        'videos_per_minute': videos / wall * 60 if wall else 0.0,
+        'http_requests': server.requests - requests_before,
+        'peak_rss_mb': peak_rss_mb(),
+        'stages': timer.summary(),
+    }
+
+
+def run_single_videos(fixtures: Fixtures, server: FixtureServer, work_dir: Path, args) -> Dict[str, Any]:
+    with quiet(args.verbose):
+        extractor = new_extractor(work_dir / 'single', args)
+    timer = StageTimer()
+    timer.wrap(extractor, STAGES)
+
+    requests_before = server.requests
+    successful = 0
+    start = time.perf_counter()
+    with quiet(args.verbose):
+        for video_id in fixtures.videos:
+            result = extractor.extract_single_video(video_id)
+            successful += bool(result.get('success'))
+    wall = time.perf_counter() - start
+    return scenario_result(len(fixtures.videos), successful, wall, timer, server, requests_before)
+
+
+def run_playlist(fixtures: Fixtures, server: FixtureServer, storage: Path, args) -> Dict[str, Any]:
+    playlist_id = next(iter(fixtures.playlists))
+    with quiet(args.verbose):
+        extractor = new_extractor(storage, args)
+    timer = StageTimer()
+    timer.wrap(extractor, STAGES)
+
+    requests_before = server.requests
+    start = time.perf_counter()
+    with quiet(args.verbose):
+        result = extractor.extract_playlist(f"https://www.youtube.com/playlist?list={playlist_id}")
+    wall = time.perf_counter() - start
+    if 'error' in result:
+        raise RuntimeError(f"extract_playlist falhou: {result['error']}")
+    return scenario_result(result['total_videos'], result['successful_extractions'], wall,
+                           timer, server, requests_before)
+
+
+def run_stages(fixtures: Fixtures, work_dir: Path, args) -> Dict[str, Any]:
+    """create_chunks, analyze_content e save_to_database isolados, na maior legenda das fixtures"""
+    with quiet(args.verbose):
+        extractor = new_extractor(work_dir / 'stages', args)
+
+    subtitles = [(path.stat().st_size, video_id, path)
+                 for video_id, entry in fixtures.videos.items() for path in entry['subtitles'].values()]
+    if not subtitles:
+        return {}
+    _, video_id, path = max(subtitles)
+    metadata = fixtures.videos[video_id]['info']
+    lang = next(lang for lang, track in fixtures.videos[video_id]['subtitles'].items() if track == path)
+
+    with quiet(args.verbose):
+        with open(path, 'rb') as f:
+            transcript = extractor.parse_vtt_content(
+                video_id, f, lang, is_generated=lang in fixtures.automatic_languages(video_id)
+            )
+
+    timer = StageTimer()
+    with quiet(args.verbose):
+        db_path = extractor.create_database()
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            chunks = extractor.create_chunks(transcript['full_text'], segments=transcript['segments'])
+            timer.add('create_chunks', time.perf_counter() - start)
+
+            start = time.perf_counter()
+            analysis = extractor.analyze_content(transcript)
+            timer.add('analyze_content', time.perf_counter() - start)
+
+            start = time.perf_counter()
+            extractor.save_to_database(db_path, video_id, metadata, transcript, chunks, analysis)
+            timer.add('save_to_database', time.perf_counter() - start)
+
+    return {
+        'video_id': video_id,
+        'segments': len(transcript['segments']),
+        'characters': len(transcript['full_text']),
+        'chunks': len(chunks),
+        'repeat': args.repeat,
+        'peak_rss_mb': peak_rss_mb(),
+        'stages': timer.summary(),
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=Path(__file__).resolve().parent, timeout=5)
+        return result.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+# ---------------------------------------------------------------- relatório
+
+def print_report(report: Dict[str, Any]):
+    print(f"📊 Benchmark do extrator ({report['fixtures']['videos']} vídeos, commit {report['git_commit'] or '?'})")
+    print("=" * 72)
+    for name, scenario in report['scenarios'].items():
+        print(f"⏱️  {name}: {scenario['wall_seconds']:.2f} s, {scenario['videos_per_minute']:.1f} vídeos/min, "
+              f"{scenario['successful']}/{scenario['videos']} ok, {scenario['http_requests']} requisições, "
+              f"pico RSS {scenario['peak_rss_mb'] or 0:.0f} MB")
+        print_stages(scenario['stages'])
+
+    stages = report.get('stages')
+    if stages:
+        print(f"⏱️  etapas isoladas ({stages['segments']} segmentos, {stages['chunks']} chunks, "
+              f"{stages['repeat']} repetições):")
+        print_stages(stages['stages'])
+    print("=" * 72)
+
+
+def print_stages(stages: Dict[str, Dict[str, float]]):
+    for name, stats in stages.items():
+        print(f"   {name:32s} {stats['calls']:4d}x  média {stats['mean_ms']:9.2f} ms  "
+              f"p95 {stats['p95_ms']:9.2f} ms  máx {stats['max_ms']:9.2f} ms")
+
+
+def print_comparison(report: Dict[str, Any], baseline: Dict[str, Any]):
+    """Variação em relação a um JSON anterior (vídeos/min e média de cada etapa)"""
+    print(f"📈 Comparação com commit {baseline.get('git_commit') or '?'}")
+    if baseline.get('params') != report['params'] or baseline.get('fixtures') != report['fixtures']:
+        print("   ⚠️  Parâmetros ou fixtures diferentes da execução anterior")
+    for name, scenario in report['scenarios'].items():
+        before = baseline.get('scenarios', {}).get(name)
+        if not before or not before.get('videos_per_minute'):
+            continue
+        ratio = scenario['videos_per_minute'] / before['videos_per_minute']
+        print(f"   {name:32s} {before['videos_per_minute']:8.1f} -> {scenario['videos_per_minute']:8.1f} vídeos/min ({ratio:.2f}x)")
+
+    for name, stats in report.get('stages', {}).get('stages', {}).items():
+        before = baseline.get('stages', {}).get('stages', {}).get(name)
+        if before and stats['mean_ms']:
+            print(f"   {name:32s} {before['mean_ms']:8.2f} -> {stats['mean_ms']:8.2f} ms ({before['mean_ms'] / stats['mean_ms']:.2f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do YouTubeRAGExtractor com fixtures locais")
+    parser.add_argument('--fixtures', help='Pasta com fixtures gravadas (padrão: sintéticas)')
+    parser.add_argument('--videos', type=int, default=8, help='Vídeos sintéticos (padrão: 8)')
+    parser.add_argument('--minutes', type=float, default=20, help='Duração de cada vídeo sintético (padrão: 20)')
+    parser.add_argument('--latency-ms', type=float, default=20, help='Latência artificial por requisição (padrão: 20)')
+    parser.add_argument('--repeat', type=int, default=REPEAT, help=f'Repetições das etapas isoladas (padrão: {REPEAT})')
+    parser.add_argument('--chunk-size', type=int, default=500)
+    parser.add_argument('--fetch-workers', type=int, default=4)
+    parser.add_argument('--transcribe-workers', type=int, default=1)
+    parser.add_argument('--rate-limit', type=float, default=0, help='Requisições/s por host (padrão: 0 = sem limite)')
+    parser.add_argument('--json', help='Arquivo de saída com o resultado em JSON')
+    parser.add_argument('--compare', help='JSON de uma execução anterior para comparar')
+    parser.add_argument('--verbose', action='store_true', help='Mostrar a saída do extrator')
+    args = parser.parse_args()
+
+    if not args.verbose:
+        logging.getLogger().setLevel(logging.WARNING)
+
+    # Nada sai para a rede: legendas pelo yt-dlp "replay", sem youtube-transcript-api
+    youtube_extractor.yt_dlp = type('ReplayModule', (), {'YoutubeDL': ReplayYoutubeDL})
+    youtube_extractor.YT_DLP_AVAILABLE = True
+    youtube_extractor.YOUTUBE_TRANSCRIPT_AVAILABLE = False
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        work_dir = Path(temp_dir)
+        if args.fixtures:
+            fixtures_dir = Path(args.fixtures)
+        else:
+            fixtures_dir = work_dir / 'fixtures'
+            generate_fixtures(fixtures_dir, args.videos, args.minutes)
+        fixtures = Fixtures(fixtures_dir)
+        if not fixtures.videos:
+            print(f"❌ Nenhuma fixture (*.info.json) em {fixtures_dir}")
+            sys.exit(1)
+
+        with FixtureServer(fixtures, args.latency_ms) as server:
+            ReplayYoutubeDL.base_url = server.base_url
+
+            scenarios = {'single_video': run_single_videos(fixtures, server, work_dir, args)}
+            # Mesma pasta nas duas execuções: a segunda encontra os metadados no cache
+            scenarios['playlist_cold'] = run_playlist(fixtures, server, work_dir / 'playlist', args)
+            scenarios['playlist_warm_cache'] = run_playlist(fixtures, server, work_dir / 'playlist', args)
+            stages = run_stages(fixtures, work_dir, args)
+
+    report = {
+        'benchmark': 'youtube_extractor',
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'git_commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'params': {key: value for key, value in vars(args).items() if key not in ('json', 'compare', 'verbose')},
+        'fixtures': {
+            'source': str(args.fixtures) if args.fixtures else 'synthetic',
+            'videos': len(fixtures.videos),
+            'playlists': len(fixtures.playlists),
+        },
+        'scenarios': scenarios,
+        'stages': stages,
+        'peak_rss_mb': peak_rss_mb(),
+    }
+
+    print_report(report)
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            print_comparison(report, json.load(f))
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"💾 Resultado: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,8 +8,10 @@ Inclui todas as funcionalidades: analysis, summary, text, transcript, database,
 
 import os
 import sys
+import atexit
 import json
 import csv
+import hashlib
 import sqlite3
 import shutil
 import zipfile
@@ -17,7 +19,9 @@ import argparse
 import re
 import logging
 import time
+import threading
 import subprocess
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from pathlib import Path
 from datetime import datetime
 
@@ -48,7 +52,7 @@ def auto_configure_ffmpeg():
 
 # Configurar FFmpeg automaticamente na inicialização
 auto_configure_ffmpeg()
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, Any, Optional, Tuple
 from urllib.parse import urlparse, parse_qs
 from collections import Counter
 
@@ -104,10 +108,47 @@ except ImportError:
     print(" pandas não instalado. Execute: pip install pandas")
     PANDAS_AVAILABLE = False
 
+# Chunker, parser de legendas, pool do Whisper e streaming de áudio compartilhados com o backend do sistema RAG
+sys.path.append(str(Path(__file__).resolve().parent.parent / "rag-system" / "backend"))
+from text_chunker import SegmentChunker, TextChunker
+from subtitle_parser import parse_subtitles, parse_timestamp
+from whisper_pool import get_transcription_pool
+from audio_stream import pcm_to_float32, stream_pcm_windows
+from vad_segmenter import decode_pcm, frame_rms, plan_segments, segment_pcm
+
 # Configuração de logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+
+class HostRateLimiter:
+    """
+    Intervalo mínimo entre requisições ao mesmo host, compartilhado entre threads
+    """
+    
+    def __init__(self, requests_per_second: float = 2.0):
+        """
+        Args:
+            requests_per_second: Requisições por segundo por host (0 = sem limite)
+        """
+        self.interval = 1.0 / requests_per_second if requests_per_second > 0 else 0.0
+        self.next_slot: Dict[str, float] = {}
+        self.lock = threading.Lock()
+    
+    def wait(self, url: str):
+        """Bloqueia até o próximo horário livre do host da URL"""
+        if not self.interval:
+            return
+        
+        host = urlparse(url).netloc or url
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot.get(host, 0.0))
+            self.next_slot[host] = slot + self.interval
+        
+        if slot > now:
+            time.sleep(slot - now)
+
 # Stop words para filtro de keywords
 STOP_WORDS = {
     'en': {
@@ -136,6 +177,418 @@ STOP_WORDS = {
     }
 }
 
+# Etapas de cada vídeo registradas no manifesto da playlist (na ordem em que acontecem)
+MANIFEST_STAGES = ('metadata', 'transcript', 'chunks', 'db')
+
+
+class PlaylistManifest:
+    """
+    Checkpoint da extração de uma playlist: etapas concluídas por vídeo
+    
+    Regravado de forma atômica (arquivo temporário + os.replace) a cada etapa,
+    então uma queda no meio da playlist sempre deixa um manifesto válido para o --resume.
+    """
+    
+    FILENAME = 'playlist_manifest.json'
+    
+    def __init__(self, playlist_folder: Path, playlist_id: str):
+        self.path = Path(playlist_folder) / self.FILENAME
+        self.lock = threading.Lock()
+        self.data = {'playlist_id': playlist_id, 'videos': {}}
+        
+        if self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self.data = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f" Manifesto ilegível, recomeçando do zero: {e}")
+    
+    @classmethod
+    def read_playlist_id(cls, playlist_folder: Path) -> Optional[str]:
+        """ID da playlist registrado no manifesto da pasta (None se não houver)"""
+        try:
+            with open(Path(playlist_folder) / cls.FILENAME, 'r', encoding='utf-8') as f:
+                return json.load(f).get('playlist_id')
+        except (OSError, ValueError):
+            return None
+    
+    def video(self, video_id: str) -> Dict[str, Any]:
+        return self.data['videos'].get(video_id, {})
+    
+    def is_done(self, video_id: str, stage: str) -> bool:
+        return stage in self.video(video_id).get('stages', {})
+    
+    def is_complete(self, video_id: str) -> bool:
+        return all(self.is_done(video_id, stage) for stage in MANIFEST_STAGES)
+    
+    def mark(self, video_id: str, stage: str, **info):
+        """Registra a etapa concluída (e informações do vídeo) e grava o manifesto"""
+        with self.lock:
+            entry = self.data['videos'].setdefault(video_id, {'stages': {}})
+            entry['stages'][stage] = datetime.now().isoformat()
+            entry.update(info)
+            self.data['updated_at'] = datetime.now().isoformat()
+            
+            temp_path = self.path.with_name(self.path.name + '.tmp')
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.data, f, indent=2, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.path)
+
+
+# Arquivos reaproveitáveis de um vídeo (--reuse-data), reconhecidos pelo nome
+ARTIFACT_PATTERNS = [
+    ('transcript', re.compile(r'^(?P<video_id>[\w-]{11})_\d{8}_\d{6}_transcript\.json$')),
+    ('transcript', re.compile(r'^transcript_(?P<video_id>[\w-]{11})\.json$')),
+    ('transcript', re.compile(r'^(?P<video_id>[\w-]{11})_transcript\.json$')),
+    ('metadata', re.compile(r'^(?P<video_id>[\w-]{11})_\d{8}_\d{6}_metadata\.json$')),
+    ('audio', re.compile(r'^audio_(?P<video_id>[\w-]{11})\.\w+$')),
+]
+
+
+class ArtifactIndex:
+    """
+    Índice persistente (SQLite) dos arquivos já extraídos: video_id -> transcrições, metadados e áudios
+    
+    Substitui a varredura recursiva do storage a cada vídeo no --reuse-data:
+    a consulta é por chave, e o índice é atualizado a cada save_video_data.
+    """
+    
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.Lock()
+        
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS video_artifacts (
+                    path TEXT PRIMARY KEY,
+                    video_id TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    size INTEGER,
+                    sha256 TEXT,
+                    mtime REAL,
+                    indexed_at TEXT
+                )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_artifacts_video ON video_artifacts(video_id, kind)')
+            conn.execute('CREATE TABLE IF NOT EXISTS artifact_index_info (key TEXT PRIMARY KEY, value TEXT)')
+            conn.commit()
+    
+    @staticmethod
+    def classify(file_name: str) -> Optional[Tuple[str, str]]:
+        """(video_id, tipo) de um arquivo reaproveitável, ou None"""
+        for kind, pattern in ARTIFACT_PATTERNS:
+            match = pattern.match(file_name)
+            if match:
+                return match.group('video_id'), kind
+        return None
+    
+    @staticmethod
+    def file_sha256(path: Path) -> str:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+        return digest.hexdigest()
+    
+    def _row(self, video_id: str, kind: str, path: Path, now: str) -> Tuple:
+        stat = path.stat()
+        return (str(path.resolve()), video_id, kind, stat.st_size, self.file_sha256(path), stat.st_mtime, now)
+    
+    def add_files(self, paths: List[Path]):
+        """Indexa os arquivos reconhecidos por ARTIFACT_PATTERNS (os demais são ignorados)"""
+        now = datetime.now().isoformat()
+        rows = []
+        for path in paths:
+            match = self.classify(Path(path).name)
+            if match and Path(path).is_file():
+                rows.append(self._row(match[0], match[1], Path(path), now))
+        
+        if rows:
+            with self.lock, sqlite3.connect(self.db_path) as conn:
+                conn.executemany('INSERT OR REPLACE INTO video_artifacts VALUES (?, ?, ?, ?, ?, ?, ?)', rows)
+                conn.commit()
+    
+    def is_built(self) -> bool:
+        with sqlite3.connect(self.db_path) as conn:
+            return conn.execute("SELECT 1 FROM artifact_index_info WHERE key = 'built_at'").fetchone() is not None
+    
+    def rebuild(self, storage_dir: Path) -> int:
+        """
+        Recria o índice com uma única varredura do storage
+        
+        Returns:
+            int: Número de arquivos indexados
+        """
+        now = datetime.now().isoformat()
+        rows = []
+        for path in Path(storage_dir).rglob('*'):
+            match = self.classify(path.name)
+            if match and path.is_file():
+                try:
+                    rows.append(self._row(match[0], match[1], path, now))
+                except OSError as e:
+                    print(f" Arquivo ignorado no índice: {path} ({e})")
+        
+        with self.lock, sqlite3.connect(self.db_path) as conn:
+            conn.execute('DELETE FROM video_artifacts')
+            conn.executemany('INSERT OR REPLACE INTO video_artifacts VALUES (?, ?, ?, ?, ?, ?, ?)', rows)
+            conn.execute("INSERT OR REPLACE INTO artifact_index_info (key, value) VALUES ('built_at', ?)", (now,))
+            conn.commit()
+        
+        return len(rows)
+    
+    def lookup(self, video_id: str) -> Dict[str, List[str]]:
+        """
+        Arquivos do vídeo por tipo ('transcript', 'metadata', 'audio'), do mais recente ao mais antigo
+        
+        Arquivos apagados desde a indexação saem do índice.
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute(
+                'SELECT path, kind FROM video_artifacts WHERE video_id = ? ORDER BY mtime DESC', (video_id,)
+            ).fetchall()
+        
+        files = {'transcript': [], 'metadata': [], 'audio': []}
+        missing = []
+        for path, kind in rows:
+            if os.path.exists(path):
+                files[kind].append(path)
+            else:
+                missing.append((path,))
+        
+        if missing:
+            with self.lock, sqlite3.connect(self.db_path) as conn:
+                conn.executemany('DELETE FROM video_artifacts WHERE path = ?', missing)
+                conn.commit()
+        
+        return files
+
+
+class TranscriptDatabaseWriter:
+    """
+    Gravação em lote no banco de transcrições
+    
+    A conexão (WAL) do último banco usado fica aberta e é reaproveitada, junto com o
+    cache de comandos preparados do sqlite3, enquanto os vídeos vão para o mesmo arquivo;
+    ao trocar de banco (cada vídeo tem o seu youtube_transcripts.db) a anterior é fechada.
+    Cada vídeo é uma única transação com executemany seguida de um checkpoint, então o
+    .db fica completo (para o ZIP ou uma cópia) sem depender do -wal. Segmentos/chunks
+    são upserts por (video_id, índice): reprocessar um vídeo substitui as linhas em vez
+    de duplicá-las.
+    """
+    
+    UPSERT_METADATA = '''
+        INSERT OR REPLACE INTO video_metadata 
+        (video_id, title, description, uploader, upload_date, duration, view_count, like_count, extraction_date, extractor_version)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    '''
+    UPSERT_SEGMENT = '''
+        INSERT INTO transcript_segments 
+        (video_id, segment_index, text, start_time, duration, end_time)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT (video_id, segment_index) DO UPDATE SET
+            text = excluded.text, start_time = excluded.start_time,
+            duration = excluded.duration, end_time = excluded.end_time
+    '''
+    UPSERT_CHUNK = '''
+        INSERT INTO content_chunks 
+        (video_id, chunk_index, text, start_char, end_char, char_count, word_count, start_time, end_time)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (video_id, chunk_index) DO UPDATE SET
+            text = excluded.text, start_char = excluded.start_char, end_char = excluded.end_char,
+            char_count = excluded.char_count, word_count = excluded.word_count,
+            start_time = excluded.start_time, end_time = excluded.end_time
+    '''
+    UPSERT_ANALYSIS = '''
+        INSERT OR REPLACE INTO content_analysis 
+        (video_id, language_detected, transcript_type, total_characters, total_words, total_segments, keywords, topics, sentiment)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    '''
+    
+    def __init__(self):
+        self.db_path: Optional[str] = None
+        self.conn: Optional[sqlite3.Connection] = None
+        self.lock = threading.Lock()
+    
+    def _close_connection(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+            self.db_path = None
+    
+    def _connection(self, db_path: str) -> sqlite3.Connection:
+        if self.db_path != db_path:
+            self._close_connection()
+            conn = sqlite3.connect(db_path, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            YouTubeRAGExtractor.ensure_indexes(conn.cursor())
+            conn.commit()
+            self.conn, self.db_path = conn, db_path
+        return self.conn
+    
+    def write_video(self, db_path: str, video_id: str, metadata: Dict, transcript: Optional[Dict],
+                    chunks: List[Dict], analysis: Dict):
+        """Grava metadados, segmentos, chunks e análise de um vídeo em uma transação"""
+        segments = transcript.get('segments', []) if transcript else []
+        segment_rows = [
+            (
+                video_id,
+                segment.get('index', i),
+                segment.get('text', ''),
+                segment.get('start', 0),
+                segment.get('duration', 0),
+                segment.get('end', 0)
+            )
+            for i, segment in enumerate(segments)
+        ]
+        chunk_rows = [
+            (
+                video_id,
+                chunk.get('index', i),
+                chunk.get('text', ''),
+                chunk.get('start_char', 0),
+                chunk.get('end_char', 0),
+                chunk.get('char_count', 0),
+                chunk.get('word_count', 0),
+                chunk.get('start_time'),
+                chunk.get('end_time')
+            )
+            for i, chunk in enumerate(chunks)
+        ]
+        
+        with self.lock:
+            conn = self._connection(db_path)
+            with conn:
+                conn.execute(self.UPSERT_METADATA, (
+                    video_id,
+                    metadata.get('title', ''),
+                    metadata.get('description', ''),
+                    metadata.get('uploader', ''),
+                    metadata.get('upload_date', ''),
+                    metadata.get('duration', 0),
+                    metadata.get('view_count', 0),
+                    metadata.get('like_count', 0),
+                    metadata.get('extraction_date', ''),
+                    metadata.get('extractor_version', '3.0.0')
+                ))
+                
+                # Linhas além do último índice sobram de uma extração anterior maior
+                if segment_rows:
+                    conn.executemany(self.UPSERT_SEGMENT, segment_rows)
+                    conn.execute('DELETE FROM transcript_segments WHERE video_id = ? AND segment_index > ?',
+                                 (video_id, max(row[1] for row in segment_rows)))
+                
+                conn.executemany(self.UPSERT_CHUNK, chunk_rows)
+                conn.execute('DELETE FROM content_chunks WHERE video_id = ? AND chunk_index > ?',
+                             (video_id, max((row[1] for row in chunk_rows), default=-1)))
+                
+                if analysis:
+                    conn.execute(self.UPSERT_ANALYSIS, (
+                        video_id,
+                        analysis.get('content_analysis', {}).get('language_detected', ''),
+                        analysis.get('content_analysis', {}).get('transcript_type', ''),
+                        analysis.get('statistics', {}).get('total_characters', 0),
+                        analysis.get('statistics', {}).get('total_words', 0),
+                        analysis.get('statistics', {}).get('total_segments', 0),
+                        json.dumps(analysis.get('keywords', [])),
+                        json.dumps(analysis.get('topics', [])),
+                        analysis.get('sentiment', 'neutral')
+                    ))
+            
+            # Incorpora o WAL ao arquivo principal: o .db já pode ser copiado/compactado
+            conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+    
+    def close(self):
+        """Fecha a conexão aberta (o SQLite incorpora o WAL ao arquivo principal)"""
+        with self.lock:
+            self._close_connection()
+
+
+class MetadataCache:
+    """
+    Cache em disco (SQLite) dos metadados do yt-dlp, com validade (TTL)
+    
+    Chaves 'video:<id>' e 'playlist:<id>'; dentro do TTL, reprocessar uma playlist
+    não faz nenhuma chamada de rede para metadados. Respostas com erro não são guardadas.
+    """
+    
+    def __init__(self, db_path: Path, ttl_hours: float = 24.0):
+        """
+        Args:
+            db_path: Arquivo do cache
+            ttl_hours: Validade das entradas em horas (0 = cache desativado)
+        """
+        self.db_path = Path(db_path)
+        self.ttl_seconds = max(0.0, ttl_hours) * 3600
+        self.lock = threading.Lock()
+        
+        # Contadores (não persistidos)
+        self.hits = 0
+        self.misses = 0
+        
+        if not self.ttl_seconds:
+            return
+        
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS metadata_cache (
+                    key TEXT PRIMARY KEY,
+                    data TEXT NOT NULL,
+                    fetched_at REAL NOT NULL
+                )
+            ''')
+            conn.commit()
+    
+    def get_many(self, keys: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Entradas ainda válidas entre as chaves pedidas (as vencidas ou ausentes ficam de fora)"""
+        if not self.ttl_seconds or not keys:
+            return {}
+        
+        found = {}
+        oldest = time.time() - self.ttl_seconds
+        with self.lock, sqlite3.connect(self.db_path) as conn:
+            # Consultas em lotes abaixo do limite de parâmetros do SQLite
+            for start in range(0, len(keys), 500):
+                batch = keys[start:start + 500]
+                rows = conn.execute(
+                    f'SELECT key, data FROM metadata_cache WHERE fetched_at >= ? AND key IN ({",".join("?" * len(batch))})',
+                    [oldest, *batch]
+                ).fetchall()
+                for key, data in rows:
+                    found[key] = json.loads(data)
+        
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return self.get_many([key]).get(key)
+    
+    def put_many(self, items: Dict[str, Dict[str, Any]]):
+        """Grava (ou renova) as entradas em uma transação"""
+        if not self.ttl_seconds:
+            return
+        
+        now = time.time()
+        rows = [(key, json.dumps(data, ensure_ascii=False), now) for key, data in items.items() if 'error' not in data]
+        if not rows:
+            return
+        
+        with self.lock, sqlite3.connect(self.db_path) as conn:
+            conn.executemany('INSERT OR REPLACE INTO metadata_cache (key, data, fetched_at) VALUES (?, ?, ?)', rows)
+            conn.commit()
+    
+    def put(self, key: str, data: Dict[str, Any]):
+        self.put_many({key: data})
+
+
 class YouTubeRAGExtractor:
     """
      Extrator RAG completo de vídeos do YouTube
@@ -143,8 +596,9 @@ class YouTubeRAGExtractor:
     
     def __init__(self, storage_dir: str = "storage", proxy: Optional[str] = None, use_tor: bool = False,
                  advanced_mode: bool = False, save_audio: bool = False, reuse_data: bool = False,
-                 chunk_size: int = 500, max_chunks: int = 30, cookies_from_browser: Optional[str] = None,
-                 cookies_file: Optional[str] = None):
+                 chunk_size: int = 500, max_chunks: int = 0, cookies_from_browser: Optional[str] = None,
+                 cookies_file: Optional[str] = None, fetch_workers: int = 4, transcribe_workers: int = 1,
+                 rate_limit: float = 2.0, metadata_ttl: float = 24.0, stream_audio: bool = False):
         """
         Inicializa o extrator RAG de videos do YouTube
         
@@ -156,10 +610,15 @@ class YouTubeRAGExtractor:
             save_audio: Salvar arquivos de áudio permanentemente
             reuse_data: Reutilizar dados de versões anteriores
             chunk_size: Tamanho dos chunks (padrão 500, avançado 1000)
-            max_chunks: Número máximo de chunks (padrão 30, avançado 100)
+            max_chunks: Número máximo de chunks (padrão 0 = sem limite)
             cookies_from_browser: Navegador do qual extrair cookies (chrome, firefox, edge, etc.)
             cookies_file: Arquivo de cookies (.txt) para vídeos de membros
             cookies_file: Caminho para arquivo de cookies no formato Netscape
+            fetch_workers: Threads da etapa de rede da playlist (metadados e legendas)
+            transcribe_workers: Vídeos da playlist em download de áudio + Whisper ao mesmo tempo
+            rate_limit: Requisições por segundo por host na playlist (0 = sem limite)
+            metadata_ttl: Validade em horas do cache de metadados de vídeos/playlists (0 = sem cache)
+            stream_audio: Transcrever o áudio durante o download (FFmpeg -> janelas PCM), sem arquivo temporário
         """
         self.storage_dir = Path(storage_dir)
         self.storage_dir.mkdir(exist_ok=True)
@@ -174,20 +633,35 @@ class YouTubeRAGExtractor:
         self.advanced_mode = advanced_mode
         self.save_audio = save_audio
         self.reuse_data = reuse_data
+        self.stream_audio = stream_audio
         
         #  CONFIGURAÇÕES DE COOKIES PARA VÍDEOS RESTRITOS A MEMBROS
         self.cookies_from_browser = cookies_from_browser
         self.cookies_file = cookies_file
         self.cookies_file = cookies_file
         
-        # Configurações de chunks baseadas no modo
+        # Concorrência do pipeline de playlist (a escrita é sempre um único thread)
+        self.fetch_workers = max(1, fetch_workers)
+        self.transcribe_workers = max(1, transcribe_workers)
+        self.rate_limiter = HostRateLimiter(rate_limit)
+        self.index_lock = threading.Lock()
+        
+        # Metadados: um YoutubeDL por thread e cache em disco (criado em setup_directory_structure)
+        self.metadata_ttl = metadata_ttl
+        self._ydl_local = threading.local()
+        
+        # Conexão do banco reaproveitada entre vídeos do mesmo arquivo (fechada na saída do processo)
+        self.db_writer = TranscriptDatabaseWriter()
+        atexit.register(self.db_writer.close)
+        
+        # Configurações de chunks baseadas no modo (o texto é sempre chunkado por completo;
+        # max_chunks = 0 significa sem limite)
+        self.max_chunks = max_chunks
         if advanced_mode:
             self.chunk_size = max(chunk_size, 1000)  # Modo avançado: mínimo 1000
-            self.max_chunks = max(max_chunks, 200)   # Modo avançado: mínimo 200 chunks
             print(" MODO AVANÇADO ativado: Chunks maiores para melhor qualidade RAG")
         else:
             self.chunk_size = min(chunk_size, 500)   # Modo básico: máximo 500
-            self.max_chunks = min(max_chunks, 30)    # Modo básico: máximo 30
             print(" MODO BÁSICO ativado: Chunks menores para processamento rápido")
         
         # Configurar estrutura de diretórios baseada no sistema antigo
@@ -196,7 +670,7 @@ class YouTubeRAGExtractor:
         print(f" YouTubeRAGExtractor v5.0 inicializado")
         print(f" Diretório de armazenamento: {self.storage_dir}")
         print(f" Tamanho dos chunks: {self.chunk_size}")
-        print(f" Máximo de chunks: {self.max_chunks}")
+        print(f" Máximo de chunks: {self.max_chunks or 'sem limite'}")
         print(f" Salvar áudio: {'SIM' if self.save_audio else 'NÃO (temporário)'}")
         print(f" Reutilizar dados: {'SIM' if self.reuse_data else 'NÃO'}")
         if self.proxy:
@@ -224,6 +698,12 @@ class YouTubeRAGExtractor:
         # Criar todos os diretórios
         for directory in self.dirs.values():
             directory.mkdir(exist_ok=True)
+        
+        # Índice dos arquivos já extraídos (--reuse-data)
+        self.artifact_index = ArtifactIndex(self.dirs['database'] / 'artifact_index.db')
+        
+        # Cache de metadados do yt-dlp
+        self.metadata_cache = MetadataCache(self.dirs['database'] / 'metadata_cache.db', self.metadata_ttl)
     
     def extract_video_id(self, url: str) -> Optional[str]:
         """
@@ -271,56 +751,67 @@ class YouTubeRAGExtractor:
             logger.error(f"Erro ao extrair ID da playlist: {e}")
             return None
     
-    def get_video_metadata(self, video_id: str) -> Dict[str, Any]:
+    def _metadata_ydl(self, flat: bool = False):
         """
-        Obtém metadados do vídeo usando yt-dlp com suporte a proxy
+        YoutubeDL de metadados do thread atual, criado uma vez por worker e reaproveitado
+        (mantém a sessão HTTP, os cookies e o extrator já inicializados entre vídeos)
+        
+        Args:
+            flat: Listagem de playlist (só os IDs das entradas, sem abrir cada vídeo)
         """
-        if not YT_DLP_AVAILABLE:
-            return {'error': 'yt-dlp não disponível'}
+        attr = 'flat' if flat else 'full'
+        ydl = getattr(self._ydl_local, attr, None)
+        if ydl is not None:
+            return ydl
+        
+        ydl_opts = {
+            'quiet': True,
+            'no_warnings': True,
+            'extract_flat': 'in_playlist' if flat else False
+        }
+        
+        # Adicionar configuração de cookies para vídeos de membros
+        if self.cookies_from_browser:
+            ydl_opts['cookiesfrom_browser'] = self.cookies_from_browser
+            print(f" yt-dlp usando cookies do navegador: {self.cookies_from_browser}")
+        elif self.cookies_file:
+            ydl_opts['cookiefile'] = self.cookies_file
+            print(f" yt-dlp usando arquivo de cookies: {self.cookies_file}")
+        
+        # Adicionar configuração de proxy se disponível
+        if self.proxy:
+            ydl_opts['proxy'] = self.proxy
+            print(f" yt-dlp usando proxy: {self.proxy}")
         
+        ydl = yt_dlp.YoutubeDL(ydl_opts)
+        setattr(self._ydl_local, attr, ydl)
+        return ydl
+    
+    def _fetch_video_metadata(self, video_id: str) -> Dict[str, Any]:
+        """Metadados do vídeo direto do YouTube (sem consultar o cache)"""
         try:
             url = f'https://www.youtube.com/watch?v={video_id}'
+            self.rate_limiter.wait(url)
+            info = self._metadata_ydl().extract_info(url, download=False)
             
-            ydl_opts = {
-                'quiet': True,
-                'no_warnings': True,
-                'extract_flat': False
+            metadata = {
+                'video_id': video_id,
+                'title': info.get('title', ''),
+                'description': info.get('description', ''),
+                'uploader': info.get('uploader', ''),
+                'upload_date': info.get('upload_date', ''),
+                'duration': info.get('duration', 0),
+                'view_count': info.get('view_count', 0),
+                'like_count': info.get('like_count', 0),
+                'comment_count': info.get('comment_count', 0),
+                'thumbnail': info.get('thumbnail', ''),
+                'url': url,
+                'extraction_date': datetime.now().isoformat(),
+                'extractor_version': '3.0.0',
+                'proxy_used': self.proxy if self.proxy else None
             }
             
-            # Adicionar configuração de cookies para vídeos de membros
-            if self.cookies_from_browser:
-                ydl_opts['cookiesfrom_browser'] = self.cookies_from_browser
-                print(f" yt-dlp usando cookies do navegador: {self.cookies_from_browser}")
-            elif self.cookies_file:
-                ydl_opts['cookiefile'] = self.cookies_file
-                print(f" yt-dlp usando arquivo de cookies: {self.cookies_file}")
-            
-            # Adicionar configuração de proxy se disponível
-            if self.proxy:
-                ydl_opts['proxy'] = self.proxy
-                print(f" yt-dlp usando proxy: {self.proxy}")
-            
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(url, download=False)
-                
-                metadata = {
-                    'video_id': video_id,
-                    'title': info.get('title', ''),
-                    'description': info.get('description', ''),
-                    'uploader': info.get('uploader', ''),
-                    'upload_date': info.get('upload_date', ''),
-                    'duration': info.get('duration', 0),
-                    'view_count': info.get('view_count', 0),
-                    'like_count': info.get('like_count', 0),
-                    'comment_count': info.get('comment_count', 0),
-                    'thumbnail': info.get('thumbnail', ''),
-                    'url': url,
-                    'extraction_date': datetime.now().isoformat(),
-                    'extractor_version': '3.0.0',
-                    'proxy_used': self.proxy if self.proxy else None
-                }
-                
-                return metadata
+            return metadata
             
         except Exception as e:
             logger.error(f"Erro ao obter metadados: {e}")
@@ -331,67 +822,106 @@ class YouTubeRAGExtractor:
                 'extraction_date': datetime.now().isoformat()
             }
     
+    def get_video_metadata(self, video_id: str) -> Dict[str, Any]:
+        """
+        Obtém metadados do vídeo usando yt-dlp com suporte a proxy (cache em disco primeiro)
+        """
+        if not YT_DLP_AVAILABLE:
+            return {'error': 'yt-dlp não disponível'}
+        
+        key = f'video:{video_id}'
+        metadata = self.metadata_cache.get(key)
+        if metadata:
+            return metadata
+        
+        metadata = self._fetch_video_metadata(video_id)
+        self.metadata_cache.put(key, metadata)
+        return metadata
+    
+    def prefetch_video_metadata(self, video_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Metadados de vários vídeos de uma vez
+        
+        Uma consulta ao cache para todos; os que faltam são buscados em paralelo
+        (fetch_workers threads, cada um com seu YoutubeDL, respeitando o limite por host)
+        e gravados no cache em uma transação.
+        
+        Returns:
+            Dict: video_id -> metadados (com 'error' nos que falharam)
+        """
+        if not YT_DLP_AVAILABLE or not video_ids:
+            return {}
+        
+        unique_ids = list(dict.fromkeys(video_ids))
+        cached = self.metadata_cache.get_many([f'video:{video_id}' for video_id in unique_ids])
+        results = {video_id: cached[f'video:{video_id}'] for video_id in unique_ids if f'video:{video_id}' in cached}
+        missing = [video_id for video_id in unique_ids if video_id not in results]
+        
+        if missing:
+            print(f" Metadados: {len(results)} no cache, buscando {len(missing)} ({self.fetch_workers} em paralelo)")
+            with ThreadPoolExecutor(min(self.fetch_workers, len(missing)), thread_name_prefix="yt-metadata") as pool:
+                for video_id, metadata in zip(missing, pool.map(self._fetch_video_metadata, missing)):
+                    results[video_id] = metadata
+            self.metadata_cache.put_many({f'video:{video_id}': results[video_id] for video_id in missing})
+        else:
+            print(f" Metadados: {len(results)} no cache, nenhuma chamada de rede")
+        
+        return results
+    
     def get_playlist_info(self, playlist_id: str) -> Dict[str, Any]:
         """
-        Obtém informações completas da playlist incluindo nome
+        Obtém informações da playlist incluindo nome e IDs dos vídeos (cache em disco primeiro)
+        
+        A listagem é plana: os metadados de cada vídeo vêm depois, do cache ou
+        de prefetch_video_metadata, em vez de uma requisição por vídeo aqui.
         """
         if not YT_DLP_AVAILABLE:
             return {}
         
+        key = f'playlist:{playlist_id}'
+        cached = self.metadata_cache.get(key)
+        if cached:
+            print(f" Playlist no cache: '{cached['title']}' ({len(cached.get('video_ids', []))} vídeos)")
+            return cached
+        
         try:
             url = f'https://www.youtube.com/playlist?list={playlist_id}'
+            self.rate_limiter.wait(url)
+            playlist_info = self._metadata_ydl(flat=True).extract_info(url, download=False)
+            entries = list(playlist_info.get('entries') or [])
             
-            ydl_opts = {
-                'quiet': True,
-                'no_warnings': True,
-                'extract_flat': False  # Extrair metadados completos
+            # Extrair informações da playlist
+            playlist_data = {
+                'id': playlist_id,
+                'title': playlist_info.get('title', f'playlist_{playlist_id}'),
+                'uploader': playlist_info.get('uploader', 'Unknown'),
+                'description': playlist_info.get('description', ''),
+                'video_count': len(entries),
+                'url': url,
+                'extraction_timestamp': datetime.now().isoformat()
             }
             
-            # Adicionar configuração de cookies para vídeos de membros
-            if self.cookies_from_browser:
-                ydl_opts['cookiesfrom_browser'] = self.cookies_from_browser
-                print(f" yt-dlp playlist usando cookies do navegador: {self.cookies_from_browser}")
-            elif self.cookies_file:
-                ydl_opts['cookiefile'] = self.cookies_file
-                print(f" yt-dlp playlist usando arquivo de cookies: {self.cookies_file}")
+            # Extrair IDs dos vídeos
+            video_ids = []
+            for entry in entries:
+                if entry and entry.get('id'):
+                    video_ids.append(entry['id'])
             
-            # Adicionar configuração de proxy se disponível
-            if self.proxy:
-                ydl_opts['proxy'] = self.proxy
-                print(f" yt-dlp playlist usando proxy: {self.proxy}")
+            playlist_data['video_ids'] = video_ids
             
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                playlist_info = ydl.extract_info(url, download=False)
-                
-                # Extrair informações da playlist
-                playlist_data = {
-                    'id': playlist_id,
-                    'title': playlist_info.get('title', f'playlist_{playlist_id}'),
-                    'uploader': playlist_info.get('uploader', 'Unknown'),
-                    'description': playlist_info.get('description', ''),
-                    'video_count': len(playlist_info.get('entries', [])),
-                    'url': url,
-                    'extraction_timestamp': datetime.now().isoformat()
-                }
-                
-                # Extrair IDs dos vídeos
-                video_ids = []
-                for entry in playlist_info.get('entries', []):
-                    if entry and entry.get('id'):
-                        video_ids.append(entry['id'])
-                
-                playlist_data['video_ids'] = video_ids
-                
-                print(f" Playlist: '{playlist_data['title']}' ({len(video_ids)} vídeos)")
-                return playlist_data
+            if video_ids:
+                self.metadata_cache.put(key, playlist_data)
+            
+            print(f" Playlist: '{playlist_data['title']}' ({len(video_ids)} vídeos)")
+            return playlist_data
         
         except Exception as e:
             logger.error(f"Erro ao obter informações da playlist: {e}")
-            # Fallback para método antigo
+            # Sem a listagem não há vídeos (get_playlist_videos usa este mesmo método)
             return {
                 'id': playlist_id,
                 'title': f'playlist_{playlist_id}',
-                'video_ids': self.get_playlist_videos(playlist_id)
+                'video_ids': []
             }
 
     def get_playlist_videos(self, playlist_id: str) -> List[str]:
@@ -557,6 +1087,9 @@ class YouTubeRAGExtractor:
     def find_existing_video_data(self, video_id: str) -> Optional[Dict[str, Any]]:
         """
         Busca dados existentes de um vídeo em versões anteriores (NOVA FUNCIONALIDADE v5.0)
+        
+        Consulta o índice de artefatos; na primeira vez (índice nunca construído) ele é criado
+        com uma única varredura do storage (ou manualmente com --rebuild-index)
         """
         if not self.reuse_data:
             return None
@@ -564,36 +1097,36 @@ class YouTubeRAGExtractor:
         try:
             print(f" Buscando dados existentes para {video_id}...")
             
-            # Buscar em todas as pastas do storage
-            for folder in self.storage_dir.rglob("*"):
-                if not folder.is_dir():
-                    continue
+            with self.index_lock:
+                if not self.artifact_index.is_built():
+                    self.rebuild_artifact_index()
+            
+            files = self.artifact_index.lookup(video_id)
+            transcript_files = files['transcript']
+            metadata_files = files['metadata']
+            audio_files = files['audio']
+            
+            if transcript_files or metadata_files:
+                folder = Path((transcript_files or metadata_files)[0]).parent
+                existing_data = {
+                    'folder': str(folder),
+                    'transcript_files': transcript_files,
+                    'metadata_files': metadata_files,
+                    'audio_files': audio_files,
+                    'has_transcript': len(transcript_files) > 0,
+                    'has_metadata': len(metadata_files) > 0,
+                    'has_audio': len(audio_files) > 0
+                }
                 
-                # Buscar arquivos de transcrição
-                transcript_files = list(folder.rglob(f"*{video_id}*transcript*.json"))
-                metadata_files = list(folder.rglob(f"*{video_id}*metadata*.json"))
-                audio_files = list(folder.rglob(f"*{video_id}*audio*"))
+                print(f" Dados encontrados em: {folder.name}")
+                if existing_data['has_transcript']:
+                    print(f"    Transcrições: {len(transcript_files)}")
+                if existing_data['has_metadata']:
+                    print(f"    Metadados: {len(metadata_files)}")
+                if existing_data['has_audio']:
+                    print(f"    Áudios: {len(audio_files)}")
                 
-                if transcript_files or metadata_files:
-                    existing_data = {
-                        'folder': str(folder),
-                        'transcript_files': [str(f) for f in transcript_files],
-                        'metadata_files': [str(f) for f in metadata_files],
-                        'audio_files': [str(f) for f in audio_files],
-                        'has_transcript': len(transcript_files) > 0,
-                        'has_metadata': len(metadata_files) > 0,
-                        'has_audio': len(audio_files) > 0
-                    }
-                    
-                    print(f" Dados encontrados em: {folder.name}")
-                    if existing_data['has_transcript']:
-                        print(f"    Transcrições: {len(transcript_files)}")
-                    if existing_data['has_metadata']:
-                        print(f"    Metadados: {len(metadata_files)}")
-                    if existing_data['has_audio']:
-                        print(f"    Áudios: {len(audio_files)}")
-                    
-                    return existing_data
+                return existing_data
             
             print(f"ℹ️ Nenhum dado existente encontrado para {video_id}")
             return None
@@ -601,6 +1134,15 @@ class YouTubeRAGExtractor:
         except Exception as e:
             print(f" Erro ao buscar dados existentes: {e}")
             return None
+    
+    def rebuild_artifact_index(self) -> int:
+        """
+        Recria o índice de artefatos varrendo o storage uma vez
+        """
+        print(f" Indexando arquivos de {self.storage_dir}...")
+        count = self.artifact_index.rebuild(self.storage_dir)
+        print(f" Índice de artefatos: {count} arquivos")
+        return count
 
     def load_existing_transcript(self, video_id: str, existing_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
@@ -764,6 +1306,68 @@ class YouTubeRAGExtractor:
         except Exception as e:
             return {'error': f'Erro ao organizar playlist: {e}'}
 
+    def stream_audio_and_transcribe(self, video_id: str, video_folder: Optional[Path] = None) -> Optional[Dict[str, Any]]:
+        """
+        Transcreve o áudio enquanto ele é baixado (--stream-audio), sem arquivo temporário
+        
+        O download do yt-dlp passa por um único FFmpeg (audio_stream) que entrega janelas
+        PCM 16 kHz mono de ~30 s; cada janela vai para o pool do Whisper assim que fica
+        pronta e os timestamps são deslocados pelo início da janela. O idioma detectado
+        na primeira janela vale para as demais. Com --save-audio os bytes originais são
+        gravados na pasta do vídeo durante o mesmo download.
+        """
+        url = f'https://www.youtube.com/watch?v={video_id}'
+        print(" Transcrevendo áudio durante o download (streaming)...")
+        
+        # Opus/WebM decodifica a partir de um pipe; M4A pode ter o índice no fim do arquivo
+        ydl_opts = {
+            'format': 'bestaudio[acodec=opus]/bestaudio/best',
+            'quiet': True,
+            'no_warnings': True
+        }
+        
+        # Adicionar configuração de cookies para vídeos de membros
+        if self.cookies_from_browser:
+            ydl_opts['cookiesfrom_browser'] = self.cookies_from_browser
+        elif self.cookies_file:
+            ydl_opts['cookiefile'] = self.cookies_file
+        
+        # Configurar proxy se disponível
+        if self.proxy:
+            ydl_opts['proxy'] = self.proxy
+        
+        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            info = ydl.extract_info(url, download=False)
+            audio_url = info.get('url')
+            if not audio_url:
+                print(" Formato de áudio sem URL direta para streaming")
+                return None
+            
+            # Mesmo critério do arquivo baixado, pelo tamanho informado pelo YouTube
+            size_mb = (info.get('filesize') or info.get('filesize_approx') or 0) / (1024 * 1024)
+            model_size = self._whisper_model_size(size_mb, parallel=True)
+            print(f" Áudio: {info.get('ext', '?')} ({size_mb:.2f} MB), modelo Whisper: {model_size}")
+            
+            tee = None
+            if video_folder and self.save_audio:
+                video_folder.mkdir(exist_ok=True)
+                saved_audio_path = video_folder / f"audio_{video_id}.{info.get('ext', 'webm')}"
+                tee = open(saved_audio_path, 'wb')
+            
+            response = ydl.urlopen(audio_url)
+            try:
+                whisper_segments, full_text, language = self._transcribe_pieces(
+                    stream_pcm_windows(response, tee=tee), model_size
+                )
+            finally:
+                response.close()
+                if tee is not None:
+                    tee.close()
+                    print(f" Áudio salvo permanentemente em: {saved_audio_path}")
+        
+        return self._whisper_transcript(video_id, whisper_segments, full_text,
+                                        language, model_size, 'whisper_audio_stream')
+    
     def download_audio_and_transcribe(self, video_id: str, video_folder: Optional[Path] = None) -> Optional[Dict[str, Any]]:
         """
         Baixa áudio do vídeo e faz transcrição local - SOLUÇÃO DEFINITIVA PARA BLOQUEIO IP
@@ -771,6 +1375,16 @@ class YouTubeRAGExtractor:
         import tempfile
         import os
         
+        # Modo streaming: transcreve durante o download; se falhar, baixa o arquivo como antes
+        if self.stream_audio and WHISPER_AVAILABLE:
+            try:
+                transcript = self.stream_audio_and_transcribe(video_id, video_folder)
+                if transcript:
+                    return transcript
+            except Exception as e:
+                print(f" Erro no streaming de áudio: {e}")
+            print(" Usando download completo do áudio")
+        
         try:
             print(" Baixando áudio do vídeo...")
             
@@ -884,7 +1498,7 @@ class YouTubeRAGExtractor:
     
     def transcribe_with_whisper(self, video_id: str, audio_path: str) -> Optional[Dict[str, Any]]:
         """
-        Transcreve áudio usando Whisper (OpenAI) - COM CONTROLE DE MEMÓRIA
+        Transcreve áudio usando Whisper (OpenAI) - modelo residente no pool (whisper_pool)
         """
         try:
             print(" Transcrevendo com Whisper...")
@@ -898,26 +1512,32 @@ class YouTubeRAGExtractor:
             file_size_mb = os.path.getsize(audio_path) / (1024 * 1024)
             print(f" Tamanho do arquivo: {file_size_mb:.2f} MB")
             
-            # CONTROLE DE MEMÓRIA - Evitar sobrecarga que causa desligamento
-            import gc
-            import torch
-            
-            # Limpar cache antes de começar
-            gc.collect()
-            if torch.cuda.is_available():
-                torch.cuda.empty_cache()
+            # Trechos entre pausas (VAD) transcritos em paralelo; sem FFmpeg/numpy, o arquivo inteiro
+            pieces = None
+            try:
+                pcm = decode_pcm(audio_path)
+                speech = plan_segments(frame_rms(pcm))
+                if len(speech) > 1:
+                    pieces = segment_pcm(pcm, speech)
+                    print(f" Áudio dividido em {len(pieces)} trechos de voz ({get_transcription_pool().workers or 1} worker(s))")
+                del pcm
+            except Exception as e:
+                print(f" Segmentação por voz indisponível ({e}), transcrevendo o arquivo inteiro")
             
-            # Usar modelo mais leve para arquivos grandes
-            model_size = "tiny" if file_size_mb > 10 else "base"
+            # Modelo mais leve para arquivos grandes, a menos que os trechos rodem em vários workers
+            model_size = self._whisper_model_size(file_size_mb, parallel=pieces is not None)
             print(f" Usando modelo Whisper: {model_size}")
             
-            # Carregar modelo com configurações otimizadas
-            model = whisper.load_model(model_size, device="cpu")  # Forçar CPU para estabilidade
+            if pieces:
+                whisper_segments, full_text, detected_language = self._transcribe_pieces(pieces, model_size)
+                return self._whisper_transcript(video_id, whisper_segments, full_text,
+                                                detected_language, model_size, 'whisper_audio_download')
             
-            # Transcrever com detecção automática de idioma
+            # Modelo residente no pool compartilhado (carregado uma vez por tamanho)
             print(" Detectando idioma automaticamente...")
-            result = model.transcribe(
+            result = get_transcription_pool().transcribe(
                 audio_path,
+                model_size,
                 language=None,  # Detecção automática de idioma
                 fp16=False,     # Usar FP32 no CPU
                 verbose=False,  # Menos verbose
@@ -929,59 +1549,8 @@ class YouTubeRAGExtractor:
             detected_language = result.get('language', 'unknown')
             print(f"🌍 Idioma detectado: {detected_language}")
             
-            # Limpar modelo da memória imediatamente
-            del model
-            gc.collect()
-            if torch.cuda.is_available():
-                torch.cuda.empty_cache()
-            
-            print("🧹 Memória limpa após transcrição")
-            
-            # Processar resultado
-            segments = []
-            full_text = result.get('text', '')
-            
-            # Whisper retorna segmentos com timestamps
-            for i, segment in enumerate(result.get('segments', [])):
-                segment_info = {
-                    'index': i,
-                    'text': segment.get('text', '').strip(),
-                    'start': segment.get('start', 0),
-                    'end': segment.get('end', 0),
-                    'duration': segment.get('end', 0) - segment.get('start', 0)
-                }
-                segments.append(segment_info)
-            
-            # Se não há segmentos mas há texto, criar um segmento único
-            if not segments and full_text.strip():
-                segments = [{
-                    'index': 0,
-                    'text': full_text.strip(),
-                    'start': 0,
-                    'end': 180,  # Aproximar 3 minutos
-                    'duration': 180
-                }]
-            
-            print(f" Whisper: {len(segments)} segmentos transcritos")
-            print(f" Texto: {full_text[:100]}..." if len(full_text) > 100 else f" Texto: {full_text}")
-            
-            return {
-                'video_id': video_id,
-                'language': detected_language,
-                'is_generated': True,
-                'segments': segments,
-                'full_text': full_text.strip(),
-                'total_segments': len(segments),
-                'total_duration': segments[-1]['end'] if segments else 0,
-                'extraction_timestamp': datetime.now().isoformat(),
-                'transcript_info': {
-                    'language': detected_language,
-                    'type': 'whisper_local',
-                    'model_size': model_size
-                },
-                'source': 'whisper_audio_download',
-                'quality': 'high'
-            }
+            return self._whisper_transcript(video_id, result.get('segments', []), result.get('text', ''),
+                                            detected_language, model_size, 'whisper_audio_download')
         
         except Exception as e:
             print(f" Erro no Whisper: {e}")
@@ -990,6 +1559,124 @@ class YouTubeRAGExtractor:
             print(f" Traceback: {traceback.format_exc()}")
             return None
     
+    def _whisper_model_size(self, file_size_mb: float, parallel: bool) -> str:
+        """
+        Modelo do Whisper: WHISPER_MODEL, se definido; senão "base", trocando para "tiny"
+        acima de 10 MB só quando o áudio não vai ser dividido entre vários workers
+        """
+        model_size = os.getenv('WHISPER_MODEL')
+        if model_size:
+            return model_size
+        if file_size_mb > 10 and not (parallel and get_transcription_pool().workers > 1):
+            return "tiny"
+        return "base"
+    
+    def _transcribe_pieces(self, pieces: Iterable[Tuple[float, bytes]], model_size: str) -> Tuple[List[Dict[str, Any]], str, str]:
+        """
+        Transcreve trechos de áudio (início em segundos, PCM 16 kHz) no pool do Whisper
+        
+        O primeiro trecho detecta o idioma, usado nos demais; os outros são enfileirados
+        assim que chegam (em paralelo com WHISPER_WORKERS > 0), com no máximo alguns
+        aguardando para não acumular áudio decodificado em memória. Os timestamps de cada
+        trecho são deslocados pelo seu início.
+        
+        Returns:
+            (segmentos do Whisper no tempo do áudio, texto completo, idioma)
+        """
+        options = {
+            'fp16': False,   # Usar FP32 no CPU
+            'verbose': False,
+            'beam_size': 1,
+            'best_of': 1,
+            'temperature': 0
+        }
+        pool = get_transcription_pool()
+        max_pending = max(2, pool.workers + 1)
+        
+        results: List[Tuple[float, Any]] = []
+        language = None
+        for offset, pcm in pieces:
+            audio = pcm_to_float32(pcm)
+            if language is None:
+                result = pool.transcribe(audio, model_size, language=None, **options)
+                language = result.get('language') or 'unknown'
+                print(f"🌍 Idioma detectado: {language}")
+                results.append((offset, result))
+                continue
+            
+            results.append((offset, pool.submit(
+                audio, model_size, language=None if language == 'unknown' else language, **options
+            )))
+            pending = [item for _, item in results if isinstance(item, Future) and not item.done()]
+            if len(pending) > max_pending:
+                pending[0].result()
+        
+        whisper_segments = []
+        texts = []
+        for offset, item in results:
+            result = item.result() if isinstance(item, Future) else item
+            for segment in result.get('segments', []):
+                whisper_segments.append({
+                    'text': segment.get('text', ''),
+                    'start': segment.get('start', 0) + offset,
+                    'end': segment.get('end', 0) + offset
+                })
+            if result.get('text', '').strip():
+                texts.append(result['text'].strip())
+        
+        print(f" Whisper: {len(results)} trecho(s) de áudio transcrito(s)")
+        return whisper_segments, ' '.join(texts), language or 'unknown'
+    
+    def _whisper_transcript(self, video_id: str, whisper_segments: List[Dict[str, Any]], full_text: str,
+                            detected_language: str, model_size: str, source: str) -> Dict[str, Any]:
+        """
+        Transcrição no formato do extrator a partir dos segmentos do Whisper
+        """
+        # Processar resultado
+        segments = []
+        
+        # Whisper retorna segmentos com timestamps
+        for i, segment in enumerate(whisper_segments):
+            segment_info = {
+                'index': i,
+                'text': segment.get('text', '').strip(),
+                'start': segment.get('start', 0),
+                'end': segment.get('end', 0),
+                'duration': segment.get('end', 0) - segment.get('start', 0)
+            }
+            segments.append(segment_info)
+        
+        # Se não há segmentos mas há texto, criar um segmento único
+        if not segments and full_text.strip():
+            segments = [{
+                'index': 0,
+                'text': full_text.strip(),
+                'start': 0,
+                'end': 180,  # Aproximar 3 minutos
+                'duration': 180
+            }]
+        
+        print(f" Whisper: {len(segments)} segmentos transcritos")
+        print(f" Texto: {full_text[:100]}..." if len(full_text) > 100 else f" Texto: {full_text}")
+        
+        return {
+            'video_id': video_id,
+            'language': detected_language,
+            'is_generated': True,
+            'segments': segments,
+            'full_text': full_text.strip(),
+            'total_segments': len(segments),
+            'total_duration': segments[-1]['end'] if segments else 0,
+            'extraction_timestamp': datetime.now().isoformat(),
+            'transcript_info': {
+                'language': detected_language,
+                'type': 'whisper_local',
+                'model_size': model_size
+            },
+            'source': source,
+            'quality': 'high'
+        }
+    
     def transcribe_with_speech_recognition(self, video_id: str, audio_path: str) -> Optional[Dict[str, Any]]:
         """
         Transcreve áudio usando SpeechRecognition - FALLBACK
@@ -1080,13 +1767,19 @@ class YouTubeRAGExtractor:
             print(f" Erro no SpeechRecognition: {e}")
             return None
 
-    def get_transcript_with_fallbacks(self, video_id: str, video_folder: Optional[Path] = None) -> Optional[Dict[str, Any]]:
+    def get_transcript_with_fallbacks(self, video_id: str, video_folder: Optional[Path] = None,
+                                      allow_audio: bool = True) -> Optional[Dict[str, Any]]:
         """
         Tenta múltiplas estratégias para obter transcrição - INCLUINDO DOWNLOAD LOCAL
+        
+        Com allow_audio=False só as legendas são tentadas (o pipeline da playlist
+        faz o download de áudio + Whisper numa etapa própria)
         """
+        url = f'https://www.youtube.com/watch?v={video_id}'
         try:
             # Estratégia 1: youtube-transcript-api direto
             print(" Tentando: youtube-transcript-api direto...")
+            self.rate_limiter.wait(url)
             transcript = self.get_transcript(video_id)
             if transcript and transcript.get('segments'):
                 print(" Sucesso com youtube-transcript-api direto")
@@ -1098,6 +1791,7 @@ class YouTubeRAGExtractor:
             # Estratégia 2: youtube-transcript-api com proxy
             if self.proxy:
                 print(" Tentando: youtube-transcript-api com proxy...")
+                self.rate_limiter.wait(url)
                 transcript = self.get_transcript(video_id)
                 if transcript and transcript.get('segments'):
                     print(" Sucesso com youtube-transcript-api + proxy")
@@ -1108,6 +1802,7 @@ class YouTubeRAGExtractor:
             
             # Estratégia 3: yt-dlp subtitles
             print(" Tentando: yt-dlp subtitles...")
+            self.rate_limiter.wait(url)
             transcript = self.extract_subtitles_with_ydl(video_id)
             if transcript and transcript.get('segments'):
                 print(" Sucesso com yt-dlp subtitles")
@@ -1116,6 +1811,9 @@ class YouTubeRAGExtractor:
             
             print(" Falhou: yt-dlp subtitles")
             
+            if not allow_audio:
+                return None
+            
             # Estratégia 4: DOWNLOAD DE ÁUDIO + TRANSCRIÇÃO LOCAL (SOLUÇÃO DEFINITIVA)
             print(" Tentando: Download de áudio + transcrição local...")
             transcript = self.download_audio_and_transcribe(video_id, video_folder)
@@ -1135,158 +1833,77 @@ class YouTubeRAGExtractor:
     def extract_subtitles_with_ydl(self, video_id: str) -> Optional[Dict[str, Any]]:
         """
         Extrai legendas usando yt-dlp como fallback
-        """
-        import tempfile
-        import os
         
+        A legenda escolhida é lida direto da resposta HTTP (ydl.urlopen) pelo parser
+        em streaming, sem arquivo temporário nem um novo YoutubeDL por idioma
+        """
         try:
             url = f'https://www.youtube.com/watch?v={video_id}'
             
-            # Criar diretório temporário
-            with tempfile.TemporaryDirectory() as temp_dir:
-                output_template = os.path.join(temp_dir, f"{video_id}.%(ext)s")
-                
-                ydl_opts = {
-                    'writesubtitles': True,
-                    'writeautomaticsub': True,
-                    'skip_download': True,
-                    'outtmpl': output_template,
-                    'quiet': True,
-                    'no_warnings': True,
-                    'subtitleslangs': ['pt', 'pt-BR', 'en'],
-                    'subtitlesformat': 'vtt'
-                }
-                
-                # Adicionar configuração de cookies para vídeos de membros
-                if self.cookies_from_browser:
-                    ydl_opts['cookiesfrom_browser'] = self.cookies_from_browser
-                    print(f" Transcrição usando cookies do navegador: {self.cookies_from_browser}")
-                elif self.cookies_file:
-                    ydl_opts['cookiefile'] = self.cookies_file
-                    print(f" Transcrição usando arquivo de cookies: {self.cookies_file}")
-                
-                if self.proxy:
-                    ydl_opts['proxy'] = self.proxy
-                
-                with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                    try:
-                        # Extrair informações e baixar legendas
-                        info = ydl.extract_info(url, download=False)
-                        
-                        # Verificar quais legendas estão disponíveis
-                        subtitles = info.get('subtitles', {})
-                        automatic_captions = info.get('automatic_captions', {})
-                        
-                        all_subs = {**subtitles, **automatic_captions}
-                        
-                        # Tentar baixar legendas na ordem de preferência
-                        for lang in ['pt', 'pt-BR', 'en']:
-                            if lang in all_subs:
-                                print(f"🔽 Baixando legenda em {lang}...")
-                                
-                                # Baixar só essa legenda específica
-                                ydl_opts_specific = ydl_opts.copy()
-                                ydl_opts_specific['subtitleslangs'] = [lang]
-                                
-                                with yt_dlp.YoutubeDL(ydl_opts_specific) as ydl_specific:
-                                    ydl_specific.download([url])
-                                
-                                # Procurar arquivo de legenda baixado
-                                vtt_file = os.path.join(temp_dir, f"{video_id}.{lang}.vtt")
-                                if os.path.exists(vtt_file):
-                                    with open(vtt_file, 'r', encoding='utf-8') as f:
-                                        vtt_content = f.read()
-                                    
-                                    return self.parse_vtt_content(video_id, vtt_content, lang)
-                        
-                        # Se não conseguiu com idiomas específicos, tentar qualquer um
-                        for lang_code in all_subs.keys():
-                            print(f"🔽 Tentando baixar legenda em {lang_code}...")
-                            
-                            ydl_opts_any = ydl_opts.copy()
-                            ydl_opts_any['subtitleslangs'] = [lang_code]
-                            
-                            with yt_dlp.YoutubeDL(ydl_opts_any) as ydl_any:
-                                try:
-                                    ydl_any.download([url])
-                                    
-                                    vtt_file = os.path.join(temp_dir, f"{video_id}.{lang_code}.vtt")
-                                    if os.path.exists(vtt_file):
-                                        with open(vtt_file, 'r', encoding='utf-8') as f:
-                                            vtt_content = f.read()
-                                        
-                                        return self.parse_vtt_content(video_id, vtt_content, lang_code)
-                                except:
-                                    continue
+            ydl_opts = {
+                'skip_download': True,
+                'quiet': True,
+                'no_warnings': True
+            }
+            
+            # Adicionar configuração de cookies para vídeos de membros
+            if self.cookies_from_browser:
+                ydl_opts['cookiesfrom_browser'] = self.cookies_from_browser
+                print(f" Transcrição usando cookies do navegador: {self.cookies_from_browser}")
+            elif self.cookies_file:
+                ydl_opts['cookiefile'] = self.cookies_file
+                print(f" Transcrição usando arquivo de cookies: {self.cookies_file}")
+            
+            if self.proxy:
+                ydl_opts['proxy'] = self.proxy
+            
+            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                try:
+                    # Extrair informações (lista de legendas com as URLs de cada formato)
+                    info = ydl.extract_info(url, download=False)
                     
-                    except Exception as e:
-                        print(f"Erro ao extrair com yt-dlp: {e}")
+                    # Legendas manuais têm preferência sobre as automáticas do mesmo idioma
+                    manual_subs = info.get('subtitles') or {}
+                    all_subs = {**(info.get('automatic_captions') or {}), **manual_subs}
+                    
+                    # Idiomas preferidos primeiro, depois qualquer um
+                    preferred = [lang for lang in ['pt', 'pt-BR', 'en'] if lang in all_subs]
+                    for lang in preferred + [lang for lang in all_subs if lang not in preferred]:
+                        track = next((fmt for ext in ('vtt', 'srt') for fmt in all_subs[lang]
+                                      if fmt.get('ext') == ext and fmt.get('url')), None)
+                        if not track:
+                            continue
+                        
+                        print(f"🔽 Lendo legenda em {lang} ({track['ext']})...")
+                        try:
+                            with ydl.urlopen(track['url']) as response:
+                                transcript = self.parse_vtt_content(
+                                    video_id, response, lang, is_generated=lang not in manual_subs
+                                )
+                            if transcript:
+                                return transcript
+                        except Exception as e:
+                            print(f" Falha na legenda {lang}: {e}")
+                            continue
+                
+                except Exception as e:
+                    print(f"Erro ao extrair com yt-dlp: {e}")
         
         except Exception as e:
             print(f"Erro no método yt-dlp: {e}")
         
         return None
     
-    def parse_vtt_content(self, video_id: str, vtt_content: str, language: str) -> Dict[str, Any]:
+    def parse_vtt_content(self, video_id: str, vtt_content, language: str,
+                          is_generated: bool = False) -> Dict[str, Any]:
         """
-        Parseia conteúdo VTT e retorna estrutura de transcrição
+        Parseia legenda VTT ou SRT (texto, arquivo ou stream) e retorna estrutura de transcrição
+        
+        Só as legendas automáticas (is_generated) têm os cues repetidos colapsados;
+        nas manuais, falas repetidas em cues seguidos são mantidas.
         """
         try:
-            segments = []
-            full_text = ""
-            lines = vtt_content.split('\n')
-            
-            current_segment = None
-            segment_index = 0
-            
-            for line in lines:
-                line = line.strip()
-                
-                # Pular linhas vazias e cabeçalhos
-                if not line or line.startswith('WEBVTT') or line.startswith('NOTE'):
-                    continue
-                
-                # Linha de tempo: 00:00:01.000 --> 00:00:05.000
-                if '-->' in line:
-                    try:
-                        times = line.split('-->')
-                        start_time = self.parse_vtt_time(times[0].strip())
-                        end_time = self.parse_vtt_time(times[1].strip())
-                        
-                        current_segment = {
-                            'index': segment_index,
-                            'start': start_time,
-                            'end': end_time,
-                            'duration': end_time - start_time,
-                            'text': ''
-                        }
-                    except:
-                        continue
-                
-                # Texto da legenda
-                elif line and current_segment is not None:
-                    # Remover tags HTML e formatação
-                    clean_text = re.sub(r'<[^>]+>', '', line)
-                    clean_text = clean_text.replace('&amp;', '&').replace('&lt;', '<').replace('&gt;', '>')
-                    clean_text = clean_text.strip()
-                    
-                    if clean_text:
-                        if current_segment['text']:
-                            current_segment['text'] += ' ' + clean_text
-                        else:
-                            current_segment['text'] = clean_text
-                
-                # Linha vazia indica fim do segmento
-                elif not line and current_segment is not None and current_segment['text']:
-                    segments.append(current_segment)
-                    full_text += current_segment['text'] + ' '
-                    segment_index += 1
-                    current_segment = None
-            
-            # Adicionar último segmento se necessário
-            if current_segment is not None and current_segment['text']:
-                segments.append(current_segment)
-                full_text += current_segment['text'] + ' '
+            segments, full_text = parse_subtitles(vtt_content, collapse_rolling=is_generated)
             
             if segments:
                 print(f" Extraídos {len(segments)} segmentos via yt-dlp")
@@ -1294,9 +1911,9 @@ class YouTubeRAGExtractor:
                 return {
                     'video_id': video_id,
                     'language': language,
-                    'is_generated': True,
+                    'is_generated': is_generated,
                     'segments': segments,
-                    'full_text': full_text.strip(),
+                    'full_text': full_text,
                     'total_segments': len(segments),
                     'total_duration': segments[-1]['end'] if segments else 0,
                     'extraction_timestamp': datetime.now().isoformat(),
@@ -1314,27 +1931,11 @@ class YouTubeRAGExtractor:
     
     def parse_vtt_time(self, time_str: str) -> float:
         """
-        Converte timestamp VTT para segundos
+        Converte timestamp VTT/SRT para segundos
         """
         try:
-            # Remove espaços e normaliza
-            time_str = time_str.strip().replace(',', '.')
-            
-            # Formato: HH:MM:SS.mmm ou MM:SS.mmm
-            parts = time_str.split(':')
-            
-            if len(parts) == 3:  # HH:MM:SS.mmm
-                hours = float(parts[0])
-                minutes = float(parts[1])
-                seconds = float(parts[2])
-                return hours * 3600 + minutes * 60 + seconds
-            elif len(parts) == 2:  # MM:SS.mmm
-                minutes = float(parts[0])
-                seconds = float(parts[1])
-                return minutes * 60 + seconds
-            else:
-                return float(parts[0])
-        except:
+            return parse_timestamp(time_str)
+        except ValueError:
             return 0.0
         """
         Obtém transcrição do vídeo com suporte a proxy/Tor
@@ -1503,122 +2104,127 @@ class YouTubeRAGExtractor:
         
         return "\n".join(text_parts)
     
-    def create_chunks(self, text: str, chunk_size: int = None, overlap: int = None) -> List[Dict[str, Any]]:
-        """
-        Cria chunks do texto para RAG com configurações personalizáveis
+    def iter_chunks(self, text: str, chunk_size: int = None, overlap: int = None,
+                    segments: Optional[List[Dict]] = None) -> Iterator[Dict[str, Any]]:
         """
-        import gc
+        Gera os chunks do texto um a um, em tempo linear
+        
+        Cada passo avança pelo menos até o fim do chunk anterior menos a sobreposição,
+        então transcrições longas sem pontuação não geram um chunk por caractere. Só o
+        chunk atual é materializado: quem consome pode gravar e descartar (ver write_chunks).
         
+        Com segments, os chunks são formados por segmentos inteiros e levam start_time /
+        end_time (segundos) e o intervalo de segmentos; start_char / end_char passam a
+        apontar para os textos dos segmentos juntados com quebra de linha.
+        """
         # Usar configurações da instância se não especificadas
         if chunk_size is None:
             chunk_size = self.chunk_size
         if overlap is None:
             overlap = min(100, chunk_size // 5)  # 20% do tamanho do chunk
+        overlap = min(overlap, chunk_size - 1)
         
-        max_chunks = self.max_chunks
+        metadata = {
+            'chunk_size': chunk_size,
+            'overlap': overlap,
+            'mode': 'advanced' if self.advanced_mode else 'basic'
+        }
         
-        # Verificar memória disponível
-        try:
-            import psutil
-            memory = psutil.virtual_memory()
-            if memory.percent > 85 and not self.advanced_mode:
-                print(" Memória alta detectada, reduzindo tamanho dos chunks")
-                chunk_size = min(chunk_size, 300)
-                overlap = 50
-                max_chunks = min(max_chunks, 20)
-        except ImportError:
-            pass  # Se psutil não estiver disponível, usar valores padrão
-        except:
-            pass  # Se psutil falhar, continuar com valores padrão
-        
-        chunks = []
-        start = 0
-        chunk_index = 0
-        
-        # Limitar texto se muito grande (exceto no modo avançado)
-        text_limit = 50000 if self.advanced_mode else 30000
-        if len(text) > text_limit:
-            if not self.advanced_mode:
-                print(f" Texto muito grande ({len(text)} chars), truncando para {text_limit} chars")
-                text = text[:text_limit]
-            else:
-                print(f" Modo avançado: processando texto completo ({len(text)} chars)")
+        if segments:
+            chunker = SegmentChunker(chunk_size, overlap, separator="\n", max_chunks=self.max_chunks or None)
+            for chunk in chunker.iter_chunks(segments):
+                yield {
+                    'index': chunk.index,
+                    'text': chunk.text,
+                    'start_char': chunk.start,
+                    'end_char': chunk.end,
+                    'char_count': chunk.char_count,
+                    'word_count': chunk.word_count,
+                    'start_time': round(chunk.start_time, 3),
+                    'end_time': round(chunk.end_time, 3),
+                    'first_segment': chunk.first_segment,
+                    'last_segment': chunk.last_segment,
+                    'metadata': dict(metadata)
+                }
+            return
         
-        print(f"🔗 Criando chunks: tamanho={chunk_size}, sobreposição={overlap}, máximo={max_chunks}")
+        chunker = TextChunker(chunk_size, overlap, max_chunks=self.max_chunks or None)
+        for chunk in chunker.iter_chunks(text):
+            yield {
+                'index': chunk.index,
+                'text': chunk.text,
+                'start_char': chunk.start,
+                'end_char': chunk.end,
+                'char_count': chunk.char_count,
+                'word_count': chunk.word_count,
+                'metadata': dict(metadata)
+            }
+    
+    def create_chunks(self, text: str, chunk_size: int = None, overlap: int = None,
+                      segments: Optional[List[Dict]] = None) -> List[Dict[str, Any]]:
+        """
+        Cria chunks do texto para RAG com configurações personalizáveis
+        
+        O texto é sempre processado por completo (max_chunks = 0 significa sem limite).
+        Com segments, os chunks seguem os segmentos e guardam os tempos (ver iter_chunks).
+        """
+        print(f"🔗 Criando chunks: tamanho={chunk_size or self.chunk_size}, máximo={self.max_chunks or 'sem limite'}")
         
         try:
-            while start < len(text) and chunk_index < max_chunks:
-                end = start + chunk_size
-                
-                if end < len(text):
-                    sentence_breaks = ['. ', '! ', '? ', '\n\n']
-                    best_break = end
-                    
-                    for break_char in sentence_breaks:
-                        break_pos = text.rfind(break_char, start, end + 100)
-                        if break_pos > start:
-                            best_break = break_pos + len(break_char)
-                            break
-                    
-                    end = best_break
-                
-                chunk_text = text[start:end].strip()
-                
-                if chunk_text:
-                    chunk = {
-                        'index': chunk_index,
-                        'text': chunk_text,
-                        'start_char': start,
-                        'end_char': end,
-                        'char_count': len(chunk_text),
-                        'word_count': len(chunk_text.split()),
-                        'metadata': {
-                            'chunk_size': chunk_size,
-                            'overlap': overlap,
-                            'mode': 'advanced' if self.advanced_mode else 'basic'
-                        }
-                    }
-                    chunks.append(chunk)
-                    chunk_index += 1
-                
-                # Calcular próximo início com proteção contra loop infinito
-                next_start = end - overlap
-                
-                # Proteção contra loop infinito
-                if next_start <= start:
-                    next_start = start + 1
-                
-                # Se chegamos ao final do texto, parar
-                if next_start >= len(text):
-                    break
-                    
-                start = next_start
-                
-                # Limpeza de memória a cada 10 chunks (5 no modo básico)
-                cleanup_interval = 10 if self.advanced_mode else 5
-                if chunk_index % cleanup_interval == 0:
-                    gc.collect()
-                    try:
-                        import psutil
-                        memory = psutil.virtual_memory()
-                        memory_limit = 95 if self.advanced_mode else 90
-                        if memory.percent > memory_limit:
-                            print(f" Memória crítica ({memory.percent}%), parando criação de chunks (limite: {memory_limit}%)")
-                            break
-                    except ImportError:
-                        pass  # psutil não disponível
-                    except:
-                        pass
-            
+            chunks = list(self.iter_chunks(text, chunk_size, overlap, segments))
             mode_str = "avançado" if self.advanced_mode else "básico"
-            print(f" Chunks criados: {len(chunks)} (modo {mode_str}, máximo permitido: {max_chunks})")
+            print(f" Chunks criados: {len(chunks)} (modo {mode_str}, {len(text)} caracteres)")
             return chunks
             
         except Exception as e:
             print(f" Erro na criação de chunks: {e}")
-            gc.collect()
             return []
     
+    def write_chunks(self, text: str, json_path: Path, csv_path: Optional[Path] = None,
+                     csv_columns: Optional[Dict[str, str]] = None, segments: Optional[List[Dict]] = None) -> int:
+        """
+        Grava os chunks direto em disco à medida que são gerados
+        
+        A memória usada não depende da duração do vídeo: além do texto, só um chunk
+        existe por vez.
+        
+        Args:
+            json_path: Arquivo JSON (lista de chunks)
+            csv_path: Arquivo CSV opcional
+            csv_columns: Cabeçalho do CSV -> campo do chunk (padrão: todos os campos)
+            segments: Segmentos da transcrição (chunks alinhados aos tempos)
+        
+        Returns:
+            int: Número de chunks gravados
+        """
+        count = 0
+        csv_file = open(csv_path, 'w', newline='', encoding='utf-8') if csv_path else None
+        
+        try:
+            writer = csv.writer(csv_file) if csv_file else None
+            if writer and csv_columns:
+                writer.writerow(list(csv_columns))
+            
+            with open(json_path, 'w', encoding='utf-8') as f:
+                f.write('[')
+                for chunk in self.iter_chunks(text, segments=segments):
+                    if count == 0 and writer and not csv_columns:
+                        writer.writerow(list(chunk))
+                    
+                    f.write(',\n' if count else '\n')
+                    f.write(json.dumps(chunk, ensure_ascii=False, indent=2))
+                    if writer:
+                        keys = csv_columns.values() if csv_columns else chunk.keys()
+                        writer.writerow([chunk.get(key, '') for key in keys])
+                    count += 1
+                f.write('\n]\n' if count else ']\n')
+        finally:
+            if csv_file:
+                csv_file.close()
+        
+        print(f" Chunks gravados: {count} ({len(text)} caracteres)")
+        return count
+    
     def analyze_content(self, transcript_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Análise leve do conteúdo para RAG com controle de memória
@@ -1788,9 +2394,12 @@ class YouTubeRAGExtractor:
                     end_char INTEGER,
                     char_count INTEGER,
                     word_count INTEGER,
+                    start_time REAL,
+                    end_time REAL,
                     FOREIGN KEY (video_id) REFERENCES video_metadata (video_id)
                 )
             ''')
+            self.ensure_indexes(cursor)
             
             # Tabela de análises
             cursor.execute('''
@@ -1817,86 +2426,82 @@ class YouTubeRAGExtractor:
             logger.error(f"Erro ao criar banco de dados: {e}")
             return ""
     
+    @staticmethod
+    def ensure_indexes(cursor):
+        """
+        Índices de busca e unicidade por (video_id, índice) em segmentos e chunks
+        
+        Bancos antigos podem ter linhas duplicadas por reprocessamentos: antes de criar
+        o índice único fica só a gravação mais recente de cada (video_id, índice).
+        """
+        YouTubeRAGExtractor.ensure_chunk_time_index(cursor)
+        
+        existing = {row[0] for row in cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        for table, column, index_name in (
+            ('transcript_segments', 'segment_index', 'idx_segments_video_index'),
+            ('content_chunks', 'chunk_index', 'idx_chunks_video_index'),
+        ):
+            if index_name in existing:
+                continue
+            cursor.execute(f'''
+                DELETE FROM {table} WHERE id NOT IN (
+                    SELECT MAX(id) FROM {table} GROUP BY video_id, {column}
+                )
+            ''')
+            cursor.execute(f'CREATE UNIQUE INDEX {index_name} ON {table}(video_id, {column})')
+    
+    @staticmethod
+    def ensure_chunk_time_index(cursor):
+        """
+        Colunas de tempo em content_chunks (bancos antigos não têm) e o índice usado
+        para ir de um instante ao chunk correspondente
+        """
+        columns = {row[1] for row in cursor.execute('PRAGMA table_info(content_chunks)')}
+        for column in ('start_time', 'end_time'):
+            if column not in columns:
+                cursor.execute(f'ALTER TABLE content_chunks ADD COLUMN {column} REAL')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_chunks_video_time ON content_chunks(video_id, start_time)')
+    
+    def find_chunks_by_time(self, db_path: str, video_id: str, start: float,
+                            end: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Chunks de um vídeo que cobrem um instante (ou a faixa [start, end])
+        
+        Com sobreposição vários chunks cobrem o mesmo instante, e não só o último
+        iniciado até start: todo chunk com start_time <= end e end_time >= start entra.
+        A faixa lida no índice (video_id, start_time) começa em start menos a maior
+        duração de chunk do vídeo, então nenhum chunk que cobre start fica de fora e
+        os segmentos não são varridos. Cada resultado traz a URL do vídeo já
+        posicionada no início do chunk.
+        """
+        end = start if end is None else end
+        
+        with sqlite3.connect(db_path) as conn:
+            conn.row_factory = sqlite3.Row
+            row = conn.execute('''
+                SELECT MAX(end_time - start_time) AS longest FROM content_chunks
+                WHERE video_id = ?
+            ''', (video_id,)).fetchone()
+            first_start = start - (row['longest'] or 0)
+            
+            rows = conn.execute('''
+                SELECT chunk_index, text, start_time, end_time FROM content_chunks
+                WHERE video_id = ? AND start_time >= ? AND start_time <= ? AND end_time >= ?
+                ORDER BY start_time, chunk_index
+            ''', (video_id, first_start, end, start)).fetchall()
+        
+        return [
+            dict(row, url=f"https://www.youtube.com/watch?v={video_id}&t={int(row['start_time'])}s")
+            for row in rows
+        ]
+    
     def save_to_database(self, db_path: str, video_id: str, metadata: Dict, transcript: Optional[Dict], 
                         chunks: List[Dict], analysis: Dict) -> bool:
         """
-        Salva dados no banco SQLite
+        Salva dados no banco SQLite (uma transação por vídeo, ver TranscriptDatabaseWriter)
         """
         try:
-            conn = sqlite3.connect(db_path)
-            cursor = conn.cursor()
-            
-            # Inserir metadados
-            cursor.execute('''
-                INSERT OR REPLACE INTO video_metadata 
-                (video_id, title, description, uploader, upload_date, duration, view_count, like_count, extraction_date, extractor_version)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                video_id,
-                metadata.get('title', ''),
-                metadata.get('description', ''),
-                metadata.get('uploader', ''),
-                metadata.get('upload_date', ''),
-                metadata.get('duration', 0),
-                metadata.get('view_count', 0),
-                metadata.get('like_count', 0),
-                metadata.get('extraction_date', ''),
-                metadata.get('extractor_version', '3.0.0')
-            ))
-            
-            # Inserir segmentos de transcrição
-            if transcript and transcript.get('segments'):
-                for segment in transcript['segments']:
-                    cursor.execute('''
-                        INSERT INTO transcript_segments 
-                        (video_id, segment_index, text, start_time, duration, end_time)
-                        VALUES (?, ?, ?, ?, ?, ?)
-                    ''', (
-                        video_id,
-                        segment.get('index', 0),
-                        segment.get('text', ''),
-                        segment.get('start', 0),
-                        segment.get('duration', 0),
-                        segment.get('end', 0)
-                    ))
-            
-            # Inserir chunks
-            for chunk in chunks:
-                cursor.execute('''
-                    INSERT INTO content_chunks 
-                    (video_id, chunk_index, text, start_char, end_char, char_count, word_count)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    video_id,
-                    chunk.get('index', 0),
-                    chunk.get('text', ''),
-                    chunk.get('start_char', 0),
-                    chunk.get('end_char', 0),
-                    chunk.get('char_count', 0),
-                    chunk.get('word_count', 0)
-                ))
-            
-            # Inserir análise
-            if analysis:
-                cursor.execute('''
-                    INSERT OR REPLACE INTO content_analysis 
-                    (video_id, language_detected, transcript_type, total_characters, total_words, total_segments, keywords, topics, sentiment)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    video_id,
-                    analysis.get('content_analysis', {}).get('language_detected', ''),
-                    analysis.get('content_analysis', {}).get('transcript_type', ''),
-                    analysis.get('statistics', {}).get('total_characters', 0),
-                    analysis.get('statistics', {}).get('total_words', 0),
-                    analysis.get('statistics', {}).get('total_segments', 0),
-                    json.dumps(analysis.get('keywords', [])),
-                    json.dumps(analysis.get('topics', [])),
-                    analysis.get('sentiment', 'neutral')
-                ))
-            
-            conn.commit()
-            conn.close()
-            
+            self.db_writer.write_video(db_path, video_id, metadata, transcript, chunks, analysis)
             return True
             
         except Exception as e:
@@ -2146,7 +2751,7 @@ class YouTubeRAGExtractor:
                 
                 # Criar chunks com configurações personalizadas
                 print("🔗 Criando chunks para RAG...")
-                chunks = self.create_chunks(full_text)
+                chunks = self.create_chunks(full_text, segments=transcript.get('segments'))
                 
                 # Salvar chunks JSON
                 chunks_file = dirs['chunks'] / f"{video_id}_{timestamp}_chunks.json"
@@ -2250,9 +2855,12 @@ class YouTubeRAGExtractor:
                     end_char INTEGER,
                     char_count INTEGER,
                     word_count INTEGER,
+                    start_time REAL,
+                    end_time REAL,
                     FOREIGN KEY (video_id) REFERENCES video_metadata (video_id)
                 )
             ''')
+            self.ensure_indexes(cursor)
             
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS content_analysis (
@@ -2286,6 +2894,12 @@ class YouTubeRAGExtractor:
             if thumbnail_path:
                 files_created['thumbnail'] = thumbnail_path
             
+            # Atualizar índice de artefatos (--reuse-data)
+            self.artifact_index.add_files(
+                [metadata_file] + ([Path(files_created['transcript_json'])] if files_created['transcript_json'] else [])
+                + list(work_dir.glob(f'audio_{video_id}.*'))
+            )
+            
             # Criar resumo RAG completo com informações de reutilização
             rag_summary = {
                 'video_id': video_id,
@@ -2349,7 +2963,179 @@ class YouTubeRAGExtractor:
             logger.error(f"Erro ao processar vídeo: {e}")
             return {'error': str(e), 'input': url_or_id}
     
-    def extract_playlist(self, playlist_url: str, start_index: int = 1, end_index: int = None) -> Dict[str, Any]:
+    def _load_json_file(self, path: Path) -> Optional[Dict[str, Any]]:
+        """Conteúdo de um JSON salvo anteriormente (None se não existir ou estiver corrompido)"""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def _fetch_playlist_video(self, video_index: int, video_id: str, playlist_folder: Path,
+                              manifest: Optional[PlaylistManifest] = None) -> Dict[str, Any]:
+        """
+        Etapa de rede do pipeline da playlist: metadados, pasta [N] e legendas
+        
+        Com manifesto, metadados e transcrição já concluídos são lidos da pasta do vídeo
+        """
+        print(f"\n[{video_index}] Processando vídeo: {video_id}")
+        item = {
+            'index': video_index,
+            'video_id': video_id,
+            'manifest': manifest,
+            'reused_data': {
+                'transcript': False,
+                'metadata': False,
+                'audio': False
+            }
+        }
+        entry = manifest.video(video_id) if manifest else {}
+        resumed = []
+        
+        # NOVA FUNCIONALIDADE v5.0: Buscar dados existentes
+        existing_data = self.find_existing_video_data(video_id) if self.reuse_data else None
+        
+        metadata = None
+        if manifest and manifest.is_done(video_id, 'metadata'):
+            metadata = self._load_json_file(playlist_folder / entry['folder_name'] / 'metadata.json')
+        if metadata:
+            resumed.append("metadados")
+        else:
+            metadata = self.load_existing_metadata(video_id, existing_data) if existing_data else None
+            if metadata:
+                item['reused_data']['metadata'] = True
+            else:
+                metadata = self.get_video_metadata(video_id)
+        
+        # NOVA FUNCIONALIDADE v5.0: Nome da pasta com numeração [N]
+        video_title = metadata.get('title', f'Video_{video_id}')
+        video_folder_name = self.create_numbered_video_folder_name(video_title, video_id, video_index)
+        video_folder = playlist_folder / video_folder_name
+        video_folder.mkdir(exist_ok=True)
+        print(f" [{video_index}] Pasta do vídeo: {playlist_folder.name}/{video_folder_name}")
+        
+        if manifest and "metadados" not in resumed:
+            with open(video_folder / 'metadata.json', 'w', encoding='utf-8') as f:
+                json.dump(metadata, f, indent=2, ensure_ascii=False)
+            manifest.mark(video_id, 'metadata', index=video_index, title=video_title, folder_name=video_folder_name)
+        
+        if existing_data and self.save_audio:
+            item['reused_data']['audio'] = self.copy_existing_audio(video_id, existing_data, video_folder)
+        
+        transcript = None
+        if manifest and manifest.is_done(video_id, 'transcript'):
+            transcript = self._load_json_file(video_folder / f'transcript_{video_id}.json')
+        if transcript:
+            resumed.append("transcrição")
+        else:
+            transcript = self.load_existing_transcript(video_id, existing_data) if existing_data else None
+            if transcript:
+                item['reused_data']['transcript'] = True
+            else:
+                transcript = self.get_transcript_with_fallbacks(video_id, video_folder, allow_audio=False)
+            self._checkpoint_transcript(manifest, video_id, video_folder, transcript)
+        
+        if resumed:
+            print(f" [{video_index}] Retomado do manifesto: {', '.join(resumed)}")
+        
+        item.update({
+            'metadata': metadata,
+            'title': video_title,
+            'folder_name': video_folder_name,
+            'folder': video_folder,
+            'transcript': transcript
+        })
+        return item
+    
+    def _checkpoint_transcript(self, manifest: Optional[PlaylistManifest], video_id: str,
+                               video_folder: Path, transcript: Optional[Dict[str, Any]]):
+        """Grava a transcrição na pasta do vídeo e marca a etapa no manifesto"""
+        if not manifest or not transcript:
+            return
+        
+        with open(video_folder / f'transcript_{video_id}.json', 'w', encoding='utf-8') as f:
+            json.dump(transcript, f, indent=2, ensure_ascii=False)
+        manifest.mark(video_id, 'transcript', segments=len(transcript.get('segments', [])),
+                      source=transcript.get('source', 'unknown'))
+    
+    def _transcribe_playlist_video(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Etapa de transcrição do pipeline da playlist: download de áudio + Whisper (vídeos sem legendas)
+        """
+        video_id = item['video_id']
+        print(f" [{item['index']}] Sem legendas, tentando download de áudio + transcrição local...")
+        self.rate_limiter.wait(f'https://www.youtube.com/watch?v={video_id}')
+        
+        transcript = self.download_audio_and_transcribe(video_id, item['folder'])
+        item['transcript'] = transcript if transcript and transcript.get('segments') else None
+        self._checkpoint_transcript(item['manifest'], video_id, item['folder'], item['transcript'])
+        return item
+    
+    def _write_playlist_video(self, item: Dict[str, Any], playlist_folder_name: str, end_index: int) -> Dict[str, Any]:
+        """
+        Etapa de escrita do pipeline da playlist (um único thread): análise, arquivos e banco
+        """
+        i = item['index']
+        video_id = item['video_id']
+        video_folder_name = item['folder_name']
+        transcript = item['transcript']
+        reused_data = item['reused_data']
+        manifest = item['manifest']
+        
+        if not transcript:
+            print(f" [{i}/{end_index}] Falha na transcrição: {video_folder_name}")
+            return {
+                'success': False,
+                'video_id': video_id,
+                'title': item['title'],
+                'error': 'Transcrição não disponível',
+                'reused_data': reused_data
+            }
+        
+        # Análise RAG (combinar metadata com transcript para análise)
+        transcript_with_metadata = transcript.copy()
+        transcript_with_metadata.update(item['metadata'])
+        analysis = self.analyze_content(transcript_with_metadata)
+        
+        # Salvar dados na pasta individual do vídeo
+        self.save_video_data(item['folder'], video_id, item['metadata'], transcript, analysis,
+                             on_stage=(lambda stage: manifest.mark(video_id, stage)) if manifest else None)
+        
+        if any(reused_data.values()):
+            reuse_info = []
+            if reused_data['transcript']: reuse_info.append("transcrição")
+            if reused_data['metadata']: reuse_info.append("metadados")
+            if reused_data['audio']: reuse_info.append("áudio")
+            print(f" [{i}/{end_index}] Vídeo extraído (reutilizado: {', '.join(reuse_info)}): {video_folder_name}")
+        else:
+            print(f" [{i}/{end_index}] Vídeo extraído: {video_folder_name}")
+        
+        return {
+            'success': True,
+            'video_id': video_id,
+            'title': item['title'],
+            'folder': f"{playlist_folder_name}/{video_folder_name}",
+            'segments': len(transcript.get('segments', [])),
+            'source': transcript.get('source', 'unknown'),
+            'reused_data': reused_data  # NOVA FUNCIONALIDADE v5.0
+        }
+    
+    def find_resumable_playlist_folder(self, base_name: str, playlist_id: str) -> Optional[str]:
+        """
+        Pasta mais recente desta playlist com manifesto (base_name, base_name_vN ou base_name_<timestamp>)
+        """
+        pattern = re.compile(re.escape(base_name) + r'(_v\d+|_\d{8}_\d{6})?')
+        candidates = []
+        for folder in self.storage_dir.iterdir():
+            manifest_path = folder / PlaylistManifest.FILENAME
+            if (folder.is_dir() and pattern.fullmatch(folder.name) and manifest_path.exists()
+                    and PlaylistManifest.read_playlist_id(folder) == playlist_id):
+                candidates.append((manifest_path.stat().st_mtime, folder.name))
+        
+        return max(candidates)[1] if candidates else None
+    
+    def extract_playlist(self, playlist_url: str, start_index: int = 1, end_index: int = None,
+                         resume: bool = False) -> Dict[str, Any]:
         """
         Extrai playlist com melhorias v5.0:
         -  Numeração automática [1], [2], etc.
@@ -2358,7 +3144,8 @@ class YouTubeRAGExtractor:
         -  Versionamento de pastas
         -  Range de vídeos (ex: do 3 ao 15)
         -  Pastas individuais para cada vídeo
-        -  Controle de memória
+        -  Pipeline concorrente: rede, transcrição e escrita em etapas separadas
+        -  Manifesto por playlist: com resume=True continua na última pasta, pulando o que já foi feito
         """
         try:
             print(f"\n Processando playlist: {playlist_url}")
@@ -2383,8 +3170,16 @@ class YouTubeRAGExtractor:
             # Criar nome da pasta baseado no título real
             playlist_folder_name = self.create_playlist_folder_name(playlist_title, playlist_id)
             
-            # Aplicar versionamento se pasta já existir
-            versioned_folder_name = self.get_versioned_playlist_folder(playlist_folder_name, self.storage_dir)
+            # Retomar a última extração desta playlist ou aplicar versionamento se pasta já existir
+            versioned_folder_name = None
+            if resume:
+                versioned_folder_name = self.find_resumable_playlist_folder(playlist_folder_name, playlist_id)
+                if versioned_folder_name:
+                    print(f" Retomando extração em: {versioned_folder_name}")
+                else:
+                    print(" Nenhuma extração anterior com manifesto, começando do início")
+            if not versioned_folder_name:
+                versioned_folder_name = self.get_versioned_playlist_folder(playlist_folder_name, self.storage_dir)
             
             # Criar subpasta para a playlist
             playlist_folder = self.storage_dir / versioned_folder_name
@@ -2428,174 +3223,90 @@ class YouTubeRAGExtractor:
             with open(playlist_folder / 'playlist_metadata.json', 'w', encoding='utf-8') as f:
                 json.dump(playlist_metadata, f, indent=2, ensure_ascii=False)
             
-            # Processar cada vídeo selecionado com numeração
-            results = []
-            success_count = 0
-            error_count = 0
-            reused_count = 0
-            
-            for i, video_id in enumerate(selected_videos, start_index):
-                print(f"\n[{i}/{end_index}] Processando vídeo: {video_id}")
-                
-                # Controle de memória antes de cada vídeo
-                import gc
-                
-                try:
-                    import psutil
-                    memory = psutil.virtual_memory()
-                    print(f" Memória atual: {memory.percent:.1f}% usada")
-                    
-                    if memory.percent > 80:
-                        print(" Memória alta detectada, forçando limpeza...")
-                        gc.collect()
-                        import time
-                        time.sleep(2)  # Dar tempo para limpeza
-                        
-                        memory = psutil.virtual_memory()
-                        memory_limit = 95 if self.advanced_mode else 90
-                        if memory.percent > memory_limit:
-                            print(f" MEMÓRIA CRÍTICA! Pausando processamento... ({memory.percent}% > {memory_limit}%)")
-                            time.sleep(5)
-                            gc.collect()
-                except ImportError:
-                    print(" psutil não disponível, continuando sem monitoramento de memória")
-                except Exception:
-                    pass  # Se psutil falhar, continuar
-                
-                try:
-                    # NOVA FUNCIONALIDADE v5.0: Buscar dados existentes
-                    existing_data = self.find_existing_video_data(video_id) if self.reuse_data else None
-                    reused_transcript = False
-                    reused_metadata = False
-                    reused_audio = False
-                    
-                    # Tentar carregar metadados existentes primeiro
-                    if existing_data:
-                        metadata = self.load_existing_metadata(video_id, existing_data)
-                        if metadata:
-                            reused_metadata = True
-                        else:
-                            metadata = self.get_video_metadata(video_id)
-                    else:
-                        metadata = self.get_video_metadata(video_id)
-                    
-                    video_title = metadata.get('title', f'Video_{video_id}')
-                    
-                    # NOVA FUNCIONALIDADE v5.0: Nome da pasta com numeração [N]
-                    video_folder_name = self.create_numbered_video_folder_name(video_title, video_id, i)
-                    
-                    # Criar pasta individual para o vídeo dentro da playlist
-                    video_folder = playlist_folder / video_folder_name
-                    video_folder.mkdir(exist_ok=True)
-                    
-                    print(f" Pasta do vídeo: {playlist_folder.name}/{video_folder_name}")
-                    
-                    # Tentar copiar áudio existente se necessário
-                    if existing_data and self.save_audio:
-                        reused_audio = self.copy_existing_audio(video_id, existing_data, video_folder)
-                    
-                    # Tentar carregar transcrição existente
-                    if existing_data:
-                        transcript = self.load_existing_transcript(video_id, existing_data)
-                        if transcript:
-                            reused_transcript = True
-                        else:
-                            transcript = self.get_transcript_with_fallbacks(video_id, video_folder)
-                    else:
-                        transcript = self.get_transcript_with_fallbacks(video_id, video_folder)
-                    
-                    if transcript:
-                        # Análise RAG (combinar metadata com transcript para análise)
-                        transcript_with_metadata = transcript.copy()
-                        transcript_with_metadata.update(metadata)
-                        analysis = self.analyze_content(transcript_with_metadata)
-                        
-                        # Salvar dados na pasta individual do vídeo
-                        self.save_video_data(video_folder, video_id, metadata, transcript, analysis)
-                        
-                        result = {
-                            'success': True,
-                            'video_id': video_id,
-                            'title': video_title,
-                            'folder': f"{versioned_folder_name}/{video_folder_name}",
-                            'segments': len(transcript.get('segments', [])),
-                            'source': transcript.get('source', 'unknown'),
-                            'reused_data': {  # NOVA FUNCIONALIDADE v5.0
-                                'transcript': reused_transcript,
-                                'metadata': reused_metadata,
-                                'audio': reused_audio
-                            }
-                        }
-                        success_count += 1
-                        if reused_transcript or reused_metadata or reused_audio:
-                            reused_count += 1
-                            reuse_info = []
-                            if reused_transcript: reuse_info.append("transcrição")
-                            if reused_metadata: reuse_info.append("metadados")
-                            if reused_audio: reuse_info.append("áudio")
-                            print(f" [{i}/{end_index}] Vídeo extraído (reutilizado: {', '.join(reuse_info)}): {video_folder_name}")
-                        else:
-                            print(f" [{i}/{end_index}] Vídeo extraído: {video_folder_name}")
-                    else:
-                        result = {
-                            'success': False,
-                            'video_id': video_id,
-                            'title': video_title,
-                            'error': 'Transcrição não disponível',
-                            'reused_data': {
-                                'transcript': reused_transcript,
-                                'metadata': reused_metadata,
-                                'audio': reused_audio
-                            }
-                        }
-                        error_count += 1
-                        print(f" [{i}/{end_index}] Falha na transcrição: {video_folder_name}")
-                    
-                    results.append(result)
-                    
-                    # Limpeza de memória robusta entre vídeos para evitar sobrecarga
-                    import gc
-                    import time
-                    
-                    print("🧹 Limpando memória...")
-                    
-                    # Liberar variáveis grandes
-                    transcript = None
-                    transcript_with_metadata = None
-                    analysis = None
-                    metadata = None
-                    existing_data = None
-                    
-                    # Forçar limpeza do garbage collector
-                    gc.collect()
-                    gc.collect()  # Duas vezes para garantir
-                    
-                    # Pausa entre vídeos para estabilizar sistema
-                    time.sleep(3)
-                    
-                    try:
-                        import psutil
-                        memory = psutil.virtual_memory()
-                        print(f" Memória após limpeza: {memory.percent:.1f}% usada")
-                    except ImportError:
-                        print(" Limpeza de memória concluída")
-                    except:
-                        pass
-                    
-                except Exception as e:
-                    error_result = {
-                        'success': False,
+            # Pipeline em etapas: rede (threads + limite por host) -> áudio/Whisper -> escrita (um thread).
+            # Os resultados ficam na posição do vídeo na playlist, e a pasta [N] vem do índice,
+            # então a saída não depende da ordem em que as etapas terminam.
+            print(f" Pipeline: {self.fetch_workers} busca(s), {self.transcribe_workers} transcrição(ões), 1 escrita")
+            results: List[Optional[Dict[str, Any]]] = [None] * len(selected_videos)
+            
+            # Vídeos com todas as etapas no manifesto não voltam para o pipeline
+            manifest = PlaylistManifest(playlist_folder, playlist_id)
+            pending = []
+            for position, video_id in enumerate(selected_videos):
+                entry = manifest.video(video_id)
+                if manifest.is_complete(video_id):
+                    results[position] = {
+                        'success': True,
                         'video_id': video_id,
-                        'error': str(e),
+                        'title': entry.get('title'),
+                        'folder': f"{versioned_folder_name}/{entry.get('folder_name')}",
+                        'segments': entry.get('segments', 0),
+                        'source': entry.get('source', 'unknown'),
+                        'resumed': True,
                         'reused_data': {
                             'transcript': False,
                             'metadata': False,
                             'audio': False
                         }
                     }
-                    results.append(error_result)
-                    error_count += 1
-                    print(f" [{i}/{end_index}] Erro no vídeo {video_id}: {e}")
+                else:
+                    pending.append(position)
+            
+            if len(pending) < len(selected_videos):
+                print(f" {len(selected_videos) - len(pending)} vídeo(s) já concluído(s) no manifesto")
+            
+            # Metadados dos vídeos pendentes em lote (cache + busca paralela); a etapa de rede
+            # do pipeline encontra tudo no cache. Quem tem metadados no manifesto ou em uma
+            # extração anterior (--reuse-data) não precisa deles.
+            self.prefetch_video_metadata([
+                selected_videos[position] for position in pending
+                if not manifest.is_done(selected_videos[position], 'metadata')
+                and not (self.reuse_data and self.find_existing_video_data(selected_videos[position]))
+            ])
+            
+            with ThreadPoolExecutor(self.fetch_workers, thread_name_prefix="yt-fetch") as fetch_pool, \
+                 ThreadPoolExecutor(self.transcribe_workers, thread_name_prefix="yt-transcribe") as transcribe_pool, \
+                 ThreadPoolExecutor(1, thread_name_prefix="yt-writer") as writer:
+                
+                running = {
+                    fetch_pool.submit(self._fetch_playlist_video, start_index + position, selected_videos[position],
+                                      playlist_folder, manifest): ('fetch', position)
+                    for position in pending
+                }
+                
+                while running:
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        stage, position = running.pop(future)
+                        video_id = selected_videos[position]
+                        
+                        try:
+                            item = future.result()
+                        except Exception as e:
+                            results[position] = {
+                                'success': False,
+                                'video_id': video_id,
+                                'error': str(e),
+                                'reused_data': {
+                                    'transcript': False,
+                                    'metadata': False,
+                                    'audio': False
+                                }
+                            }
+                            print(f" [{start_index + position}/{end_index}] Erro no vídeo {video_id}: {e}")
+                            continue
+                        
+                        if stage == 'write':
+                            results[position] = item
+                        elif stage == 'fetch' and not item['transcript']:
+                            running[transcribe_pool.submit(self._transcribe_playlist_video, item)] = ('transcribe', position)
+                        else:
+                            running[writer.submit(self._write_playlist_video, item, versioned_folder_name, end_index)] = ('write', position)
+            
+            success_count = sum(1 for result in results if result['success'])
+            error_count = len(results) - success_count
+            reused_count = sum(1 for result in results if result['success'] and any(result['reused_data'].values()))
+            resumed_count = len(selected_videos) - len(pending)
             
             # Criar ZIP da playlist
             zip_path = self.create_playlist_zip(playlist_folder)
@@ -2610,6 +3321,8 @@ class YouTubeRAGExtractor:
                 'successful_extractions': success_count,
                 'failed_extractions': error_count,
                 'reused_videos': reused_count,  # NOVA FUNCIONALIDADE v5.0
+                'resumed_videos': resumed_count,
+                'manifest': str(manifest.path),
                 'zip_file': zip_path,
                 'results': results,
                 'features_used': {  # NOVA FUNCIONALIDADE v5.0
@@ -2626,6 +3339,8 @@ class YouTubeRAGExtractor:
             print(f" Falhas: {error_count}/{len(selected_videos)}")
             if reused_count > 0:
                 print(f" Reutilizados: {reused_count}/{len(selected_videos)}")
+            if resumed_count > 0:
+                print(f" Retomados do manifesto: {resumed_count}/{len(selected_videos)}")
             print(f" ZIP: {zip_path}")
             
             return final_result
@@ -2634,9 +3349,12 @@ class YouTubeRAGExtractor:
             logger.error(f"Erro ao extrair playlist: {e}")
             return {'error': str(e), 'playlist_url': playlist_url}
 
-    def save_video_data(self, video_folder: Path, video_id: str, metadata: Dict, transcript: Dict, analysis: Dict):
+    def save_video_data(self, video_folder: Path, video_id: str, metadata: Dict, transcript: Dict, analysis: Dict,
+                        on_stage=None):
         """
         Salva todos os dados do vídeo na pasta individual
+        
+        on_stage (opcional) é chamado com 'chunks' e 'db' quando cada etapa termina sem erro
         """
         try:
             # Criar pasta youtube_extracted_data igual ao vídeo individual
@@ -2690,42 +3408,23 @@ class YouTubeRAGExtractor:
             with open(text_file, 'w', encoding='utf-8') as f:
                 f.write(text_content)
             
-            # Criar chunks se possível
+            # Criar chunks se possível (gravados em streaming: só um chunk em memória por vez)
             try:
-                import gc
-                print("🔗 Iniciando criação de chunks com controle de memória...")
-                
-                # Forçar limpeza antes de criar chunks
-                gc.collect()
-                
-                chunks = self.create_chunks(text_content)
-                if chunks:
-                    chunks_file_json = chunks_folder / f'{base_filename}_chunks.json'
-                    with open(chunks_file_json, 'w', encoding='utf-8') as f:
-                        json.dump(chunks, f, indent=2, ensure_ascii=False)
-                        
-                    # Salvar chunks em CSV também (versão mais leve)
-                    chunks_file_csv = chunks_folder / f'{base_filename}_chunks.csv'
-                    import csv
-                    with open(chunks_file_csv, 'w', newline='', encoding='utf-8') as f:
-                        writer = csv.writer(f)
-                        writer.writerow(['chunk_id', 'content'])
-                        for chunk in chunks:
-                            writer.writerow([chunk.get('index', ''), chunk.get('text', '')])
-                    
-                    print(f" Chunks salvos: {len(chunks)} chunks")
-                else:
+                print("🔗 Iniciando criação de chunks...")
+                chunks_count = self.write_chunks(
+                    text_content,
+                    chunks_folder / f'{base_filename}_chunks.json',
+                    csv_path=chunks_folder / f'{base_filename}_chunks.csv',
+                    csv_columns={'chunk_id': 'index', 'content': 'text', 'start_time': 'start_time', 'end_time': 'end_time'},
+                    segments=transcript.get('segments')
+                )
+                if not chunks_count:
                     print(" Nenhum chunk foi criado")
-                
-                # Limpeza imediata após chunks
-                chunks = None  # Liberar referência
-                gc.collect()
+                if on_stage:
+                    on_stage('chunks')
                 
             except Exception as e:
                 print(f" Erro ao criar chunks: {e}")
-                # Forçar limpeza em caso de erro
-                import gc
-                gc.collect()
             
             # Criar banco de dados
             db_path = self.create_database()
@@ -2737,6 +3436,8 @@ class YouTubeRAGExtractor:
                 
                 target_db_ts = database_folder / 'youtube_transcripts.db'
                 shutil.copy2(db_path, target_db_ts)
+                if on_stage:
+                    on_stage('db')
             
             # Baixar thumbnail
             thumbnail_url = metadata.get('thumbnail')
@@ -2750,6 +3451,11 @@ class YouTubeRAGExtractor:
                     import shutil
                     shutil.copy2(downloaded_thumb, extracted_folder / f'{video_id}_thumbnail.jpg')
             
+            # Atualizar índice de artefatos (--reuse-data)
+            self.artifact_index.add_files(
+                [transcript_file, transcript_file_ts, metadata_file] + list(video_folder.glob(f'audio_{video_id}.*'))
+            )
+            
             print(f" Dados salvos em: {video_folder.name}")
             
         except Exception as e:
@@ -2909,9 +3615,24 @@ Exemplos de uso:
   # Extrair playlist com numeração automática
   python youtube_extractor.py --playlist "https://www.youtube.com/playlist?list=ID"
   
+  # Extrair playlist com 8 buscas simultâneas e 2 transcrições Whisper
+  python youtube_extractor.py --playlist "PLAYLIST_URL" --fetch-workers 8 --transcribe-workers 2
+  
+  # Reprocessar playlist buscando os metadados de novo (ignora o cache em disco)
+  python youtube_extractor.py --playlist "PLAYLIST_URL" --metadata-ttl 0
+  
+  # Retomar uma playlist interrompida (continua na mesma pasta, só os vídeos que faltam)
+  python youtube_extractor.py --playlist "PLAYLIST_URL" --resume
+  
+  # Vídeos sem legenda: transcrever o áudio enquanto ele é baixado
+  python youtube_extractor.py --url "URL_DO_VIDEO" --stream-audio
+  
   # Extrair playlist com reutilização de dados anteriores
   python youtube_extractor.py --playlist "PLAYLIST_URL" --reuse-data
   
+  # Recriar o índice de arquivos usado pelo --reuse-data
+  python youtube_extractor.py --rebuild-index
+  
   # Organizar playlist existente (apenas reorganizar arquivos)
   python youtube_extractor.py --organize-playlist "nome_da_pasta"
   
@@ -2926,6 +3647,8 @@ Exemplos de uso:
     group.add_argument('--list', '-l', action='store_true', help='Listar vídeos extraídos')
     group.add_argument('--zip-folder', '-z', help='Criar ZIP de uma pasta específica')
     group.add_argument('--organize-playlist', '-o', help='Organizar playlist existente (reorganizar arquivos)')
+    group.add_argument('--rebuild-index', action='store_true',
+                       help='Recriar o índice de arquivos usado pelo --reuse-data (varre o storage uma vez)')
     
     parser.add_argument('--storage', '-s', default='storage', help='Diretório de armazenamento (padrão: storage)')
     parser.add_argument('--folder', '-f', help='Pasta personalizada para vídeo individual')
@@ -2939,6 +3662,16 @@ Exemplos de uso:
     # Novos argumentos para playlist
     parser.add_argument('--start', type=int, default=1, help='Índice inicial da playlist (padrão: 1)')
     parser.add_argument('--end', type=int, help='Índice final da playlist (padrão: todos os vídeos)')
+    parser.add_argument('--resume', action='store_true',
+                       help='Playlist: continuar a última extração (manifesto) pulando vídeos já concluídos')
+    parser.add_argument('--fetch-workers', type=int, default=4,
+                       help='Playlist: vídeos buscando metadados/legendas ao mesmo tempo (padrão: 4)')
+    parser.add_argument('--transcribe-workers', type=int, default=1,
+                       help='Playlist: vídeos em download de áudio + Whisper ao mesmo tempo (padrão: 1)')
+    parser.add_argument('--rate-limit', type=float, default=2.0,
+                       help='Playlist: requisições por segundo por host (padrão: 2, 0 = sem limite)')
+    parser.add_argument('--metadata-ttl', type=float, default=24.0,
+                       help='Validade em horas do cache de metadados de vídeos/playlists (padrão: 24, 0 = sem cache)')
     
     # NOVAS FUNCIONALIDADES v5.0
     parser.add_argument('--advanced-mode', action='store_true', 
@@ -2947,10 +3680,12 @@ Exemplos de uso:
                        help=' Salvar arquivos de áudio permanentemente (padrão: temporário)')
     parser.add_argument('--reuse-data', action='store_true',
                        help=' Reutilizar vídeos/transcrições de versões anteriores')
+    parser.add_argument('--stream-audio', action='store_true',
+                       help=' Whisper: transcrever durante o download do áudio, sem arquivo temporário (requer FFmpeg)')
     parser.add_argument('--chunk-size', type=int, default=500,
                        help=' Tamanho dos chunks (padrão: 500, avançado: 1000)')
-    parser.add_argument('--max-chunks', type=int, default=30,
-                       help=' Número máximo de chunks (padrão: 30, avançado: 100)')
+    parser.add_argument('--max-chunks', type=int, default=0,
+                       help=' Número máximo de chunks (padrão: 0 = sem limite)')
     
     args = parser.parse_args()
     
@@ -2958,8 +3693,6 @@ Exemplos de uso:
     if args.advanced_mode:
         if args.chunk_size == 500:  # Se é valor padrão, aumentar
             args.chunk_size = 1000
-        if args.max_chunks == 30:  # Se é valor padrão, aumentar para 200
-            args.max_chunks = 200
         print(" MODO AVANÇADO: Configurações otimizadas para melhor qualidade RAG")
     
     # Criar extrator com novas configurações v5.0
@@ -2973,7 +3706,12 @@ Exemplos de uso:
         chunk_size=args.chunk_size,
         max_chunks=args.max_chunks,
         cookies_from_browser=args.cookies_from_browser,
-        cookies_file=args.cookies_file
+        cookies_file=args.cookies_file,
+        fetch_workers=args.fetch_workers,
+        transcribe_workers=args.transcribe_workers,
+        rate_limit=args.rate_limit,
+        metadata_ttl=args.metadata_ttl,
+        stream_audio=args.stream_audio
     )
     
     # Opção de pasta personalizada via input se não foi especificada via argumento
@@ -3039,6 +3777,11 @@ Exemplos de uso:
                 failed_extractions = 0
                 total_reused_data = {'transcript': 0, 'metadata': 0, 'audio': 0}
                 
+                # Metadados de todos os vídeos em lote antes de processá-los um a um
+                extractor.prefetch_video_metadata([
+                    video_id for video_id in map(extractor.extract_video_id, urls) if video_id
+                ])
+                
                 for i, url in enumerate(urls, 1):
                     print(f"\n📹 [{i}/{len(urls)}] Processando: {url}")
                     
@@ -3104,7 +3847,7 @@ Exemplos de uso:
             if args.start > 1 or args.end:
                 print(f" Processando playlist do vídeo {args.start} até {args.end}")
             
-            result = extractor.extract_playlist(args.playlist, args.start, args.end)
+            result = extractor.extract_playlist(args.playlist, args.start, args.end, resume=args.resume)
             
             if result.get('success'):
                 print(f"\n🎉 Playlist extraída com sucesso!")
@@ -3133,6 +3876,10 @@ Exemplos de uso:
                 print(f"\n Erro na organização: {result.get('error')}")
                 sys.exit(1)
         
+        elif args.rebuild_index:
+            count = extractor.rebuild_artifact_index()
+            print(f"\n Índice recriado: {count} arquivos em {extractor.artifact_index.db_path}")
+        
         elif args.list:
             # Listar vídeos
             videos = extractor.list_extracted_videos()